@@ -64,7 +64,22 @@ TEMPLATES = [
     },
 ]
 
-ASGI_APPLICATION = 'voyageview.asgi.application'
+ASGI_APPLICATION = 'VoyageView.asgi.application'
+
+# WebSocket kanal katmanı: varsayılan olarak tek süreçli bellek içi katman (geliştirme ve testler).
+# Üretimde işçi süreçlerinin (ör. run_fanout_worker) olayları da iletebilmesi için CHANNEL_REDIS_URL
+# ortam değişkeni verilmeli ve channels_redis paketi kurulmalıdır.
+if os.environ.get('CHANNEL_REDIS_URL'):
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels_redis.core.RedisChannelLayer',
+            'CONFIG': {'hosts': [os.environ['CHANNEL_REDIS_URL']]},
+        },
+    }
+else:
+    CHANNEL_LAYERS = {
+        'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'},
+    }
 
 WSGI_APPLICATION = 'VoyageView.wsgi.application'
 
@@ -86,6 +101,58 @@ REST_FRAMEWORK = {
     
 }
 
+# Ana sayfa akışı (timeline) ayarları
+TIMELINE_FANOUT_THRESHOLD = 10000  # Bu sayıdan fazla takipçisi olan yazarların postları okuma sırasında çekilir
+TIMELINE_FANOUT_RETURN_THRESHOLD = 9000  # Takipçi sayısı buna düşen yazarların postları yeniden akışlara yazılır
+TIMELINE_BACKFILL_SIZE = 50  # Yeni takip edilen kullanıcının akışa eklenecek son post sayısı
+
+# Takip grafiği ayarları
+FOLLOW_GRAPH_CACHE_SIZE = 10000  # Bellekte takipçi / takip edilen ID kümesi tutulacak en fazla kullanıcı yönü
+FOLLOW_GRAPH_CACHE_TTL = 300  # Kümelerin bellekte kalabileceği en uzun süre (saniye); diğer süreçlerdeki değişiklikler için
+RECOMMENDATIONS_TOP_K = 20  # Kullanıcı başına saklanan "tanıyor olabileceğin kişiler" önerisi sayısı
+RECOMMENDATIONS_CATEGORY_WEIGHT = 1.0  # Ortak ilgi alanlarının (post kategorileri) öneri skoruna etkisi
+RECOMMENDATIONS_MAX_DEGREE = 5000  # Bundan fazla kişiyi takip eden kullanıcılar üzerinden öneri yapılmaz
+
+# Yorum ağacı ayarları
+COMMENT_TREE_DEPTH = 3  # Her yorumun altında gösterilen yanıt seviyesi sayısı
+COMMENT_TREE_REPLIES = 3  # Her yorumun altında gösterilen en fazla yanıt sayısı (fazlası bağlantıyla yüklenir)
+POST_RECENT_COMMENTS = 3  # Post listelerinde her postla birlikte gösterilen en yeni ana yorum sayısı
+
+# Trend skoru ayarları
+TRENDING_HALF_LIFE_HOURS = 24  # Bir etkileşimin skora katkısının yarıya inme süresi
+TRENDING_WEIGHTS = {'post': 1.0, 'like': 1.0, 'comment': 2.0, 'share': 3.0, 'view': 0.2}  # Etkileşim ağırlıkları
+
+# Bildirim dağıtım kuyruğu ayarları
+FANOUT_ASYNC = True  # Yeni post bildirimleri `run_fanout_worker` işçisi tarafından gönderilir (False: istek içinde)
+FANOUT_CHUNK_SIZE = 1000  # Tek transaction'da bildirim yazılacak takipçi sayısı
+FANOUT_MODE_CHECK_INTERVAL = 60  # Yazarların akış kipinin (akışa yazma / okumada çekme) kontrol aralığı (saniye)
+
+# Parçalı (devam ettirilebilir) medya yükleme ayarları
+UPLOAD_TEMP_DIR = os.path.join(BASE_DIR, 'uploads_tmp')  # Yarım kalan yüklemelerin yazıldığı dizin (MEDIA_ROOT ile aynı disk olmalı)
+MAX_UPLOAD_SIZE = 500 * 1024 * 1024  # Tek bir medya dosyasının en büyük boyutu (bayt)
+UPLOAD_EXPIRY_HOURS = 24  # Bu sürede gönderiye bağlanmayan yüklemeler `cleanup_uploads` ile silinir
+
+# Görsel türevleri (küçük resim, orta ve büyük boy WebP/JPEG) ayarları
+IMAGE_DERIVATIVES_ASYNC = True  # Türevler süreç havuzunda üretilir (False: commit sonrasında istek içinde)
+IMAGE_DERIVATIVE_WORKERS = 2  # Türev üreten süreç sayısı
+
+# Video dönüştürme (web uyumlu MP4, kapak görseli ve önizleme) ayarları
+VIDEO_TRANSCODE_ASYNC = True  # Videolar `run_transcode_worker` işçisi tarafından dönüştürülür (False: istek içinde)
+VIDEO_TRANSCODE_WORKERS = 2  # İşçinin aynı anda dönüştürdüğü video sayısı
+VIDEO_MAX_BITRATE_KBPS = 2500  # Web sürümünün en yüksek video bit hızı
+VIDEO_MAX_DIMENSION = 1280  # Web sürümünün en uzun kenarı (piksel)
+
+# İçerik adresli medya deposu (gönderi görselleri, gönderi medyaları ve mesaj ekleri) ayarları
+MEDIA_BLOB_DIR = 'blobs'  # Blobların MEDIA_ROOT altındaki dizini
+MEDIA_BLOB_GRACE_HOURS = 24  # Referansı kalmayan bloblar bu süreden sonra `collect_media_blobs` ile silinir
+FILE_UPLOAD_HANDLERS = [  # Yüklenen dosyaların SHA-256 özeti parçalar alınırken hesaplanır
+    'backend.storage.HashingMemoryFileUploadHandler',
+    'backend.storage.HashingTemporaryFileUploadHandler',
+]
+
+# Benzer görsel tespiti
+NEAR_DUPLICATE_DISTANCE = 10  # Algısal özetleri en fazla bu kadar bit farklı olan görseller benzer sayılır (0-64)
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -123,6 +190,8 @@ STATIC_URL = 'static/'
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+MEDIA_CACHE_MAX_AGE = 3600  # Blob olmayan medya dosyalarının tarayıcı/CDN önbelleğinde tutulma süresi (saniye)
+MEDIA_ACCEL_REDIRECT = None  # Ör. '/protected-media/': dosyaları Nginx'in bu internal konumu gönderir (X-Accel-Redirect)
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -1,6 +1,5 @@
 from django.contrib import admin
 from django.urls import path, include
-from django.conf.urls.static import static
 from django.conf import settings
 from django.views.i18n import set_language
 
@@ -12,8 +11,10 @@ urlpatterns = [
     path('notifications/', include('backend.urls.notification')),  # Notifications
     path('home/', include('backend.urls.home')),  # Home (featured, personalized, trending, etc.)
     path('messages/', include('backend.urls.message')),  # Messages
-    path('search/', include('backend.urls.search')) # Search
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)  # Medya dosyaları için static
+    path('search/', include('backend.urls.search')),  # Search
+    path('admin-panel/', include('backend.urls.admin')),  # Yönetim paneli (raporlar, metrikler, moderasyon)
+    path(settings.MEDIA_URL.lstrip('/'), include('backend.urls.media')),  # Medya dosyaları (Range, ETag, önbellek)
+]
 
 # Dil ayarı için URL
 urlpatterns += [
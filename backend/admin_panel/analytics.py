@@ -23,11 +23,11 @@ class AnalyticsView(APIView):
         total_comments = Comment.objects.filter(author=user).count()  # Kullanıcının yazdığı toplam yorum sayısı
 
         # Postların toplam beğeni sayısı
-        total_likes = Post.objects.filter(author=user).aggregate(Sum('likes')).get('likes__sum', 0)
+        total_likes = Post.objects.filter(author=user).aggregate(Sum('like_count')).get('like_count__sum', 0)
 
         # Kullanıcı profil verileri
-        followers = profile.followers.count()  # Takipçi sayısı
-        following = profile.following.count()  # Takip edilen sayısı
+        followers = profile.followers_count  # Takipçi sayısı
+        following = profile.following_count  # Takip edilen sayısı
 
         # Aylık etkileşim sayısı gibi ek metrikler
         # Örnek: Son bir ayda yapılan yorum sayısı
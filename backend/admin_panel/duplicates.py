@@ -0,0 +1,59 @@
+from datetime import timedelta
+from django.shortcuts import get_object_or_404
+from django.utils.timezone import now
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from backend.duplicates import DISTANCE, clusters, near_duplicates
+from backend.models import PostMedia
+from backend.utils.params import float_param
+from backend.serializers import NearDuplicateMediaSerializer
+from backend.utils.perceptual import to_unsigned
+
+
+class NearDuplicateClusterView(APIView):
+    """
+    Birbirine çok benzeyen (yeniden yüklenmiş, kırpılmış, yeniden sıkıştırılmış) görselleri gösteren API.
+    - Varsayılan olarak son `days` gün içinde yüklenen görsellerin benzerlik kümeleri büyükten küçüğe döndürülür;
+      her küme için görsel sayısı, farklı yazar sayısı ve görseller listelenir.
+    - `media` parametresi verilirse yalnızca o görsele benzeyen görseller, uzaklıklarıyla birlikte döndürülür.
+    - `distance` (0-16 bit, varsayılan `NEAR_DUPLICATE_DISTANCE`) benzerlik eşiğidir.
+    """
+    permission_classes = [IsAdminUser]  # Sadece yöneticiler erişebilir
+
+    def get(self, request):
+        params = request.query_params
+        distance = int(float_param(params, 'distance', 0, 16, DISTANCE))
+        context = {'request': request}
+
+        if params.get('media'):
+            media = get_object_or_404(PostMedia, pk=int(float_param(params, 'media', 1, 2 ** 63)))
+            if media.phash is None:
+                raise ValidationError({"media": "Bu medyanın algısal özeti henüz hesaplanmadı."})
+            matches = [match for match in near_duplicates(to_unsigned(media.phash), distance) if match.pk != media.pk]
+            return Response({
+                "media": media.pk,
+                "distance": distance,
+                "matches": NearDuplicateMediaSerializer(matches, many=True, context=context).data,
+            })
+
+        days = int(float_param(params, 'days', 1, 365, 30))
+        min_size = int(float_param(params, 'min_size', 2, 1000, 2))
+        limit = int(float_param(params, 'limit', 1, 100, 20))
+        recent = PostMedia.objects.filter(media_type='image', created_at__gte=now() - timedelta(days=days))
+        found = clusters(distance, recent, min_size)
+        total = len(found)
+        found = found[:limit]
+
+        media = PostMedia.objects.filter(pk__in=[pk for group in found for pk in group]).select_related('post__author')
+        media = {item.pk: item for item in media}
+        results = []
+        for group in found:
+            items = [media[pk] for pk in group if pk in media]
+            results.append({
+                "size": len(items),
+                "authors": len({item.post.author_id for item in items}),
+                "media": NearDuplicateMediaSerializer(items, many=True, context=context).data,
+            })
+        return Response({"distance": distance, "days": days, "count": total, "clusters": results})
@@ -0,0 +1,15 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAdminUser
+from backend.fanout import lag_metrics
+
+class FanoutMetricsView(APIView):
+    """
+    Bildirim dağıtım kuyruğunun durumunu gösteren API.
+    - Bekleyen, çalışan ve başarısız iş sayıları ile en eski bekleyen işin yaşı döndürülür.
+    - Son bir saatte tamamlanan işlerin ortalama ve en yüksek gecikmesi (saniye) döndürülür.
+    """
+    permission_classes = [IsAdminUser]  # Sadece yöneticiler erişebilir
+
+    def get(self, request):
+        return Response(lag_metrics())
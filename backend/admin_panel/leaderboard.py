@@ -40,7 +40,7 @@ class LeaderboardView(ListAPIView):
         best_posts = self.request.query_params.get('best_posts', 'false').lower()
         if best_posts == 'true':
             # En fazla beğeniye sahip postları sıralıyoruz
-            queryset = queryset.annotate(total_likes=Sum('user__posts__likes')).order_by('-total_likes')
+            queryset = queryset.annotate(total_likes=Sum('user__posts__like_count')).order_by('-total_likes')
 
         # Kategori filtreleme
         category = self.request.query_params.get('category')
@@ -50,7 +50,7 @@ class LeaderboardView(ListAPIView):
 
         # Varsayılan sıralama
         # Kategoriye göre sıralama yapılır ve toplam beğenilere göre en yüksek profillere göre sıralanır
-        return queryset.annotate(points_sum=Sum('user__posts__likes')).order_by('-level', '-points_sum')
+        return queryset.annotate(points_sum=Sum('user__posts__like_count')).order_by('-level', '-points_sum')
 
     def list(self, request, *args, **kwargs):
         """
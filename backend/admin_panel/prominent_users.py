@@ -1,7 +1,6 @@
 from rest_framework.generics import ListAPIView
 from backend.models import Profile
 from backend.serializers import ProfileSerializer
-from django.db.models import Count
 
 class ProminentUsersView(ListAPIView):
     """
@@ -12,6 +11,7 @@ class ProminentUsersView(ListAPIView):
 
     def get_queryset(self):
         """
-        Kullanıcıların toplam takipçi sayısını hesaplar ve en fazla takipçiye sahip 10 kullanıcıyı döndürür.
+        En fazla takipçiye sahip 10 kullanıcıyı döndürür.
+        - Sıralama, indekslenmiş `followers_count` sayaç alanı üzerinden yapılır.
         """
-        return Profile.objects.annotate(total_followers=Count('followers')).order_by('-total_followers')[:10]
+        return Profile.objects.order_by('-followers_count')[:10]
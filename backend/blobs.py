@@ -0,0 +1,159 @@
+import logging
+import os
+from collections import Counter
+from datetime import timedelta
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils.timezone import now
+from backend.models import MediaBlob, Message, Post, PostMedia
+from backend.storage import BLOB_DIR, BLOB_TEMP_DIR, blob_digest, blob_storage, is_blob
+
+logger = logging.getLogger(__name__)
+
+# İçerik adresli depoda saklanan dosya alanları: model -> alan
+BLOB_FIELDS = {Post: 'image', PostMedia: 'file', Message: 'attachment'}
+# Referansı kalmayan blobların silinmeden önce bekletildiği süre (bu arada aynı dosya yeniden yüklenebilir)
+GRACE = timedelta(hours=getattr(settings, 'MEDIA_BLOB_GRACE_HOURS', 24))
+
+
+def acquire(name):
+    """Blobun referans sayısını bir artırır; blobun kaydı yoksa oluşturulur. Blob olmayan (eski) dosyalar yok sayılır."""
+    if not is_blob(name):
+        return
+    MediaBlob.objects.bulk_create([MediaBlob(name=name, size=blob_storage.size(name))], ignore_conflicts=True)
+    MediaBlob.objects.filter(name=name).update(ref_count=F('ref_count') + 1)
+
+
+def release(name):
+    """Blobun referans sayısını bir azaltır (sıfırın altına düşürmez); blob hemen silinmez."""
+    if not is_blob(name):
+        return
+    MediaBlob.objects.filter(name=name, ref_count__gt=0).update(ref_count=F('ref_count') - 1, released_at=now())
+
+
+def reference_counts():
+    """Blobları kullanan kayıt sayılarını tüm alanlardan toplayarak `{ad: sayı}` olarak döndürür."""
+    counts = Counter()
+    for model, field in BLOB_FIELDS.items():
+        rows = model.objects.filter(**{f'{field}__startswith': f'{BLOB_DIR}/'}).values_list(field).annotate(total=Count('pk'))
+        counts.update(dict(rows.order_by()))
+    return counts
+
+
+def reconcile():
+    """
+    Referans sayılarını kayıtlardaki gerçek kullanımla karşılaştırıp sapmaları düzeltir; düzeltilen blob sayısını döndürür.
+    - Kaydı olmayan ama kullanılan bloblar için kayıt oluşturulur.
+    """
+    counts = reference_counts()
+    known = set(MediaBlob.objects.filter(name__in=list(counts)).values_list('name', flat=True))
+    MediaBlob.objects.bulk_create([
+        MediaBlob(name=name, size=blob_storage.size(name) if blob_storage.exists(name) else 0)
+        for name in counts if name not in known
+    ], ignore_conflicts=True)
+
+    fixed = 0
+    for blob in MediaBlob.objects.only('pk', 'name', 'ref_count').iterator():
+        actual = counts.get(blob.name, 0)
+        if blob.ref_count != actual:
+            fixed += MediaBlob.objects.filter(pk=blob.pk).update(
+                ref_count=actual, released_at=now() if actual < blob.ref_count else F('released_at'),
+            )
+    return fixed
+
+
+def is_referenced(name):
+    """Blobun herhangi bir kayıt tarafından kullanılıp kullanılmadığını (indeksli sorgularla) kontrol eder."""
+    return any(model.objects.filter(**{field: name}).exists() for model, field in BLOB_FIELDS.items())
+
+
+def _recently_used(path, cutoff):
+    """Blob dosyası bekleme süresi içinde yazıldıysa veya yeniden yüklendiyse True döner."""
+    try:
+        return os.path.getmtime(path) > cutoff.timestamp()
+    except FileNotFoundError:
+        return False
+
+
+def collect(current=None):
+    """
+    Referansı kalmayan blobları ve onlardan üretilmiş türev dosyalarını siler; silinen blob sayısını döndürür.
+    - Bloblar referans sayısı sıfıra düştükten `GRACE` süre sonra silinir; bu sürede yeniden yüklenen blob silinmez.
+    - Silmeden önce blobun gerçekten kullanılmadığı kontrol edilir; sayaç sapmışsa blob silinmez, sayaç düzeltilir.
+    - Kaydı olmayan (ör. kaydedilemeyen yüklemelerden kalan) eski dosyalar ve yarım kalmış geçici dosyalar da silinir.
+    """
+    current = current or now()
+    cutoff = current - GRACE
+    removed = 0
+
+    unused = MediaBlob.objects.filter(ref_count=0).filter(
+        Q(released_at__lte=cutoff) | Q(released_at__isnull=True, created_at__lte=cutoff)
+    )
+    for blob in unused.iterator():
+        if _recently_used(blob_storage.path(blob.name), cutoff):
+            continue
+        if is_referenced(blob.name):
+            logger.warning("Media blob %s has references but a zero counter; reconciling", blob.name)
+            MediaBlob.objects.filter(pk=blob.pk).update(ref_count=reference_counts()[blob.name])
+            continue
+        with transaction.atomic():
+            deleted, _ = MediaBlob.objects.filter(pk=blob.pk, ref_count=0).delete()
+        # Tam bu sırada aynı dosya yeniden yüklendiyse (dosya zamanı yenilenir) diskteki blob korunur
+        if deleted and not _recently_used(blob_storage.path(blob.name), cutoff):
+            blob_storage.purge(blob.name)
+            removed += 1
+
+    # Diskte olup kaydı bulunmayan bloblar (türevleriyle birlikte)
+    root = blob_storage.path(BLOB_DIR)
+    known = {blob_digest(name) for name in MediaBlob.objects.values_list('name', flat=True).iterator()}
+    for directory, subdirectories, files in os.walk(root):
+        if os.path.abspath(directory) == os.path.abspath(blob_storage.path(BLOB_TEMP_DIR)):
+            subdirectories[:] = []
+            for file_name in files:
+                path = os.path.join(directory, file_name)
+                if not _recently_used(path, cutoff):
+                    os.remove(path)
+            continue
+        orphans = {file_name[:64] for file_name in files} - known
+        for digest in orphans:
+            names = [file_name for file_name in files if file_name.startswith(digest)]
+            paths = [os.path.join(directory, file_name) for file_name in names]
+            blob_names = [
+                os.path.relpath(path, blob_storage.location).replace(os.sep, '/')
+                for file_name, path in zip(names, paths) if blob_digest(file_name) == digest
+            ]
+            if any(_recently_used(path, cutoff) for path in paths) or any(map(is_referenced, blob_names)):
+                continue
+            for path in paths:
+                os.remove(path)
+            removed += 1
+    return removed
+
+
+def adopt(batch_size=500):
+    """
+    İçerik adresli depodan önce yüklenmiş dosyaları depoya taşır; aynı içerikli kopyalar tek bloba indirgenir.
+    - Kayıtlar `save` ile güncellenir; referans sayıları sinyallerle güncellenir, görsel türevleri ve video sürümleri
+      yeni ad için yeniden üretilir (aynı içerikli kopyalar için bir kez).
+    - Eski dosya, hiçbir kayıt tarafından kullanılmadığında silinir. Taşınan kayıt sayısını döndürür.
+    """
+    adopted = 0
+    for model, field in BLOB_FIELDS.items():
+        legacy = model.objects.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True}).exclude(
+            **{f'{field}__startswith': f'{BLOB_DIR}/'}
+        )
+        for instance in legacy.iterator(chunk_size=batch_size):
+            old = getattr(instance, field).name
+            if not default_storage.exists(old):
+                logger.warning("%s %s: file %s is missing, skipped", model.__name__, instance.pk, old)
+                continue
+            with default_storage.open(old, 'rb') as file:
+                new = blob_storage.save(old, file)
+            getattr(instance, field).name = new
+            instance.save(update_fields=[field])
+            adopted += 1
+            if not any(other.objects.filter(**{other_field: old}).exists() for other, other_field in BLOB_FIELDS.items()):
+                default_storage.delete(old)
+    return adopted
@@ -0,0 +1,184 @@
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+from django.conf import settings
+from django.db.models import Count, F, Q, Window
+from django.db.models.functions import RowNumber
+from rest_framework.settings import api_settings
+from backend.models import Comment
+from backend.pagination import older_than
+from backend.querysets import with_comment_relations
+
+# Sayfadaki her yorumun altında gösterilen yanıt seviyesi sayısı
+DEPTH = getattr(settings, 'COMMENT_TREE_DEPTH', 3)
+# Her yorumun altında gösterilen en fazla yanıt sayısı; fazlası "daha fazla yanıt" bağlantısıyla yüklenir
+REPLIES = getattr(settings, 'COMMENT_TREE_REPLIES', 3)
+# Yoldaki her yorum ID'sinin uzunluğu (36 tabanında, sıfırla doldurulmuş; 36^10 ID'ye kadar yeter)
+SEGMENT_WIDTH = 10
+# Yolu yazılabilen en büyük derinlik (yol alanının uzunluğuyla sınırlıdır); daha derindeki yanıtların yolu boş kalır
+MAX_DEPTH = Comment._meta.get_field('path').max_length // SEGMENT_WIDTH - 1
+_DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+
+
+def segment(pk):
+    """Yorum ID'sinin yoldaki sabit uzunluklu karşılığı; sıralama ID sırasıyla aynıdır."""
+    digits = ''
+    while pk:
+        pk, remainder = divmod(pk, 36)
+        digits = _DIGITS[remainder] + digits
+    return digits.rjust(SEGMENT_WIDTH, '0')
+
+
+def assign_path(comment):
+    """
+    Yeni yorumun yolunu ve derinliğini yazar; üst yorumun yolu henüz yoksa (eski yorum) boş bırakılır.
+    - Üst yorum nesnesi yüklüyse ek sorgu yapılmaz.
+    """
+    if comment.parent_id is None:
+        path, depth = segment(comment.pk), 0
+    else:
+        if Comment.parent.is_cached(comment):
+            parent = (comment.parent.path, comment.parent.depth)
+        else:
+            parent = Comment.objects.filter(pk=comment.parent_id).values_list('path', 'depth').first()
+        if not parent or not parent[0] or parent[1] >= MAX_DEPTH:
+            return
+        path, depth = parent[0] + segment(comment.pk), parent[1] + 1
+    Comment.objects.filter(pk=comment.pk).update(path=path, depth=depth)
+    comment.path, comment.depth = path, depth
+
+
+def under(path):
+    """
+    Yolu `path` ile başlayan yorumları (yorumun kendisi ve alt ağacı) seçen filtre.
+    - LIKE yerine `[path, path'ten sonraki ilk önek)` aralığı kullanılır; her veritabanında sıradan B-tree indeksiyle
+      aralık taramasına dönüşür (yollar yalnızca 0-9 ve a-z içerdiği için sıralama harmanlamadan etkilenmez).
+    """
+    stem = path.rstrip(_DIGITS[-1])
+    if not stem:
+        return Q(path__gte=path)
+    successor = stem[:-1] + _DIGITS[_DIGITS.index(stem[-1]) + 1]
+    return Q(path__gte=path, path__lt=successor)
+
+
+def subtree(comment):
+    """Yorumun tüm alt yorumları (kendisi hariç); yol üzerinde tek bir indeks aralık taraması."""
+    return Comment.objects.filter(under(comment.path)).exclude(pk=comment.pk)
+
+
+def descendant_count(comment):
+    """Yorumun altındaki toplam yorum sayısı (tüm seviyeler)."""
+    return subtree(comment).count()
+
+
+def backfill_paths(batch_size=1000):
+    """
+    Yolu olmayan yorumların yollarını yukarıdan aşağıya doğru yazar; yazılan yorum sayısını döndürür.
+    - Her turda ana yorumlar ve üst yorumunun yolu yazılmış yorumlar işlenir; alt seviyeler sonraki turlarda gelir.
+    """
+    count = 0
+    while True:
+        ready = Comment.objects.filter(path='').filter(
+            Q(parent__isnull=True) | Q(parent__path__gt='', parent__depth__lt=MAX_DEPTH)
+        ).values_list('pk', 'parent__path', 'parent__depth')[:batch_size]
+        batch = [
+            Comment(pk=pk, path=(parent_path or '') + segment(pk), depth=0 if parent_path is None else parent_depth + 1)
+            for pk, parent_path, parent_depth in ready
+        ]
+        if not batch:
+            return count
+        Comment.objects.bulk_update(batch, ['path', 'depth'])
+        count += len(batch)
+
+
+def _page(post_id, parent_id, cursor, limit):
+    """Ana yorumların veya bir yorumun yanıtlarının bir sayfası: `([(created_at, id, path, depth)], sonraki var mı)`."""
+    siblings = Comment.objects.filter(post_id=post_id, parent_id=parent_id).order_by('-created_at', '-id')
+    if cursor is not None:
+        siblings = siblings.filter(older_than(cursor))
+    rows = list(siblings.values_list('created_at', 'id', 'path', 'depth')[:limit + 1])
+    return rows[:limit], len(rows) > limit
+
+
+def _window(page, depth, replies):
+    """
+    Sayfadaki yorumların alt ağaçlarından gösterilecek yanıtları tek sorguyla okur: `(çocuklar, yanıt sayıları)`.
+    - Alt ağaçlar yol aralıklarıyla seçilir; her yorumun yalnızca en yeni `replies` yanıtı döner (pencere fonksiyonu).
+    - Gösterilen son seviyenin bir altı da okunur; böylece en alttaki yorumların yanıt sayıları da bilinir.
+    """
+    base = page[0][3]
+    rows = Comment.objects.filter(
+        reduce(or_, (under(path) for _, _, path, _ in page)),
+        depth__gt=base, depth__lte=base + depth + 1,
+    ).annotate(
+        rank=Window(RowNumber(), partition_by=[F('parent_id')], order_by=[F('created_at').desc(), F('id').desc()]),
+        siblings=Window(Count('id'), partition_by=[F('parent_id')]),
+    ).filter(rank__lte=replies).order_by('parent_id', 'rank').values_list('created_at', 'id', 'parent_id', 'siblings')
+
+    children, counts = defaultdict(list), {}
+    for created_at, pk, parent_id, siblings in rows:
+        children[parent_id].append((created_at, pk))
+        counts[parent_id] = siblings
+    return children, counts
+
+
+def _skeleton(post_id):
+    """
+    Yolu yazılmamış yorumlar için: gönderinin tüm yorum ağacının iskeletini tek sorguyla okur.
+    - `{üst yorum ID: [(created_at, id), ...]}` yeniden eskiye sıralı ve yanıt sayıları döndürülür.
+    """
+    children = defaultdict(list)
+    rows = Comment.objects.filter(post_id=post_id).order_by('-created_at', '-id').values_list(
+        'created_at', 'id', 'parent_id'
+    )
+    for created_at, pk, parent_id in rows:
+        children[parent_id].append((created_at, pk))
+    return children, {pk: len(items) for pk, items in children.items()}
+
+
+def load_thread(post_id, user=None, parent_id=None, cursor=None, limit=None, depth=DEPTH, replies=REPLIES):
+    """
+    Gönderinin yorumlarını yanıtlarıyla birlikte ağaç olarak yükler; `(yorumlar, sonraki sayfa var mı)` döndürür.
+    - `parent_id` verilmezse ana yorumlar, verilirse o yorumun yanıtları sayfalanır; `cursor` (created_at, id)
+      verilirse o noktadan daha eski olanlar döndürülür.
+    - Her yorumun altına `depth` seviyeye kadar en yeni `replies` yanıtı eklenir (`tree_replies`). Her yorumda
+      toplam yanıt sayısı (`reply_count`) ve gösterilmeyen yanıtlar için cursor (`replies_cursor`) bulunur:
+      None ise tüm yanıtlar gösterilmiştir, '' ise yanıtlar baştan, diğer değerlerde bu cursor'dan sonra yüklenir.
+    - Sayfa, gösterilecek yanıtlar (yol aralıklarıyla) ve gösterilen yorumlar birer sorguyla, beğeniler bir ön yükleme
+      sorgusuyla okunur; ağacın büyüklüğünden bağımsızdır. Yolu yazılmamış eski yorumlarda gönderinin tüm ağacının
+      iskeleti okunur.
+    """
+    limit = limit or api_settings.PAGE_SIZE
+    page, has_next = _page(post_id, parent_id, cursor, limit)
+    if not page:
+        return [], False
+    if all(path for _, _, path, _ in page):
+        children, counts = _window(page, depth, replies)
+    else:
+        children, counts = _skeleton(post_id)
+
+    # Gösterilecek yanıtlar seviye seviye seçilir
+    shown, level = {}, [pk for _, pk, _, _ in page]
+    for _ in range(depth):
+        next_level = []
+        for pk in level:
+            shown[pk] = [child for _, child in children.get(pk, [])[:replies]]
+            next_level.extend(shown[pk])
+        level = next_level
+    for pk in level:
+        shown[pk] = []
+
+    comments = {
+        comment.pk: comment
+        for comment in with_comment_relations(Comment.objects.filter(pk__in=list(shown)), user)
+    }
+    for pk, comment in comments.items():
+        comment.tree_replies = [comments[child] for child in shown[pk] if child in comments]
+        comment.reply_count = counts.get(pk, 0)
+        if comment.reply_count <= len(shown[pk]):
+            comment.replies_cursor = None
+        elif shown[pk]:
+            comment.replies_cursor = children[pk][len(shown[pk]) - 1]
+        else:
+            comment.replies_cursor = ''
+    return [comments[pk] for _, pk, _, _ in page if pk in comments], has_next
@@ -0,0 +1,167 @@
+from urllib.parse import parse_qs
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from backend.models import GroupMessage, Notification
+from backend.serializers import GroupMessageSerializer, MessageSerializer
+from backend.group_chat import is_member, mark_read, messages_since, read_state
+from backend.realtime import group_chat_group, messages_group, notifications_group
+
+# Kimliği doğrulanmamış veya yetkisiz bağlantıların kapatılma kodları
+CLOSE_UNAUTHORIZED = 4401
+CLOSE_FORBIDDEN = 4403
+
+
+class PushConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Kanal grubuna gönderilen olayları istemciye ileten temel consumer.
+    - Yalnızca giriş yapmış kullanıcılar bağlanabilir; alt sınıflar `get_groups` ile katılınacak grupları belirler.
+    - Olaylar istemciye `{"type": <olay>, "data": {...}}` biçiminde gönderilir.
+    """
+
+    async def connect(self):
+        self.user = self.scope.get('user')
+        if self.user is None or not self.user.is_authenticated:
+            await self.close(code=CLOSE_UNAUTHORIZED)
+            return
+        self.groups_joined = await self.get_groups()
+        if self.groups_joined is None:
+            await self.close(code=CLOSE_FORBIDDEN)
+            return
+        for group in self.groups_joined:
+            await self.channel_layer.group_add(group, self.channel_name)
+        await self.accept()
+        await self.on_connected()
+
+    async def disconnect(self, code):
+        for group in getattr(self, 'groups_joined', None) or []:
+            await self.channel_layer.group_discard(group, self.channel_name)
+
+    async def get_groups(self):
+        """Katılınacak kanal grupları; `None` dönerse bağlantı reddedilir. Temel sınıf hiçbir gruba katılmaz."""
+        return []
+
+    async def on_connected(self):
+        pass
+
+    async def push(self, event):
+        await self.send_json({'type': event['event'], 'data': event['data']})
+
+    async def send_error(self, errors):
+        await self.send_json({'type': 'error', 'data': errors})
+
+
+class NotificationConsumer(PushConsumer):
+    """
+    Kullanıcının yeni bildirimlerini anlık olarak ileten consumer (`ws/notifications/`).
+    - Bağlanınca okunmamış bildirim sayısı gönderilir; sonrasında her yeni bildirim `notification` olayıyla gelir.
+    - İstemci `{"action": "mark_read", "id": <id>}` veya `{"action": "mark_all_read"}` göndererek bildirimleri okundu yapabilir.
+    """
+
+    async def get_groups(self):
+        return [notifications_group(self.user.pk)]
+
+    async def on_connected(self):
+        await self.send_unread_count()
+
+    @database_sync_to_async
+    def unread_count(self):
+        return Notification.objects.filter(user=self.user, is_read=False).count()
+
+    @database_sync_to_async
+    def mark_read(self, notification_id=None):
+        notifications = Notification.objects.filter(user=self.user, is_read=False)
+        if notification_id is not None:
+            notifications = notifications.filter(pk=notification_id)
+        notifications.update(is_read=True)
+
+    async def send_unread_count(self):
+        await self.send_json({'type': 'unread_count', 'data': {'unread_count': await self.unread_count()}})
+
+    async def receive_json(self, content, **kwargs):
+        action = content.get('action')
+        if action == 'mark_read' and isinstance(content.get('id'), int):
+            await self.mark_read(content['id'])
+        elif action == 'mark_all_read':
+            await self.mark_read()
+        else:
+            await self.send_error({'action': "Geçersiz işlem. 'mark_read' veya 'mark_all_read' kullanın."})
+            return
+        await self.send_unread_count()
+
+
+class DirectMessageConsumer(PushConsumer):
+    """
+    Kullanıcının birebir mesajlarını anlık olarak ileten consumer (`ws/messages/`).
+    - Kullanıcıya gelen ve kullanıcının gönderdiği her mesaj `message` olayıyla iletilir (REST API ile gönderilenler dahil).
+    - İstemci `{"recipient": <kullanıcı ID>, "content": "..."}` göndererek mesaj gönderebilir.
+    """
+
+    async def get_groups(self):
+        return [messages_group(self.user.pk)]
+
+    @database_sync_to_async
+    def create_message(self, content):
+        serializer = MessageSerializer(data={'recipient': content.get('recipient'), 'content': content.get('content')})
+        if not serializer.is_valid():
+            return serializer.errors
+        serializer.save(sender=self.user)
+        return None
+
+    async def receive_json(self, content, **kwargs):
+        errors = await self.create_message(content)
+        if errors:
+            await self.send_error(errors)
+
+
+class GroupChatConsumer(PushConsumer):
+    """
+    Bir grup sohbeti odasının mesajlarını anlık olarak ileten consumer (`ws/groups/<group_id>/`).
+    - Yalnızca grubun üyeleri bağlanabilir.
+    - `?since=<mesaj ID>` ile bağlanan istemciye önce kaçırdığı mesajlar `sync` olayıyla gönderilir.
+    - İstemci `{"content": "..."}` göndererek gruba mesaj yazabilir; mesaj odadaki herkese `group_message` olayıyla iletilir.
+    - İstemci `{"action": "read", "message_id": <id>}` göndererek okuma imlecini ilerletebilir.
+    """
+
+    async def get_groups(self):
+        self.group_id = self.scope['url_route']['kwargs']['group_id']
+        if not await database_sync_to_async(is_member)(self.group_id, self.user):
+            return None
+        return [group_chat_group(self.group_id)]
+
+    @database_sync_to_async
+    def sync_messages(self, since_id):
+        messages, has_more = messages_since(self.group_id, since_id)
+        return {'results': GroupMessageSerializer(messages, many=True).data, 'has_more': has_more}
+
+    async def on_connected(self):
+        since = parse_qs(self.scope.get('query_string', b'').decode()).get('since')
+        if since and since[0].isdigit():
+            await self.send_json({'type': 'sync', 'data': await self.sync_messages(int(since[0]))})
+
+    @database_sync_to_async
+    def create_message(self, text):
+        # Üyelik bağlantı süresince değişebileceği için her mesajda yeniden kontrol edilir
+        if not is_member(self.group_id, self.user):
+            return False
+        GroupMessage.objects.create(group_id=self.group_id, sender=self.user, content=text)
+        return True
+
+    @database_sync_to_async
+    def advance_read_cursor(self, message_id):
+        if GroupMessage.objects.filter(group_id=self.group_id, id=message_id).exists():
+            mark_read(self.group_id, self.user, message_id)
+        return read_state(self.group_id, self.user)
+
+    async def receive_json(self, content, **kwargs):
+        if content.get('action') == 'read':
+            if not isinstance(content.get('message_id'), int):
+                await self.send_error({'message_id': "Geçerli bir mesaj ID'si gereklidir."})
+                return
+            await self.send_json({'type': 'read_state', 'data': await self.advance_read_cursor(content['message_id'])})
+            return
+        text = content.get('content')
+        if not isinstance(text, str) or not text.strip():
+            await self.send_error({'content': "Mesaj içeriği gereklidir."})
+            return
+        if not await self.create_message(text):
+            await self.close(code=CLOSE_FORBIDDEN)
@@ -0,0 +1,85 @@
+from django.db import transaction
+from django.db.models import Q
+from backend.models import Conversation, ConversationParticipant, Message
+from backend.counters import increment
+
+
+def conversation_for(user_id, other_id):
+    """
+    İki kullanıcı arasındaki sohbeti döndürür; yoksa her iki tarafın gelen kutusu satırlarıyla birlikte oluşturur.
+    - Çift sıralı saklandığından (küçük ID önce) aynı iki kullanıcı için tek sohbet oluşur.
+    """
+    low, high = sorted((user_id, other_id))
+    conversation, created = Conversation.objects.get_or_create(user_low_id=low, user_high_id=high)
+    if created:
+        ConversationParticipant.objects.bulk_create([
+            ConversationParticipant(conversation=conversation, user_id=low, peer_id=high),
+            ConversationParticipant(conversation=conversation, user_id=high, peer_id=low),
+        ], ignore_conflicts=True)  # Kullanıcı kendine yazdıysa tek satır oluşur
+    return conversation
+
+
+def record_message(message):
+    """
+    Yeni mesajı sohbetin özetine işler: son mesaj, iki tarafın sıralama zamanı ve alıcının okunmamış sayısı.
+    - Güncellemeler koşullu olduğundan eşzamanlı gönderilen mesajlarda son mesaj geriye gitmez.
+    """
+    with transaction.atomic():
+        newer = Q(last_message_at__lt=message.created_at) | Q(last_message_at=message.created_at, last_message_id__lt=message.pk)
+        Conversation.objects.filter(newer | Q(last_message__isnull=True), pk=message.conversation_id).update(
+            last_message=message, last_message_at=message.created_at,
+        )
+        ConversationParticipant.objects.filter(
+            conversation_id=message.conversation_id, last_message_at__lt=message.created_at
+        ).update(last_message_at=message.created_at)
+        if message.recipient_id != message.sender_id and not message.is_read:
+            increment(ConversationParticipant.objects.filter(conversation_id=message.conversation_id, user_id=message.recipient_id), 'unread_count')
+
+
+def forget_message(message):
+    """
+    Silinen mesajı sohbetin özetinden çıkarır.
+    - Okunmamışsa alıcının sayacı azaltılır; son mesajsa yerine sohbetteki bir önceki mesaj yazılır.
+    """
+    if message.conversation_id is None:
+        return
+    if message.recipient_id != message.sender_id and not message.is_read:
+        increment(ConversationParticipant.objects.filter(conversation_id=message.conversation_id, user_id=message.recipient_id), 'unread_count', -1)
+    # Son mesaj silindiğinde alan SET_NULL ile boşaltılmış olur
+    previous = Message.objects.filter(conversation_id=message.conversation_id).order_by('-created_at', '-id').first()
+    if previous is not None and Conversation.objects.filter(pk=message.conversation_id, last_message__isnull=True).update(
+        last_message=previous, last_message_at=previous.created_at,
+    ):
+        ConversationParticipant.objects.filter(conversation_id=message.conversation_id).update(last_message_at=previous.created_at)
+
+
+def mark_message_read(message, user):
+    """
+    Tek bir mesajı okundu yapar ve alıcının okunmamış sayısını azaltır; mesaj zaten okunmuşsa bir şey yapmaz.
+    """
+    with transaction.atomic():
+        updated = Message.objects.filter(pk=message.pk, recipient=user, is_read=False).update(is_read=True)
+        if updated and message.conversation_id is not None and message.sender_id != user.pk:
+            increment(ConversationParticipant.objects.filter(conversation_id=message.conversation_id, user=user), 'unread_count', -1)
+    message.is_read = True
+    return updated
+
+
+def mark_thread_read(conversation_id, user):
+    """
+    Kullanıcıya sohbette gelen tüm okunmamış mesajları tek UPDATE ile okundu yapar ve sayacını sıfırlar.
+    - Okundu yapılan mesaj sayısını döndürür.
+    """
+    with transaction.atomic():
+        updated = Message.objects.filter(conversation_id=conversation_id, recipient=user, is_read=False).update(is_read=True)
+        ConversationParticipant.objects.filter(conversation_id=conversation_id, user=user).update(unread_count=0)
+    return updated
+
+
+def inbox(user):
+    """Kullanıcının sohbetlerini son mesaj zamanına göre (yeniden eskiye) döndüren queryset."""
+    return (
+        ConversationParticipant.objects.filter(user=user)
+        .select_related('peer', 'conversation__last_message')
+        .order_by('-last_message_at', '-id')
+    )
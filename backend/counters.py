@@ -0,0 +1,33 @@
+from django.db import transaction
+from django.db.models import F
+
+
+def increment(queryset, field, delta=1):
+    """
+    Sorgudaki satırların sayaç alanını `F()` ifadesiyle veritabanında atomik olarak artırır veya azaltır.
+    - Azaltma işleminde sayaç sıfırın altına düşürülmez.
+    """
+    if delta < 0:
+        queryset = queryset.filter(**{f'{field}__gte': -delta})
+    return queryset.update(**{field: F(field) + delta})
+
+
+def toggle_like(obj, user):
+    """
+    Post veya yorum için beğeniyi ekler ya da kaldırır ve `like_count` alanını aynı işlemde günceller.
+    - Kullanıcının yeni beğeni durumunu döndürür; `obj.like_count` güncel değere yenilenir.
+    """
+    model = type(obj)
+    through = model.likes.through
+    lookup = {f'{model._meta.model_name}_id': obj.pk, 'user_id': user.pk}
+
+    with transaction.atomic():
+        removed, _ = through.objects.filter(**lookup).delete()
+        if removed:
+            increment(model.objects.filter(pk=obj.pk), 'like_count', -1)
+        else:
+            through.objects.create(**lookup)
+            increment(model.objects.filter(pk=obj.pk), 'like_count', 1)
+
+    obj.refresh_from_db(fields=['like_count'])
+    return not removed
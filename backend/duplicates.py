@@ -0,0 +1,100 @@
+import logging
+from collections import defaultdict
+from io import BytesIO
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db.models import Q
+from PIL import Image
+from backend.models import PostMedia
+from backend.utils.perceptual import (
+    BANDS, MultiIndex, band_neighbors, band_radius, bands, hamming, phash, to_signed, to_unsigned,
+)
+
+logger = logging.getLogger(__name__)
+
+# İki görselin benzer sayıldığı en büyük Hamming mesafesi (64 bit üzerinden)
+DISTANCE = getattr(settings, 'NEAR_DUPLICATE_DISTANCE', 10)
+# Özetin parçalarının saklandığı alanlar
+BAND_FIELDS = [f'phash_band_{index}' for index in range(BANDS)]
+
+
+def hash_fields(value):
+    """Özetin `PostMedia` satırına yazılacak alanları: işaretli özet ve indeksli parçaları."""
+    return {'phash': to_signed(value), **dict(zip(BAND_FIELDS, bands(value)))}
+
+
+def near_duplicates(value, distance=DISTANCE, queryset=None):
+    """
+    Özete en fazla `distance` uzaklıktaki görsel medyaları yakından uzağa döndürür; her medyaya `distance` eklenir.
+    - Özetin her parçası için parçaya yakın değerler indeksli alanlarda aranır; yalnızca bu adaylar karşılaştırılır.
+    """
+    radius = band_radius(distance)
+    query = Q()
+    for field, band in zip(BAND_FIELDS, bands(value)):
+        query |= Q(**{f'{field}__in': band_neighbors(band, radius)})
+    queryset = PostMedia.objects.all() if queryset is None else queryset
+    matches = []
+    for media in queryset.filter(query).select_related('post__author'):
+        media.distance = hamming(value, to_unsigned(media.phash))
+        if media.distance <= distance:
+            matches.append(media)
+    return sorted(matches, key=lambda media: (media.distance, media.pk))
+
+
+def clusters(distance=DISTANCE, queryset=None, min_size=2):
+    """
+    Birbirine benzeyen görsellerin kümelerini (medya ID listeleri) büyükten küçüğe döndürür.
+    - Özetler bellek içi çoklu indekse eklenir; her görsel yalnızca aday komşularıyla karşılaştırılır.
+    - Kümeler, `distance` içindeki benzerlik ilişkisinin bağlantılı bileşenleridir (A~B ve B~C ise A, B, C aynı kümededir).
+    """
+    queryset = PostMedia.objects.all() if queryset is None else queryset
+    index = MultiIndex()
+    for pk, value in queryset.filter(phash__isnull=False).values_list('pk', 'phash').iterator():
+        index.add(pk, to_unsigned(value))
+
+    parent = {pk: pk for pk in index.values}
+
+    def find(pk):
+        while parent[pk] != pk:
+            parent[pk] = parent[parent[pk]]
+            pk = parent[pk]
+        return pk
+
+    for pk, value in index.values.items():
+        for other, _ in index.search(value, distance):
+            root, other_root = find(pk), find(other)
+            if root != other_root:
+                parent[max(root, other_root)] = min(root, other_root)
+
+    groups = defaultdict(list)
+    for pk in parent:
+        groups[find(pk)].append(pk)
+    found = [sorted(group) for group in groups.values() if len(group) >= min_size]
+    return sorted(found, key=lambda group: (-len(group), group[0]))
+
+
+def fingerprint(content):
+    """Kodlanmış görselin (ör. küçük resim türevi) algısal özetini hesaplar."""
+    with Image.open(BytesIO(content)) as image:
+        image.draft('L', (64, 64))  # JPEG'ler özet için gereken çözünürlüğe yakın çözülür
+        return phash(image)
+
+
+def backfill(batch_size=500):
+    """
+    Özeti olmayan görsel medyaların özetlerini hesaplar; hesaplanan medya sayısını döndürür.
+    - Varsa küçük resim türevinden, yoksa orijinal görselden hesaplanır. Okunamayan görseller atlanır.
+    """
+    count = 0
+    missing = PostMedia.objects.filter(media_type='image', phash__isnull=True).only('pk', 'file', 'variants')
+    for media in missing.iterator(chunk_size=batch_size):
+        thumbs = [item for item in (media.variants or {}).get('items', []) if item['format'] == 'jpeg']
+        name = min(thumbs, key=lambda item: item['width'])['name'] if thumbs else media.file.name
+        try:
+            with default_storage.open(name, 'rb') as file:
+                value = fingerprint(file.read())
+        except Exception:
+            logger.exception("Perceptual hash for PostMedia %s (%s) failed", media.pk, name)
+            continue
+        count += PostMedia.objects.filter(pk=media.pk, file=media.file.name).update(**hash_fields(value))
+    return count
@@ -0,0 +1,192 @@
+import logging
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Avg, Count, F, Max, Min, Q, Sum
+from django.utils.timezone import now
+from backend.models import FanoutJob, Follow, Notification
+from backend.timeline import fan_out_post, update_fanout_modes
+from backend.realtime import notifications_group, push_many
+from backend.serializers import NotificationSerializer
+
+logger = logging.getLogger(__name__)
+
+# Dağıtımın işçi süreçte mi (True) yoksa istek içinde mi (False) yapılacağı
+ASYNC = getattr(settings, 'FANOUT_ASYNC', True)
+# Tek transaction'da işlenecek takipçi sayısı
+CHUNK_SIZE = getattr(settings, 'FANOUT_CHUNK_SIZE', 1000)
+# İşi alan işçinin kira süresi; her parçadan sonra uzatılır
+LEASE_SECONDS = 60
+# Bir işin başarısız sayılmadan önce en fazla kaç kez deneneceği
+MAX_ATTEMPTS = 5
+# Boşta kalan işçinin kuyruğu yoklama aralığı (saniye)
+POLL_INTERVAL = 1.0
+# Yazarların akış kiplerinin (akışa yazma / okumada çekme) kontrol aralığı (saniye)
+MODE_CHECK_INTERVAL = getattr(settings, 'FANOUT_MODE_CHECK_INTERVAL', 60)
+
+
+def enqueue_post(post):
+    """
+    Yeni postun takipçilere dağıtımını kuyruğa ekler.
+    - İş, postla aynı transaction'da oluşturulur; post kaydedilemezse iş de oluşmaz.
+    - `FANOUT_ASYNC = False` ise iş hemen istek içinde işlenir (işçi çalıştırılmayan geliştirme ortamları için).
+    """
+    job = FanoutJob.objects.create(post=post, sender_id=post.author_id)
+    if not ASYNC:
+        transaction.on_commit(lambda: _run_inline(job.pk))
+    return job
+
+
+def _run_inline(job_id):
+    job = claim_job(FanoutJob.objects.filter(pk=job_id))
+    if job is not None:
+        process_job(job)
+
+
+def claim_job(queryset=None):
+    """
+    Kuyruktaki en eski işi alır ve kirasını başlatır; alınacak iş yoksa None döndürür.
+    - Bekleyen işler ile kira süresi dolmuş (işçisi çökmüş) çalışan işler alınabilir.
+    - İş, koşullu bir UPDATE ile alınır; aynı işi iki işçi aynı anda alamaz.
+    """
+    current = now()
+    queryset = FanoutJob.objects.all() if queryset is None else queryset
+    claimable = queryset.filter(
+        Q(status='pending') & (Q(locked_until__isnull=True) | Q(locked_until__lte=current))
+        | Q(status='running', locked_until__lte=current)
+    )
+    for job in claimable.order_by('created_at', 'id')[:10]:
+        lease = current + timedelta(seconds=LEASE_SECONDS)
+        claimed = FanoutJob.objects.filter(pk=job.pk, status=job.status, locked_until=job.locked_until).update(
+            status='running', locked_until=lease, attempts=F('attempts') + 1,
+            started_at=job.started_at or current,
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+    return None
+
+
+class LeaseLost(Exception):
+    """İşin kirası başka bir işçiye geçtiğinde yükseltilir."""
+
+
+def _process_chunk(job):
+    """
+    Takipçilerin bir sonraki parçası için bildirim ve akış satırlarını yazar ve işin ilerlemesini kaydeder.
+    - Satırlar ve cursor aynı transaction'da yazılır; işlenecek takipçi kalmadıysa False döndürür.
+    - Akış satırları çakışmaları yok sayarak eklendiğinden, bildirimlerle birlikte yeniden denemelerde tekrarlanmaz.
+    """
+    follower_ids = list(
+        Follow.objects.filter(followed_user_id=job.sender_id, user_id__gt=job.cursor)
+        .order_by('user_id').values_list('user_id', flat=True)[:CHUNK_SIZE]
+    )
+    if not follower_ids:
+        return False
+
+    with transaction.atomic():
+        lease = now() + timedelta(seconds=LEASE_SECONDS)
+        moved = FanoutJob.objects.filter(pk=job.pk, status='running', locked_until=job.locked_until).update(
+            cursor=follower_ids[-1], delivered=F('delivered') + len(follower_ids), locked_until=lease,
+        )
+        if not moved:
+            raise LeaseLost(f"Fan-out job {job.pk} was taken over by another worker.")
+
+        notifications = Notification.objects.bulk_create([
+            Notification(user_id=follower_id, sender=job.sender, notification_type='post', post=job.post)
+            for follower_id in follower_ids
+        ])
+        fan_out_post(job.post, follower_ids)
+        # bulk_create sinyal göndermediği için bildirimler çevrimiçi takipçilere burada iletilir (commit sonrası);
+        # parçadaki bildirimler yalnızca ID'leriyle ayrıldığından bir kez serileştirilir
+        data = NotificationSerializer(notifications[0]).data
+        push_many([
+            (notifications_group(notification.user_id), 'notification', dict(data, id=notification.id))
+            for notification in notifications
+        ])
+
+    job.cursor = follower_ids[-1]
+    job.delivered += len(follower_ids)
+    job.locked_until = lease
+    return True
+
+
+def process_job(job):
+    """
+    Alınmış bir işi tamamlanana kadar parça parça işler.
+    - Hata olursa iş artan bekleme süresiyle yeniden kuyruğa alınır; `MAX_ATTEMPTS` denemeden sonra başarısız sayılır.
+    """
+    try:
+        while _process_chunk(job):
+            pass
+    except LeaseLost:
+        logger.warning("Fan-out job %s lost its lease", job.pk)
+        return job
+    except Exception as error:
+        logger.exception("Fan-out job %s failed", job.pk)
+        failed = job.attempts >= MAX_ATTEMPTS
+        FanoutJob.objects.filter(pk=job.pk, locked_until=job.locked_until).update(
+            status='failed' if failed else 'pending',
+            locked_until=now() + timedelta(seconds=2 ** job.attempts),
+            last_error=str(error),
+        )
+        return job
+
+    job.status, job.finished_at, job.locked_until = 'done', now(), None
+    FanoutJob.objects.filter(pk=job.pk).update(status='done', finished_at=job.finished_at, locked_until=None)
+    return job
+
+
+def run_worker(once=False, poll_interval=POLL_INTERVAL):
+    """
+    Kuyruktaki işleri sırayla alıp işleyen işçi döngüsü.
+    - `once=True` ise kuyruk boşaldığında döner; işlenen iş sayısını döndürür.
+    - Her `MODE_CHECK_INTERVAL` saniyede bir, takipçi eşiklerini geçen yazarların akış kipi güncellenir.
+    """
+    processed = 0
+    mode_checked = None
+    while True:
+        if mode_checked is None or time.monotonic() - mode_checked >= MODE_CHECK_INTERVAL:
+            changed = update_fanout_modes()
+            if changed:
+                logger.info("Switched timeline fan-out mode for %s authors", changed)
+            mode_checked = time.monotonic()
+        job = claim_job()
+        if job is None:
+            if once:
+                return processed
+            time.sleep(poll_interval)
+            continue
+        process_job(job)
+        processed += 1
+        logger.info(
+            "Fan-out job %s %s: %s notifications, lag %.1fs",
+            job.pk, job.status, job.delivered, ((job.finished_at or now()) - job.created_at).total_seconds(),
+        )
+
+
+def lag_metrics(window=timedelta(hours=1)):
+    """
+    Dağıtım kuyruğunun durumunu ve gecikme ölçümlerini döndürür.
+    - Bekleyen/çalışan/başarısız iş sayıları ve en eski bekleyen işin yaşı (saniye).
+    - Son `window` içinde tamamlanan işlerin ortalama ve en yüksek gecikmesi (kuyruğa eklenme ile tamamlanma arası).
+    """
+    current = now()
+    counts = dict(FanoutJob.objects.values_list('status').annotate(total=Count('id')).order_by())
+    oldest = FanoutJob.objects.filter(status__in=['pending', 'running']).aggregate(oldest=Min('created_at'))['oldest']
+    recent = FanoutJob.objects.filter(status='done', finished_at__gte=current - window).annotate(
+        lag=F('finished_at') - F('created_at')
+    ).aggregate(jobs=Count('id'), average=Avg('lag'), maximum=Max('lag'), delivered=Sum('delivered'))
+
+    seconds = lambda value: round(value.total_seconds(), 3) if value is not None else None
+    return {
+        'pending': counts.get('pending', 0),
+        'running': counts.get('running', 0),
+        'failed': counts.get('failed', 0),
+        'oldest_pending_seconds': seconds(current - oldest) if oldest else 0,
+        'completed_jobs': recent['jobs'],
+        'delivered_notifications': recent['delivered'] or 0,
+        'average_lag_seconds': seconds(recent['average']),
+        'max_lag_seconds': seconds(recent['maximum']),
+    }
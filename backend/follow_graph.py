@@ -0,0 +1,152 @@
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from backend.models import Follow
+from backend import timeline
+
+# Bellekte komşuluk kümesi tutulacak en fazla kullanıcı yönü (takipçiler ve takip edilenler ayrı sayılır)
+CACHE_SIZE = getattr(settings, 'FOLLOW_GRAPH_CACHE_SIZE', 10000)
+# Bir kümenin bellekte kalabileceği en uzun süre (saniye); diğer süreçlerdeki değişiklikler en geç bu sürede görülür
+CACHE_TTL = getattr(settings, 'FOLLOW_GRAPH_CACHE_TTL', 300)
+
+FOLLOWERS = 'followers'
+FOLLOWING = 'following'
+
+
+class AdjacencyCache:
+    """
+    Kullanıcıların takipçi ve takip edilen ID kümelerini süreç içinde tutan LRU önbellek.
+    - Anahtar `(yön, kullanıcı ID)`; değer değiştirilemez bir `frozenset` olduğundan okuyanlar kilitsiz kullanabilir.
+    - Kapasite dolunca en uzun süredir okunmayan küme atılır; `ttl` süresini geçen kümeler yeniden okunur.
+    - Takip başlatılıp bırakıldığında sinyaller her iki ucun ilgili kümesini siler.
+    """
+
+    def __init__(self, maxsize=CACHE_SIZE, ttl=CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()  # anahtar -> (okunma zamanı, frozenset)
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self.ttl:
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic(), value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def discard(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+adjacency = AdjacencyCache()
+
+
+def _load(direction, user_id):
+    if direction == FOLLOWERS:
+        rows = Follow.objects.filter(followed_user_id=user_id).values_list('user_id', flat=True)
+    else:
+        rows = Follow.objects.filter(user_id=user_id).values_list('followed_user_id', flat=True)
+    return frozenset(rows.order_by())
+
+
+def _adjacent(direction, user_id):
+    key = (direction, user_id)
+    ids = adjacency.get(key)
+    if ids is None:
+        ids = _load(direction, user_id)
+        adjacency.set(key, ids)
+    return ids
+
+
+def follower_ids(user_id):
+    """Kullanıcıyı takip edenlerin ID kümesi (önbellekten; yoksa tek bir indeks taramasıyla okunur)."""
+    return _adjacent(FOLLOWERS, user_id)
+
+
+def following_ids(user_id):
+    """Kullanıcının takip ettiklerinin ID kümesi."""
+    return _adjacent(FOLLOWING, user_id)
+
+
+def is_following(user_id, target_id):
+    """`user_id` kullanıcısı `target_id` kullanıcısını takip ediyorsa True döner."""
+    return target_id in following_ids(user_id)
+
+
+def invalidate(user_id, followed_user_id):
+    """
+    Bir takip eklenip silindiğinde iki ucun etkilenen kümelerini önbellekten atar (sinyallerden çağrılır).
+    - Kümeler işlem onaylandıktan sonra bir kez daha atılır; arada eski veriyle yeniden yüklenmiş olabilirler.
+    """
+    def discard():
+        adjacency.discard((FOLLOWING, user_id))
+        adjacency.discard((FOLLOWERS, followed_user_id))
+
+    discard()
+    transaction.on_commit(discard)
+
+
+def follow(user, target):
+    """
+    `user` kullanıcısının `target` kullanıcısını takip etmesini sağlar; yeni takip oluştuysa True döner.
+    - Takip edilenin son postları kullanıcının akışına eklenir; sayaçlar ve önbellek sinyallerle güncellenir.
+    - Kullanıcı kendini takip edemez; bu durumda takip oluşturulmaz ve False döner.
+    """
+    if user.pk == target.pk:
+        return False
+    try:
+        with transaction.atomic():
+            Follow.objects.create(user=user, followed_user=target)
+    except IntegrityError:
+        return False  # Eşzamanlı bir istek takibi zaten oluşturdu
+    timeline.backfill_author(user, target)
+    return True
+
+
+def unfollow(user, target):
+    """Takibi bırakır; silinen bir takip varsa True döner. Takibi bırakılanın postları akıştan silinir."""
+    deleted, _ = Follow.objects.filter(user=user, followed_user=target).delete()
+    if not deleted:
+        return False
+    timeline.remove_author(user, target)
+    return True
+
+
+def toggle(user, target):
+    """Takip ediliyorsa takibi bırakır, edilmiyorsa takip eder; işlemden sonra takip edilip edilmediğini döndürür."""
+    if Follow.objects.filter(user=user, followed_user=target).exists():
+        unfollow(user, target)
+        return False
+    follow(user, target)
+    return user.pk != target.pk
+
+
+def followers(user_id):
+    """Kullanıcıyı takip edenler; en son takip edenden başlayarak sıralı `User` sorgusu."""
+    return User.objects.filter(followers__followed_user_id=user_id).order_by(
+        '-followers__created_at', '-followers__id'
+    )
+
+
+def following(user_id):
+    """Kullanıcının takip ettikleri; en son takip edilenden başlayarak sıralı `User` sorgusu."""
+    return User.objects.filter(following__user_id=user_id).order_by('-following__created_at', '-following__id')
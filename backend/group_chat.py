@@ -0,0 +1,55 @@
+from django.db.models import F
+from django.db.models.functions import Greatest
+from backend.models import GroupChat, GroupMessage, GroupReadCursor
+
+# Senkronizasyonda tek seferde döndürülecek en fazla mesaj
+SYNC_LIMIT = 500
+# Okunmamış mesaj sayısının sayılacağı üst sınır (istemci "999+" gösterir)
+UNREAD_COUNT_LIMIT = 999
+
+
+def is_member(group_id, user):
+    """Kullanıcının grup sohbetinin üyesi olup olmadığını döndürür."""
+    return GroupChat.members.through.objects.filter(groupchat_id=group_id, user_id=user.pk).exists()
+
+
+def messages_since(group_id, since_id, limit=SYNC_LIMIT):
+    """
+    Gruptaki `since_id`'den sonra gönderilen mesajları eskiden yeniye döndürür.
+    - Yeniden bağlanan istemciler yalnızca kaçırdıkları mesajları alır; `(group, id)` indeksi üzerinden okunur.
+    - Daha fazla mesaj olup olmadığı da döndürülür; istemci son mesajın ID'siyle devam eder.
+    """
+    messages = list(
+        GroupMessage.objects.filter(group_id=group_id, id__gt=since_id)
+        .select_related('sender').order_by('id')[:limit + 1]
+    )
+    return messages[:limit], len(messages) > limit
+
+
+def mark_read(group_id, user, message_id):
+    """
+    Üyenin okuma imlecini verilen mesaja ilerletir (geri alınmaz) ve güncel imleç değerini döndürür.
+    """
+    cursor, created = GroupReadCursor.objects.get_or_create(
+        group_id=group_id, user=user, defaults={'last_read_message_id': message_id}
+    )
+    if not created and cursor.last_read_message_id < message_id:
+        GroupReadCursor.objects.filter(pk=cursor.pk).update(
+            last_read_message_id=Greatest(F('last_read_message_id'), message_id)
+        )
+        cursor.refresh_from_db(fields=['last_read_message_id'])
+    return cursor.last_read_message_id
+
+
+def read_state(group_id, user):
+    """
+    Üyenin okuma imlecini ve okunmamış mesaj sayısını (kendi mesajları hariç) döndürür.
+    - Sayım `UNREAD_COUNT_LIMIT` ile sınırlıdır; uzun süre okunmamış büyük gruplarda tüm geçmiş taranmaz.
+    """
+    last_read = (
+        GroupReadCursor.objects.filter(group_id=group_id, user=user)
+        .values_list('last_read_message_id', flat=True).first()
+    ) or 0
+    unread = GroupMessage.objects.filter(group_id=group_id, id__gt=last_read).exclude(sender=user)
+    unread = unread.order_by('id')[:UNREAD_COUNT_LIMIT].count()
+    return {'last_read_message_id': last_read, 'unread_count': unread}
@@ -1,11 +1,12 @@
 from rest_framework.generics import ListAPIView
 from backend.models import Post
 from backend.serializers import PostSerializer
+from backend.querysets import with_post_relations
 from django.utils.timezone import now
 from datetime import timedelta
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
-from django.db.models import Count
+from django.db.models import F
 from rest_framework import generics
 from rest_framework.permissions import AllowAny, IsAuthenticated
 
@@ -13,13 +14,13 @@ class FeaturedPostsView(ListAPIView):
     """
     Öne çıkan postları listeler.
     - Kullanıcılar kategorilerine göre filtreleyebilirler.
-    - Beğeni, yorum sayısı gibi verilere göre sıralama yapılabilir.
+    - Beğeni, yorum sayısı veya trend skoruna göre sıralama yapılabilir.
     """
     serializer_class = PostSerializer
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]  # Filtreleme ve sıralama işlevselliği ekleniyor
     filterset_fields = ['category']  # Kategoriye göre filtreleme
-    ordering_fields = ['total_likes', 'comment_count', 'created_at']  # Sıralama alanları
-    ordering = ['-created_at']  # Varsayılan sıralama: en son oluşturulanlar
+    ordering_fields = ['total_likes', 'comment_count', 'trending_score', 'created_at']  # Sıralama alanları
+    ordering = ['-trending_score', '-created_at']  # Varsayılan sıralama: trend skoru en yüksek olanlar
 
     def get_queryset(self):
         """
@@ -39,12 +40,9 @@ class FeaturedPostsView(ListAPIView):
         if start_date:
             queryset = queryset.filter(created_at__gte=start_date)
 
-        # Beğeni ve yorum sayısını anotasyon ile ekliyoruz
-        queryset = queryset.annotate(
-            total_likes=Count('likes'),
-            comment_count=Count('comments')
-        )
-        return queryset
+        # Beğeni sayısı sayaç alanından okunur (yorum sayısı zaten `comment_count` alanında tutulur)
+        queryset = queryset.annotate(total_likes=F('like_count'))
+        return with_post_relations(queryset, self.request.user)
 
 class PersonalizedFeedView(generics.ListAPIView):
     """
@@ -60,21 +58,25 @@ class PersonalizedFeedView(generics.ListAPIView):
         """
         user = self.request.user
         interactions = user.userinteraction_set.values_list('post__category', flat=True).distinct()  # Kullanıcının etkileşimde bulunduğu kategoriler
-        return Post.objects.filter(category__in=interactions).order_by('-created_at')  # Bu kategorilerdeki postları döndürür
+        queryset = Post.objects.filter(category__in=interactions).order_by('-created_at')  # Bu kategorilerdeki postları döndürür
+        return with_post_relations(queryset, user)
 
 class TrendingPostsView(generics.ListAPIView):
     """
-    Popüler (beğenilen) postları listeler.
-    - Beğeni sayısına göre sıralanır.
+    Popüler postları listeler.
+    - Beğeni, yorum, paylaşım ve görüntülemelerden zamanla sönümlenerek hesaplanan trend skoruna göre sıralanır.
+    - Skorlar `update_trending_scores` komutu ile periyodik olarak güncellenir.
     """
     serializer_class = PostSerializer
     permission_classes = [AllowAny]  # Herkesin erişebileceği bir API
 
     def get_queryset(self):
         """
-        Beğeni sayısına göre sıralanan en popüler 10 postu döndürür.
+        Trend skoruna göre sıralanan en popüler 10 postu döndürür.
+        - Sıralama, indekslenmiş `trending_score` alanı üzerinden yapılır.
         """
-        return Post.objects.annotate(like_count=Count('likes')).order_by('-like_count')[:10]  # En fazla beğeniye sahip 10 postu döndürür
+        queryset = with_post_relations(Post.objects.all(), self.request.user)
+        return queryset.order_by('-trending_score')[:10]  # Trend skoru en yüksek 10 postu döndürür
 
 class MostCommentedPostsView(generics.ListAPIView):
     """
@@ -87,8 +89,10 @@ class MostCommentedPostsView(generics.ListAPIView):
     def get_queryset(self):
         """
         Yorum sayısına göre sıralanan en çok yorumlanan 10 postu döndürür.
+        - Sıralama, indekslenmiş `comment_count` alanı üzerinden yapılır.
         """
-        return Post.objects.annotate(comment_count=Count('comments')).order_by('-comment_count')[:10]  # En çok yorum alan 10 postu döndürür
+        queryset = with_post_relations(Post.objects.all(), self.request.user)
+        return queryset.order_by('-comment_count')[:10]  # En çok yorum alan 10 postu döndürür
 
 class RecentPostsView(generics.ListAPIView):
     """
@@ -102,4 +106,5 @@ class RecentPostsView(generics.ListAPIView):
         """
         En son paylaşılan 10 postu döndürür.
         """
-        return Post.objects.order_by('-created_at')[:10]  # En yeni 10 postu döndürür
+        queryset = with_post_relations(Post.objects.all(), self.request.user)
+        return queryset.order_by('-created_at')[:10]  # En yeni 10 postu döndürür
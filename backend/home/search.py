@@ -1,7 +1,9 @@
 from django.http import JsonResponse
 from django.views import View
-from django.contrib.auth.models import User
-from django.db.models import Q
+from rest_framework import generics, permissions
+from rest_framework.exceptions import ValidationError
+from backend.pagination import SuggestionPagination
+from backend.user_search import suggest_users
 import json
 
 class SearchUserAPI(View):
@@ -14,17 +16,16 @@ class SearchUserAPI(View):
             if not username_query:
                 return JsonResponse({"error": "'username' alanı gereklidir."}, status=400)
 
-            # Kullanıcıyı ve benzerlerini ara
-            users = User.objects.filter(Q(username__icontains=username_query))
+            # Kullanıcıyı ve benzerlerini dizinden ara (sonuç sayısı sınırlıdır)
+            users = suggest_users(username_query)
 
-            # Kullanıcı bilgilerini JSON formatında döndür
+            # Kullanıcı bilgilerini JSON formatında döndür (e-posta adresleri paylaşılmaz)
             results = [
                 {
-                    "id": user.id,
-                    "username": user.username,
-                    "email": user.email
+                    "id": user_id,
+                    "username": username,
                 }
-                for user in users
+                for user_id, username, _ in users
             ]
 
             return JsonResponse({"results": results}, status=200)
@@ -32,4 +33,26 @@ class SearchUserAPI(View):
         except json.JSONDecodeError:
             return JsonResponse({"error": "Geçersiz JSON formatı."}, status=400)
         except Exception as e:
-            return JsonResponse({"error": str(e)}, status=500)
\ No newline at end of file
+            return JsonResponse({"error": str(e)}, status=500)
+
+
+class UserTypeaheadView(generics.ListAPIView):
+    """
+    Yazarken kullanıcı önerileri (typeahead) sunan API.
+    - `q` parametresiyle başlayan kullanıcı adları önce, adın içinde geçenler sonra gelir; her grup takipçi sayısına göre sıralanır.
+    - Sonuçlar en fazla 50 kullanıcı ile sınırlıdır ve sayfalanır.
+    """
+    permission_classes = [permissions.AllowAny]
+    pagination_class = SuggestionPagination
+    filter_backends = []
+
+    def list(self, request, *args, **kwargs):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            raise ValidationError({"q": "Arama sorgusu gereklidir."})
+        results = [
+            {"id": user_id, "username": username, "followers_count": followers_count}
+            for user_id, username, followers_count in suggest_users(query)
+        ]
+        page = self.paginate_queryset(results)
+        return self.get_paginated_response(page)
@@ -0,0 +1,187 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import django
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from backend.duplicates import fingerprint, hash_fields
+from backend.models import Post, PostMedia, Profile
+from backend.storage import blob_storage, is_blob
+from backend.utils.images import render_variants
+
+logger = logging.getLogger(__name__)
+
+# Türevlerin işçi süreç havuzunda mı (True) yoksa istek içinde mi (False) üretileceği
+ASYNC = getattr(settings, 'IMAGE_DERIVATIVES_ASYNC', True)
+# Havuzdaki süreç sayısı
+WORKERS = getattr(settings, 'IMAGE_DERIVATIVE_WORKERS', 2)
+# Türevi üretilen görsel alanları: model -> (dosya alanı, türev bilgisi alanı)
+IMAGE_FIELDS = {
+    Post: ('image', 'image_variants'),
+    PostMedia: ('file', 'variants'),
+    Profile: ('profile_image', 'profile_image_variants'),
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def executor():
+    """
+    Görsel işleme süreç havuzunu (ilk kullanımda) oluşturur.
+    - Süreçler 'spawn' ile başlatılır; ana süreçteki veritabanı bağlantıları ve iş parçacıkları kopyalanmaz.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=WORKERS, mp_context=multiprocessing.get_context('spawn'), initializer=django.setup,
+            )
+        return _executor
+
+
+def derivative_name(name, size, extension):
+    """Türevin depolamadaki adı; orijinalin yanına yazılır (post_media/abc.jpg -> post_media/abc_thumb.webp)."""
+    root, _ = os.path.splitext(name)
+    return f"{root}_{size}.{extension}"
+
+
+def generate(name):
+    """
+    Depolamadaki görselin türevlerini üretip orijinalin yanına kaydeder ve türev bilgilerini döndürür.
+    - Havuzdaki süreçlerde çalışır; veritabanına erişmez.
+    """
+    with default_storage.open(name, 'rb') as file:
+        width, height, variants = render_variants(file)
+    # Algısal özet, orijinal yeniden çözülmeden en küçük JPEG türevinden hesaplanır
+    thumb = min((variant for variant in variants if variant['format'] == 'jpeg'), key=lambda variant: variant['width'])
+    value = fingerprint(thumb['content'])
+    items = []
+    for variant in variants:
+        target = derivative_name(name, variant['size'], variant['format'])
+        if default_storage.exists(target):
+            default_storage.delete(target)
+        target = default_storage.save(target, ContentFile(variant.pop('content')))
+        items.append(dict(variant, name=target))
+    return {'source': name, 'width': width, 'height': height, 'phash': value, 'items': items}
+
+
+def delete_files(variants):
+    """
+    Türev bilgilerindeki dosyaları depolamadan siler.
+    - İçerik adresli bir blobun türevleri başka kayıtlarca da kullanılabildiğinden silinmez; blobla birlikte silinir.
+    """
+    if is_blob((variants or {}).get('source')):
+        return
+    for item in (variants or {}).get('items', []):
+        default_storage.delete(item['name'])
+
+
+def needs_variants(instance):
+    """Örneğin görselinin türevlerinin (yeniden) üretilmesi gerekip gerekmediğini döndürür."""
+    file_field, variants_field = IMAGE_FIELDS[type(instance)]
+    name = getattr(instance, file_field).name
+    if not name or (isinstance(instance, PostMedia) and instance.media_type != 'image'):
+        return False
+    return (getattr(instance, variants_field) or {}).get('source') != name
+
+
+def shared_variants(name):
+    """
+    Aynı blobu kullanan başka bir kayıtta hazır olan türevleri döndürür (yoksa None).
+    - Aynı dosya yeniden yüklendiğinde türevler yeniden üretilmez.
+    """
+    if not is_blob(name):
+        return None
+    for model, (file_field, variants_field) in IMAGE_FIELDS.items():
+        if model._meta.get_field(file_field).storage is not blob_storage:
+            continue
+        for variants in model.objects.filter(**{file_field: name}).values_list(variants_field, flat=True)[:10]:
+            if (variants or {}).get('source') == name:
+                return variants
+    return None
+
+
+def record(model, pk, name, variants):
+    """
+    Üretilen türevleri kayda yazar; gönderi medyalarında algısal özet de yazılır (benzer görsel araması için).
+    - Yalnızca kaydın dosyası hâlâ aynıysa yazılır; bu arada görsel değiştiyse üretilen dosyalar silinir.
+    """
+    file_field, variants_field = IMAGE_FIELDS[model]
+    fields = {variants_field: variants}
+    if model is PostMedia and variants.get('phash') is not None:
+        fields.update(hash_fields(variants['phash']))
+    updated = model.objects.filter(pk=pk, **{file_field: name}).update(**fields)
+    if not updated:
+        delete_files(variants)
+    return updated
+
+
+def _record_result(model, pk, name, future):
+    """Havuzdaki iş bittiğinde (havuzun iş parçacığında) sonucu kaydeder."""
+    try:
+        record(model, pk, name, future.result())
+    except Exception:
+        logger.exception("Image derivatives for %s %s (%s) failed", model.__name__, pk, name)
+    finally:
+        connection.close()  # Bu iş parçacığının bağlantısı açık bırakılmaz
+
+
+def schedule(instance):
+    """
+    Görselin türevlerinin üretimini transaction tamamlandıktan sonra başlatır.
+    - Eski görselin türevleri silinir; yeni türevler hazır olana kadar istemciler orijinali kullanır.
+    - Aynı blobun türevleri başka bir kayıtta hazırsa yeniden üretilmeden kullanılır.
+    - `IMAGE_DERIVATIVES_ASYNC = False` ise türevler commit sonrasında istek içinde üretilir.
+    """
+    if not needs_variants(instance):
+        return
+    model = type(instance)
+    file_field, variants_field = IMAGE_FIELDS[model]
+    name = getattr(instance, file_field).name
+    delete_files(getattr(instance, variants_field))
+    shared = shared_variants(name)
+    if shared is not None:
+        setattr(instance, variants_field, shared)
+        record(model, instance.pk, name, shared)
+        return
+
+    def run():
+        if ASYNC:
+            executor().submit(generate, name).add_done_callback(partial(_record_result, model, instance.pk, name))
+            return
+        try:
+            record(model, instance.pk, name, generate(name))
+        except Exception:
+            # Türev üretilemese de kayıt geçerlidir; istemciler orijinal görseli kullanır
+            logger.exception("Image derivatives for %s %s (%s) failed", model.__name__, instance.pk, name)
+
+    transaction.on_commit(run)
+
+
+def regenerate_missing(batch_size=500):
+    """
+    Türevi olmayan veya eskimiş tüm görseller için türevleri süreç havuzunda üretir; üretilen görsel sayısını döndürür.
+    - Okunamayan görseller günlüğe yazılıp atlanır.
+    """
+    count = 0
+    for model, (file_field, _) in IMAGE_FIELDS.items():
+        queryset = model.objects.exclude(**{file_field: ''}).exclude(**{f'{file_field}__isnull': True})
+        if model is PostMedia:
+            queryset = queryset.filter(media_type='image')
+        jobs = [
+            (instance.pk, getattr(instance, file_field).name)
+            for instance in queryset.iterator(chunk_size=batch_size) if needs_variants(instance)
+        ]
+        futures = [(pk, name, executor().submit(generate, name)) for pk, name in jobs]
+        for pk, name, future in futures:
+            try:
+                count += record(model, pk, name, future.result())
+            except Exception:
+                logger.exception("Image derivatives for %s %s (%s) failed", model.__name__, pk, name)
+    return count
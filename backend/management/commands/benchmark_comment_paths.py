@@ -0,0 +1,94 @@
+import random
+import time
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from backend import comment_tree
+from backend.models import Comment, Post
+
+
+class Command(BaseCommand):
+    """
+    Yorum yollarıyla (materialized path) yapılan ağaç sorgularını üst yorum bağlantılarıyla yapılanlarla karşılaştırır.
+    - Geçici bir gönderiye rastgele ağaç şeklinde `--comments` yorum yazılır ve yolları `backfill_paths` ile doldurulur.
+    - Alt ağaç, alt yorum sayısı ve yorum sayfası (yol penceresi ile tüm ağaç iskeleti) süreleri ve sorgu sayıları
+      raporlanır. Tüm veriler tek bir transaction içinde oluşturulur ve ölçümden sonra geri alınır.
+    """
+    help = "Yorum ağacı sorgularında yol aralıklarını üst yorum bağlantılarıyla karşılaştırır."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--comments', type=int, default=100000, help="Oluşturulacak yorum sayısı.")
+        parser.add_argument('--roots', type=int, default=200, help="Ana yorum sayısı.")
+        parser.add_argument('--repeat', type=int, default=3, help="Her ölçümün tekrar sayısı.")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.run(options)
+            transaction.set_rollback(True)
+
+    def run(self, options):
+        rng = random.Random(4)
+        user = User.objects.create(username='benchmark-comment-paths')
+        post = Post.objects.create(
+            author=user, title='benchmark', description='benchmark', category='nature', image='benchmark.jpg',
+            latitude=0, longitude=0, location_name='benchmark',
+        )
+        ids = [
+            comment.pk for comment in
+            Comment.objects.bulk_create(Comment(post=post, author=user, content='c') for _ in range(options['roots']))
+        ]
+        while len(ids) < options['comments']:
+            # Yanıtların yarısı rastgele bir yoruma, yarısı son yorumlardan birine yazılır (derin zincirler oluşur)
+            batch = [
+                Comment(post=post, author=user, content='c', parent_id=rng.choice(ids if rng.random() < 0.5 else ids[-50:]))
+                for _ in range(min(1000, options['comments'] - len(ids)))
+            ]
+            ids.extend(comment.pk for comment in Comment.objects.bulk_create(batch))
+        started = time.perf_counter()
+        count = comment_tree.backfill_paths(5000)
+        self.stdout.write(f"{count} yorumun yolu {time.perf_counter() - started:.1f} sn'de yazıldı.")
+
+        def measure(function):
+            queries = []
+
+            def count_queries(execute, sql, params, many, context):
+                queries.append(sql)
+                return execute(sql, params, many, context)
+
+            with connection.execute_wrapper(count_queries):
+                started = time.perf_counter()
+                for _ in range(options['repeat']):
+                    result = function()
+                milliseconds = (time.perf_counter() - started) / options['repeat'] * 1000
+            return result, milliseconds, len(queries) // options['repeat']
+
+        def descendants(pk):
+            found, level = [], [pk]
+            while level:
+                level = list(Comment.objects.filter(parent_id__in=level).values_list('pk', flat=True))
+                found.extend(level)
+            return found
+
+        for pk in (ids[0], ids[len(ids) // 20]):
+            comment = Comment.objects.get(pk=pk)
+            linked, linked_ms, linked_queries = measure(lambda: sorted(descendants(comment.pk)))
+            path, path_ms, path_queries = measure(lambda: sorted(comment_tree.subtree(comment).values_list('pk', flat=True)))
+            self.stdout.write(
+                f"  yorum {pk} alt ağacı ({len(path)} yorum): üst bağlantılarıyla {linked_ms:.1f} ms/{linked_queries} sorgu, "
+                f"yol aralığıyla {path_ms:.1f} ms/{path_queries} sorgu; sonuçlar {'aynı' if linked == path else 'FARKLI'}"
+            )
+
+        oldest = Comment.objects.filter(post=post, parent=None).order_by('created_at', 'id')[5]
+        cursor = (oldest.created_at, oldest.pk)
+        window, window_ms, window_queries = measure(lambda: comment_tree.load_thread(post.pk, user, cursor=cursor))
+        with mock.patch.object(comment_tree, '_window', lambda page, depth, replies: comment_tree._skeleton(post.pk)):
+            skeleton, skeleton_ms, skeleton_queries = measure(lambda: comment_tree.load_thread(post.pk, user, cursor=cursor))
+
+        def dump(comments):
+            return [(comment.pk, comment.reply_count, comment.replies_cursor, dump(comment.tree_replies)) for comment in comments]
+
+        self.stdout.write(
+            f"  yorum sayfası: yol penceresiyle {window_ms:.1f} ms/{window_queries} sorgu, tüm ağaç iskeletiyle "
+            f"{skeleton_ms:.1f} ms/{skeleton_queries} sorgu; sonuçlar {'aynı' if dump(window[0]) == dump(skeleton[0]) else 'FARKLI'}"
+        )
@@ -0,0 +1,104 @@
+import random
+import time
+import numpy as np
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from backend.models import Post
+from backend.post.nearby import NearbyPostsView
+from backend.utils.geo import geohash_encode, haversine_km
+
+# Postların yoğunlaştığı (enlem, boylam) merkezleri; tarih değiştirme çizgisi ve kutup yakını da dahil
+CITIES = [(41.01, 28.97), (39.93, 32.86), (48.86, 2.35), (40.71, -74.01), (-17.71, 178.07), (78.22, 15.65), (89.7, 0.0)]
+# Ölçülen sorgular: (ad, sorgu parametreleri)
+QUERIES = [
+    ("yarıçap 5 km, şehir merkezi", {'lat': 41.01, 'lng': 28.97, 'radius': 5}),
+    ("yarıçap 100 km, şehir", {'lat': 48.86, 'lng': 2.35, 'radius': 100}),
+    ("yarıçap 50 km, tarih değiştirme çizgisi", {'lat': -17.71, 'lng': 179.9, 'radius': 50}),
+    ("yarıçap 50 km, kutba yakın", {'lat': 89.8, 'lng': 0.0, 'radius': 50}),
+    ("sınır kutusu, şehir", {'min_lat': 40.9, 'min_lng': 28.8, 'max_lat': 41.1, 'max_lng': 29.1}),
+    ("sınır kutusu, tarih değiştirme çizgisi", {'min_lat': -18.5, 'min_lng': 177.5, 'max_lat': -17.0, 'max_lng': -179.5}),
+    ("sınır kutusu, kutup", {'min_lat': 89.5, 'min_lng': -180, 'max_lat': 90, 'max_lng': 180}),
+]
+
+
+class Command(BaseCommand):
+    """
+    Yakındaki postlar sorgularını (geohash aralıkları) tüm postların taranmasıyla karşılaştırır.
+    - `--posts` post oluşturulur; çoğu birkaç şehrin çevresinde, kalanı dünyaya rastgele dağılır.
+    - Her sorgu için sonuçların kaba kuvvet haversine taramasıyla aynı olduğu kontrol edilir.
+    - Tüm veriler tek bir transaction içinde oluşturulur ve ölçümden sonra geri alınır.
+    """
+    help = "Yakındaki postlar API'sinin yarıçap ve sınır kutusu sorgularını kaba kuvvet taramasıyla karşılaştırır."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=1000000, help="Oluşturulacak post sayısı.")
+        parser.add_argument('--repeat', type=int, default=5, help="Her ölçümün tekrar sayısı.")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.run(options['posts'], options['repeat'])
+            transaction.set_rollback(True)
+
+    def run(self, count, repeat):
+        rng = random.Random(6)
+        started = time.perf_counter()
+        author = User.objects.create(username='benchmark-nearby')
+
+        def location():
+            if rng.random() < 0.2:
+                return rng.uniform(-90, 90), rng.uniform(-180, 180)
+            lat, lng = rng.choice(CITIES)
+            return max(min(rng.gauss(lat, 0.5), 90.0), -90.0), (rng.gauss(lng, 0.5) + 180) % 360 - 180
+
+        for offset in range(0, count, 10000):
+            batch = []
+            for _ in range(min(10000, count - offset)):
+                lat, lng = location()
+                batch.append(Post(
+                    author=author, title='benchmark', category='nature', image='benchmark.jpg', location_name='benchmark',
+                    latitude=lat, longitude=lng, geohash=geohash_encode(lat, lng), status='published',
+                ))
+            Post.objects.bulk_create(batch)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        self.stdout.write(f"{count} post {time.perf_counter() - started:.0f} sn'de oluşturuldu.")
+
+        factory = APIRequestFactory()
+
+        def nearby(params):
+            view = NearbyPostsView()
+            view.setup(factory.get('/posts/nearby/', params))
+            view.request = Request(view.request)
+            return view.find_nearby()
+
+        def scan(params):
+            ids, latitudes, longitudes = np.array(
+                list(Post.objects.values_list('id', 'latitude', 'longitude').iterator(chunk_size=20000)), dtype=float
+            ).reshape(-1, 3).T
+            if 'radius' in params:
+                keep = haversine_km(params['lat'], params['lng'], latitudes, longitudes) <= params['radius']
+            else:
+                min_lng, max_lng = params['min_lng'], params['max_lng']
+                inside = (longitudes >= min_lng) & (longitudes <= max_lng) if min_lng <= max_lng else (
+                    (longitudes >= min_lng) | (longitudes <= max_lng)
+                )
+                keep = inside & (latitudes >= params['min_lat']) & (latitudes <= params['max_lat'])
+            return set(ids[keep].astype(int).tolist())
+
+        def measure(function, params, times):
+            started = time.perf_counter()
+            for _ in range(times):
+                result = function(params)
+            return result, (time.perf_counter() - started) / times * 1000
+
+        for name, params in QUERIES:
+            found, indexed_ms = measure(nearby, params, repeat)
+            expected, scan_ms = measure(scan, params, 1)
+            same = {post_id for _, post_id in found} == expected
+            self.stdout.write(
+                f"  {name}: {len(found)} post, geohash {indexed_ms:.1f} ms, tam tarama {scan_ms:.1f} ms; "
+                f"sonuçlar {'aynı' if same else 'FARKLI'}"
+            )
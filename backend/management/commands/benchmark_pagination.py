@@ -0,0 +1,59 @@
+import time
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.settings import api_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+from backend.models import Notification
+from backend.notification.notification import NotificationListView
+from backend.pagination import encode_cursor
+
+
+class Command(BaseCommand):
+    """
+    Keyset sayfalama ile sayfa numarasıyla sayfalamanın ilk ve son sayfa sürelerini karşılaştırır.
+    - Geçici bir kullanıcı için `--notifications` bildirim oluşturulur; bildirim listesi her iki sayfalamayla da ölçülür.
+    - Tüm veriler tek bir transaction içinde oluşturulur ve ölçümden sonra geri alınır.
+    """
+    help = "Bildirim listesinde keyset ve sayfa numaralı sayfalamanın ilk/son sayfa sürelerini ölçer."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--notifications', type=int, default=50000, help="Oluşturulacak bildirim sayısı.")
+        parser.add_argument('--repeat', type=int, default=20, help="Her ölçümün tekrar sayısı.")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.run(options['notifications'], options['repeat'])
+            transaction.set_rollback(True)
+
+    def run(self, count, repeat):
+        user = User.objects.create(username='benchmark-pagination-user')
+        sender = User.objects.create(username='benchmark-pagination-sender')
+        Notification.objects.bulk_create(
+            (Notification(user=user, sender=sender, notification_type='like') for _ in range(count)), batch_size=5000
+        )
+        factory = APIRequestFactory()
+        page_size = api_settings.PAGE_SIZE
+        last_page = max(count // page_size, 1)
+        deep = Notification.objects.filter(user=user).order_by('-created_at', '-id')[max(count - page_size, 0)]
+
+        def measure(url, **initkwargs):
+            view = NotificationListView.as_view(**initkwargs)
+            request = factory.get(url)
+            force_authenticate(request, user)
+            started = time.perf_counter()
+            for _ in range(repeat):
+                response = view(request)
+            assert response.status_code == 200, response.data
+            return (time.perf_counter() - started) / repeat * 1000
+
+        rows = [
+            ('keyset', 1, measure('/notifications/')),
+            ('keyset', last_page, measure(f'/notifications/?cursor={encode_cursor(deep.created_at, deep.pk)}')),
+            ('page number', 1, measure('/notifications/', pagination_class=PageNumberPagination)),
+            ('page number', last_page, measure(f'/notifications/?page={last_page}', pagination_class=PageNumberPagination)),
+        ]
+        self.stdout.write(f"{count} bildirim, sayfa boyutu {page_size}, {repeat} tekrar:")
+        for name, page, milliseconds in rows:
+            self.stdout.write(f"  {name:<12} sayfa {page:>7}: {milliseconds:.2f} ms")
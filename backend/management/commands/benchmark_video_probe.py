@@ -0,0 +1,79 @@
+import os
+import shutil
+import tempfile
+import time
+from django.core.files import File
+from django.core.management.base import BaseCommand
+from backend.utils.video import local_file_path, probe_opencv, probe_stream
+
+# Dosya verilmezse OpenCV ile üretilen örnek videolar: (dosya adı, FourCC, çözünürlük)
+SAMPLES = [('sample.mp4', 'mp4v', (1280, 720)), ('sample.avi', 'MJPG', (640, 480))]
+
+
+class Command(BaseCommand):
+    """
+    Video bilgilerinin konteyner başlıklarından okunmasını, dosyanın kopyalanıp OpenCV ile açılmasıyla karşılaştırır.
+    - Verilen her dosya iki yoldan da okunur; süreler ve çözünürlükler yan yana raporlanır.
+    - Dosya verilmezse OpenCV ile kısa örnek videolar (MP4 ve AVI) üretilir ve ölçümden sonra silinir.
+    """
+    help = "Başlıklardan video bilgisi okumayı kopyalama + OpenCV yoluyla karşılaştırır."
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', help="Ölçülecek video dosyaları.")
+        parser.add_argument('--repeat', type=int, default=20, help="Her ölçümün tekrar sayısı.")
+        parser.add_argument('--frames', type=int, default=250, help="Üretilen örnek videoların kare sayısı.")
+
+    def handle(self, *args, **options):
+        directory = None
+        paths = options['paths']
+        if not paths:
+            directory = tempfile.mkdtemp()
+            paths = self.generate(directory, options['frames'])
+        try:
+            for path in paths:
+                self.compare(path, options['repeat'])
+        finally:
+            if directory:
+                shutil.rmtree(directory, ignore_errors=True)
+
+    def generate(self, directory, frames):
+        import cv2
+        import numpy as np
+
+        paths = []
+        for name, fourcc, (width, height) in SAMPLES:
+            path = os.path.join(directory, name)
+            writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc), 25, (width, height))
+            for index in range(frames):
+                writer.write(np.full((height, width, 3), index % 256, dtype=np.uint8))
+            writer.release()
+            paths.append(path)
+        return paths
+
+    def compare(self, path, repeat):
+        def measure(function):
+            started = time.perf_counter()
+            for _ in range(repeat):
+                result = function()
+            return result, (time.perf_counter() - started) / repeat * 1000
+
+        def headers():
+            with open(path, 'rb') as stream:
+                return probe_stream(stream)
+
+        def opencv():
+            # Önceki yol: yükleme geçici dosyaya kopyalanır ve OpenCV ile açılır
+            with open(path, 'rb') as stream, local_file_path(File(stream)) as copy:
+                return probe_opencv(copy)
+
+        new, new_ms = measure(headers)
+        old, old_ms = measure(opencv)
+
+        def describe(info):
+            if info is None:
+                return "okunamadı"
+            return f"{info['duration']:.3f} sn, {info['width']}x{info['height']}, {info['codec']}"
+
+        self.stdout.write(f"{os.path.basename(path)} ({os.path.getsize(path) / 1e6:.1f} MB)")
+        self.stdout.write(f"  başlıklar: {new_ms:.3f} ms ({describe(new)})")
+        self.stdout.write(f"  OpenCV:    {old_ms:.3f} ms ({describe(old)})")
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from backend.comment_tree import backfill_paths
+
+
+class Command(BaseCommand):
+    """
+    Ağaç yolu (materialized path) olmayan, bu özellikten önce yazılmış yorumların yollarını ve derinliklerini yazar.
+    - Yeni yorumların yolları oluşturulurken yazılır; bu komut yalnızca eksikleri tamamlar.
+    - Yolu olmayan gönderilerin yorumları çalışmaya devam eder, ancak her sayfada tüm yorum ağacı okunur.
+    """
+    help = "Eksik yorum ağacı yollarını (alt ağaç sorguları için) yazar."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help="Tek seferde güncellenen yorum sayısı.")
+
+    def handle(self, *args, **options):
+        count = backfill_paths(options['batch_size'])
+        self.stdout.write(f"{count} yorumun ağaç yolu yazıldı.")
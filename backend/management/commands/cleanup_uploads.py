@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from backend.uploads import cleanup_expired
+
+
+class Command(BaseCommand):
+    """
+    Süresi dolan parçalı yüklemeleri ve geçici dosyalarını siler.
+    - Tamamlanmadan bırakılan veya gönderiye bağlanmayan yüklemelerin diski doldurmaması için periyodik (ör. saatlik cron) çalıştırılmalıdır.
+    """
+    help = "Süresi dolan parçalı yüklemeleri ve geçici dosyalarını siler."
+
+    def handle(self, *args, **options):
+        deleted = cleanup_expired()
+        self.stdout.write(f"{deleted} süresi dolmuş yükleme silindi.")
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from backend.blobs import adopt, collect, reconcile
+
+
+class Command(BaseCommand):
+    """
+    İçerik adresli medya deposunda hiçbir kayıt tarafından kullanılmayan blobları (türevleriyle birlikte) siler.
+    - Periyodik olarak (ör. günde bir kez cron ile) çalıştırılması amaçlanmıştır.
+    - `--reconcile` ile önce referans sayıları kayıtlardaki gerçek kullanımla düzeltilir.
+    - `--adopt` ile depodan önce yüklenmiş dosyalar depoya taşınır; aynı içerikli kopyalar tek bloba indirgenir.
+    """
+    help = "Kullanılmayan medya bloblarını siler."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reconcile', action='store_true', help="Referans sayılarını yeniden hesaplar.")
+        parser.add_argument('--adopt', action='store_true', help="Eski medya dosyalarını içerik adresli depoya taşır.")
+
+    def handle(self, *args, **options):
+        if options['adopt']:
+            self.stdout.write(f"{adopt()} dosya depoya taşındı.")
+        if options['reconcile']:
+            self.stdout.write(f"{reconcile()} blobun referans sayısı düzeltildi.")
+        self.stdout.write(f"{collect()} kullanılmayan blob silindi.")
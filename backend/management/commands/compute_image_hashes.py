@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from backend.duplicates import backfill
+
+
+class Command(BaseCommand):
+    """
+    Algısal özeti olmayan (ör. bu özellikten önce yüklenmiş) görsel medyaların özetlerini hesaplar.
+    - Yeni yüklenen görsellerin özetleri türevleriyle birlikte üretilir; bu komut yalnızca eksikleri tamamlar.
+    """
+    help = "Eksik algısal görsel özetlerini (benzer görsel tespiti için) hesaplar."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help="Veritabanından tek seferde okunan medya sayısı.")
+
+    def handle(self, *args, **options):
+        count = backfill(options['batch_size'])
+        self.stdout.write(f"{count} görselin algısal özeti hesaplandı.")
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from backend.recommendations import compute_recommendations
+
+
+class Command(BaseCommand):
+    """
+    "Tanıyor olabileceğin kişiler" önerilerini takip grafiğinden yeniden hesaplar.
+    - Periyodik olarak (ör. günde bir kez cron ile) çalıştırılmalıdır; öneriler bir sonraki çalıştırmaya kadar tablodan sunulur.
+    """
+    help = "Takip grafiğinden kullanıcı önerilerini (ikinci derece bağlantılar) hesaplar."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help="Tek partide önerisi hesaplanan kullanıcı sayısı.")
+
+    def handle(self, *args, **options):
+        count = compute_recommendations(options['batch_size'])
+        self.stdout.write(f"{count} kullanıcının önerileri hesaplandı.")
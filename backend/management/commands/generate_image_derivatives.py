@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from backend.images import regenerate_missing
+
+
+class Command(BaseCommand):
+    """
+    Türevi olmayan (ör. bu özellikten önce yüklenmiş) veya türevleri eskimiş görseller için türevleri üretir.
+    - Görseller `IMAGE_DERIVATIVE_WORKERS` süreçli havuzda paralel işlenir.
+    """
+    help = "Eksik görsel türevlerini (küçük resim, orta ve büyük boy) üretir."
+
+    def handle(self, *args, **options):
+        count = regenerate_missing()
+        self.stdout.write(f"{count} görselin türevleri üretildi.")
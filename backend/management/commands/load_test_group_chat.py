@@ -0,0 +1,81 @@
+import random
+import statistics
+import time
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+from backend.models import GroupChat, GroupMessage
+from backend.message.message_group import GroupMessageHistoryView, GroupReadCursorView
+
+
+class Command(BaseCommand):
+    """
+    Büyük bir grup sohbetinde geçmiş, yeniden bağlanma (`since`) ve okundu durumu uç noktalarının sürelerini ölçer.
+    - Geçici üyeler ve mesajlar oluşturulur; mesajların onda biri başka bir gruba yazılır.
+    - Tüm veriler tek bir transaction içinde oluşturulur ve ölçümden sonra geri alınır.
+    """
+    help = "Büyük bir grup sohbetinde mesaj geçmişi ve okundu durumu uç noktalarının yük testini yapar."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--members', type=int, default=10000, help="Gruptaki üye sayısı.")
+        parser.add_argument('--messages', type=int, default=1000000, help="Oluşturulacak toplam mesaj sayısı.")
+        parser.add_argument('--pages', type=int, default=200, help="Geçmişte gezilecek sayfa sayısı.")
+        parser.add_argument('--repeat', type=int, default=30, help="Her ölçümün tekrar sayısı.")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.run(options)
+            transaction.set_rollback(True)
+
+    def run(self, options):
+        rng = random.Random(5)
+        started = time.perf_counter()
+        User.objects.bulk_create(
+            (User(username=f'load-test-member-{index}') for index in range(options['members'])), batch_size=5000
+        )
+        member_ids = list(User.objects.filter(username__startswith='load-test-member-').values_list('id', flat=True))
+        group = GroupChat.objects.create(name='load-test')
+        other = GroupChat.objects.create(name='load-test-other')
+        Membership = GroupChat.members.through
+        Membership.objects.bulk_create(
+            (Membership(groupchat_id=group.id, user_id=user_id) for user_id in member_ids), batch_size=5000
+        )
+        GroupMessage.objects.bulk_create((
+            GroupMessage(group=group if index % 10 else other, sender_id=rng.choice(member_ids), content=f'message {index}')
+            for index in range(options['messages'])
+        ), batch_size=20000)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        self.stdout.write(f"Hazırlık: {time.perf_counter() - started:.0f} sn")
+
+        factory = APIRequestFactory()
+        user = User.objects.get(pk=member_ids[len(member_ids) // 2])
+
+        def call(view, url, data=None):
+            request = factory.post(url, data, format='json') if data else factory.get(url)
+            force_authenticate(request, user=user)
+            started = time.perf_counter()
+            response = view.as_view()(request, group_id=group.id)
+            assert response.status_code == 200, response.data
+            return response, (time.perf_counter() - started) * 1000
+
+        def bench(label, view, url):
+            timings = [call(view, url)[1] for _ in range(options['repeat'])]
+            self.stdout.write(f"  {label}: p50 {statistics.median(timings):.2f} ms, en fazla {max(timings):.2f} ms")
+
+        bench("geçmiş, ilk sayfa", GroupMessageHistoryView, '/')
+        url = '/'
+        for _ in range(options['pages']):
+            response, milliseconds = call(GroupMessageHistoryView, url)
+            if not response.data['next']:
+                break
+            url = response.data['next'].replace('http://testserver', '')
+        self.stdout.write(f"  geçmiş, {options['pages']}. sayfa: {milliseconds:.2f} ms")
+
+        recent = list(GroupMessage.objects.filter(group=group).order_by('-id').values_list('id', flat=True)[:121])
+        since = recent[-1]
+        bench(f"yeniden bağlanma ({len(recent) - 1} kaçırılmış mesaj)", GroupMessageHistoryView, f'/?since={since}')
+        bench("okundu durumu (hiç okunmamış)", GroupReadCursorView, '/')
+        call(GroupReadCursorView, '/', {'message_id': since})
+        bench("okundu durumu (imleç sona yakın)", GroupReadCursorView, '/')
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from backend.map_clusters import rebuild
+
+
+class Command(BaseCommand):
+    """
+    Harita kümelerinin özet tablosunu tüm postlardan yeniden oluşturur.
+    - Sinyallerin atlandığı toplu güncellemelerden (ör. `update()`) sonra çalıştırılmalıdır.
+    """
+    help = "Harita kümelerini postlardan yeniden hesaplar."
+
+    def handle(self, *args, **options):
+        cells = rebuild()
+        self.stdout.write(f"{cells} harita hücresi oluşturuldu.")
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from backend.search import reindex_all
+
+
+class Command(BaseCommand):
+    """
+    Tüm postların tam metin arama dizinini yeniden oluşturur.
+    - Sinyallerin atlandığı toplu güncellemelerden veya etiket adı değişikliklerinden sonra çalıştırılmalıdır.
+    """
+    help = "Postların arama dizinini yeniden oluşturur."
+
+    def handle(self, *args, **options):
+        count = reindex_all()
+        self.stdout.write(f"{count} post arama dizinine eklendi.")
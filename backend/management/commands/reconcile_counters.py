@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from backend.models import Comment, Follow, Post, Profile
+
+
+def count_subquery(queryset, field, outer_field='pk'):
+    """
+    `field` alanı dış sorgudaki satırın `outer_field` değerine eşit olan kayıtların sayısını döndüren alt sorgu.
+    """
+    counts = queryset.filter(**{field: OuterRef(outer_field)}).order_by().values(field).annotate(total=Count('*')).values('total')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def counter_specs():
+    """
+    (model, sayaç alanı, gerçek değeri hesaplayan ifade) üçlülerini döndürür.
+    """
+    return [
+        (Post, 'like_count', count_subquery(Post.likes.through.objects.all(), 'post_id')),
+        (Post, 'comment_count', count_subquery(Comment.objects.all(), 'post_id')),
+        (Comment, 'like_count', count_subquery(Comment.likes.through.objects.all(), 'comment_id')),
+        (Profile, 'followers_count', count_subquery(Follow.objects.all(), 'followed_user_id', 'user_id')),
+        (Profile, 'following_count', count_subquery(Follow.objects.all(), 'user_id', 'user_id')),
+    ]
+
+
+class Command(BaseCommand):
+    """
+    Beğeni, yorum ve takipçi sayaçlarını gerçek değerlerle karşılaştırır ve sapmaları toplu olarak düzeltir.
+    - Her sayaç için yalnızca sapma olan satırlar tek bir UPDATE sorgusuyla güncellenir.
+    """
+    help = "Beğeni, yorum ve takip sayaçlarındaki sapmaları toplu olarak düzeltir."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Sapmaları yalnızca raporlar, düzeltmez.")
+
+    def handle(self, *args, **options):
+        for model, field, actual in counter_specs():
+            drifted = model.objects.annotate(actual=actual).filter(~Q(**{field: F('actual')}))
+            with transaction.atomic():
+                if options['dry_run']:
+                    fixed = drifted.count()
+                else:
+                    fixed = model.objects.filter(pk__in=drifted.values('pk')).update(**{field: actual})
+            self.stdout.write(f"{model.__name__}.{field}: {fixed} satır {'sapmalı' if options['dry_run'] else 'düzeltildi'}")
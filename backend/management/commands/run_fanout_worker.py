@@ -0,0 +1,21 @@
+import logging
+from django.core.management.base import BaseCommand
+from backend.fanout import POLL_INTERVAL, run_worker
+
+
+class Command(BaseCommand):
+    """
+    Yeni post bildirimlerini ve akış satırlarını takipçilere dağıtan işçi süreci.
+    - Harici bir kuyruk sunucusu gerekmez; işler veritabanındaki `FanoutJob` tablosundan alınır.
+    - Birden fazla işçi aynı anda çalıştırılabilir; her iş yalnızca bir işçi tarafından alınır.
+    """
+    help = "Bildirim dağıtım kuyruğundaki işleri işler."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Kuyruk boşaldığında çıkar.")
+        parser.add_argument('--interval', type=float, default=POLL_INTERVAL, help="Boşta yoklama aralığı (saniye).")
+
+    def handle(self, *args, **options):
+        logging.getLogger('backend.fanout').setLevel(logging.INFO)
+        processed = run_worker(once=options['once'], poll_interval=options['interval'])
+        self.stdout.write(f"{processed} dağıtım işi işlendi.")
@@ -0,0 +1,22 @@
+import logging
+from django.core.management.base import BaseCommand
+from backend.transcoding import POLL_INTERVAL, WORKERS, run_worker
+
+
+class Command(BaseCommand):
+    """
+    Yüklenen videoları web uyumlu MP4'e dönüştüren, kapak görseli ve önizleme üreten işçi süreci.
+    - İşler `PostMedia` satırlarındaki dönüştürme durumundan alınır; harici bir kuyruk sunucusu gerekmez.
+    - Birden fazla işçi aynı anda çalıştırılabilir; her iş yalnızca bir işçi tarafından alınır.
+    """
+    help = "Video dönüştürme kuyruğundaki işleri işler."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Kuyruk boşaldığında çıkar.")
+        parser.add_argument('--interval', type=float, default=POLL_INTERVAL, help="Boşta yoklama aralığı (saniye).")
+        parser.add_argument('--workers', type=int, default=WORKERS, help="Aynı anda dönüştürülecek video sayısı.")
+
+    def handle(self, *args, **options):
+        logging.getLogger('backend.transcoding').setLevel(logging.INFO)
+        processed = run_worker(once=options['once'], poll_interval=options['interval'], workers=options['workers'])
+        self.stdout.write(f"{processed} video dönüştürme işi işlendi.")
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from backend.trending import update_trending_scores
+
+
+class Command(BaseCommand):
+    """
+    Son çalıştırmadan bu yana etkileşim alan postların trend skorlarını yeniden hesaplar.
+    - Periyodik olarak (ör. birkaç dakikada bir cron ile) çalıştırılması amaçlanmıştır.
+    """
+    help = "Etkileşim alan postların trend skorlarını günceller."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help="Tüm postların skorlarını yeniden hesaplar.")
+
+    def handle(self, *args, **options):
+        updated = update_trending_scores(full=options['full'])
+        self.stdout.write(f"{updated} postun trend skoru güncellendi.")
@@ -0,0 +1,98 @@
+from collections import defaultdict
+from django.db import transaction
+from django.db.models import F, Q
+from backend.models import MapCluster, Post
+from backend.utils.geo import covering_cells
+
+# Önceden toplanan en yüksek çözünürlük (geohash uzunluğu, ~150 m)
+MAX_PRECISION = 7
+# Harita yakınlaştırma seviyesinin (zoom) geohash uzunluğuna karşılığı
+ZOOM_PRECISIONS = [(2, 1), (4, 2), (7, 3), (9, 4), (12, 5), (14, 6)]
+
+
+def precision_for_zoom(zoom):
+    """Harita yakınlaştırma seviyesine uygun geohash uzunluğunu döndürür."""
+    for max_zoom, precision in ZOOM_PRECISIONS:
+        if zoom <= max_zoom:
+            return precision
+    return MAX_PRECISION
+
+
+def apply_post(geohash, category, latitude, longitude, delta):
+    """
+    Bir postu tüm çözünürlük seviyelerindeki hücre özetlerine ekler (`delta=1`) veya çıkarır (`delta=-1`).
+    - Sayaçlar `F()` ifadeleriyle atomik olarak güncellenir, boşalan hücreler silinir.
+    """
+    if not geohash:
+        return
+    cells = [(precision, geohash[:precision]) for precision in range(1, MAX_PRECISION + 1)]
+    with transaction.atomic():
+        if delta > 0:
+            MapCluster.objects.bulk_create([
+                MapCluster(precision=precision, cell=cell, category=category) for precision, cell in cells
+            ], ignore_conflicts=True)
+        for precision, cell in cells:
+            MapCluster.objects.filter(precision=precision, cell=cell, category=category).update(
+                count=F('count') + delta,
+                latitude_sum=F('latitude_sum') + delta * latitude,
+                longitude_sum=F('longitude_sum') + delta * longitude,
+            )
+        if delta < 0:
+            MapCluster.objects.filter(
+                Q(*[Q(precision=precision, cell=cell) for precision, cell in cells], _connector=Q.OR),
+                category=category, count=0,
+            ).delete()
+
+
+def rebuild():
+    """Tüm hücre özetlerini postlardan yeniden hesaplar ve oluşturulan satır sayısını döndürür."""
+    totals = defaultdict(lambda: [0, 0.0, 0.0])
+    for geohash, category, latitude, longitude in Post.objects.values_list('geohash', 'category', 'latitude', 'longitude').iterator():
+        if not geohash:
+            continue
+        for precision in range(1, MAX_PRECISION + 1):
+            total = totals[(precision, geohash[:precision], category)]
+            total[0] += 1
+            total[1] += latitude
+            total[2] += longitude
+
+    with transaction.atomic():
+        MapCluster.objects.all().delete()
+        MapCluster.objects.bulk_create([
+            MapCluster(precision=precision, cell=cell, category=category, count=count, latitude_sum=lat_sum, longitude_sum=lng_sum)
+            for (precision, cell, category), (count, lat_sum, lng_sum) in totals.items()
+        ], batch_size=1000)
+    return len(totals)
+
+
+def clusters_in_viewport(zoom, min_lat, min_lng, max_lat, max_lng):
+    """
+    Görünür alandaki hücrelerin kümelerini (post sayısı, ağırlık merkezi, en yaygın kategori) döndürür.
+    """
+    precision = precision_for_zoom(zoom)
+    cover = [cell[:precision] for cell in covering_cells(min_lat, min_lng, max_lat, max_lng)]
+    cells = Q()
+    for prefix in set(cover):
+        cells |= Q(cell__gte=prefix, cell__lt=prefix + '{')
+
+    clusters = {}
+    rows = MapCluster.objects.filter(cells, precision=precision, count__gt=0)
+    for cell, category, count, lat_sum, lng_sum in rows.values_list('cell', 'category', 'count', 'latitude_sum', 'longitude_sum'):
+        cluster = clusters.setdefault(cell, {'cell': cell, 'count': 0, 'latitude': 0.0, 'longitude': 0.0, 'categories': {}})
+        cluster['count'] += count
+        cluster['latitude'] += lat_sum
+        cluster['longitude'] += lng_sum
+        cluster['categories'][category] = count
+
+    results = []
+    for cluster in clusters.values():
+        cluster['latitude'] /= cluster['count']
+        cluster['longitude'] /= cluster['count']
+        cluster['top_category'] = max(cluster.pop('categories').items(), key=lambda item: item[1])[0]
+        # Kaplama hücreleri görünür alandan geniş olabilir; merkezi alan dışında kalan kümeler atlanır
+        in_lng = min_lng <= cluster['longitude'] <= max_lng if min_lng <= max_lng else (
+            cluster['longitude'] >= min_lng or cluster['longitude'] <= max_lng
+        )
+        if min_lat <= cluster['latitude'] <= max_lat and in_lng:
+            results.append(cluster)
+    return precision, results
@@ -0,0 +1,107 @@
+import os
+import re
+from urllib.parse import quote
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe
+from django.views import View
+from backend.storage import BLOB_TEMP_DIR, blob_digest, is_blob
+from backend.utils.http import RangeFile, RangeNotSatisfiable, parse_range
+
+# İçeriği değişebilen dosyaların (eski dosyalar, türevler) önbellekte tutulma süresi (saniye)
+CACHE_MAX_AGE = getattr(settings, 'MEDIA_CACHE_MAX_AGE', 3600)
+# İçerik adresli blobların önbellekte tutulma süresi; adı içeriğinden türediği için blob hiç değişmez
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+# Ayarlanırsa dosyayı Nginx gönderir (X-Accel-Redirect); değer, MEDIA_ROOT'u sunan `internal` konumun önekidir
+ACCEL_REDIRECT = getattr(settings, 'MEDIA_ACCEL_REDIRECT', None)
+_DIGEST_RE = re.compile(r'[0-9a-f]{64}')
+
+
+def is_content_addressed(name):
+    """Dosya bir blobun kendisiyse True döner (blobdan üretilmiş türevler yeniden üretilebildiği için hariçtir)."""
+    return is_blob(name) and bool(_DIGEST_RE.fullmatch(blob_digest(name)))
+
+
+def file_etag(name, stat):
+    """Blobların ETag'i içeriğin SHA-256 özetidir; diğer dosyalarınki değişiklik zamanı ve boyutundan üretilir."""
+    if is_content_addressed(name):
+        return f'"{blob_digest(name)}"'
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def _if_range_matches(request, etag, last_modified):
+    """`If-Range` yoksa veya dosyanın güncel sürümünü gösteriyorsa True döner; değilse aralık yok sayılır."""
+    value = request.headers.get('If-Range')
+    if value is None:
+        return True
+    if value.startswith(('"', 'W/')):
+        return value == etag
+    return parse_http_date_safe(value) == last_modified
+
+
+class MediaFileView(View):
+    """
+    MEDIA_ROOT altındaki yüklenmiş dosyaları sunan view (`django.views.static.serve` yerine).
+    - Dosya belleğe okunmaz; `FileResponse` ile parça parça, WSGI sunucusu destekliyorsa `sendfile` ile gönderilir.
+    - `Range` istekleri (video ileri/geri sarma) 206 ile yalnızca istenen bölüm gönderilerek yanıtlanır.
+    - `If-None-Match` / `If-Modified-Since` koşullu isteklerine dosya gönderilmeden 304 döner.
+    - Bloblar bir yıl ve `immutable` olarak, diğer dosyalar `MEDIA_CACHE_MAX_AGE` süreyle önbelleğe alınabilir.
+    - `MEDIA_ACCEL_REDIRECT` ayarlıysa dosyayı Nginx gönderir; başlıklar yine burada belirlenir.
+    """
+
+    def get(self, request, path):
+        name = path.lstrip('/')
+        if name.startswith(f'{BLOB_TEMP_DIR}/'):
+            raise Http404
+        try:
+            file = open(default_storage.path(name), 'rb')
+        except (SuspiciousFileOperation, NotImplementedError, OSError):
+            raise Http404
+        stat = os.fstat(file.fileno())
+        etag, last_modified = file_etag(name, stat), int(stat.st_mtime)
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is not None:
+            file.close()
+            return self.finalize(response, name, etag, last_modified)
+
+        if ACCEL_REDIRECT:
+            file.close()
+            response = HttpResponse()
+            response['X-Accel-Redirect'] = quote(f"{ACCEL_REDIRECT.rstrip('/')}/{name}")
+            del response['Content-Type']  # Nginx dosya uzantısından belirler
+            return self.finalize(response, name, etag, last_modified)
+
+        size = stat.st_size
+        try:
+            byte_range = parse_range(request.headers.get('Range'), size) if _if_range_matches(
+                request, etag, last_modified
+            ) else None
+        except RangeNotSatisfiable:
+            file.close()
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return self.finalize(response, name, etag, last_modified)
+
+        if byte_range is None:
+            response = FileResponse(file)
+        else:
+            start, end = byte_range
+            response = FileResponse(RangeFile(file, start, end - start + 1), status=206, filename=os.path.basename(name))
+            response['Content-Length'] = end - start + 1
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        return self.finalize(response, name, etag, last_modified)
+
+    def finalize(self, response, name, etag, last_modified):
+        """Doğrulama ve önbellek başlıklarını ekler."""
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        response['Accept-Ranges'] = 'bytes'
+        if is_content_addressed(name):
+            patch_cache_control(response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+        else:
+            patch_cache_control(response, public=True, max_age=CACHE_MAX_AGE)
+        return response
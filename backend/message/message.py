@@ -1,9 +1,12 @@
 from django.shortcuts import get_object_or_404
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
-from backend.models import Message, User
-from backend.serializers import MessageSerializer
+from backend.models import ConversationParticipant, Message, User
+from backend.serializers import ConversationSerializer, MessageSerializer
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+from backend.pagination import ConversationPagination, KeysetPagination
+from backend.conversations import inbox, mark_message_read, mark_thread_read
 
 class MessageListCreateView(generics.ListCreateAPIView):
     """
@@ -15,6 +18,7 @@ class MessageListCreateView(generics.ListCreateAPIView):
     serializer_class = MessageSerializer
     permission_classes = [permissions.IsAuthenticated]  # Yalnızca giriş yapmış kullanıcılar erişebilir
     search_fields = ['content', 'sender__username', 'recipient__username']  # Mesaj içerikleri ve kullanıcı adları üzerinden arama yapılabilir
+    pagination_class = KeysetPagination  # Cursor ile sayfalama
 
     def get_queryset(self):
         """
@@ -40,33 +44,61 @@ class MessageMarkAsReadView(generics.UpdateAPIView):
     """
     Kullanıcının mesajlarını okundu olarak işaretleme işlemi yapan API.
     - Sadece alıcı kullanıcı bu işlemi gerçekleştirebilir.
+    - `thread: true` gönderilirse mesajın ait olduğu sohbetteki tüm okunmamış mesajlar tek seferde okundu yapılır.
     """
     queryset = Message.objects.all()
     permission_classes = [permissions.IsAuthenticated]
 
     def patch(self, request, *args, **kwargs):
         """
-        Mesajı okundu olarak işaretler.
+        Mesajı (veya sohbetin tamamını) okundu olarak işaretler ve sohbetin okunmamış sayacını günceller.
         - Kullanıcı, yalnızca kendisine ait mesajları okundu olarak işaretleyebilir.
         """
         message = self.get_object()
         if message.recipient != request.user:
             return Response({"hata": "Bu mesajı okundu olarak işaretleme izniniz yok."}, status=403)
-        message.is_read = True
-        message.save()
+        if request.data.get('thread') in (True, 'true', '1'):
+            marked = mark_thread_read(message.conversation_id, request.user)
+            return Response({"mesaj": "Sohbet başarıyla okundu olarak işaretlendi.", "okunan": marked})
+        mark_message_read(message, request.user)
         return Response({"mesaj": "Mesaj başarıyla okundu olarak işaretlendi."})
 
-class SortedMessageListView(generics.ListAPIView):
+
+class ConversationListView(generics.ListAPIView):
+    """
+    Kullanıcının gelen kutusunu (sohbet listesini) döndüren API.
+    - Her satırda diğer kullanıcı, son mesaj ve okunmamış mesaj sayısı bulunur.
+    - Sohbetler son mesaj zamanına göre yeniden eskiye cursor ile sayfalanır; mesajlar taranmaz.
+    """
+    serializer_class = ConversationSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = ConversationPagination  # Son mesaj zamanına göre cursor ile sayfalama
+
+    def get_queryset(self):
+        return inbox(self.request.user)
+
+
+class ConversationMessageListView(generics.ListAPIView):
     """
-    Kullanıcının mesajlarını sıralı bir şekilde listeleyen API.
-    - Mesajlar, belirtilen sıralama kriterlerine göre sıralanır.
+    Bir sohbetin mesajlarını yeniden eskiye cursor ile listeleyen API.
+    - Yalnızca sohbetin tarafları erişebilir.
     """
     serializer_class = MessageSerializer
-    permission_classes = [permissions.IsAuthenticated]
-    ordering_fields = ['created_at', 'is_read', 'sender__username']  # Sıralama yapılabilecek alanlar
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination  # Cursor ile sayfalama
 
     def get_queryset(self):
-        """
-        Kullanıcının aldığı mesajları belirtilen sıralama kriterine göre döndürür.
-        """
-        return Message.objects.filter(recipient=self.request.user)
+        participant = get_object_or_404(ConversationParticipant, conversation_id=self.kwargs['conversation_id'], user=self.request.user)
+        return Message.objects.filter(conversation_id=participant.conversation_id).order_by('-created_at', '-id')
+
+
+class ConversationMarkAsReadView(APIView):
+    """
+    Sohbetteki kullanıcıya gelen tüm okunmamış mesajları tek seferde okundu olarak işaretleyen API.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        participant = get_object_or_404(ConversationParticipant, conversation_id=kwargs['conversation_id'], user=request.user)
+        marked = mark_thread_read(participant.conversation_id, request.user)
+        return Response({"mesaj": "Sohbet başarıyla okundu olarak işaretlendi.", "okunan": marked})
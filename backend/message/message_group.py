@@ -1,8 +1,11 @@
 from rest_framework import serializers, generics, permissions, status
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
-from backend.models import GroupChat, User, GroupInvitation
-from backend.serializers import GroupChatSerializer, GroupInvitationSerializer
+from rest_framework.exceptions import PermissionDenied
+from backend.models import GroupChat, GroupMessage, User, GroupInvitation
+from backend.serializers import GroupChatSerializer, GroupInvitationSerializer, GroupMessageSerializer
+from backend.pagination import KeysetPagination
+from backend.group_chat import is_member, mark_read, messages_since, read_state
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 
@@ -81,3 +84,63 @@ class GroupInvitationResponseView(APIView):
             return Response({"mesaj": "Davet reddedildi."}, status=200)
 
         return Response({"hata": "Geçersiz işlem. Lütfen 'accept' veya 'reject' kullanın."}, status=400)
+
+
+class GroupMessageHistoryView(generics.ListAPIView):
+    """
+    Grup sohbetinin mesaj geçmişini listeleyen API.
+    - Yalnızca grubun üyeleri erişebilir.
+    - Varsayılan olarak en yeni mesajlardan geriye doğru cursor ile sayfalanır.
+    - `since=<mesaj ID>` verilirse yeniden bağlanan istemciler için o mesajdan sonraki mesajlar eskiden yeniye döndürülür
+      (`has_more` true ise son mesajın ID'siyle tekrar istenir).
+    """
+    serializer_class = GroupMessageSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination  # Cursor ile sayfalama
+
+    def check_membership(self):
+        get_object_or_404(GroupChat, id=self.kwargs['group_id'])
+        if not is_member(self.kwargs['group_id'], self.request.user):
+            raise PermissionDenied("Bu grubun üyesi değilsiniz.")
+
+    def get_queryset(self):
+        return GroupMessage.objects.filter(group_id=self.kwargs['group_id']).select_related('sender').order_by('-created_at')
+
+    def list(self, request, *args, **kwargs):
+        self.check_membership()
+        since = request.query_params.get('since')
+        if since is None:
+            return super().list(request, *args, **kwargs)
+        try:
+            since = int(since)
+        except ValueError:
+            return Response({"hata": "'since' bir mesaj ID'si olmalıdır."}, status=400)
+        messages, has_more = messages_since(self.kwargs['group_id'], since)
+        return Response({"results": self.get_serializer(messages, many=True).data, "has_more": has_more})
+
+
+class GroupReadCursorView(APIView):
+    """
+    Grup üyesinin okuma imlecini yöneten API.
+    - GET: Okunan son mesajın ID'sini ve okunmamış mesaj sayısını döndürür.
+    - POST: `message_id` ile okuma imlecini ilerletir (geri alınamaz).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def check_membership(self, group_id):
+        get_object_or_404(GroupChat, id=group_id)
+        if not is_member(group_id, self.request.user):
+            raise PermissionDenied("Bu grubun üyesi değilsiniz.")
+
+    def get(self, request, *args, **kwargs):
+        self.check_membership(kwargs['group_id'])
+        return Response(read_state(kwargs['group_id'], request.user), status=200)
+
+    def post(self, request, *args, **kwargs):
+        self.check_membership(kwargs['group_id'])
+        message_id = request.data.get('message_id')
+        if not isinstance(message_id, int) or not GroupMessage.objects.filter(group_id=kwargs['group_id'], id=message_id).exists():
+            return Response({"hata": "Geçerli bir 'message_id' gereklidir."}, status=400)
+        mark_read(kwargs['group_id'], request.user, message_id)
+        return Response(read_state(kwargs['group_id'], request.user), status=200)
+
@@ -4,6 +4,7 @@ from django.shortcuts import get_object_or_404
 from backend.models import SharedPost, Post, User
 from backend.serializers import SharedPostSerializer
 from backend.models import Notification
+from backend.trending import mark_active
 
 class SharePostView(generics.CreateAPIView):
     """
@@ -32,6 +33,7 @@ class SharePostView(generics.CreateAPIView):
             recipient=recipient,
             message=message
         )
+        mark_active(post.id)  # Paylaşım trend skoruna katkı sağlar
 
         # Paylaşım bildirimini oluştur
         if recipient != self.request.user:
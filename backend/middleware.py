@@ -0,0 +1,33 @@
+from urllib.parse import parse_qs
+from channels.db import database_sync_to_async
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+@database_sync_to_async
+def _user_for_token(raw_token):
+    try:
+        token = AccessToken(raw_token)
+        return User.objects.get(pk=token['user_id'], is_active=True)
+    except (TokenError, KeyError, User.DoesNotExist):
+        return None
+
+
+class JWTAuthMiddleware:
+    """
+    WebSocket bağlantılarında JWT access token ile kimlik doğrulayan Channels middleware'i.
+    - Token, tarayıcılar WebSocket'e başlık ekleyemediği için `?token=<access>` sorgu parametresiyle gönderilir.
+    - Geçerli bir token varsa `scope['user']` doldurulur; yoksa oturum tabanlı doğrulamaya (AuthMiddlewareStack) bırakılır.
+    """
+
+    def __init__(self, inner):
+        self.inner = inner
+
+    async def __call__(self, scope, receive, send):
+        token = parse_qs(scope.get('query_string', b'').decode()).get('token')
+        if token:
+            user = await _user_for_token(token[0])
+            if user is not None:
+                scope = dict(scope, user=user)
+        return await self.inner(scope, receive, send)
@@ -0,0 +1,58 @@
+# Generated by Django 5.1.4 on 2026-10-18 14:20
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_counters(apps, schema_editor):
+    """Sayaç alanlarını mevcut verilerden hesaplar."""
+    Post = apps.get_model('backend', 'Post')
+    Comment = apps.get_model('backend', 'Comment')
+    Profile = apps.get_model('backend', 'Profile')
+    Follow = apps.get_model('backend', 'Follow')
+
+    def count(queryset, field, outer_field='pk'):
+        counts = queryset.filter(**{field: OuterRef(outer_field)}).order_by().values(field).annotate(total=Count('*')).values('total')
+        return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+    Post.objects.update(
+        like_count=count(Post.likes.through.objects.all(), 'post_id'),
+        comment_count=count(Comment.objects.all(), 'post_id'),
+    )
+    Comment.objects.update(like_count=count(Comment.likes.through.objects.all(), 'comment_id'))
+    Profile.objects.update(
+        followers_count=count(Follow.objects.all(), 'followed_user_id', 'user_id'),
+        following_count=count(Follow.objects.all(), 'user_id', 'user_id'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0025_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(db_index=True, default=0),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='followers_count',
+            field=models.PositiveIntegerField(db_index=True, default=0),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='following_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='post',
+            name='like_count',
+            field=models.PositiveIntegerField(db_index=True, default=0),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.4 on 2026-10-18 14:23
+
+from django.db import migrations, models
+from backend.utils.geo import geohash_encode
+
+
+def fill_geohashes(apps, schema_editor):
+    """Mevcut postların geohash değerlerini hesaplar."""
+    Post = apps.get_model('backend', 'Post')
+    posts = list(Post.objects.only('id', 'latitude', 'longitude'))
+    for post in posts:
+        post.geohash = geohash_encode(post.latitude, post.longitude)
+    Post.objects.bulk_update(posts, ['geohash'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0027_post_trending_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, max_length=12),
+        ),
+        migrations.RunPython(fill_geohashes, migrations.RunPython.noop),
+    ]
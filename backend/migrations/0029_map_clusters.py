@@ -0,0 +1,53 @@
+# Generated by Django 5.1.4 on 2026-10-18 14:28
+
+from collections import defaultdict
+
+from django.db import migrations, models
+
+# Migrasyon sırasındaki `backend.map_clusters.MAX_PRECISION` değeri
+MAX_PRECISION = 7
+
+
+def fill_map_clusters(apps, schema_editor):
+    """Mevcut postlardan her hassasiyet, hücre ve kategori için harita kümelerini oluşturur."""
+    Post = apps.get_model('backend', 'Post')
+    MapCluster = apps.get_model('backend', 'MapCluster')
+    totals = defaultdict(lambda: [0, 0.0, 0.0])
+    for geohash, category, latitude, longitude in Post.objects.values_list('geohash', 'category', 'latitude', 'longitude').iterator():
+        if not geohash:
+            continue
+        for precision in range(1, MAX_PRECISION + 1):
+            total = totals[(precision, geohash[:precision], category)]
+            total[0] += 1
+            total[1] += latitude
+            total[2] += longitude
+    MapCluster.objects.bulk_create([
+        MapCluster(precision=precision, cell=cell, category=category, count=count, latitude_sum=lat_sum, longitude_sum=lng_sum)
+        for (precision, cell, category), (count, lat_sum, lng_sum) in totals.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0028_post_geohash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MapCluster',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('precision', models.PositiveSmallIntegerField()),
+                ('cell', models.CharField(max_length=12)),
+                ('category', models.CharField(max_length=20)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('latitude_sum', models.FloatField(default=0)),
+                ('longitude_sum', models.FloatField(default=0)),
+            ],
+            options={
+                'unique_together': {('precision', 'cell', 'category')},
+            },
+        ),
+        migrations.RunPython(fill_map_clusters, migrations.RunPython.noop),
+    ]
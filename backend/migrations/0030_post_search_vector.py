@@ -0,0 +1,51 @@
+# Generated by Django 5.1.4 on 2026-10-18 14:30
+
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import Value
+
+from backend.utils.text import analyze
+
+GIN_INDEX_NAME = 'post_search_vector_gin'
+
+
+def create_search_index(apps, schema_editor):
+    """
+    PostgreSQL'de arama vektörü için GIN indeksini oluşturur ve mevcut postları dizine ekler.
+    - SQLite GIN indeksini desteklemediği için indeks model Meta'sında değil burada tanımlanır.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f'CREATE INDEX {GIN_INDEX_NAME} ON backend_post USING gin (search_vector)')
+    Post = apps.get_model('backend', 'Post')
+    posts = Post.objects.only('id', 'title', 'description', 'location_name').prefetch_related('tags')
+    for post in posts.iterator(chunk_size=2000):
+        tags = ' '.join(tag.name for tag in post.tags.all())
+        document = {'A': post.title or '', 'B': f"{tags} {post.location_name or ''}", 'C': post.description or ''}
+        vector = None
+        for weight, text in document.items():
+            part = SearchVector(Value(' '.join(analyze(text))), weight=weight, config='simple')
+            vector = part if vector is None else vector + part
+        Post.objects.filter(pk=post.pk).update(search_vector=vector)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {GIN_INDEX_NAME}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0029_map_clusters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.4 on 2026-10-18 15:02
+
+from django.db import migrations
+
+TRIGRAM_INDEX_NAME = 'user_username_trgm'
+
+
+def create_trigram_index(apps, schema_editor):
+    """
+    PostgreSQL'de kullanıcı adları için pg_trgm GIN indeksini oluşturur.
+    - İndeks, Django'nun `istartswith`/`icontains` sorgularının ürettiği `UPPER(username)` ifadesi üzerindedir.
+    - Diğer veritabanlarında kullanıcı araması bellek içi dizinle yapıldığı için indeks oluşturulmaz.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        f'CREATE INDEX {TRIGRAM_INDEX_NAME} ON auth_user USING gin (UPPER(username::text) gin_trgm_ops)'
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {TRIGRAM_INDEX_NAME}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0030_post_search_vector'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,109 @@
+# Generated by Django 5.1.4 on 2026-10-18 14:48
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest, Least
+
+
+def fill_conversations(apps, schema_editor):
+    """Mevcut mesajları kullanıcı çiftlerine göre sohbetlere bağlar ve gelen kutusu özetlerini hesaplar."""
+    Message = apps.get_model('backend', 'Message')
+    Conversation = apps.get_model('backend', 'Conversation')
+    ConversationParticipant = apps.get_model('backend', 'ConversationParticipant')
+    pairs = (
+        Message.objects.annotate(low=Least('sender_id', 'recipient_id'), high=Greatest('sender_id', 'recipient_id'))
+        .values('low', 'high').distinct().order_by()
+    )
+    for pair in list(pairs):
+        low, high = pair['low'], pair['high']
+        conversation = Conversation.objects.create(user_low_id=low, user_high_id=high)
+        ConversationParticipant.objects.bulk_create([
+            ConversationParticipant(conversation=conversation, user_id=low, peer_id=high),
+            ConversationParticipant(conversation=conversation, user_id=high, peer_id=low),
+        ], ignore_conflicts=True)  # Kullanıcı kendine yazdıysa tek satır oluşur
+        Message.objects.filter(
+            Q(sender_id=low, recipient_id=high) | Q(sender_id=high, recipient_id=low)
+        ).update(conversation=conversation)
+        last = Message.objects.filter(conversation=conversation).order_by('-created_at', '-id').first()
+        Conversation.objects.filter(pk=conversation.pk).update(last_message=last, last_message_at=last.created_at)
+        ConversationParticipant.objects.filter(conversation=conversation).update(last_message_at=last.created_at)
+        unread = (
+            Message.objects.filter(conversation=conversation, is_read=False).exclude(sender_id=F('recipient_id'))
+            .values('recipient_id').annotate(total=Count('id')).order_by()
+        )
+        for row in unread:
+            ConversationParticipant.objects.filter(conversation=conversation, user_id=row['recipient_id']).update(unread_count=row['total'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0033_group_chat_history'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConversationParticipant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('unread_count', models.PositiveIntegerField(default=0)),
+                ('last_message_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Conversation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_message_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_message', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='backend.message')),
+                ('user_high', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('user_low', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='message',
+            name='conversation',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='messages', to='backend.conversation'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['conversation', '-created_at', '-id'], name='message_conversation_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['conversation', 'recipient', 'is_read'], name='message_unread_idx'),
+        ),
+        migrations.AddField(
+            model_name='conversationparticipant',
+            name='conversation',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='participants', to='backend.conversation'),
+        ),
+        migrations.AddField(
+            model_name='conversationparticipant',
+            name='peer',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='conversationparticipant',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='conversations', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterUniqueTogether(
+            name='conversation',
+            unique_together={('user_low', 'user_high')},
+        ),
+        migrations.AddIndex(
+            model_name='conversationparticipant',
+            index=models.Index(fields=['user', '-last_message_at', '-id'], name='conversation_inbox_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='conversationparticipant',
+            unique_together={('conversation', 'user')},
+        ),
+        migrations.RunPython(fill_conversations, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.1.4 on 2026-10-18 15:04
+
+from django.db import migrations, models
+
+
+def queue_existing_videos(apps, schema_editor):
+    """Bu özellikten önce yüklenmiş videoları dönüştürme kuyruğuna ekler."""
+    apps.get_model('backend', 'PostMedia').objects.filter(media_type='video').update(transcode_status='pending')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0036_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='postmedia',
+            name='transcode_attempts',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='postmedia',
+            name='transcode_error',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='postmedia',
+            name='transcode_locked_until',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='postmedia',
+            name='transcode_status',
+            field=models.CharField(blank=True, choices=[('pending', 'Pending'), ('processing', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], default='', editable=False, max_length=10),
+        ),
+        migrations.AddField(
+            model_name='postmedia',
+            name='transcoded',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='postmedia',
+            index=models.Index(fields=['transcode_status', 'transcode_locked_until'], name='media_transcode_idx'),
+        ),
+        migrations.RunPython(queue_existing_videos, migrations.RunPython.noop),
+    ]
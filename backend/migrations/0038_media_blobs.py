@@ -0,0 +1,44 @@
+# Generated by Django 5.1.4 on 2026-10-18 15:11
+
+import backend.storage
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0037_video_transcoding'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='message',
+            name='attachment',
+            field=models.FileField(blank=True, db_index=True, null=True, storage=backend.storage.ContentAddressedStorage(), upload_to='message_attachments/'),
+        ),
+        migrations.AlterField(
+            model_name='post',
+            name='image',
+            field=models.ImageField(db_index=True, storage=backend.storage.ContentAddressedStorage(), upload_to='post_images/'),
+        ),
+        migrations.AlterField(
+            model_name='postmedia',
+            name='file',
+            field=models.FileField(db_index=True, storage=backend.storage.ContentAddressedStorage(), upload_to='post_media/', validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['jpg', 'jpeg', 'png', 'mp4', 'mov', 'avi'])]),
+        ),
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('size', models.BigIntegerField(default=0)),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('released_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['ref_count', 'released_at'], name='media_blob_unused_idx')],
+            },
+        ),
+    ]
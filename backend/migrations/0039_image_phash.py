@@ -0,0 +1,54 @@
+# Generated by Django 5.1.4 on 2026-10-18 15:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0038_media_blobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='postmedia',
+            name='phash',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='postmedia',
+            name='phash_band_0',
+            field=models.IntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='postmedia',
+            name='phash_band_1',
+            field=models.IntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='postmedia',
+            name='phash_band_2',
+            field=models.IntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='postmedia',
+            name='phash_band_3',
+            field=models.IntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='postmedia',
+            index=models.Index(fields=['phash_band_0'], name='media_phash_band_0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='postmedia',
+            index=models.Index(fields=['phash_band_1'], name='media_phash_band_1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='postmedia',
+            index=models.Index(fields=['phash_band_2'], name='media_phash_band_2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='postmedia',
+            index=models.Index(fields=['phash_band_3'], name='media_phash_band_3_idx'),
+        ),
+    ]
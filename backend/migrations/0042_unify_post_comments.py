@@ -0,0 +1,23 @@
+# Generated by Django 5.1.4 on 2026-10-18 15:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0041_comment_paths'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='post',
+            name='comments',
+        ),
+        migrations.AlterField(
+            model_name='comment',
+            name='post',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='backend.post'),
+        ),
+    ]
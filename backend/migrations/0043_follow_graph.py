@@ -0,0 +1,65 @@
+# Generated by Django 5.1.4 on 2026-10-18 15:34
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def reconcile_follows(apps, schema_editor):
+    """
+    Eski `Profile.followers` ve `Profile.following` ilişkilerinde olup `Follow` tablosunda olmayan takipleri
+    `Follow` tablosuna taşır ve takip sayaçlarını tablodan yeniden hesaplar.
+    """
+    Follow = apps.get_model('backend', 'Follow')
+    Profile = apps.get_model('backend', 'Profile')
+    legacy = [
+        # (takip eden, takip edilen)
+        Profile.followers.through.objects.values_list('user_id', 'profile__user_id'),
+        Profile.following.through.objects.values_list('from_profile__user_id', 'to_profile__user_id'),
+    ]
+    batch = []
+    for rows in legacy:
+        for user_id, followed_user_id in rows.iterator(chunk_size=5000):
+            if user_id != followed_user_id:
+                batch.append(Follow(user_id=user_id, followed_user_id=followed_user_id))
+            if len(batch) >= 5000:
+                Follow.objects.bulk_create(batch, ignore_conflicts=True)
+                batch = []
+    Follow.objects.bulk_create(batch, ignore_conflicts=True)
+
+    def count(field):
+        rows = Follow.objects.filter(**{field: OuterRef('user_id')}).order_by().values(field).annotate(total=Count('*'))
+        return Coalesce(Subquery(rows.values('total'), output_field=IntegerField()), 0)
+
+    Profile.objects.update(followers_count=count('followed_user_id'), following_count=count('user_id'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0042_unify_post_comments'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(reconcile_follows, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='profile',
+            name='followers',
+        ),
+        migrations.RemoveField(
+            model_name='profile',
+            name='following',
+        ),
+        migrations.AlterField(
+            model_name='follow',
+            name='followed_user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='following', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='follow',
+            index=models.Index(fields=['followed_user', 'user'], name='follow_followers_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-18 15:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0044_user_recommendations'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='mediaupload',
+            name='status',
+            field=models.CharField(choices=[('uploading', 'Uploading'), ('completing', 'Completing'), ('completed', 'Completed'), ('failed', 'Failed')], default='uploading', max_length=10),
+        ),
+    ]
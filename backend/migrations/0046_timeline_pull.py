@@ -0,0 +1,26 @@
+# Generated by Django 5.1.4 on 2026-10-18 15:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def mark_pulled_authors(apps, schema_editor):
+    """Eşiği zaten aşmış yazarların postları bu değişiklikten önce de okuma sırasında çekiliyordu."""
+    threshold = getattr(settings, 'TIMELINE_FANOUT_THRESHOLD', 10000)
+    apps.get_model('backend', 'Profile').objects.filter(followers_count__gt=threshold).update(timeline_pull=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0045_upload_completing'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='timeline_pull',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.RunPython(mark_pulled_authors, migrations.RunPython.noop),
+    ]
@@ -4,6 +4,8 @@ from .follow import *
 from .password import *
 from .post import *
 from .media import *
+from .media_upload import *
+from .media_blob import *
 from .comment import *
 from .tag import *
 from .interaction import *
@@ -11,9 +13,16 @@ from .notification import *
 from .group_chat import *
 from .group_invitation import *
 from .group_message import *
+from .group_read_cursor import *
 from .message import *
+from .conversation import *
+from .conversation_participant import *
 from .badge import *
 from .report import *
+from .timeline import *
+from .map_cluster import *
+from .fanout_job import *
+from .recommendation import *
 
 from backend.utils.validators import validate_video_duration, validate_password_strength
 
@@ -24,6 +33,8 @@ __all__ = [
     'PasswordHistory',
     'Post',
     'PostMedia',
+    'MediaUpload',
+    'MediaBlob',
     'Comment',
     'Tag',
     'UserInteraction',
@@ -32,9 +43,16 @@ __all__ = [
     'GroupChat',
     'GroupInvitation',
     'GroupMessage',
+    'GroupReadCursor',
     'Message',
+    'Conversation',
+    'ConversationParticipant',
     'Badge',
     'Report',
+    'TimelineEntry',
+    'MapCluster',
+    'FanoutJob',
+    'UserRecommendation',
     
     'validate_video_duration',
     'validate_password_strength',
@@ -23,8 +23,12 @@ class Comment(models.Model):
     - created_at: Yorumun oluşturulma tarih ve saatini belirtir. Yorum ne zaman yapıldı?
     - edited_at: Yorumun ne zaman düzenlendiği bilgisini tutar.
     - like_count: Yorumun toplam beğeni sayısını tutar.
+    - path: Yorumun ağaçtaki yolu (materialized path): kökten yoruma kadar her yorumun sabit uzunluklu ID'si.
+      Bir yorumun alt ağacı, yolu onun yoluyla başlayan yorumlardır; indeksli tek bir aralık sorgusuyla okunur.
+      Bu alan eklenmeden önce yazılmış yorumlarda `build_comment_paths` komutu çalışana kadar boştur.
+    - depth: Yorumun derinliği (ana yorumlar 0).
     """
-    post = models.ForeignKey(Post, related_name='comments_related', on_delete=models.CASCADE)
+    post = models.ForeignKey(Post, related_name='comments', on_delete=models.CASCADE)
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='comments')
     content = models.TextField()
     parent = models.ForeignKey('self', null=True, blank=True, on_delete=models.CASCADE, related_name='replies')
@@ -32,7 +36,16 @@ class Comment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     edited_at = models.DateTimeField(null=True, blank=True)  # Yorumun düzenlendiği tarih
     like_count = models.PositiveIntegerField(default=0)  # Beğeni sayısı
-    
+    path = models.CharField(max_length=1000, blank=True, default='', editable=False)  # Ağaçtaki yol (bkz. backend.comment_tree)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)  # Ana yorumlar 0
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['post', '-created_at', '-id'], name='comment_post_created_idx'),  # Yorum ağacı iskeleti
+            models.Index(fields=['post', 'parent', '-created_at', '-id'], name='comment_siblings_idx'),  # Yorum/yanıt sayfaları
+            models.Index(fields=['path'], name='comment_path_idx'),  # Alt ağaç aralık sorguları
+        ]
+
     def edit(self, new_content):
         self.content = new_content
         self.edited_at = timezone.now()
@@ -41,7 +54,7 @@ class Comment(models.Model):
     def update_like_count(self):
         """Beğeni sayısını günceller."""
         self.like_count = self.likes.count()
-        self.save()
+        self.save(update_fields=['like_count'])
 
     def __str__(self):
         return f"Comment by {self.author.username} on {self.post.title}"
\ No newline at end of file
@@ -0,0 +1,29 @@
+from django.db import models
+from django.contrib.auth.models import User
+from django.utils.timezone import now
+
+class Conversation(models.Model):
+    """
+    Conversation modeli, iki kullanıcı arasındaki birebir mesajlaşmayı (sohbet dizisini) temsil eder.
+    Her kullanıcı çifti için tek bir satır bulunur; çift, küçük ID'li kullanıcı önce olacak şekilde saklanır.
+    Son mesaj bilgisi her yeni mesajda güncellenir, böylece gelen kutusu mesajlar taranmadan listelenir.
+
+    Alanlar:
+    - user_low: Çiftteki ID'si küçük olan kullanıcı.
+    - user_high: Çiftteki ID'si büyük olan kullanıcı (kullanıcı kendine yazdıysa user_low ile aynıdır).
+    - last_message: Sohbette gönderilen son mesaj.
+    - last_message_at: Son mesajın gönderilme zamanı.
+    - created_at: Sohbetin başladığı zaman.
+    """
+
+    user_low = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')  # Küçük ID'li kullanıcı
+    user_high = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')  # Büyük ID'li kullanıcı
+    last_message = models.ForeignKey('Message', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')  # Son mesaj
+    last_message_at = models.DateTimeField(default=now)  # Son mesajın zamanı
+    created_at = models.DateTimeField(auto_now_add=True)  # Sohbetin başlangıç zamanı
+
+    class Meta:
+        unique_together = ('user_low', 'user_high')  # Her kullanıcı çifti için tek sohbet
+
+    def __str__(self):
+        return f"Conversation between {self.user_low_id} and {self.user_high_id}"
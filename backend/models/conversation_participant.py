@@ -0,0 +1,33 @@
+from django.db import models
+from django.contrib.auth.models import User
+from django.utils.timezone import now
+from .conversation import Conversation
+
+class ConversationParticipant(models.Model):
+    """
+    ConversationParticipant modeli, bir kullanıcının gelen kutusundaki sohbet satırını temsil eder.
+    Her sohbet için iki taraf ayrı satırlara sahiptir; okunmamış mesaj sayısı ve sıralama zamanı
+    burada tutulduğundan gelen kutusu `(user, -last_message_at, -id)` indeksi üzerinden tek sorguyla okunur.
+
+    Alanlar:
+    - conversation: Ait olduğu sohbet.
+    - user: Gelen kutusunun sahibi.
+    - peer: Sohbetteki diğer kullanıcı.
+    - unread_count: Kullanıcının okumadığı mesaj sayısı.
+    - last_message_at: Sohbetteki son mesajın zamanı (gelen kutusu sıralaması için).
+    """
+
+    conversation = models.ForeignKey(Conversation, on_delete=models.CASCADE, related_name='participants')  # Sohbet
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='conversations')  # Gelen kutusunun sahibi
+    peer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')  # Diğer kullanıcı
+    unread_count = models.PositiveIntegerField(default=0)  # Okunmamış mesaj sayısı
+    last_message_at = models.DateTimeField(default=now)  # Son mesajın zamanı
+
+    class Meta:
+        unique_together = ('conversation', 'user')  # Her kullanıcının bir sohbette tek satırı vardır
+        indexes = [
+            models.Index(fields=['user', '-last_message_at', '-id'], name='conversation_inbox_idx'),  # Gelen kutusu
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} in conversation {self.conversation_id} ({self.unread_count} unread)"
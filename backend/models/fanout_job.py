@@ -0,0 +1,51 @@
+from django.db import models
+from django.contrib.auth.models import User
+from .post import Post
+
+class FanoutJob(models.Model):
+    """
+    FanoutJob modeli, yeni bir postun takipçilere dağıtımını (bildirim ve akış satırları) arka planda yapılacak bir iş olarak tutar.
+    İşler `run_fanout_worker` komutuyla çalışan işçi süreç tarafından takipçi ID sırasına göre parça parça işlenir.
+    Her parçanın satırları ile işin ilerlemesi (cursor) aynı transaction'da yazıldığından, yarıda kalan bir iş
+    yeniden denendiğinde aynı takipçiye ikinci kez bildirim gönderilmez.
+
+    Alanlar:
+    - post: Dağıtılacak post.
+    - sender: Postun yazarı; bildirimlerin göndereni ve takipçileri okunacak kullanıcı.
+    - status: İşin durumu (bekliyor, çalışıyor, tamamlandı, başarısız).
+    - cursor: İşlenen son takipçinin kullanıcı ID'si. Yeniden denemeler buradan devam eder.
+    - delivered: Şimdiye kadar oluşturulan bildirim sayısı.
+    - attempts: İşin kaç kez alındığı.
+    - last_error: Son hatanın açıklaması.
+    - locked_until: İşi alan işçinin kira süresinin bittiği zaman. Süresi geçen işler başka bir işçi tarafından alınabilir.
+    - created_at: İşin kuyruğa eklendiği zaman.
+    - started_at: İşin ilk kez alındığı zaman.
+    - finished_at: İşin tamamlandığı zaman. Gecikme ölçümleri `finished_at - created_at` üzerinden hesaplanır.
+    """
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='fanout_jobs')  # Dağıtılacak post
+    sender = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')  # Postun yazarı
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')  # İşin durumu
+    cursor = models.IntegerField(default=0)  # İşlenen son takipçi ID'si
+    delivered = models.PositiveIntegerField(default=0)  # Oluşturulan bildirim sayısı
+    attempts = models.PositiveSmallIntegerField(default=0)  # Deneme sayısı
+    last_error = models.TextField(blank=True)  # Son hata
+    locked_until = models.DateTimeField(null=True, blank=True)  # İşçi kira süresinin sonu
+    created_at = models.DateTimeField(auto_now_add=True)  # Kuyruğa eklenme zamanı
+    started_at = models.DateTimeField(null=True, blank=True)  # İlk alınma zamanı
+    finished_at = models.DateTimeField(null=True, blank=True)  # Tamamlanma zamanı
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='fanout_status_created_idx'),  # Kuyruktan iş alma
+        ]
+
+    def __str__(self):
+        return f"Fan-out of post {self.post_id} ({self.status})"
@@ -21,14 +21,19 @@ class Follow(models.Model):
     """
     
     user = models.ForeignKey(User, related_name='followers', on_delete=models.CASCADE)  # Takip eden kullanıcı
-    followed_user = models.ForeignKey(User, related_name='following', on_delete=models.CASCADE)  # Takip edilen kullanıcı
+    followed_user = models.ForeignKey(User, related_name='following', on_delete=models.CASCADE, db_index=False)  # Takip edilen kullanıcı
     created_at = models.DateTimeField(auto_now_add=True)  # Takip etme işleminin oluşturulma tarihi
 
     class Meta:
         """
         Aynı kullanıcının aynı kişiyi takip etmesine izin verilmez.
+        Takip grafiğinin iki yönü de bileşik indekslerden okunur: takip edilenler benzersizlik kısıtının indeksinden,
+        takipçiler (`followed_user`, `user`) indeksinden (takipçi kümeleri ve bildirim dağıtımının sayfalanması).
         """
         unique_together = ('user', 'followed_user')  # Bir kullanıcı, aynı kişiyi birden fazla takip edemez
+        indexes = [
+            models.Index(fields=['followed_user', 'user'], name='follow_followers_idx'),
+        ]
 
     def __str__(self):
         """
@@ -28,6 +28,12 @@ class GroupMessage(models.Model):
     content = models.TextField()  # Mesajın içeriği
     created_at = models.DateTimeField(auto_now_add=True)  # Mesajın oluşturulma tarihi
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['group', '-created_at', '-id'], name='group_message_created_idx'),  # Geçmiş (cursor ile sayfalama)
+            models.Index(fields=['group', 'id'], name='group_message_sync_idx'),  # Son görülen mesajdan sonrası (senkronizasyon)
+        ]
+
     def __str__(self):
         """
         Bu metod, mesajın string temsiline, mesajın içeriğini ve gönderen kullanıcıyı dahil eder.
@@ -0,0 +1,27 @@
+from django.db import models
+from django.contrib.auth.models import User
+from .group_chat import GroupChat
+
+class GroupReadCursor(models.Model):
+    """
+    GroupReadCursor modeli, bir grup üyesinin sohbette en son okuduğu mesajı tutar.
+    Her mesaj için ayrı bir "okundu" kaydı tutmak yerine üye başına tek bir satır bulunur;
+    okunmamış mesajlar bu mesajdan sonra gelen mesajlardır.
+
+    Alanlar:
+    - group: Grup sohbeti.
+    - user: Grubun üyesi.
+    - last_read_message_id: Üyenin okuduğu en son mesajın ID'si. Yalnızca ileriye doğru güncellenir.
+    - updated_at: İmlecin son güncellenme zamanı.
+    """
+
+    group = models.ForeignKey(GroupChat, on_delete=models.CASCADE, related_name='read_cursors')  # Grup sohbeti
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='group_read_cursors')  # Grup üyesi
+    last_read_message_id = models.BigIntegerField(default=0)  # Okunan son mesajın ID'si
+    updated_at = models.DateTimeField(auto_now=True)  # Son güncellenme zamanı
+
+    class Meta:
+        unique_together = ('group', 'user')  # Her üyenin bir grupta tek imleci vardır
+
+    def __str__(self):
+        return f"{self.user.username} read {self.group.name} up to {self.last_read_message_id}"
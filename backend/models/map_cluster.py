@@ -0,0 +1,28 @@
+from django.db import models
+
+class MapCluster(models.Model):
+    """
+    MapCluster modeli, harita görünümü için postların geohash hücrelerine göre önceden toplanmış özetini tutar.
+    Her çözünürlük (geohash uzunluğu), hücre ve kategori için bir satır bulunur; post eklendikçe veya silindikçe güncellenir.
+
+    Alanlar:
+    - precision: Geohash uzunluğu (çözünürlük seviyesi). Uzunluk arttıkça hücreler küçülür.
+    - cell: Hücrenin geohash öneki.
+    - category: Hücredeki postların kategorisi.
+    - count: Hücredeki bu kategoriye ait post sayısı.
+    - latitude_sum: Postların enlemlerinin toplamı. Ağırlık merkezini hesaplamak için tutulur.
+    - longitude_sum: Postların boylamlarının toplamı.
+    """
+
+    precision = models.PositiveSmallIntegerField()  # Geohash uzunluğu
+    cell = models.CharField(max_length=12)  # Hücrenin geohash öneki
+    category = models.CharField(max_length=20)  # Post kategorisi
+    count = models.PositiveIntegerField(default=0)  # Post sayısı
+    latitude_sum = models.FloatField(default=0)  # Enlemler toplamı
+    longitude_sum = models.FloatField(default=0)  # Boylamlar toplamı
+
+    class Meta:
+        unique_together = ('precision', 'cell', 'category')  # Sorgular (precision, cell) önekiyle bu indeks üzerinden yapılır
+
+    def __str__(self):
+        return f"{self.cell} ({self.category}): {self.count}"
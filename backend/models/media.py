@@ -5,6 +5,7 @@ from django.core.validators import FileExtensionValidator
 from datetime import datetime
 from django.utils.timezone import now
 from backend.utils.validators import *
+from backend.storage import blob_storage
 from .post import Post
 
 class PostMedia(models.Model):
@@ -17,8 +18,16 @@ class PostMedia(models.Model):
     Alanlar:
     - post: Bu medya dosyasının hangi gönderiye ait olduğunu belirtir. Bir gönderinin birden fazla medya dosyası olabilir.
     - media_type: Medya dosyasının türünü belirtir. Bu, 'image' (resim) ya da 'video' (video) olabilir.
-    - file: Medya dosyasının kendisini tutar. Burada resim veya video dosyası saklanır.
+    - file: Medya dosyasının kendisini tutar. Burada resim veya video dosyası saklanır (içerik adresli depoda; aynı dosya bir kez saklanır).
     - created_at: Medya dosyasının oluşturulma tarih ve saatini belirtir. Bu, dosyanın yüklenme zamanını gösterir.
+    - variants: Görselin küçültülmüş (WebP/JPEG) türevlerinin bilgileri. Yüklemeden sonra arka planda üretilir.
+    - transcode_status: Videonun web sürümüne dönüştürme işinin durumu (görsellerde boş).
+    - transcode_attempts: Dönüştürme işinin kaç kez başlatıldığı.
+    - transcode_locked_until: İşi alan işçinin kirasının bitişi; bekleyen işlerde yeniden deneme zamanı.
+    - transcode_error: Son başarısız denemenin hata mesajı.
+    - transcoded: Videonun web uyumlu MP4 sürümü, kapak görseli ve kısa önizlemesinin bilgileri.
+    - phash: Görselin 64 bitlik algısal özeti (işaretli tamsayı olarak); benzer görsellerin bulunması için kullanılır.
+    - phash_band_0..3: Özetin 16 bitlik parçaları; yakın özetler bu indeksli parçalar üzerinden aranır.
     
     Yöntemler:
     - clean: Medya türü video ise, dosyanın süresi doğrulanır.
@@ -27,13 +36,40 @@ class PostMedia(models.Model):
         ('image', 'Image'),
         ('video', 'Video'),
     ]
+    TRANSCODE_STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    ]
 
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='media')
     media_type = models.CharField(max_length=10, choices=MEDIA_TYPE_CHOICES)
-    file = models.FileField(upload_to='post_media/', validators=[
+    file = models.FileField(upload_to='post_media/', storage=blob_storage, db_index=True, validators=[
         FileExtensionValidator(allowed_extensions=['jpg', 'jpeg', 'png', 'mp4', 'mov', 'avi'])  # Yalnızca belirli uzantılara izin ver
     ])
     created_at = models.DateTimeField(auto_now_add=True)
+    variants = models.JSONField(default=dict, blank=True, editable=False)  # Görselin türevleri
+    transcode_status = models.CharField(max_length=10, choices=TRANSCODE_STATUS_CHOICES, blank=True, default='', editable=False)
+    transcode_attempts = models.PositiveSmallIntegerField(default=0, editable=False)
+    transcode_locked_until = models.DateTimeField(null=True, blank=True, editable=False)
+    transcode_error = models.CharField(max_length=255, blank=True, default='', editable=False)
+    transcoded = models.JSONField(default=dict, blank=True, editable=False)  # Videonun web sürümü, kapağı ve önizlemesi
+    phash = models.BigIntegerField(null=True, blank=True, editable=False)  # Algısal özet
+    phash_band_0 = models.IntegerField(null=True, blank=True, editable=False)
+    phash_band_1 = models.IntegerField(null=True, blank=True, editable=False)
+    phash_band_2 = models.IntegerField(null=True, blank=True, editable=False)
+    phash_band_3 = models.IntegerField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['transcode_status', 'transcode_locked_until'], name='media_transcode_idx'),  # İş kuyruğu
+            # Benzer görsel araması (her parça ayrı indekslenir)
+            models.Index(fields=['phash_band_0'], name='media_phash_band_0_idx'),
+            models.Index(fields=['phash_band_1'], name='media_phash_band_1_idx'),
+            models.Index(fields=['phash_band_2'], name='media_phash_band_2_idx'),
+            models.Index(fields=['phash_band_3'], name='media_phash_band_3_idx'),
+        ]
 
     def clean(self):
         """
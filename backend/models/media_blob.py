@@ -0,0 +1,28 @@
+from django.db import models
+
+class MediaBlob(models.Model):
+    """
+    MediaBlob modeli, içerik adresli depodaki (bkz. `backend.storage`) tek bir dosyanın referans sayacını tutar.
+    Aynı içerikli dosyalar diskte bir kez saklanır ve gönderi görselleri, gönderi medyaları ve mesaj ekleri
+    tarafından paylaşılır; hiçbir kayıt tarafından kullanılmayan bloblar çöp toplayıcı tarafından silinir.
+
+    Alanlar:
+    - name: Blobun depodaki adı (blobs/ab/cd/<sha256>.<uzantı>).
+    - size: Dosyanın boyutu (bayt).
+    - ref_count: Blobu kullanan kayıt sayısı.
+    - created_at: Blobun ilk kez kullanıldığı zaman.
+    - released_at: Referans sayısının son azaldığı zaman; çöp toplayıcı yeni bırakılan blobları bir süre bekletir.
+    """
+    name = models.CharField(max_length=255, unique=True)  # Depodaki ad
+    size = models.BigIntegerField(default=0)  # Boyut (bayt)
+    ref_count = models.PositiveIntegerField(default=0)  # Blobu kullanan kayıt sayısı
+    created_at = models.DateTimeField(auto_now_add=True)  # İlk kullanım zamanı
+    released_at = models.DateTimeField(null=True, blank=True)  # Son bırakılma zamanı
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['ref_count', 'released_at'], name='media_blob_unused_idx'),  # Çöp toplama
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
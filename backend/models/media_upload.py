@@ -0,0 +1,49 @@
+from django.db import models
+from django.contrib.auth.models import User
+from .post import Post
+from .media import PostMedia
+
+class MediaUpload(models.Model):
+    """
+    MediaUpload modeli, parçalar halinde (devam ettirilebilir) yüklenen bir medya dosyasını temsil eder.
+    Dosyanın gelen parçaları geçici dizindeki tek bir dosyaya yazılır; yükleme tamamlanınca dosya
+    doğrulanır ve bir gönderiye bağlandığında `PostMedia` olarak kalıcı depolamaya taşınır.
+
+    Alanlar:
+    - user: Yüklemeyi başlatan kullanıcı.
+    - post: Dosyanın ekleneceği gönderi (isteğe bağlı; boşsa post oluşturulurken bağlanır).
+    - filename: İstemcinin gönderdiği dosya adı.
+    - media_type: Dosyanın türü ('image' veya 'video').
+    - length: Dosyanın toplam boyutu (bayt).
+    - offset: Şimdiye kadar alınan bayt sayısı; istemci yüklemeye buradan devam eder.
+    - status: Yüklemenin durumu (yükleniyor, tamamlanıyor, tamamlandı, başarısız).
+    - media: Yükleme gönderiye bağlandığında oluşturulan medya kaydı.
+    - created_at / updated_at: Oluşturulma ve son parça zamanı.
+    - expires_at: Bu zamana kadar gönderiye bağlanmayan yükleme ve geçici dosyası silinir.
+    """
+    STATUS_CHOICES = [
+        ('uploading', 'Uploading'),
+        ('completing', 'Completing'),  # Son bayt alındı; dosya doğrulanıyor (tamamlama yalnızca bir kez yapılır)
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='media_uploads')  # Yükleyen kullanıcı
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, null=True, blank=True, related_name='uploads')  # Hedef gönderi
+    filename = models.CharField(max_length=255)  # Orijinal dosya adı
+    media_type = models.CharField(max_length=10, choices=PostMedia.MEDIA_TYPE_CHOICES)  # Medya türü
+    length = models.BigIntegerField()  # Toplam boyut (bayt)
+    offset = models.BigIntegerField(default=0)  # Alınan bayt sayısı
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='uploading')  # Yükleme durumu
+    media = models.ForeignKey(PostMedia, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')  # Oluşan medya
+    created_at = models.DateTimeField(auto_now_add=True)  # Oluşturulma zamanı
+    updated_at = models.DateTimeField(auto_now=True)  # Son güncellenme zamanı
+    expires_at = models.DateTimeField()  # Süresi dolan yüklemeler temizlenir
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['expires_at'], name='media_upload_expiry_idx'),  # Süresi dolanların temizlenmesi
+        ]
+
+    def __str__(self):
+        return f"Upload {self.filename} ({self.offset}/{self.length}) by {self.user.username}"
@@ -5,6 +5,7 @@ from django.core.validators import FileExtensionValidator
 from datetime import datetime
 from django.utils.timezone import now
 from backend.utils.validators import *
+from backend.storage import blob_storage
 
 class Message(models.Model):
     """
@@ -20,6 +21,7 @@ class Message(models.Model):
     - is_read: Mesaj okunmuş mu? Varsayılan olarak 'False' (okunmamış).
     - is_archived: Mesaj arşivlenmiş mi? Varsayılan olarak 'False'.
     - attachment: Mesaja eklenen dosya (isteğe bağlı).
+    - conversation: Mesajın ait olduğu sohbet (kaydedilirken otomatik atanır).
     
     Yöntemler:
     - __str__: Mesajın göndereni, alıcısı ve oluşturulma zamanını içeren bir string temsili döndürür.
@@ -31,7 +33,15 @@ class Message(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)  # Mesajın oluşturulma tarihi
     is_read = models.BooleanField(default=False)  # Mesaj okundu mu?
     is_archived = models.BooleanField(default=False)  # Mesaj arşivlendi mi?
-    attachment = models.FileField(upload_to='message_attachments/', null=True, blank=True)  # Mesaja ekli dosya (isteğe bağlı)
+    attachment = models.FileField(upload_to='message_attachments/', storage=blob_storage, db_index=True, null=True, blank=True)  # Mesaja ekli dosya (isteğe bağlı, içerik adresli)
+    conversation = models.ForeignKey('Conversation', on_delete=models.CASCADE, null=True, blank=True, related_name='messages')  # Ait olduğu sohbet
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['recipient', '-created_at', '-id'], name='message_recipient_created_idx'),  # Cursor ile sayfalama
+            models.Index(fields=['conversation', '-created_at', '-id'], name='message_conversation_idx'),  # Sohbet geçmişi
+            models.Index(fields=['conversation', 'recipient', 'is_read'], name='message_unread_idx'),  # Sohbeti okundu yapma
+        ]
 
     def __str__(self):
         """
@@ -14,7 +14,7 @@ class Notification(models.Model):
     Alanlar:
     - user: Bildirimin alıcısı (kullanıcı).
     - sender: Bildirimi gönderen kullanıcı.
-    - notification_type: Bildirimin türü, 'like' (beğeni), 'comment' (yorum), 'follow' (takip) gibi seçenekler.
+    - notification_type: Bildirimin türü, 'like' (beğeni), 'comment' (yorum), 'follow' (takip), 'post' (yeni post) gibi seçenekler.
     - post: İlgili gönderiyi belirtir. Yalnızca 'like' ve 'comment' türleri için geçerli olabilir.
     - comment: İlgili yorumu belirtir. Yalnızca 'comment' türü için geçerli olabilir.
     - is_read: Kullanıcı bildirimi okudu mu? Varsayılan olarak 'False' (okunmamış).
@@ -28,6 +28,7 @@ class Notification(models.Model):
         ('like', 'Like'),
         ('comment', 'Comment'),
         ('follow', 'Follow'),
+        ('post', 'Post'),
     ]
 
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')  # Bildirimi alan kullanıcı
@@ -38,6 +39,11 @@ class Notification(models.Model):
     is_read = models.BooleanField(default=False)  # Bildirim okundu mu?
     created_at = models.DateTimeField(auto_now_add=True)  # Bildirimin oluşturulma tarihi
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id'], name='notification_user_created_idx'),  # Cursor ile sayfalama
+        ]
+
     def __str__(self):
         """
         Bu metod, bildirim oluşturulduğunda bildirimin alıcısını ve göndereni belirten bir string temsili döndürür.
@@ -1,10 +1,13 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
 from django.core.validators import FileExtensionValidator
 from datetime import datetime
 from django.utils.timezone import now
 from backend.utils.validators import *
+from backend.utils.geo import geohash_encode
+from backend.storage import blob_storage
 
 class Post(models.Model):
     """
@@ -16,17 +19,23 @@ class Post(models.Model):
     - title: Gönderinin başlığını tutar.
     - description: Gönderinin açıklaması, isteğe bağlıdır.
     - image: Gönderiye ait görsel dosyası.
+    - image_variants: Görselin küçültülmüş (WebP/JPEG) türevlerinin bilgileri. Yüklemeden sonra arka planda üretilir.
     - category: Gönderinin ait olduğu kategori, örneğin kültürel yer, turistik yer vb.
     - location_name: Gönderinin konumunun adı (örneğin, şehir adı veya bölge adı).
     - author: Gönderiyi paylaşan kullanıcıyı belirtir.
     - latitude: Gönderinin konumunun enlem bilgisini tutar.
     - longitude: Gönderinin konumunun boylam bilgisini tutar.
+    - geohash: Enlem ve boylamdan kaydederken hesaplanan geohash. Yakındaki postları indeks üzerinden bulmak için kullanılır.
     - likes: Gönderiye beğeni yapan kullanıcıları tutar. Bir gönderi birden fazla kullanıcı tarafından beğenilebilir.
-    - like_count: Beğeni sayısını tutar.
+    - like_count: Beğeni sayısını tutar. Beğeni eklenip kaldırıldıkça atomik olarak güncellenir.
+    - comment_count: Yorum sayısını tutar. Yorum eklenip silindikçe atomik olarak güncellenir.
+    - trending_score: Zamanla sönümlenen trend skoru (logaritmik ölçekte). Periyodik olarak yeniden hesaplanır.
+    - activity_at: Postun son etkileşim aldığı zaman. Dolu ise trend skoru bir sonraki çalıştırmada yeniden hesaplanır.
+    - search_vector: Başlık, etiket, konum adı ve açıklamadan oluşturulan tam metin arama vektörü (PostgreSQL'de GIN indeksli).
     - created_at: Gönderinin oluşturulma tarihini tutar.
     - updated_at: Gönderinin son güncellenme tarihini tutar.
     - tags: Gönderiye ait etiketler. Bir gönderi birden fazla etikete sahip olabilir.
-    - comments: Gönderiye yapılan yorumları tutar.
+    - comments: Gönderiye yapılan yorumlar (`Comment.post` ilişkisinin ters tarafı).
     - media_type: Gönderinin medya türünü belirtir. (görsel, video, ses vb.)
     - status: Gönderinin yayın durumu (taslak, yayımlandı).
     - published_at: Gönderinin yayımlandığı tarih.
@@ -71,18 +80,23 @@ class Post(models.Model):
 
     title = models.CharField(max_length=255)  # Gönderinin başlığı
     description = models.TextField(blank=True, null=True)  # Gönderinin açıklaması (isteğe bağlı)
-    image = models.ImageField(upload_to='post_images/', blank=False, null=False)  # Gönderiye ait görsel dosyası
+    image = models.ImageField(upload_to='post_images/', storage=blob_storage, db_index=True, blank=False, null=False)  # Gönderiye ait görsel dosyası (içerik adresli)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)  # Görselin küçültülmüş türevleri
     category = models.CharField(max_length=20, choices=CATEGORY_CHOICES)  # Gönderinin kategorisi
     location_name = models.CharField(max_length=255, db_index=True)  # Konum adı (örneğin, şehir adı)
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name="posts")  # Gönderiyi paylaşan kullanıcı
     latitude = models.FloatField(blank=False, null=False)  # Gönderinin enlem bilgisi
     longitude = models.FloatField(blank=False, null=False)  # Gönderinin boylam bilgisi
+    geohash = models.CharField(max_length=12, blank=True, db_index=True)  # Konumun geohash karşılığı
     likes = models.ManyToManyField(User, related_name="liked_posts", blank=True)  # Gönderiye beğeni yapan kullanıcılar
-    like_count = models.PositiveIntegerField(default=0)  # Beğeni sayısı
+    like_count = models.PositiveIntegerField(default=0, db_index=True)  # Beğeni sayısı
+    comment_count = models.PositiveIntegerField(default=0, db_index=True)  # Yorum sayısı
+    trending_score = models.FloatField(default=0, db_index=True)  # Trend skoru
+    activity_at = models.DateTimeField(null=True, blank=True, default=now, db_index=True)  # Skoru hesaplanmamış son etkileşim
+    search_vector = SearchVectorField(null=True, editable=False)  # Tam metin arama vektörü
     created_at = models.DateTimeField(auto_now_add=True)  # Gönderinin oluşturulma tarihi
     updated_at = models.DateTimeField(auto_now=True)  # Gönderinin son güncellenme tarihi
     tags = models.ManyToManyField('Tag', related_name='posts', blank=True)  # Gönderiye ait etiketler
-    comments = models.ManyToManyField('Comment', related_name='posts_related', blank=True)  # Gönderiye yapılan yorumlar
     media_type = models.CharField(
             max_length=20, 
             choices=[('image', 'Image'), ('video', 'Video'), ('audio', 'Audio')],
@@ -92,16 +106,44 @@ class Post(models.Model):
     published_at = models.DateTimeField(null=True, blank=True)  # Yayınlanma tarihi
     visibility = models.CharField(max_length=10, choices=VISIBILITY_CHOICES, default='public')  # Gönderi görünürlüğü
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['author', '-created_at'], name='post_author_created_idx'),  # Yazarın son postları (akış okuma)
+            models.Index(fields=['-created_at', '-id'], name='post_created_idx'),  # Cursor ile sayfalama
+        ]
+
     def location(self):
         """
         Gönderinin enlem ve boylam bilgisini birleştirir.
         """
         return f"{self.latitude}, {self.longitude}"
 
+    # Veritabanında atomik olarak (F() ile) güncellenen alanlar; mevcut postun tam kaydında yazılmazlar
+    COUNTER_FIELDS = ('like_count', 'comment_count', 'trending_score', 'activity_at')
+
+    def save(self, *args, **kwargs):
+        """
+        Kaydetmeden önce konumun geohash değerini hesaplar.
+        - Mevcut bir post `update_fields` verilmeden kaydedilirse sayaç ve skor alanları (`COUNTER_FIELDS`) yazılmaz;
+          nesne yüklendikten sonra yapılan beğeni/yorum artışları eski değerlerle ezilmez.
+        """
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS and field.attname not in deferred
+            ]
+        if self.latitude is not None and self.longitude is not None:
+            self.geohash = geohash_encode(self.latitude, self.longitude)
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+                kwargs['update_fields'] = set(update_fields) | {'geohash'}
+        super().save(*args, **kwargs)
+
     def update_like_count(self):
         """Beğeni sayısını günceller."""
         self.like_count = self.likes.count()
-        self.save()
+        self.save(update_fields=['like_count'])
 
     def __str__(self):
         """
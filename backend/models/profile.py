@@ -20,11 +20,15 @@ class Profile(models.Model):
     - birth_date: Kullanıcının doğum tarihini tutar. (isteğe bağlı)
     - phone_number: Kullanıcının telefon numarasını tutar. (isteğe bağlı)
     - profile_image: Kullanıcının profil fotoğrafını tutar. (isteğe bağlı)
+    - profile_image_variants: Profil fotoğrafının küçültülmüş (WebP/JPEG) türevlerinin bilgileri. Arka planda üretilir.
     - gender: Kullanıcının cinsiyetini tutar. 'M' (Erkek), 'F' (Kadın), 'O' (Diğer).
     - social_link: Kullanıcının sosyal medya bağlantısı. (isteğe bağlı)
     - created_at: Profilin oluşturulma tarihini tutar.
-    - followers: Kullanıcının takipçilerini tutar. Birçok kullanıcı bir profilin takipçisi olabilir.
-    - following: Kullanıcının takip ettiği profilleri tutar. Birçok kullanıcı bir profili takip edebilir.
+    - followers_count: Takipçi sayısını tutar. Takip başlatılıp bırakıldıkça atomik olarak güncellenir.
+    - following_count: Takip edilen kullanıcı sayısını tutar.
+    - timeline_pull: Kullanıcının postları takipçilerin akışlarına yazılmıyor, okuma sırasında çekiliyorsa True
+      (çok takipçili yazarlar; bkz. `backend.timeline.update_fanout_modes`).
+    Takipçiler ve takip edilenler yalnızca `Follow` tablosunda tutulur; `backend.follow_graph` üzerinden okunur.
     - level: Kullanıcının seviyesini tutar. Seviye, kullanıcının puanına göre belirlenir.
     - points: Kullanıcının toplam puanını tutar. Puanlar, kullanıcıların etkinliklerine göre artar.
     - badges: Kullanıcının kazandığı rozetleri tutar.
@@ -47,13 +51,15 @@ class Profile(models.Model):
     birth_date = models.DateField(blank=True, null=True)
     phone_number = models.CharField(max_length=15, blank=True, null=True)
     profile_image = models.ImageField(upload_to='profile_images/', blank=True, null=True)
+    profile_image_variants = models.JSONField(default=dict, blank=True, editable=False)  # Profil fotoğrafının türevleri
     gender = models.CharField(max_length=1, choices=GENDER_CHOICES, blank=True, null=True)
     social_link = models.URLField(max_length=200, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
-    # Takipçi ve takip edilenler arasındaki ManyToMany ilişkisi
-    followers = models.ManyToManyField(User, related_name='following_profiles')  # Takip edenler
-    following = models.ManyToManyField('self', symmetrical=False, related_name='followers_profiles')  # Takip edilenler
+    # Takip ilişkileri `Follow` modelindedir; burada yalnızca sayaçlar tutulur
+    followers_count = models.PositiveIntegerField(default=0, db_index=True)  # Takipçi sayısı
+    following_count = models.PositiveIntegerField(default=0)  # Takip edilen sayısı
+    timeline_pull = models.BooleanField(default=False, db_index=True)  # Postlar akışa okuma sırasında mı ekleniyor
 
     level = models.PositiveIntegerField(default=1, db_index=True)
     points = models.PositiveIntegerField(default=0, db_index=True)
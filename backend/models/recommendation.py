@@ -0,0 +1,30 @@
+from django.db import models
+from django.contrib.auth.models import User
+
+class UserRecommendation(models.Model):
+    """
+    UserRecommendation modeli, "Tanıyor olabileceğin kişiler" önerilerini kullanıcı başına en iyi K öneri olarak tutar.
+    Öneriler takip grafiğinden toplu olarak hesaplanır (`compute_recommendations` komutu); okuma tek bir indeks taramasıdır.
+
+    Alanlar:
+    - user: Önerinin gösterileceği kullanıcı.
+    - recommended_user: Önerilen kullanıcı (kullanıcının takip ettiklerinin takip ettiği, kendisinin takip etmediği biri).
+    - mutual_count: Kullanıcının takip ettiklerinden kaç kişinin önerilen kullanıcıyı takip ettiği.
+    - score: Ortak takip sayısının, iki kullanıcının etkileşimde bulunduğu post kategorilerinin benzerliğiyle ağırlıklandırılmış hali.
+    - computed_at: Önerinin hesaplandığı zaman.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='recommendations')  # Önerinin sahibi
+    recommended_user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')  # Önerilen kullanıcı
+    mutual_count = models.PositiveIntegerField()  # Ortak takip sayısı
+    score = models.FloatField()  # Sıralama skoru
+    computed_at = models.DateTimeField()  # Hesaplanma zamanı
+
+    class Meta:
+        unique_together = ('user', 'recommended_user')  # Bir kullanıcı aynı öneride bir kez bulunur
+        indexes = [
+            models.Index(fields=['user', '-score'], name='recommendation_user_score_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.recommended_user_id} recommended to {self.user_id}"
@@ -0,0 +1,30 @@
+from django.db import models
+from django.contrib.auth.models import User
+from .post import Post
+
+class TimelineEntry(models.Model):
+    """
+    TimelineEntry modeli, bir kullanıcının ana sayfa akışını (takip ettiği kişilerin postları) önceden hesaplanmış olarak tutar.
+    Bir post paylaşıldığında, yazarın takipçilerinin her biri için bir satır eklenir (fan-out-on-write).
+    Böylece akış okunurken takip edilen tüm kullanıcıların postlarını taramak yerine tek bir indeks taranır.
+
+    Alanlar:
+    - user: Akışın sahibi olan kullanıcı.
+    - post: Akışta gösterilecek post.
+    - author: Postun yazarı. Takip bırakıldığında ilgili satırları silmek için tutulur.
+    - created_at: Postun oluşturulma tarihi. Sıralama ve cursor için posttan kopyalanır.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='timeline_entries')  # Akışın sahibi
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='timeline_entries')  # Akıştaki post
+    author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')  # Postun yazarı
+    created_at = models.DateTimeField()  # Postun oluşturulma tarihi
+
+    class Meta:
+        unique_together = ('user', 'post')  # Aynı post bir akışta yalnızca bir kez bulunur
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-post'], name='timeline_user_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"Post {self.post_id} in {self.user.username}'s timeline"
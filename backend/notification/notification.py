@@ -4,6 +4,7 @@ from rest_framework.views import APIView
 from backend.models import Notification
 from backend.serializers import NotificationSerializer
 from backend.permissions import IsNotificationOwner
+from backend.pagination import KeysetPagination
 
 class NotificationListView(generics.ListAPIView):
     """
@@ -12,6 +13,7 @@ class NotificationListView(generics.ListAPIView):
     """
     serializer_class = NotificationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination  # Cursor ile sayfalama
 
     def get_queryset(self):
         """
@@ -0,0 +1,115 @@
+import base64
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param, remove_query_param
+
+
+def encode_cursor(created_at, pk):
+    """
+    (created_at, id) ikilisini istemciye verilecek opak bir cursor'a dönüştürür.
+    """
+    raw = f"{created_at.isoformat()}|{pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    Opak cursor'ı (created_at, id) ikilisine geri çevirir.
+    - Geçersiz bir cursor gönderilirse 404 döndürülür.
+    """
+    try:
+        created_at, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        created_at = parse_datetime(created_at)
+        pk = int(pk)
+    except (ValueError, TypeError):
+        raise NotFound("Geçersiz cursor.")
+    if created_at is None:
+        raise NotFound("Geçersiz cursor.")
+    return created_at, pk
+
+
+def older_than(cursor, id_field='id', time_field='created_at'):
+    """
+    (created_at, id) cursor'ından daha eski satırları seçen filtre.
+    - `(created_at, id)` üzerindeki bileşik indeks ile birlikte kullanıldığında bir indeks aralık taramasına dönüşür.
+    - Zaman alanı farklı olan tablolarda (ör. son mesaj zamanı) `time_field` verilebilir.
+    """
+    moment, pk = cursor
+    # İlk koşul indeks için bir aralık sınırı sağlar, ikincisi eşit tarihleri id ile ayırır
+    return Q(**{f'{time_field}__lte': moment}) & (Q(**{f'{time_field}__lt': moment}) | Q(**{f'{id_field}__lt': pk}))
+
+
+class KeysetPagination(BasePagination):
+    """
+    (created_at, id) ikilisi üzerinden keyset (cursor) sayfalama.
+    - OFFSET ve COUNT(*) kullanılmaz; her sayfa en fazla `page_size + 1` satır okur, derin sayfalar da aynı hızdadır.
+    - İstemciye opak bir `cursor` içeren `next` bağlantısı döndürülür.
+    - Sorgu farklı bir alana göre sıralanmışsa (ör. ?ordering=like_count) sayfa numarası ile sayfalamaya geri dönülür.
+    """
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+    time_field = 'created_at'
+    ordering = ('-created_at', '-id')
+    fallback_class = PageNumberPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.fallback = None
+
+        if queryset.query.order_by and tuple(queryset.query.order_by) not in ((f'-{self.time_field}',), self.ordering):
+            self.fallback = self.fallback_class()
+            return self.fallback.paginate_queryset(queryset, request, view)
+
+        queryset = queryset.order_by(*self.ordering)
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(older_than(decode_cursor(cursor), time_field=self.time_field))
+
+        results = list(queryset[:self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        last = self.page[-1]
+        url = remove_query_param(self.request.build_absolute_uri(), 'page')
+        return replace_query_param(url, self.cursor_query_param, encode_cursor(getattr(last, self.time_field), last.id))
+
+    def get_paginated_response(self, data):
+        if self.fallback is not None:
+            return self.fallback.get_paginated_response(data)
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class SuggestionPagination(PageNumberPagination):
+    """
+    Yazarken öneri (typeahead) sonuçları için sayfalama.
+    - Sonuç listesi zaten sınırlı olduğundan istemci `page_size` ile sayfa boyutunu seçebilir.
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 50
+
+
+class ConversationPagination(KeysetPagination):
+    """
+    Gelen kutusu için son mesaj zamanına göre keyset sayfalama.
+    """
+    time_field = 'last_message_at'
+    ordering = ('-last_message_at', '-id')
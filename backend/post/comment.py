@@ -1,8 +1,11 @@
 from rest_framework import serializers, generics, permissions, status
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.utils.urls import replace_query_param
 from backend.models import Comment, Notification
-from backend.serializers import CommentSerializer
+from backend.serializers import CommentSerializer, CommentTreeSerializer
+from backend.counters import toggle_like
+from backend.comment_tree import load_thread
+from backend.pagination import encode_cursor, decode_cursor
 
 class UserCommentListView(generics.ListAPIView):
     """
@@ -34,27 +37,42 @@ class UserLikedCommentsView(generics.ListAPIView):
         """
         return Comment.objects.filter(likes=self.request.user).order_by('-created_at')  # Kullanıcının beğendiği yorumları, oluşturulma tarihine göre sıralar
 
+def thread_response(request, comments, has_next):
+    """Yorum ağacı sayfasını `{"next": ..., "results": ...}` biçiminde döndürür (bkz. `KeysetPagination`)."""
+    next_url = None
+    if has_next and comments:
+        next_url = replace_query_param(
+            request.build_absolute_uri(), 'cursor', encode_cursor(comments[-1].created_at, comments[-1].id)
+        )
+    serializer = CommentTreeSerializer(comments, many=True, context={'request': request})
+    return Response({"next": next_url, "results": serializer.data})
+
 class CommentListCreateView(generics.ListCreateAPIView):
     """
     Yorumları listeleyen ve yeni yorum oluşturan API.
-    - Yorumlar alt yorumlar (nested comments) içerir.
+    - Ana yorumlar cursor ile sayfalanır; her yorumun altında yanıtları (nested comments) birkaç seviyeye kadar bulunur.
+    - Her yorumda toplam yanıt sayısı ve gösterilmeyen yanıtlar için `replies_next` bağlantısı döndürülür.
+    - Yorum ağacı, yorum sayısından bağımsız sabit sayıda sorguyla yüklenir (bkz. `backend.comment_tree`).
     """
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
-    pagination_class = PageNumberPagination
 
     def get_queryset(self):
         """
-        Post ID'sine göre yorumları filtreler, ana yorumları (parent=None) ve alt yorumları getirir.
+        Post ID'sine göre ana yorumları (parent=None) döndürür.
         """
-        post_id = self.kwargs['post_id']
-        comments = Comment.objects.filter(post_id=post_id, parent=None).order_by('-created_at')
-        
-        # Alt yorumları ilişkilendiriyoruz (parent_id ile bağlı olanlar)
-        for comment in comments:
-            comment.replies = Comment.objects.filter(parent=comment).order_by('-created_at')
+        return Comment.objects.filter(post_id=self.kwargs['post_id'], parent=None).order_by('-created_at', '-id')
 
-        return comments
+    def list(self, request, *args, **kwargs):
+        """
+        Ana yorumların bir sayfasını yanıt ağaçlarıyla birlikte döndürür.
+        - `cursor` parametresi verilirse, o noktadan daha eski yorumlar döndürülür.
+        """
+        cursor = request.query_params.get('cursor')
+        comments, has_next = load_thread(
+            self.kwargs['post_id'], request.user, cursor=decode_cursor(cursor) if cursor else None
+        )
+        return thread_response(request, comments, has_next)
 
     def perform_create(self, serializer):
         """
@@ -92,6 +110,22 @@ class CommentListCreateView(generics.ListCreateAPIView):
                 comment=comment  # Yorum
             )
 
+class CommentRepliesView(generics.GenericAPIView):
+    """
+    Bir yorumun yanıtlarını (kendi yanıt ağaçlarıyla birlikte) cursor ile sayfalayarak döndüren API.
+    - Yorum ağacındaki `replies_next` bağlantıları bu endpoint'i gösterir.
+    """
+    queryset = Comment.objects.all()
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+
+    def get(self, request, pk, *args, **kwargs):
+        comment = self.get_object()
+        cursor = request.query_params.get('cursor')
+        comments, has_next = load_thread(
+            comment.post_id, request.user, parent_id=comment.pk, cursor=decode_cursor(cursor) if cursor else None
+        )
+        return thread_response(request, comments, has_next)
+
 class CommentUpdateView(generics.UpdateAPIView):
     """
     Yalnızca kendi yorumlarını güncelleyebilen API.
@@ -161,13 +195,11 @@ class CommentLikeToggleView(generics.GenericAPIView):
         except Comment.DoesNotExist:
             return Response({"error": "Yorum bulunamadı"}, status=status.HTTP_404_NOT_FOUND)
 
-        if request.user in comment.likes.all():
-            # Beğeni kaldırma işlemi yapılır
-            comment.likes.remove(request.user)
+        # Beğeni eklenir veya kaldırılır, beğeni sayısı atomik olarak güncellenir
+        is_liked = toggle_like(comment, request.user)
+        if not is_liked:
             message = "Beğeni kaldırıldı"
         else:
-            # Beğeni ekleme işlemi yapılır
-            comment.likes.add(request.user)
             message = "Beğeni eklendi"
 
             # Bildirim: Yorum beğenildiğinde
@@ -182,7 +214,7 @@ class CommentLikeToggleView(generics.GenericAPIView):
         # Güncel beğeni sayısını ve beğeni durumu döndürülür
         return Response({
             "message": message,
-            "likes_count": comment.likes.count(),
-            "is_liked": request.user in comment.likes.all()  # Kullanıcının bu yorumu beğenip beğenmediği durumu
+            "likes_count": comment.like_count,
+            "is_liked": is_liked  # Kullanıcının bu yorumu beğenip beğenmediği durumu
         }, status=status.HTTP_200_OK)
 
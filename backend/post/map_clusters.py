@@ -0,0 +1,29 @@
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework.exceptions import ValidationError
+from backend.map_clusters import clusters_in_viewport
+from backend.utils.params import float_param
+
+
+class MapClusterView(APIView):
+    """
+    Harita görünümü için postları geohash hücrelerine göre kümelenmiş olarak döndüren API.
+    - `zoom` (0-22) ve görünür alanın sınırları (`min_lat`, `min_lng`, `max_lat`, `max_lng`) parametrelerini alır.
+    - Her küme için hücre, post sayısı, ağırlık merkezi ve en yaygın kategori döndürülür.
+    - Kümeler önceden toplanmış özet tablosundan okunur; postlar tek tek taranmaz.
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, *args, **kwargs):
+        params = request.query_params
+        zoom = int(float_param(params, 'zoom', 0, 22))
+        min_lat = float_param(params, 'min_lat', -90, 90)
+        max_lat = float_param(params, 'max_lat', -90, 90)
+        min_lng = float_param(params, 'min_lng', -180, 180)
+        max_lng = float_param(params, 'max_lng', -180, 180)
+        if min_lat > max_lat:
+            raise ValidationError({"min_lat": "min_lat, max_lat değerinden büyük olamaz."})
+
+        precision, clusters = clusters_in_viewport(zoom, min_lat, min_lng, max_lat, max_lng)
+        return Response({"precision": precision, "clusters": clusters})
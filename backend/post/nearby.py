@@ -0,0 +1,95 @@
+from django.db.models import Q
+from rest_framework import generics, permissions
+from rest_framework.exceptions import ValidationError
+from backend.models import Post
+from backend.serializers import PostSerializer
+from backend.querysets import with_post_relations
+from backend.utils.geo import bounding_box, covering_cells, haversine_km
+from backend.utils.params import float_param
+
+# Yarıçap sorgularında kabul edilen en büyük yarıçap (km)
+MAX_RADIUS_KM = 100
+DEFAULT_RADIUS_KM = 5
+
+
+class NearbyPostsView(generics.ListAPIView):
+    """
+    Bir konumun yakınındaki postları mesafeye göre sıralı listeleyen API.
+    - Yarıçap sorgusu: `lat`, `lng` ve isteğe bağlı `radius` (km) parametreleri.
+    - Sınır kutusu sorgusu: `min_lat`, `min_lng`, `max_lat`, `max_lng` parametreleri (isteğe bağlı `lat`/`lng` sıralama merkezi).
+    - Adaylar geohash önekleri ile indeks üzerinden bulunur, ardından haversine mesafesiyle elenir ve sıralanır.
+    """
+    serializer_class = PostSerializer
+    permission_classes = [permissions.AllowAny]
+    filter_backends = []
+
+    def get_queryset(self):
+        return with_post_relations(Post.objects.all(), self.request.user)
+
+    def get_search_area(self):
+        """
+        İstek parametrelerinden sınır kutusunu, sıralama merkezini ve (varsa) yarıçapı döndürür.
+        """
+        params = self.request.query_params
+        if 'min_lat' in params:
+            min_lat = float_param(params, 'min_lat', -90, 90)
+            max_lat = float_param(params, 'max_lat', -90, 90)
+            min_lng = float_param(params, 'min_lng', -180, 180)
+            max_lng = float_param(params, 'max_lng', -180, 180)
+            if min_lat > max_lat:
+                raise ValidationError({"min_lat": "min_lat, max_lat değerinden büyük olamaz."})
+            center_lng = (min_lng + max_lng) / 2 if min_lng <= max_lng else (min_lng + max_lng + 360) / 2
+            center = (
+                float_param(params, 'lat', -90, 90, (min_lat + max_lat) / 2),
+                float_param(params, 'lng', -180, 180, (center_lng + 180) % 360 - 180),
+            )
+            return (min_lat, min_lng, max_lat, max_lng), center, None
+
+        lat = float_param(params, 'lat', -90, 90)
+        lng = float_param(params, 'lng', -180, 180)
+        radius = float_param(params, 'radius', 0, MAX_RADIUS_KM, DEFAULT_RADIUS_KM)
+        return bounding_box(lat, lng, radius), (lat, lng), radius
+
+    def find_nearby(self):
+        """
+        Arama alanındaki postların (mesafe, id) listesini mesafeye göre sıralı olarak döndürür.
+        """
+        (min_lat, min_lng, max_lat, max_lng), (lat, lng), radius = self.get_search_area()
+
+        # Her hücre öneki, geohash indeksinde bir aralık taramasına dönüşür ('{' alfabedeki son karakterden sonra gelir)
+        cells = Q()
+        for cell in covering_cells(min_lat, min_lng, max_lat, max_lng):
+            cells |= Q(geohash__gte=cell, geohash__lt=cell + '{')
+        candidates = Post.objects.filter(cells, latitude__range=(min_lat, max_lat))
+        candidates = list(candidates.values_list('id', 'latitude', 'longitude'))
+        if not candidates:
+            return []
+
+        ids, latitudes, longitudes = zip(*candidates)
+        distances = haversine_km(lat, lng, latitudes, longitudes)
+        results = []
+        for post_id, post_lat, post_lng, distance in zip(ids, latitudes, longitudes, distances):
+            if radius is not None:
+                if distance > radius:
+                    continue
+            elif not min_lat <= post_lat <= max_lat or not (
+                min_lng <= post_lng <= max_lng if min_lng <= max_lng else post_lng >= min_lng or post_lng <= max_lng
+            ):
+                continue
+            results.append((float(distance), post_id))
+        results.sort()
+        return results
+
+    def list(self, request, *args, **kwargs):
+        """
+        Yakındaki postları sayfalayarak, her postun mesafesini (`distance_km`) ekleyerek döndürür.
+        """
+        page = self.paginate_queryset(self.find_nearby())
+        posts = self.get_queryset().in_bulk([post_id for _, post_id in page])
+        page = [(distance, posts[post_id]) for distance, post_id in page if post_id in posts]
+
+        serializer = self.get_serializer([post for _, post in page], many=True)
+        data = serializer.data
+        for item, (distance, _) in zip(data, page):
+            item['distance_km'] = round(distance, 3)
+        return self.get_paginated_response(data)
@@ -1,46 +1,51 @@
-from django.db.models import Count
 from rest_framework import generics, permissions, status, filters
 from rest_framework.exceptions import ValidationError
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.response import Response
-from backend.models import Post, Notification, PostMedia, Profile, Tag, validate_video_duration
+from backend.models import Post, Notification, PostMedia, Tag, validate_video_duration
 from backend.serializers import PostSerializer
+from backend.querysets import with_post_relations
+from backend.fanout import enqueue_post
+from backend.pagination import KeysetPagination
+from backend.counters import toggle_like
+from backend.trending import record_interaction, remove_interaction
 from backend.permissions import IsOwner
+from backend.post.search import PostSearchFilter
 from django.contrib.auth.models import User
 
 class PostListCreateView(generics.ListCreateAPIView):
     """
     Postları listeleyen ve yeni post oluşturan API.
-    - Kullanıcılar, kategoriye göre filtreleme yapabilir, başlık, açıklama, konum ve etiketlere göre arama yapabilir.
+    - Kullanıcılar, kategoriye göre filtreleme yapabilir, başlık, açıklama, konum adı ve etiketlere göre arama yapabilir.
     - Postlar, beğeni sayısına veya oluşturulma tarihine göre sıralanabilir.
     """
     queryset = Post.objects.all()
     serializer_class = PostSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]  # Yalnızca giriş yapmış kullanıcılar post oluşturabilir
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]  # Filtreleme ve sıralama
+    filter_backends = [DjangoFilterBackend, PostSearchFilter, filters.OrderingFilter]  # Filtreleme, tam metin arama ve sıralama
     filterset_fields = ['category']  # Kategoriye göre filtreleme
-    search_fields = ['title', 'description', 'location', 'tags__name']  # Arama alanları
-    ordering_fields = ['likes_count', 'created_at']  # Sıralama alanları
+    ordering_fields = ['like_count', 'created_at']  # Sıralama alanları
     ordering = ['-created_at']  # Varsayılan sıralama (en yeni postlar en üstte)
+    pagination_class = KeysetPagination  # Varsayılan sıralamada cursor ile sayfalama
 
     def get_queryset(self):
         """
         Postları getiren ve ilişkili alanları (tags, media, comments, likes) ekleyen sorgu.
+        - Kullanıcının beğeni durumu anotasyon olarak eklenir.
         """
         queryset = super().get_queryset()
-        return queryset.prefetch_related('tags', 'media', 'comments', 'likes').annotate(
-            likes_count=Count('likes')  # Beğeni sayısı ekleniyor
-        )
+        return with_post_relations(queryset, self.request.user)
 
 
     def perform_create(self, serializer):
         """
         Yeni bir post oluşturulmadan önce medya dosyalarını kontrol eder.
-        - En az bir medya dosyası gerekli.
-        - Video süresi kontrol edilir.
+        - En az bir medya dosyası veya tamamlanmış parçalı yükleme (`uploads`) gerekli.
+        - Video süresi kontrol edilir (parçalı yüklemelerde yükleme tamamlanırken kontrol edilmiştir).
         """
         media_files = self.request.FILES.getlist('media', [])
-        if not media_files:
+        if not media_files and not serializer.validated_data.get('uploads'):
             raise ValidationError({"media": "En az bir medya dosyası gereklidir."})
 
         # Video süresi kontrolü
@@ -48,25 +53,14 @@ class PostListCreateView(generics.ListCreateAPIView):
             if media_file.content_type.startswith('video'):
                 try:
                     validate_video_duration(media_file)
-                except ValueError as e:
-                    raise ValidationError({"media": str(e)})
+                except (ValueError, DjangoValidationError) as e:
+                    raise ValidationError({"media": e.messages if isinstance(e, DjangoValidationError) else str(e)})
 
         # Post'u kaydet
         post = serializer.save()
 
-        # Takipçilere bildirim gönder
-        if hasattr(post.author, 'profile') and post.author.profile:  # profile var mı kontrolü
-            followers = Profile.objects.filter(following__user=post.author)  # 'user' nesnesine dayalı ilişkileri sorguluyoruz
-            for follower in followers:
-                Notification.objects.create(
-                    user=follower.user,
-                    sender=post.author,
-                    notification_type='post',
-                    post=post
-                )
-        else:
-            # Kullanıcının profili yoksa burada hata logu ekleyebilirsiniz
-            print(f"Post author {post.author.username} does not have a profile.")
+        # Takipçilere bildirim gönderimi ve akışlara yazma arka planda, parçalar halinde yapılır
+        enqueue_post(post)
 
 class PostRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
     """
@@ -77,6 +71,22 @@ class PostRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = PostSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
+    def get_queryset(self):
+        """
+        Postu ilişkili alanlarıyla birlikte tek seferde getirir.
+        """
+        return with_post_relations(super().get_queryset(), self.request.user)
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Postu döndürür; giriş yapmış kullanıcılar için görüntüleme etkileşimi kaydedilir.
+        """
+        post = self.get_object()
+        if request.user.is_authenticated:
+            record_interaction(request.user, post, 'view')  # Trend skoru için görüntüleme
+        serializer = self.get_serializer(post)
+        return Response(serializer.data)
+
     def perform_update(self, serializer):
         """
         Kullanıcı sadece kendi postunu güncelleyebilir.
@@ -94,12 +104,10 @@ class PostLikeToggleView(generics.GenericAPIView):
 
     def post(self, request, pk, *args, **kwargs):
         post = self.get_object()
-        if request.user in post.likes.all():
-            post.likes.remove(request.user)
-            message = "Beğeni kaldırıldı"
-        else:
-            post.likes.add(request.user)
+        # Beğeni eklenir veya kaldırılır, beğeni sayısı atomik olarak güncellenir
+        if toggle_like(post, request.user):
             message = "Beğeni eklendi"
+            record_interaction(request.user, post, 'like')  # Trend skoru için beğeni zamanı kaydedilir
             # Beğeni bildirimi
             if post.author != request.user:
                 Notification.objects.create(
@@ -108,4 +116,7 @@ class PostLikeToggleView(generics.GenericAPIView):
                     notification_type='like',
                     post=post
                 )
-        return Response({"message": message, "likes_count": post.likes.count()}, status=200)
+        else:
+            message = "Beğeni kaldırıldı"
+            remove_interaction(request.user, post, 'like')
+        return Response({"message": message, "likes_count": post.like_count}, status=200)
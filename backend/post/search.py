@@ -0,0 +1,58 @@
+from rest_framework import filters, generics, permissions
+from rest_framework.exceptions import ValidationError
+from backend.models import Post
+from backend.serializers import PostSerializer
+from backend.querysets import with_post_relations
+from backend.search import SNIPPET_WORDS, filter_posts, highlight, rank_posts
+
+
+class PostSearchFilter(filters.SearchFilter):
+    """
+    `search` parametresini DRF'nin `ILIKE` aramasıyla değil, postların tam metin arama diziniyle uygulayan filtre.
+    - Başlık, açıklama, konum adı ve etiketlerde arama yapar; sıralamayı değiştirmez.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '')
+        if not query.strip():
+            return queryset
+        return filter_posts(queryset, query)
+
+
+class PostSearchView(generics.ListAPIView):
+    """
+    Postlarda tam metin arama yapan ve sonuçları alaka düzeyine göre sıralayan API.
+    - `q` parametresindeki tüm kelimeleri (Türkçe ekler ve aksanlar dikkate alınmadan) içeren postlar döndürülür.
+    - Başlıktaki eşleşmeler etiket/konum ve açıklamadaki eşleşmelerden daha yüksek puan alır.
+    - Her sonuca alaka puanı (`search_rank`) ve eşleşmeleri işaretlenmiş başlık ve açıklama özeti (`highlights`) eklenir.
+    """
+    serializer_class = PostSerializer
+    permission_classes = [permissions.AllowAny]
+    filter_backends = []
+
+    def get_queryset(self):
+        return with_post_relations(Post.objects.all(), self.request.user)
+
+    def list(self, request, *args, **kwargs):
+        """
+        Sonuçları sayfalayarak alaka puanı ve vurgulamalarla birlikte döndürür.
+        - Sıralama dizinden gelen (puan, ID) listesi üzerinde yapılır; yalnızca sayfadaki postlar veritabanından okunur.
+        """
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            raise ValidationError({"q": "Arama sorgusu gereklidir."})
+        results, stems = rank_posts(query)
+        stems = set(stems)
+
+        page = self.paginate_queryset(results)
+        posts = self.get_queryset().in_bulk([post_id for _, post_id in page])
+        page = [(rank, posts[post_id]) for rank, post_id in page if post_id in posts]
+
+        data = self.get_serializer([post for _, post in page], many=True).data
+        for item, (rank, post) in zip(data, page):
+            item['search_rank'] = rank
+            item['highlights'] = {
+                'title': highlight(post.title, stems),
+                'description': highlight(post.description, stems, SNIPPET_WORDS),
+            }
+        return self.get_paginated_response(data)
@@ -0,0 +1,88 @@
+from io import BytesIO
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.urls import reverse
+from rest_framework import generics, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from backend.models import MediaUpload
+from backend.serializers import MediaUploadSerializer
+from backend.uploads import UploadConflict, write_chunk
+
+# Parça isteklerinin içerik türü (tus protokolündeki gibi)
+CHUNK_CONTENT_TYPE = 'application/offset+octet-stream'
+
+
+def upload_headers(upload):
+    """İstemcinin kaldığı yeri öğrenmesi için yükleme durumunu tus tarzı başlıklarla döndürür."""
+    return {
+        'Upload-Offset': str(upload.offset),
+        'Upload-Length': str(upload.length),
+        'Tus-Resumable': '1.0.0',
+        'Cache-Control': 'no-store',
+    }
+
+
+class MediaUploadCreateView(generics.CreateAPIView):
+    """
+    Parçalı (devam ettirilebilir) medya yüklemesi başlatan API.
+    - `filename` ve `length` (bayt) zorunludur; `post` verilirse dosya tamamlanınca o gönderiye eklenir,
+      verilmezse post oluşturulurken `uploads` alanıyla bağlanır.
+    - Yanıttaki `Location` adresine parçalar PATCH ile gönderilir.
+    """
+    serializer_class = MediaUploadSerializer
+    permission_classes = [IsAuthenticated]
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload = serializer.save()
+        headers = dict(upload_headers(upload), Location=request.build_absolute_uri(reverse('media-upload', args=[upload.pk])))
+        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
+
+
+class MediaUploadView(generics.GenericAPIView):
+    """
+    Parçalı yüklemenin durumunu sorgulayan, parça kabul eden ve yüklemeyi iptal eden API.
+    - HEAD/GET: Alınan bayt sayısını (`Upload-Offset`) döndürür; kesilen yükleme buradan devam ettirilir.
+    - PATCH: `Upload-Offset` başlığındaki konumdan itibaren gövdeyi (`application/offset+octet-stream`) dosyaya yazar.
+      Gövde bellekte tutulmadan diske aktarılır; son parça geldiğinde dosya doğrulanır ve tamamlanır.
+    - DELETE: Yüklemeyi ve geçici dosyasını siler.
+    """
+    serializer_class = MediaUploadSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return MediaUpload.objects.filter(user=self.request.user)
+
+    def get(self, request, *args, **kwargs):
+        upload = self.get_object()
+        return Response(self.get_serializer(upload).data, headers=upload_headers(upload))
+
+    def head(self, request, *args, **kwargs):
+        upload = self.get_object()
+        return Response(status=status.HTTP_200_OK, headers=upload_headers(upload))
+
+    def patch(self, request, *args, **kwargs):
+        upload = self.get_object()
+        if request.content_type != CHUNK_CONTENT_TYPE:
+            return Response({"hata": f"Content-Type '{CHUNK_CONTENT_TYPE}' olmalıdır."}, status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+        try:
+            offset = int(request.headers['Upload-Offset'])
+            content_length = int(request.headers.get('Content-Length') or 0)
+        except (KeyError, ValueError):
+            return Response({"hata": "Geçerli bir 'Upload-Offset' başlığı gereklidir."}, status=status.HTTP_400_BAD_REQUEST)
+        if offset + content_length > upload.length:
+            return Response({"hata": "Gönderilen veri dosya boyutunu aşıyor."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            # Gövde DRF ayrıştırıcılarına verilmeden doğrudan istek akışından okunur
+            write_chunk(upload, offset, request.stream or BytesIO())
+        except UploadConflict as error:
+            return Response({"hata": str(error)}, status=status.HTTP_409_CONFLICT, headers=upload_headers(upload))
+        except DjangoValidationError as error:
+            return Response({"hata": error.messages}, status=status.HTTP_400_BAD_REQUEST, headers=upload_headers(upload))
+        return Response(self.get_serializer(upload).data, headers=upload_headers(upload))
+
+    def delete(self, request, *args, **kwargs):
+        self.get_object().delete()  # Geçici dosya sinyalle silinir
+        return Response(status=status.HTTP_204_NO_CONTENT)
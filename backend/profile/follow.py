@@ -1,33 +1,51 @@
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
-from backend.models import Follow
 from django.contrib.auth.models import User
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from backend.models import Profile, Post
-from backend.serializers import ProfileSerializer
-from backend.serializers import PostSerializer
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+from backend import follow_graph
+from backend.models import Post
+from backend.serializers import PostSerializer, UserSerializer
+from backend.querysets import with_post_relations
+from backend.pagination import encode_cursor, decode_cursor
+from backend.timeline import read_timeline
 
 class FollowedUsersPostListView(generics.ListAPIView):
     """
     Takip edilen kullanıcıların postlarını listeleyen API.
     - Kullanıcı yalnızca takip ettiği kullanıcıların paylaşımlarını görebilir.
     - Postlar, en yeni olanlardan başlayarak sıralanır.
+    - Postlar önceden hesaplanmış akıştan (TimelineEntry) okunur ve cursor ile sayfalanır.
     """
     serializer_class = PostSerializer
     permission_classes = [permissions.IsAuthenticated]  # Yalnızca giriş yapmış kullanıcılar erişebilir
 
     def get_queryset(self):
         """
-        Giriş yapmış kullanıcının takip ettiği kullanıcıların postlarını alır.
-        - Kullanıcının takip ettiği kişilerin tüm postlarını filtreler ve sıralar.
+        Akıştaki postları ilişkili alanlarıyla birlikte yüklemek için kullanılan sorgu.
         """
-        user = self.request.user  # Giriş yapmış kullanıcıyı alıyoruz
-        # Kullanıcının takip ettiği kullanıcıları alıyoruz (Follow modelini kullanarak)
-        followed_users = Follow.objects.filter(user=user).values_list('followed_user', flat=True)
-        # Takip edilen kullanıcıların postlarını sıralı bir şekilde döndürüyoruz
-        return Post.objects.filter(author__in=followed_users).order_by('-created_at')
+        return with_post_relations(Post.objects.all(), self.request.user)
+
+    def list(self, request, *args, **kwargs):
+        """
+        Giriş yapmış kullanıcının önceden hesaplanmış akışını cursor ile sayfalayarak döndürür.
+        - `cursor` parametresi verilirse, o noktadan daha eski postlar döndürülür.
+        """
+        cursor = request.query_params.get('cursor')
+        cursor = decode_cursor(cursor) if cursor else None
+        posts, has_more = read_timeline(request.user, api_settings.PAGE_SIZE, cursor, self.get_queryset())
+
+        next_url = None
+        if has_more and posts:
+            next_url = replace_query_param(
+                request.build_absolute_uri(), 'cursor', encode_cursor(posts[-1].created_at, posts[-1].id)
+            )
+
+        serializer = self.get_serializer(posts, many=True)
+        return Response({"next": next_url, "results": serializer.data})
 
 
 class FollowToggleView(generics.GenericAPIView):
@@ -48,34 +66,27 @@ class FollowToggleView(generics.GenericAPIView):
         except User.DoesNotExist:
             return Response({"error": "Kullanıcı bulunamadı."}, status=status.HTTP_404_NOT_FOUND)
 
-        # Kullanıcı zaten takip ediyor mu kontrol et
-        follow_exists = Follow.objects.filter(user=request.user, followed_user=followed_user).exists()
-
-        if follow_exists:
-            # Kullanıcı zaten takip ediyorsa, takibi bırak
-            Follow.objects.filter(user=request.user, followed_user=followed_user).delete()
-            # Takip edilen kişinin follower sayısını azaltıyoruz
-            followed_user.profile.followers.remove(request.user)
-            followed_user.profile.save()
-            return Response({"message": f"{followed_user.username} artık takip edilmemektedir."}, status=status.HTTP_200_OK)
-        else:
-            # Kullanıcı takip etmiyorsa, takibi başlat
-            Follow.objects.create(user=request.user, followed_user=followed_user)
-            # Takip edilen kişinin follower sayısını arttırıyoruz
-            followed_user.profile.followers.add(request.user)
-            followed_user.profile.save()
+        if followed_user.pk == request.user.pk:
+            return Response({"error": "Kendinizi takip edemezsiniz."}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Takip yalnızca Follow tablosuna yazılır; akış, sayaçlar ve takip kümeleri servis ve sinyallerle güncellenir
+        if follow_graph.toggle(request.user, followed_user):
             return Response({"message": f"{followed_user.username} takip edilmeye başlandı."}, status=status.HTTP_201_CREATED)
+        return Response({"message": f"{followed_user.username} artık takip edilmemektedir."}, status=status.HTTP_200_OK)
 
 class FollowedUsersView(APIView):
+    """Giriş yapmış kullanıcının takip ettiği kullanıcılar (en son takip edilenden başlayarak)."""
+    permission_classes = [IsAuthenticated]
+
     def get(self, request):
-        profile = request.user.profile
-        followed_users = profile.following.all()
-        serializer = ProfileSerializer(followed_users, many=True)  # ProfileSerializer yerine UserSerializer
+        serializer = UserSerializer(follow_graph.following(request.user.pk), many=True)
         return Response(serializer.data)
 
 class FollowersView(APIView):
+    """Giriş yapmış kullanıcıyı takip eden kullanıcılar (en son takip edenden başlayarak)."""
+    permission_classes = [IsAuthenticated]
+
     def get(self, request):
-        profile = request.user.profile
-        followers = profile.followers.all()
-        serializer = ProfileSerializer(followers, many=True)  # ProfileSerializer yerine UserSerializer
+        serializer = UserSerializer(follow_graph.followers(request.user.pk), many=True)
         return Response(serializer.data)
+
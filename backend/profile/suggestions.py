@@ -0,0 +1,22 @@
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from backend.utils.params import float_param
+from backend.recommendations import TOP_K, recommendations_for
+from backend.serializers import UserRecommendationSerializer
+
+
+class PeopleYouMayKnowView(APIView):
+    """
+    "Tanıyor olabileceğin kişiler": kullanıcının takip ettiklerinin takip ettiği, kendisinin takip etmediği kişiler.
+    - Öneriler `compute_recommendations` komutuyla toplu olarak hesaplanmış tablodan okunur; istek sırasında grafik
+      taranmaz.
+    - Sıralama, ortak takip sayısı ve ortak ilgi alanlarından (etkileşimde bulunulan post kategorileri) hesaplanan
+      skora göredir; `limit` (1-TOP_K) döndürülecek öneri sayısıdır.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        limit = int(float_param(request.query_params, 'limit', 1, TOP_K, TOP_K))
+        serializer = UserRecommendationSerializer(recommendations_for(request.user, limit), many=True)
+        return Response({"results": serializer.data})
@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.db.models import Count, Exists, IntegerField, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+from backend.models import Post, Comment
+
+# Post listelerinde her postla birlikte gösterilen en yeni ana yorum sayısı
+RECENT_COMMENTS = getattr(settings, 'POST_RECENT_COMMENTS', 3)
+
+
+def _liked_by_user(through, field_name, user):
+    """
+    Verilen beğeni ara tablosunda, giriş yapmış kullanıcının ilgili satırı beğenip beğenmediğini
+    tek bir `EXISTS` alt sorgusu olarak döndürür.
+    """
+    return Exists(through.objects.filter(**{field_name: OuterRef('pk'), 'user_id': user.id}))
+
+
+def with_comment_relations(queryset, user=None):
+    """
+    CommentSerializer'ın ihtiyaç duyduğu alanları yorum sorgusuna ekler.
+    - Yazar `select_related` ile, beğenenler `prefetch_related` ile yüklenir.
+    - Kullanıcının beğeni durumu (`is_liked`) anotasyon olarak eklenir; beğeni sayısı `like_count` sayacından okunur.
+      (Sayaç için ayrıca anotasyon eklenmez: Django, alan referanslı anotasyonları dilimlenmiş `Prefetch`
+      sorgularının pencere fonksiyonlu alt sorgusunda hatalı eşler.)
+    """
+    queryset = queryset.select_related('author').prefetch_related('likes')
+    if user is not None and user.is_authenticated:
+        queryset = queryset.annotate(is_liked=_liked_by_user(Comment.likes.through, 'comment_id', user))
+    return queryset
+
+
+def recent_comments(user=None):
+    """
+    Ana yorumları yanıt sayılarıyla birlikte yeniden eskiye sıralı seçen sorgu (post önizlemeleri için).
+    - `Prefetch` içinde dilimlendiğinde (`[:RECENT_COMMENTS]`) Django sınırı post başına pencere fonksiyonuyla
+      (ROW_NUMBER) uygular; sayfadaki postların tüm yorumları okunmaz.
+    """
+    replies = Comment.objects.filter(parent=OuterRef('pk')).order_by().values('parent').annotate(total=Count('*'))
+    queryset = Comment.objects.filter(parent=None).annotate(
+        reply_count=Coalesce(Subquery(replies.values('total'), output_field=IntegerField()), 0)
+    ).order_by('-created_at', '-id')
+    return with_comment_relations(queryset, user)
+
+
+def with_post_relations(queryset, user=None):
+    """
+    PostSerializer'ın ihtiyaç duyduğu tüm ilişkileri ve sayıları tek seferde yükler.
+    - Etiketler, medyalar, beğenenler ve her postun en yeni ana yorumları (`recent_comments`) önceden getirilir.
+    - Kullanıcının beğeni durumu (`is_liked`) anotasyon olarak eklenir; beğeni sayısı postun `like_count` alanından okunur.
+    Böylece sayfadaki post sayısından bağımsız, sabit sayıda sorgu çalışır.
+    """
+    queryset = queryset.prefetch_related(
+        'tags', 'media', 'likes', Prefetch('comments', queryset=recent_comments(user)[:RECENT_COMMENTS], to_attr='recent_comments')
+    )
+    if user is not None and user.is_authenticated:
+        queryset = queryset.annotate(is_liked=_liked_by_user(Post.likes.through, 'post_id', user))
+    return queryset
@@ -0,0 +1,43 @@
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+
+
+def notifications_group(user_id):
+    """Kullanıcının bildirim bağlantılarının bulunduğu kanal grubunun adı."""
+    return f"notifications.{user_id}"
+
+
+def messages_group(user_id):
+    """Kullanıcının birebir mesaj bağlantılarının bulunduğu kanal grubunun adı."""
+    return f"messages.{user_id}"
+
+
+def group_chat_group(group_id):
+    """Grup sohbeti odasındaki bağlantıların bulunduğu kanal grubunun adı."""
+    return f"group_chat.{group_id}"
+
+
+def push(groups, event, data):
+    """
+    Olayı verilen kanal gruplarındaki WebSocket bağlantılarına gönderir.
+    - Gönderim transaction tamamlandıktan sonra yapılır; geri alınan kayıtlar istemcilere ulaşmaz.
+    - Kanal katmanı yapılandırılmamışsa hiçbir şey yapılmaz.
+    """
+    push_many([(group, event, data) for group in groups])
+
+
+def push_many(items):
+    """
+    (grup, olay, veri) üçlülerini tek seferde gönderir.
+    - Toplu dağıtımda her olay için ayrı bir olay döngüsü açmamak için tüm gönderimler tek bir `async_to_sync` çağrısında yapılır.
+    """
+    channel_layer = get_channel_layer()
+    if channel_layer is None or not items:
+        return
+
+    async def send_all():
+        for group, event, data in items:
+            await channel_layer.group_send(group, {'type': 'push', 'event': event, 'data': data})
+
+    transaction.on_commit(async_to_sync(send_all))
@@ -0,0 +1,135 @@
+import logging
+from itertools import chain
+import numpy as np
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Count
+from django.utils.timezone import now
+from backend import follow_graph
+from backend.models import Follow, Post, UserInteraction, UserRecommendation
+from backend.utils.sparse import concat_ranges, csr, row_paths, square_rows, top_k
+
+logger = logging.getLogger(__name__)
+
+# Kullanıcı başına saklanan en fazla öneri sayısı
+TOP_K = getattr(settings, 'RECOMMENDATIONS_TOP_K', 20)
+# Kategori benzerliğinin skora etkisi: skor = ortak takip sayısı * (1 + ağırlık * kategori benzerliği)
+CATEGORY_WEIGHT = getattr(settings, 'RECOMMENDATIONS_CATEGORY_WEIGHT', 1.0)
+# Bundan fazla kişiyi takip eden kullanıcılar ara düğüm olarak kullanılmaz (herkesi takip eden hesaplar öneriyi bozar)
+MAX_DEGREE = getattr(settings, 'RECOMMENDATIONS_MAX_DEGREE', 5000)
+# Bir partide genişletilecek en fazla iki adımlı yol sayısı; partinin bellek kullanımını sınırlar
+MAX_PATHS = 2_000_000
+
+
+def _load_graph():
+    """
+    Takip grafiğini `(kullanıcı ID'leri, indptr, indices)` olarak yükler.
+    - Kullanıcı ID'leri sıralıdır; matristeki satır/sütun numarası ID'nin bu dizideki konumudur.
+    """
+    rows = Follow.objects.order_by().values_list('user_id', 'followed_user_id').iterator(chunk_size=10000)
+    edges = np.fromiter(chain.from_iterable(rows), dtype=np.int64).reshape(-1, 2)
+    user_ids, positions = np.unique(edges, return_inverse=True)
+    positions = positions.reshape(-1, 2)
+    indptr, indices = csr(positions[:, 0], positions[:, 1], len(user_ids))
+    return user_ids, indptr, indices
+
+
+def _positions(user_ids, ids):
+    """ID'lerin `user_ids` içindeki konumları ve grafikte bulunup bulunmadıkları."""
+    ids = np.asarray(ids, dtype=np.int64)
+    found = np.searchsorted(user_ids, ids).clip(max=max(len(user_ids) - 1, 0))
+    return found, (user_ids[found] == ids) if len(user_ids) else np.zeros(len(ids), dtype=bool)
+
+
+def _category_vectors(user_ids):
+    """
+    Her kullanıcının etkileşimde bulunduğu (beğeni, yorum, görüntüleme) post kategorilerinin dağılımı.
+    - Satırlar birim uzunluğa getirilir; iki satırın iç çarpımı kategori benzerliğidir (0-1).
+    """
+    categories = {value: index for index, (value, _) in enumerate(Post.CATEGORY_CHOICES)}
+    vectors = np.zeros((len(user_ids), len(categories)), dtype=np.float32)
+    counts = UserInteraction.objects.order_by().values_list('user_id', 'post__category').annotate(total=Count('*'))
+    rows, cols, totals = [], [], []
+    for user_id, category, total in counts.iterator(chunk_size=10000):
+        if category in categories:
+            rows.append(user_id)
+            cols.append(categories[category])
+            totals.append(total)
+    positions, found = _positions(user_ids, rows)
+    np.add.at(vectors, (positions[found], np.asarray(cols, dtype=np.int64)[found]), np.asarray(totals)[found])
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=vectors, where=norms > 0)
+
+
+def _batches(sources, paths, batch_size):
+    """Kaynak kullanıcıları, her parti en fazla `batch_size` kullanıcı ve yaklaşık `MAX_PATHS` yol olacak şekilde böler."""
+    cumulative = np.cumsum(paths[sources])
+    start = 0
+    while start < len(sources):
+        done = cumulative[start - 1] if start else 0
+        end = int(np.searchsorted(cumulative, done + MAX_PATHS, side='right'))
+        end = max(min(end, start + batch_size), start + 1)
+        yield sources[start:end]
+        start = end
+
+
+def compute_recommendations(batch_size=1000):
+    """
+    Tüm kullanıcılar için "tanıyor olabileceğin kişiler" önerilerini hesaplayıp `UserRecommendation` tablosuna yazar;
+    önerisi olan kullanıcı sayısını döndürür.
+    - Takip matrisi `A` için `A @ A`, her kullanıcının takip ettiklerinin takip ettiği kişileri ve kaç ortak takip
+      üzerinden ulaşıldığını verir. Çarpım seyrek olarak (NumPy ile) partiler halinde hesaplanır.
+    - Kullanıcının kendisi, zaten takip ettikleri ve pasif kullanıcılar çıkarılır; ortak takip sayısı kategori
+      benzerliğiyle ağırlıklandırılır ve her kullanıcının en iyi `TOP_K` önerisi saklanır.
+    - Her partinin eski önerileri aynı işlemde değiştirilir; artık önerisi olmayan kullanıcıların satırları sonda silinir.
+    """
+    started = now()
+    user_ids, indptr, indices = _load_graph()
+    size = len(user_ids)
+    degree = np.diff(indptr)
+    through = degree <= MAX_DEGREE
+    active = np.ones(size, dtype=bool)
+    inactive, found = _positions(user_ids, User.objects.filter(is_active=False).values_list('pk', flat=True))
+    active[inactive[found]] = False
+    vectors = _category_vectors(user_ids)
+    paths = row_paths(indptr, indices, through)
+
+    users = 0
+    for rows in _batches(np.flatnonzero(degree), paths, batch_size):
+        source, target, mutual = square_rows(indptr, indices, rows, through)
+        followed = np.repeat(np.arange(len(rows)), degree[rows]) * size + indices[concat_ranges(indptr[rows], degree[rows])]
+        keep = (target != rows[source]) & active[target] & ~np.isin(source * size + target, followed)
+        source, target, mutual = source[keep], target[keep], mutual[keep]
+
+        similarity = np.einsum('ij,ij->i', vectors[rows[source]], vectors[target])
+        scores = mutual * (1 + CATEGORY_WEIGHT * similarity)
+        best = top_k(source, scores, TOP_K)
+
+        recommendations = [
+            UserRecommendation(
+                user_id=int(user_ids[rows[row]]), recommended_user_id=int(user_ids[column]),
+                mutual_count=int(count), score=float(score), computed_at=started,
+            )
+            for row, column, count, score in zip(source[best], target[best], mutual[best], scores[best])
+        ]
+        with transaction.atomic():
+            UserRecommendation.objects.filter(user_id__in=user_ids[rows].tolist()).delete()
+            UserRecommendation.objects.bulk_create(recommendations, batch_size=1000)
+        users += len(np.unique(source[best]))
+
+    UserRecommendation.objects.filter(computed_at__lt=started).delete()
+    logger.info("Computed recommendations for %d users from %d follows", users, len(indices))
+    return users
+
+
+def recommendations_for(user, limit=TOP_K):
+    """
+    Kullanıcının önerilerini skora göre döndürür.
+    - Hesaplamadan sonra takip edilmeye başlanan kullanıcılar, önbellekteki takip kümesiyle (ek sorgu olmadan) çıkarılır.
+    """
+    followed = follow_graph.following_ids(user.pk)
+    rows = UserRecommendation.objects.filter(user=user, recommended_user__is_active=True).select_related(
+        'recommended_user'
+    ).order_by('-score', 'recommended_user_id')
+    return [row for row in rows if row.recommended_user_id not in followed][:limit]
@@ -0,0 +1,8 @@
+from django.urls import path
+from backend.consumers import DirectMessageConsumer, GroupChatConsumer, NotificationConsumer
+
+websocket_urlpatterns = [
+    path('ws/notifications/', NotificationConsumer.as_asgi()),  # Anlık bildirimler
+    path('ws/messages/', DirectMessageConsumer.as_asgi()),  # Birebir mesajlar
+    path('ws/groups/<int:group_id>/', GroupChatConsumer.as_asgi()),  # Grup sohbeti odası
+]
@@ -0,0 +1,202 @@
+import math
+import threading
+from collections import defaultdict
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import F, Value
+from django.utils.html import escape
+from backend.models import Post
+from backend.utils.text import analyze, iter_words
+
+# Alanların ağırlık sınıfları: A başlık, B etiketler ve konum adı, C açıklama
+RANK_WEIGHTS = {'A': 1.0, 'B': 0.4, 'C': 0.2}
+# Sıralı aramada döndürülecek en fazla sonuç
+MAX_RESULTS = 1000
+# Açıklama özetinde gösterilecek kelime sayısı
+SNIPPET_WORDS = 24
+
+
+def uses_postgres():
+    """Veritabanının PostgreSQL olup olmadığını döndürür (değilse Python dizini kullanılır)."""
+    return connection.vendor == 'postgresql'
+
+
+def post_document(post):
+    """Postun aranabilir metinlerini ağırlık sınıflarına göre döndürür."""
+    tags = ' '.join(tag.name for tag in post.tags.all())
+    return {
+        'A': post.title or '',
+        'B': f"{tags} {post.location_name or ''}",
+        'C': post.description or '',
+    }
+
+
+def search_vector(document):
+    """
+    Dokümandan `search_vector` alanına yazılacak ifadeyi oluşturur.
+    - Katlama ve kök bulma Python'da yapılır, PostgreSQL'e 'simple' yapılandırmasıyla hazır kökler verilir;
+      böylece dizin ve sorgular her iki arka uçta aynı şekilde analiz edilir.
+    """
+    vector = None
+    for weight, text in document.items():
+        part = SearchVector(Value(' '.join(analyze(text))), weight=weight, config='simple')
+        vector = part if vector is None else vector + part
+    return vector
+
+
+class InvertedIndex:
+    """
+    PostgreSQL bulunmadığında (ör. SQLite ile geliştirme ve testlerde) kullanılan bellek içi ters dizin.
+    - Her kök için post ID'lerine göre ağırlıklı terim frekansı tutulur.
+    - İlk aramada veritabanından oluşturulur, ardından post kaydedildikçe güncellenir.
+    """
+
+    def __init__(self):
+        self.postings = defaultdict(dict)
+        self.documents = {}
+        self.loaded = False
+        self.lock = threading.RLock()
+
+    def add(self, post_id, document):
+        with self.lock:
+            self.remove(post_id)
+            terms = set()
+            for weight, text in document.items():
+                for stem in analyze(text):
+                    postings = self.postings[stem]
+                    postings[post_id] = postings.get(post_id, 0) + RANK_WEIGHTS[weight]
+                    terms.add(stem)
+            self.documents[post_id] = terms
+
+    def remove(self, post_id):
+        with self.lock:
+            for stem in self.documents.pop(post_id, ()):
+                postings = self.postings[stem]
+                postings.pop(post_id, None)
+                if not postings:
+                    del self.postings[stem]
+
+    def load(self):
+        """Dizini tüm postlardan yeniden oluşturur."""
+        with self.lock:
+            self.postings.clear()
+            self.documents.clear()
+            posts = Post.objects.only('id', 'title', 'description', 'location_name').prefetch_related('tags')
+            for post in posts.iterator(chunk_size=2000):
+                self.add(post.id, post_document(post))
+            self.loaded = True
+
+    def search(self, stems, limit=None):
+        """
+        Tüm kökleri içeren postların (skor, post ID) listesini skora göre azalan sırada döndürür.
+        - Skor, ağırlıklı terim frekansının ters doküman frekansı (idf) ile çarpımlarının toplamıdır.
+        """
+        with self.lock:
+            if not self.loaded:
+                self.load()
+            lists = [self.postings.get(stem) for stem in set(stems)]
+            if not lists or not all(lists):
+                return []
+            lists.sort(key=len)
+            candidates = set(lists[0]).intersection(*lists[1:])
+            total = len(self.documents)
+            results = [
+                (sum(postings[post_id] * math.log(1 + total / len(postings)) for postings in lists), post_id)
+                for post_id in candidates
+            ]
+        results.sort(key=lambda item: (-item[0], -item[1]))
+        return results[:limit] if limit else results
+
+
+python_index = InvertedIndex()
+
+
+def index_post(post):
+    """Postu arama dizinine ekler veya dizindeki kaydını günceller."""
+    if uses_postgres():
+        Post.objects.filter(pk=post.pk).update(search_vector=search_vector(post_document(post)))
+    elif python_index.loaded:
+        python_index.add(post.pk, post_document(post))
+
+
+def remove_post(post_id):
+    """Postu arama dizininden çıkarır (PostgreSQL'de satırla birlikte silinir)."""
+    if not uses_postgres():
+        python_index.remove(post_id)
+
+
+def reindex_all():
+    """Tüm postların arama dizinini yeniden oluşturur ve işlenen post sayısını döndürür."""
+    if not uses_postgres():
+        python_index.load()
+        return len(python_index.documents)
+    count = 0
+    posts = Post.objects.only('id', 'title', 'description', 'location_name').prefetch_related('tags')
+    for post in posts.iterator(chunk_size=2000):
+        Post.objects.filter(pk=post.pk).update(search_vector=search_vector(post_document(post)))
+        count += 1
+    return count
+
+
+def _tsquery(stems):
+    # Kökler yalnızca harf ve rakamlardan oluştuğu için ham tsquery sözdizimine güvenle yazılabilir
+    return SearchQuery(' & '.join(sorted(set(stems))), config='simple', search_type='raw')
+
+
+def filter_posts(queryset, query):
+    """Sorgudaki tüm kelimeleri içeren postlara göre queryset'i filtreler (sıralamayı değiştirmez)."""
+    stems = analyze(query)
+    if not stems:
+        return queryset
+    if uses_postgres():
+        return queryset.filter(search_vector=_tsquery(stems))
+    return queryset.filter(pk__in=[post_id for _, post_id in python_index.search(stems)])
+
+
+def rank_posts(query, limit=MAX_RESULTS):
+    """
+    Sorguyla eşleşen postların (alaka puanı, post ID) listesini puana göre azalan sırada döndürür.
+    - Sorgunun kökleri de vurgulama için döndürülür.
+    """
+    stems = analyze(query)
+    if not stems:
+        return [], stems
+    if not uses_postgres():
+        return python_index.search(stems, limit), stems
+    tsquery = _tsquery(stems)
+    weights = [0.1, RANK_WEIGHTS['C'], RANK_WEIGHTS['B'], RANK_WEIGHTS['A']]  # D, C, B, A sırasıyla
+    ranked = (
+        Post.objects.filter(search_vector=tsquery)
+        .annotate(search_rank=SearchRank(F('search_vector'), tsquery, weights=weights))
+        .order_by('-search_rank', '-id')
+        .values_list('search_rank', 'id')
+    )
+    return list(ranked[:limit]), stems
+
+
+def highlight(text, stems, words=None):
+    """
+    Metindeki eşleşen kelimeleri `<mark>` etiketiyle işaretler (metin HTML için kaçışlanır).
+    - `words` verilirse ilk eşleşmenin çevresinden bu kadar kelimelik bir özet döndürülür.
+    """
+    if not text:
+        return ''
+    tokens = list(iter_words(text))
+    hits = [index for index, (_, _, stem) in enumerate(tokens) if stem in stems]
+    start, end = 0, len(text)
+    if words and len(tokens) > words:
+        first = max(hits[0] - words // 3, 0) if hits else 0
+        last = min(first + words, len(tokens)) - 1
+        start = tokens[first][0] if first else 0
+        end = tokens[last][1] if last < len(tokens) - 1 else len(text)
+
+    parts, position = [], start
+    for index in hits:
+        token_start, token_end, _ = tokens[index]
+        if token_start < start or token_end > end:
+            continue
+        parts.append(escape(text[position:token_start]))
+        parts.append(f"<mark>{escape(text[token_start:token_end])}</mark>")
+        position = token_end
+    parts.append(escape(text[position:end]))
+    return ('…' if start else '') + ''.join(parts) + ('…' if end < len(text) else '')
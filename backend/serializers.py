@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from rest_framework.reverse import reverse
+from rest_framework.utils.urls import replace_query_param
 from django.contrib.auth.models import User
 from backend.models.follow import Follow
 from backend.models.group_invitation import GroupInvitation
@@ -6,6 +8,7 @@ from backend.models.group_chat import GroupChat
 from backend.models.group_message import GroupMessage
 from backend.models.interaction import SharedPost
 from backend.models.message import Message
+from backend.models.conversation_participant import ConversationParticipant
 from backend.models.report import Report
 from backend.models.notification import Notification
 from backend.models.profile import Profile
@@ -13,12 +16,71 @@ from backend.models.comment import Comment
 from backend.models.tag import Tag
 from backend.models.post import Post
 from backend.models.media import PostMedia
+from backend.models.media_upload import MediaUpload
+from backend.models.recommendation import UserRecommendation
+from backend.uploads import MAX_UPLOAD_SIZE, MEDIA_TYPES, attach, create_upload, extension
+from backend.images import schedule as schedule_variants
+from backend.transcoding import schedule as schedule_transcode
+from backend.blobs import acquire as acquire_blob
+from backend import follow_graph
+from backend.pagination import encode_cursor
+from backend.querysets import RECENT_COMMENTS, recent_comments
+
+def image_variants(variants, file, request=None):
+    """
+    Görsel türevlerini istemcinin `srcset` ile kullanabileceği biçimde döndürür.
+    - `sizes`: boyut adına göre genişlik, yükseklik ve biçimlerin adresleri.
+    - `srcset`: biçime göre "adres genişlikw, ..." metni.
+    - Türevler henüz üretilmediyse (veya görsel değiştiyse) None döner; istemci orijinali kullanır.
+    """
+    if not file or not variants or variants.get('source') != file.name:
+        return None
+    build = request.build_absolute_uri if request else (lambda url: url)
+    sizes, srcset = {}, {}
+    for item in variants['items']:
+        url = build(file.storage.url(item['name']))
+        entry = sizes.setdefault(item['size'], {'width': item['width'], 'height': item['height']})
+        entry[item['format']] = url
+        srcset.setdefault(item['format'], []).append((item['width'], url))
+    return {
+        'width': variants['width'],
+        'height': variants['height'],
+        'sizes': sizes,
+        'srcset': {fmt: ', '.join(f"{url} {width}w" for width, url in sorted(urls)) for fmt, urls in srcset.items()},
+    }
+
+def video_renditions(media, request=None):
+    """
+    Videonun dönüştürülmüş sürümlerinin adreslerini döndürür: web uyumlu MP4, kapak görseli ve önizleme.
+    - Dönüştürme henüz bitmediyse (veya video değiştiyse) None döner; istemci orijinali kullanır.
+    """
+    transcoded = media.transcoded or {}
+    if media.transcode_status != 'ready' or not media.file or transcoded.get('source') != media.file.name:
+        return None
+    build = request.build_absolute_uri if request else (lambda url: url)
+    return {
+        'url': build(media.file.storage.url(transcoded['video'])),
+        'poster': build(media.file.storage.url(transcoded['poster'])),
+        'preview': build(media.file.storage.url(transcoded['preview'])),
+        'width': transcoded['width'],
+        'height': transcoded['height'],
+        'duration': transcoded['duration'],
+    }
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'username']
 
+class UserRecommendationSerializer(serializers.ModelSerializer):
+    """"Tanıyor olabileceğin kişiler" önerisi: önerilen kullanıcı ve ortak takip sayısı."""
+    id = serializers.IntegerField(source='recommended_user.id', read_only=True)
+    username = serializers.CharField(source='recommended_user.username', read_only=True)
+
+    class Meta:
+        model = UserRecommendation
+        fields = ['id', 'username', 'mutual_count', 'score']
+
 class GroupInvitationSerializer(serializers.ModelSerializer):
     invited_user = UserSerializer(read_only=True)
     invited_by = UserSerializer(read_only=True)
@@ -45,6 +107,16 @@ class GroupChatSerializer(serializers.ModelSerializer):
         group.admins.add(user)  # Grup yaratıcısı otomatik yönetici olur.
         return group
 
+
+class GroupMessageSerializer(serializers.ModelSerializer):
+    sender = UserSerializer(read_only=True)
+
+    class Meta:
+        model = GroupMessage
+        fields = ['id', 'group', 'sender', 'content', 'created_at']
+        read_only_fields = ['id', 'group', 'sender', 'created_at']
+
+
 class SharedPostSerializer(serializers.ModelSerializer):
     post_id = serializers.IntegerField(write_only=True, required=True)
     recipient_id = serializers.IntegerField(write_only=True, required=True)
@@ -62,8 +134,8 @@ class MessageSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Message
-        fields = ['id', 'sender', 'recipient', 'content', 'created_at', 'is_read', 'attachment']
-        read_only_fields = ['id', 'sender', 'created_at', 'is_read']
+        fields = ['id', 'conversation', 'sender', 'recipient', 'content', 'created_at', 'is_read', 'attachment']
+        read_only_fields = ['id', 'conversation', 'sender', 'created_at', 'is_read']
 
     def validate_attachment(self, value):
         """Dosya türünü kontrol et"""
@@ -72,6 +144,17 @@ class MessageSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError("Invalid file type")
         return value
 
+class ConversationSerializer(serializers.ModelSerializer):
+    """Gelen kutusundaki bir sohbet satırı: diğer kullanıcı, son mesaj ve okunmamış mesaj sayısı."""
+    id = serializers.IntegerField(source='conversation_id', read_only=True)
+    peer = UserSerializer(read_only=True)
+    last_message = MessageSerializer(source='conversation.last_message', read_only=True)
+
+    class Meta:
+        model = ConversationParticipant
+        fields = ['id', 'peer', 'last_message', 'unread_count', 'last_message_at']
+        read_only_fields = fields
+
 class ReportSerializer(serializers.ModelSerializer):
     class Meta:
         model = Report
@@ -102,28 +185,33 @@ class NotificationSerializer(serializers.ModelSerializer):
 
 class ProfileSerializer(serializers.ModelSerializer):
     profile_image = serializers.ImageField(required=False)
-    followers_count = serializers.SerializerMethodField()
-    following_count = serializers.SerializerMethodField()
-    followers = UserSerializer(source='followers.all', many=True, read_only=True)
-    following = UserSerializer(source='following.all', many=True, read_only=True)
+    followers_count = serializers.IntegerField(read_only=True)
+    following_count = serializers.IntegerField(read_only=True)
+    followers = serializers.SerializerMethodField()
+    following = serializers.SerializerMethodField()
+    profile_image_variants = serializers.SerializerMethodField()
     level_message = serializers.SerializerMethodField()
     level_badge = serializers.SerializerMethodField()
 
     class Meta:
         model = Profile
         fields = [
-            'bio', 'location', 'birth_date', 'phone_number', 'profile_image',
+            'bio', 'location', 'birth_date', 'phone_number', 'profile_image', 'profile_image_variants',
             'gender', 'social_link', 'created_at', 'followers_count', 'following_count',
             'followers', 'following', 'level', 'points', 'level_message', 'level_badge',
         ]
 
-    def get_followers_count(self, obj):
-        """Toplam takipçi sayısını döner."""
-        return obj.followers.count()
+    def get_followers(self, obj):
+        """Kullanıcıyı takip edenler (Follow tablosundan, en son takip edenden başlayarak)"""
+        return UserSerializer(follow_graph.followers(obj.user_id), many=True).data
 
-    def get_following_count(self, obj):
-        """Toplam takip edilen sayısını döner."""
-        return obj.following.count()
+    def get_following(self, obj):
+        """Kullanıcının takip ettikleri"""
+        return UserSerializer(follow_graph.following(obj.user_id), many=True).data
+
+    def get_profile_image_variants(self, obj):
+        """Profil fotoğrafının küçültülmüş türevleri (hazır değilse null)"""
+        return image_variants(obj.profile_image_variants, obj.profile_image, self.context.get('request'))
 
     def get_level_message(self, obj):
         """Kullanıcı seviyesine göre mesaj döner."""
@@ -166,19 +254,57 @@ class CommentSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'author', 'created_at', 'post']
 
     def get_replies(self, obj):
-        if obj.replies.exists():
-            return CommentSerializer(obj.replies.all().order_by('-created_at'), many=True).data
-        return []
+        # Yanıtlar önceden getirildiyse (bkz. backend.querysets) ek sorgu yapılmaz
+        if 'replies' in getattr(obj, '_prefetched_objects_cache', {}):
+            replies = obj.replies.all()
+        elif obj.replies.exists():
+            replies = obj.replies.all().order_by('-created_at')
+        else:
+            return []
+        return CommentSerializer(replies, many=True, context=self.context).data
 
     def get_likes_count(self, obj):
-        return obj.likes.count()
+        return obj.like_count
 
     def get_is_liked(self, obj):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
+            if hasattr(obj, 'is_liked'):
+                return obj.is_liked
             return obj.likes.filter(id=request.user.id).exists()
         return False
 
+class CommentTreeSerializer(CommentSerializer):
+    """
+    `backend.comment_tree.load_thread` ile yüklenmiş yorum ağacı; yanıtlar bellekte kurulduğundan ek sorgu yapılmaz.
+    - `depth`: yorumun derinliği (ana yorumlar 0).
+    - `reply_count`: yorumun toplam yanıt sayısı.
+    - `replies_next`: gösterilmeyen yanıtları yükleyen adres (tüm yanıtlar gösterildiyse null).
+    """
+    reply_count = serializers.IntegerField(read_only=True)
+    replies_next = serializers.SerializerMethodField()
+
+    class Meta(CommentSerializer.Meta):
+        fields = CommentSerializer.Meta.fields + ['depth', 'reply_count', 'replies_next']
+
+    def get_replies(self, obj):
+        return CommentTreeSerializer(obj.tree_replies, many=True, context=self.context).data
+
+    def get_replies_next(self, obj):
+        if obj.replies_cursor is None:
+            return None
+        url = reverse('comment-replies', kwargs={'pk': obj.pk}, request=self.context.get('request'))
+        if obj.replies_cursor:
+            url = replace_query_param(url, 'cursor', encode_cursor(*obj.replies_cursor))
+        return url
+
+class RecentCommentSerializer(CommentSerializer):
+    """Post listelerindeki yorum önizlemesi: yanıtlar yerine yanıt sayısı döndürülür (bkz. `recent_comments`)."""
+    reply_count = serializers.IntegerField(read_only=True)
+
+    class Meta(CommentSerializer.Meta):
+        fields = [field for field in CommentSerializer.Meta.fields if field != 'replies'] + ['reply_count']
+
 class TagSerializer(serializers.ModelSerializer):
     category = serializers.CharField(source='category.name', read_only=True)
 
@@ -187,19 +313,71 @@ class TagSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'category']
 
 class PostMediaSerializer(serializers.ModelSerializer):
+    variants = serializers.SerializerMethodField()
+    video = serializers.SerializerMethodField()
+
     class Meta:
         model = PostMedia
-        fields = ['id', 'media_type', 'file', 'created_at']
+        fields = ['id', 'media_type', 'file', 'variants', 'video', 'transcode_status', 'created_at']
+        read_only_fields = ['transcode_status']
+
+    def get_variants(self, obj):
+        """Görselin küçültülmüş türevleri (videolarda veya türevler hazır değilse null)"""
+        return image_variants(obj.variants, obj.file, self.context.get('request'))
+
+    def get_video(self, obj):
+        """Videonun web sürümü, kapağı ve önizlemesi (görsellerde veya dönüştürme bitmediyse null)"""
+        return video_renditions(obj, self.context.get('request'))
+
+class NearDuplicateMediaSerializer(PostMediaSerializer):
+    """Benzer görsel kümelerindeki bir medya: gönderisi, yazarı ve (aramada) sorgulanan görsele uzaklığı."""
+    author = UserSerializer(source='post.author', read_only=True)
+    distance = serializers.IntegerField(read_only=True, required=False)
+
+    class Meta(PostMediaSerializer.Meta):
+        fields = ['id', 'post', 'author', 'file', 'variants', 'distance', 'created_at']
+
+class MediaUploadSerializer(serializers.ModelSerializer):
+    """Parçalı yüklemenin durumu; oluştururken dosya adı, toplam boyut ve (isteğe bağlı) hedef gönderi verilir."""
+
+    class Meta:
+        model = MediaUpload
+        fields = ['id', 'post', 'filename', 'media_type', 'length', 'offset', 'status', 'media', 'created_at', 'expires_at']
+        read_only_fields = ['id', 'media_type', 'offset', 'status', 'media', 'created_at', 'expires_at']
+
+    def validate_filename(self, value):
+        if extension(value) not in MEDIA_TYPES:
+            raise serializers.ValidationError(f"İzin verilen uzantılar: {', '.join(MEDIA_TYPES)}.")
+        return value
+
+    def validate_length(self, value):
+        if value <= 0 or value > MAX_UPLOAD_SIZE:
+            raise serializers.ValidationError(f"Dosya boyutu 1 ile {MAX_UPLOAD_SIZE} bayt arasında olmalıdır.")
+        return value
+
+    def validate_post(self, value):
+        if value is not None and value.author != self.context['request'].user:
+            raise serializers.ValidationError("Yalnızca kendi gönderinize medya yükleyebilirsiniz.")
+        return value
+
+    def create(self, validated_data):
+        return create_upload(self.context['request'].user, **validated_data)
 
 class PostSerializer(serializers.ModelSerializer):
     media = PostMediaSerializer(many=True, read_only=True)
+    uploads = serializers.PrimaryKeyRelatedField(
+        queryset=MediaUpload.objects.filter(status='completed', media__isnull=True),
+        many=True,
+        write_only=True,
+        required=False
+    )
     tags = serializers.ListField(
         child=serializers.CharField(),
         write_only=True,
         required=False
     )
     tags_info = serializers.SerializerMethodField(read_only=True)
-    comments = CommentSerializer(many=True, read_only=True)
+    comments = serializers.SerializerMethodField()
     likes_count = serializers.SerializerMethodField()
     is_liked = serializers.SerializerMethodField()
     liked_by = UserSerializer(source='likes', many=True, read_only=True)
@@ -210,28 +388,45 @@ class PostSerializer(serializers.ModelSerializer):
         model = Post
         fields = [
             'id', 'title', 'description', 'category', 'location_name', 'latitude', 'longitude', 'author',
-            'tags', 'tags_info', 'media', 'comments', 'likes_count', 'is_liked', 'liked_by',
+            'tags', 'tags_info', 'media', 'uploads', 'comments', 'comment_count', 'likes_count', 'is_liked', 'liked_by',
             'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'author', 'likes_count', 'is_liked', 'liked_by', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'author', 'comment_count', 'likes_count', 'is_liked', 'liked_by', 'created_at', 'updated_at']
 
     def get_tags_info(self, obj):
         """Her bir tag için ayrı bir dictionary döndürür"""
         return [{'id': tag.id, 'name': tag.name} for tag in obj.tags.all()]
 
+    def get_comments(self, obj):
+        """En yeni ana yorumlar (önceden getirilmediyse tek sorguyla okunur); tüm yorumlar yorum endpoint'inden alınır"""
+        comments = getattr(obj, 'recent_comments', None)
+        if comments is None:
+            request = self.context.get('request')
+            comments = recent_comments(request.user if request else None).filter(post=obj)[:RECENT_COMMENTS]
+        return RecentCommentSerializer(comments, many=True, context=self.context).data
+
     def get_likes_count(self, obj):
-        """Beğeni sayısını döndürür"""
-        return obj.likes.count()
+        """Beğeni sayısını döndürür (sayaç alanından okunur)"""
+        return obj.like_count
 
     def get_is_liked(self, obj):
-        """Mevcut kullanıcının postu beğenip beğenmediğini döndürür"""
+        """Mevcut kullanıcının postu beğenip beğenmediğini döndürür (varsa `is_liked` anotasyonu kullanılır)"""
         request = self.context.get('request')
         if request and request.user.is_authenticated:
+            if hasattr(obj, 'is_liked'):
+                return obj.is_liked
             return obj.likes.filter(id=request.user.id).exists()
         return False
 
+    def validate_uploads(self, uploads):
+        """Yalnızca kullanıcının kendi tamamlanmış yüklemeleri gönderiye eklenebilir"""
+        if any(upload.user_id != self.context['request'].user.id for upload in uploads):
+            raise serializers.ValidationError("Yükleme bulunamadı.")
+        return uploads
+
     def create(self, validated_data):
         tags_data = validated_data.pop('tags', [])
+        uploads = validated_data.pop('uploads', [])
         media_data = self.context.get('request').FILES.getlist('media', [])
         
         # Post oluşturma
@@ -252,12 +447,22 @@ class PostSerializer(serializers.ModelSerializer):
         # Bulk create medya dosyalarını ekle
         if media_objects:
             PostMedia.objects.bulk_create(media_objects)
+            for media in media_objects:
+                # bulk_create sinyal göndermediği için dosya referansı, türevler ve video dönüştürme burada işlenir
+                acquire_blob(media.file.name)
+                schedule_variants(media)
+                schedule_transcode(media)
+
+        # Parçalı yüklemeler geçici dizinden taşınarak eklenir
+        for upload in uploads:
+            attach(upload, post)
 
         return post
 
     def update(self, instance, validated_data):
         media_data = self.context.get('request').FILES.getlist('media', [])
         tags_data = validated_data.pop('tags', None)
+        uploads = validated_data.pop('uploads', [])
         
         # Temel alanları güncelle
         for attr, value in validated_data.items():
@@ -279,5 +484,13 @@ class PostSerializer(serializers.ModelSerializer):
             ]
             # Bulk create medya dosyalarını ekle
             PostMedia.objects.bulk_create(media_objects)
+            for media in media_objects:
+                acquire_blob(media.file.name)
+                schedule_variants(media)
+                schedule_transcode(media)
+
+        # Parçalı yüklemeler mevcut medyalara eklenir
+        for upload in uploads:
+            attach(upload, instance)
         
         return instance
@@ -1,7 +1,12 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_init, pre_save, post_save, post_delete, m2m_changed
 from django.contrib.auth.models import User
 from django.dispatch import receiver
-from backend.models import Post, Comment, Profile, Badge
+from backend.models import Post, Comment, Profile, Badge, Follow, Notification, Message, GroupMessage, MediaUpload, PostMedia
+from backend.serializers import NotificationSerializer, MessageSerializer, GroupMessageSerializer
+from backend.counters import increment
+from backend.trending import mark_active
+from backend import blobs, comment_tree, conversations, follow_graph, images, map_clusters, search, transcoding, uploads, user_search
+from backend.realtime import push, notifications_group, messages_group, group_chat_group
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
@@ -13,19 +18,116 @@ def save_user_profile(sender, instance, **kwargs):
     if instance.profile and (instance.profile.bio != instance.profile.bio or instance.profile.location != instance.profile.location):
         instance.profile.save()
 
+@receiver(post_save, sender=User)
+def index_user_for_search(sender, instance, **kwargs):
+    """Kullanıcı eklendiğinde veya kullanıcı adı değiştiğinde kullanıcı arama dizinini günceller."""
+    user_search.index_user(instance)
+
+@receiver(post_delete, sender=User)
+def remove_user_from_search(sender, instance, **kwargs):
+    """Kullanıcı silindiğinde kullanıcı arama dizininden çıkarır."""
+    user_search.remove_user(instance.pk)
+
 @receiver(post_save, sender=Post)
 def add_points_for_post(sender, instance, created, **kwargs):
     if created:
         profile = instance.author.profile
         profile.points += 10  # Post başına 10 puan
-        profile.save()  # Yalnızca puan değiştikten sonra kaydediyoruz
+        profile.save(update_fields=['points'])  # Yalnızca puanı kaydediyoruz (sayaçların üzerine yazılmaz)
+
+MAP_CLUSTER_FIELDS = ('geohash', 'category', 'latitude', 'longitude')
+
+@receiver(post_init, sender=Post)
+def remember_post_location(sender, instance, **kwargs):
+    """Harita kümelerini güncelleyebilmek için postun yüklendiği andaki konumunu ve kategorisini saklar."""
+    # Ertelenmiş (only/defer) alanlar __dict__ içinde bulunmaz; bu durumda önceki konum bilinmez
+    if all(field in instance.__dict__ for field in MAP_CLUSTER_FIELDS):
+        instance._map_cluster_state = tuple(instance.__dict__[field] for field in MAP_CLUSTER_FIELDS)
+    else:
+        instance._map_cluster_state = None
+
+@receiver(post_save, sender=Post)
+def update_map_clusters(sender, instance, created, update_fields=None, **kwargs):
+    """Post eklendiğinde veya konumu/kategorisi değiştiğinde harita kümelerini günceller."""
+    if update_fields is not None and not set(update_fields) & set(MAP_CLUSTER_FIELDS):
+        return
+    state = tuple(getattr(instance, field) for field in MAP_CLUSTER_FIELDS)
+    previous = getattr(instance, '_map_cluster_state', None)
+    if not created:
+        # Önceki konumu bilinmeyen kayıtlar `rebuild_map_clusters` komutuyla düzeltilir
+        if previous is None or previous == state:
+            return
+        map_clusters.apply_post(*previous, delta=-1)
+    map_clusters.apply_post(*state, delta=1)
+    instance._map_cluster_state = state
+
+@receiver(post_delete, sender=Post)
+def remove_from_map_clusters(sender, instance, **kwargs):
+    """Post silindiğinde harita kümelerinden çıkarır."""
+    map_clusters.apply_post(instance.geohash, instance.category, instance.latitude, instance.longitude, delta=-1)
+
+SEARCH_FIELDS = {'title', 'description', 'location_name'}
+
+@receiver(post_save, sender=Post)
+def index_post_for_search(sender, instance, update_fields=None, **kwargs):
+    """Post kaydedildiğinde aranabilir alanlarından biri değiştiyse arama dizinini günceller."""
+    if update_fields is not None and not set(update_fields) & SEARCH_FIELDS:
+        return
+    search.index_post(instance)
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def index_post_tags_for_search(sender, instance, action, reverse, **kwargs):
+    """Postun etiketleri değiştiğinde arama dizinini günceller."""
+    if not reverse and action in ('post_add', 'post_remove', 'post_clear'):
+        search.index_post(instance)
+
+@receiver(post_delete, sender=Post)
+def remove_post_from_search(sender, instance, **kwargs):
+    """Post silindiğinde arama dizininden çıkarır."""
+    search.remove_post(instance.pk)
 
 @receiver(post_save, sender=Comment)
 def add_points_for_comment(sender, instance, created, **kwargs):
     if created:
         profile = instance.author.profile
         profile.points += 5  # Yorum başına 5 puan
-        profile.save()  # Yalnızca puan değiştikten sonra kaydediyoruz
+        profile.save(update_fields=['points'])  # Yalnızca puanı kaydediyoruz (sayaçların üzerine yazılmaz)
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, **kwargs):
+    """Yorum eklendiğinde postun yorum sayısını atomik olarak artırır."""
+    if created:
+        increment(Post.objects.filter(pk=instance.post_id), 'comment_count', 1)
+        mark_active(instance.post_id)
+
+@receiver(post_save, sender=Comment)
+def set_comment_path(sender, instance, created, **kwargs):
+    """Yeni yorumun ağaçtaki yolunu ve derinliğini yazar (alt ağaç sorguları için)."""
+    if created and not instance.path:
+        comment_tree.assign_path(instance)
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    """Yorum silindiğinde (alt yorumlarla birlikte silinenler dahil) postun yorum sayısını azaltır."""
+    increment(Post.objects.filter(pk=instance.post_id), 'comment_count', -1)
+    mark_active(instance.post_id)
+
+@receiver(post_save, sender=Follow)
+def increment_follow_counts(sender, instance, created, **kwargs):
+    """Takip başladığında takip edilenin takipçi, takip edenin takip sayısını artırır; takip kümelerini önbellekten atar."""
+    if created:
+        increment(Profile.objects.filter(user_id=instance.followed_user_id), 'followers_count', 1)
+        increment(Profile.objects.filter(user_id=instance.user_id), 'following_count', 1)
+        user_search.adjust_followers(instance.followed_user_id, 1)
+        follow_graph.invalidate(instance.user_id, instance.followed_user_id)
+
+@receiver(post_delete, sender=Follow)
+def decrement_follow_counts(sender, instance, **kwargs):
+    """Takip bırakıldığında ilgili sayaçları azaltır."""
+    increment(Profile.objects.filter(user_id=instance.followed_user_id), 'followers_count', -1)
+    increment(Profile.objects.filter(user_id=instance.user_id), 'following_count', -1)
+    user_search.adjust_followers(instance.followed_user_id, -1)
+    follow_graph.invalidate(instance.user_id, instance.followed_user_id)
 
 @receiver(post_save, sender=Profile)
 def assign_badges(sender, instance, **kwargs):
@@ -43,3 +145,101 @@ def assign_badges(sender, instance, **kwargs):
         for badge in available_badges:
             if badge not in instance.badges.all():
                 instance.badges.add(badge)
+
+@receiver(post_save, sender=Notification)
+def push_notification(sender, instance, created, **kwargs):
+    """Yeni bildirimi alıcının açık WebSocket bağlantılarına iletir."""
+    if created:
+        push([notifications_group(instance.user_id)], 'notification', NotificationSerializer(instance).data)
+
+@receiver(pre_save, sender=Message)
+def assign_conversation(sender, instance, **kwargs):
+    """Sohbeti atanmamış mesajı gönderen ile alıcı arasındaki sohbete bağlar (sohbet yoksa oluşturulur)."""
+    if instance.conversation_id is None:
+        instance.conversation = conversations.conversation_for(instance.sender_id, instance.recipient_id)
+
+@receiver(post_save, sender=Message)
+def update_conversation(sender, instance, created, **kwargs):
+    """Yeni mesajı sohbetin son mesajına ve alıcının okunmamış sayısına işler."""
+    if created:
+        conversations.record_message(instance)
+
+@receiver(post_delete, sender=Message)
+def remove_from_conversation(sender, instance, **kwargs):
+    """Silinen mesajı sohbet özetinden çıkarır."""
+    conversations.forget_message(instance)
+
+@receiver(post_save, sender=Message)
+def push_message(sender, instance, created, **kwargs):
+    """Yeni birebir mesajı alıcının ve gönderenin açık WebSocket bağlantılarına iletir."""
+    if created:
+        groups = [messages_group(instance.recipient_id), messages_group(instance.sender_id)]
+        push(groups, 'message', MessageSerializer(instance).data)
+
+@receiver(post_save, sender=GroupMessage)
+def push_group_message(sender, instance, created, **kwargs):
+    """Yeni grup mesajını sohbet odasındaki bağlantılara iletir."""
+    if created:
+        push([group_chat_group(instance.group_id)], 'group_message', GroupMessageSerializer(instance).data)
+
+@receiver(post_delete, sender=MediaUpload)
+def remove_upload_part(sender, instance, **kwargs):
+    """Silinen (iptal edilen, süresi dolan veya gönderisiyle silinen) yüklemenin geçici dosyasını siler."""
+    uploads.discard_part(instance.pk)
+
+@receiver(post_init, sender=Post)
+@receiver(post_init, sender=PostMedia)
+@receiver(post_init, sender=Message)
+def remember_blob_name(sender, instance, **kwargs):
+    """Dosyanın referans sayısını güncelleyebilmek için kaydın yüklendiği andaki blob adını saklar."""
+    # Ertelenmiş (only/defer) alanlarda önceki ad bilinmez; yeni kayıtlarda ad henüz belirlenmemiştir
+    field = blobs.BLOB_FIELDS[sender]
+    if field in instance.__dict__:
+        value = instance.__dict__[field]
+        instance._blob_name = value if isinstance(value, str) and value else None
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=PostMedia)
+@receiver(post_save, sender=Message)
+def update_blob_references(sender, instance, created, update_fields=None, **kwargs):
+    """Kaydın dosyası eklendiğinde veya değiştiğinde yeni blobun referansını artırır, eskisininkini azaltır."""
+    field = blobs.BLOB_FIELDS[sender]
+    if update_fields is not None and field not in update_fields or not (created or hasattr(instance, '_blob_name')):
+        return
+    previous = None if created else instance._blob_name
+    current = getattr(instance, field).name or None
+    if previous != current:
+        blobs.acquire(current)
+        blobs.release(previous)
+    instance._blob_name = current
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=PostMedia)
+@receiver(post_delete, sender=Message)
+def release_blob(sender, instance, **kwargs):
+    """Silinen kaydın dosyasının referansını azaltır; blob, kullanılmıyorsa çöp toplayıcı tarafından silinir."""
+    blobs.release(getattr(instance, blobs.BLOB_FIELDS[sender]).name or None)
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=PostMedia)
+@receiver(post_save, sender=Profile)
+def generate_image_variants(sender, instance, **kwargs):
+    """Görsel eklendiğinde veya değiştiğinde küçültülmüş türevlerin üretimini başlatır."""
+    images.schedule(instance)
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=PostMedia)
+@receiver(post_delete, sender=Profile)
+def delete_image_variants(sender, instance, **kwargs):
+    """Silinen kaydın görsel türevlerini depolamadan siler."""
+    images.delete_files(getattr(instance, images.IMAGE_FIELDS[sender][1]))
+
+@receiver(post_save, sender=PostMedia)
+def transcode_video(sender, instance, **kwargs):
+    """Video eklendiğinde veya değiştiğinde web sürümüne dönüştürülmek üzere kuyruğa alır."""
+    transcoding.schedule(instance)
+
+@receiver(post_delete, sender=PostMedia)
+def delete_transcoded_video(sender, instance, **kwargs):
+    """Silinen videonun web sürümünü, kapağını ve önizlemesini depolamadan siler."""
+    transcoding.delete_files(instance.transcoded)
@@ -0,0 +1,137 @@
+import hashlib
+import os
+import tempfile
+from django.conf import settings
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadhandler import MemoryFileUploadHandler, TemporaryFileUploadHandler
+from django.utils.deconstruct import deconstructible
+
+# İçerik adresli dosyaların (blob) MEDIA_ROOT altındaki dizini
+BLOB_DIR = getattr(settings, 'MEDIA_BLOB_DIR', 'blobs')
+# Yazılmakta olan blobların geçici dizini (blobların bulunduğu diskte olmalıdır; taşıma kopyalamadan yapılır)
+BLOB_TEMP_DIR = os.path.join(BLOB_DIR, 'tmp')
+# Dosyaların parça parça okunup özetlendiği blok boyutu (bayt)
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def blob_name(digest, extension):
+    """Özeti verilen içeriğin depodaki adı: blobs/ab/cd/abcd...<uzantı>."""
+    return f"{BLOB_DIR}/{digest[:2]}/{digest[2:4]}/{digest}{extension}"
+
+
+def is_blob(name):
+    """Dosya adının içerik adresli bir bloba ait olup olmadığını döndürür (eski dosyalar için False)."""
+    return bool(name) and name.startswith(f'{BLOB_DIR}/') and not name.startswith(f'{BLOB_TEMP_DIR}/')
+
+
+def blob_digest(name):
+    """Blob adından içeriğin SHA-256 özetini döndürür."""
+    return os.path.splitext(os.path.basename(name))[0]
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Dosyaları içeriklerinin SHA-256 özetiyle adlandırarak saklayan depolama.
+    - Aynı içerik kaç kez yüklenirse yüklensin diskte tek kopya (blob) bulunur; `upload_to` ve dosya adı yok sayılır,
+      yalnızca uzantı korunur (dosyaların doğru içerik türüyle sunulması için).
+    - Yüklenirken özeti hesaplanmış dosyalar (`HashingUploadHandler`'lar) yeniden okunmaz; diskteki geçici dosyalar
+      kopyalanmadan taşınır.
+    - Bloblar birden fazla kayıt tarafından paylaşılabildiğinden `delete` hiçbir şey silmez; referansı kalmayan
+      bloblar `collect_media_blobs` komutuyla silinir (bkz. `backend.blobs`).
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # Ad içerikten belirlendiği için çakışma olmaz; aynı ad aynı içerik demektir
+        return name
+
+    def _save(self, name, content):
+        extension = os.path.splitext(name)[1].lower()
+        digest = getattr(content, 'sha256', None)
+        temp_dir = self.path(BLOB_TEMP_DIR)
+        os.makedirs(temp_dir, exist_ok=True)
+
+        if hasattr(content, 'temporary_file_path'):
+            source, move = content.temporary_file_path(), True
+            if digest is None:
+                hasher = hashlib.sha256()
+                with open(source, 'rb') as file:
+                    while block := file.read(HASH_CHUNK_SIZE):
+                        hasher.update(block)
+                digest = hasher.hexdigest()
+        else:
+            # Bellekteki içerik özetlenirken aynı geçişte geçici dosyaya yazılır
+            hasher = hashlib.sha256()
+            with tempfile.NamedTemporaryFile(dir=temp_dir, delete=False) as temp_file:
+                for chunk in content.chunks():
+                    hasher.update(chunk)
+                    temp_file.write(chunk)
+            source, move = temp_file.name, False
+            digest = digest or hasher.hexdigest()
+
+        name = blob_name(digest, extension)
+        path = self.path(name)
+        if os.path.exists(path):
+            # Aynı içerik zaten var: yeni kopya yazılmaz; çöp toplayıcının bu arada silmemesi için zamanı yenilenir
+            os.utime(path)
+            os.remove(source)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if move:
+                file_move_safe(source, path, allow_overwrite=True)
+            else:
+                os.replace(source, path)
+            if self.file_permissions_mode is not None:
+                os.chmod(path, self.file_permissions_mode)
+        return name
+
+    def delete(self, name):
+        # Blob başka kayıtlarca kullanılıyor olabilir; silme işlemi çöp toplayıcıya bırakılır
+        pass
+
+    def purge(self, name):
+        """Blobu ve ondan üretilmiş türev dosyalarını (görsel türevleri, video sürümleri) diskten siler."""
+        directory, digest = os.path.dirname(self.path(name)), blob_digest(name)
+        for entry in os.scandir(directory) if os.path.isdir(directory) else []:
+            if entry.name.startswith(digest):
+                os.remove(entry.path)
+
+
+blob_storage = ContentAddressedStorage()
+
+
+class HashingMemoryFileUploadHandler(MemoryFileUploadHandler):
+    """Bellekte tutulan yüklemelerin SHA-256 özetini parçalar alınırken hesaplar (`file.sha256`)."""
+
+    def new_file(self, *args, **kwargs):
+        self.hasher = hashlib.sha256()  # Üst sınıf StopFutureHandlers yükseltebildiğinden önce oluşturulur
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.activated:
+            self.hasher.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        if file is not None:
+            file.sha256 = self.hasher.hexdigest()
+        return file
+
+
+class HashingTemporaryFileUploadHandler(TemporaryFileUploadHandler):
+    """Diske yazılan yüklemelerin SHA-256 özetini parçalar alınırken hesaplar (`file.sha256`)."""
+
+    def new_file(self, *args, **kwargs):
+        self.hasher = hashlib.sha256()
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        self.hasher.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        file.sha256 = self.hasher.hexdigest()
+        return file
@@ -1,3 +1,1239 @@
-from django.test import TestCase
+import base64
+import math
+import fcntl
+import os
+import random
+import shutil
+import struct
+import tempfile
+from io import BytesIO
+from unittest import mock
+import numpy as np
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from datetime import datetime, timedelta, timezone
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+from PIL import Image
+from rest_framework.exceptions import NotFound
+from rest_framework.settings import api_settings
+from rest_framework.test import APIClient, APIRequestFactory
+from backend.counters import toggle_like
+from backend import blobs, comment_tree, fanout, map_clusters, search, trending, uploads
+from backend import follow_graph, timeline, user_search
+from backend.models import (
+    Comment, ConversationParticipant, FanoutJob, Follow, MapCluster, MediaBlob, MediaUpload, Message, Notification, Post, PostMedia, Profile, Tag, TimelineEntry, UserInteraction,
+)
+from backend.pagination import decode_cursor, encode_cursor
+from backend.serializers import PostSerializer
+from backend.storage import BLOB_TEMP_DIR, blob_storage
+from backend.utils.geo import bounding_box, covering_cells, geohash_encode, haversine_km
+from backend.utils.http import RangeFile, RangeNotSatisfiable, parse_range
+from backend.utils.sparse import csr, square_rows, top_k
+from backend.utils.text import fold_text
+from backend.utils.video import probe_stream
+from backend.utils.perceptual import BANDS, BAND_BITS, HASH_BITS, MultiIndex, band_radius, bands, hamming
 
-# Create your tests here.
+
+def create_post(author, **fields):
+    """Testler için görsel dosyası olmadan post oluşturur."""
+    values = {
+        'title': 'Başlık', 'description': 'Açıklama', 'category': 'nature', 'image': 'post_images/test.jpg',
+        'latitude': 41.0, 'longitude': 29.0, 'location_name': 'İstanbul', 'status': 'published',
+    }
+    values.update(fields)
+    return Post.objects.create(author=author, **values)
+
+
+class PostCounterTests(TestCase):
+    """Sayaç alanlarının eski nesnelerin tam kaydıyla ezilmediğini doğrular."""
+
+    def setUp(self):
+        self.author = User.objects.create_user('yazar', password='x')
+        self.reader = User.objects.create_user('okur', password='x')
+        self.post = create_post(self.author)
+
+    def test_full_save_keeps_concurrent_like(self):
+        stale = Post.objects.get(pk=self.post.pk)
+        toggle_like(self.post, self.reader)
+        stale.title = 'Yeni başlık'
+        stale.save()
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertEqual(post.title, 'Yeni başlık')
+        self.assertEqual(post.like_count, 1)
+
+    def test_serializer_update_keeps_concurrent_like(self):
+        stale = Post.objects.get(pk=self.post.pk)
+        toggle_like(self.post, self.reader)
+        request = APIRequestFactory().patch('/')
+        request.user = self.author
+        serializer = PostSerializer(stale, data={'title': 'Düzenlendi'}, partial=True, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        self.assertEqual(Post.objects.get(pk=self.post.pk).like_count, 1)
+
+    def test_explicit_update_fields_still_writes_counter(self):
+        self.post.like_count = 5
+        self.post.save(update_fields=['like_count'])
+        self.assertEqual(Post.objects.get(pk=self.post.pk).like_count, 5)
+
+
+class FeedQueryCountTests(TestCase):
+    """Post listelerinin sorgu sayısının sayfadaki post sayısından bağımsız olduğunu doğrular."""
+
+    FEEDS = [
+        '/posts/', '/home/feed/', '/home/featured-posts/', '/home/trending/', '/home/most-commented/',
+        '/home/recent/', '/profile/followed-posts/',
+    ]
+
+    def setUp(self):
+        self.reader = User.objects.create_user('okur', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.reader)
+        self.tag = Tag.objects.create(name='deniz')
+
+    def add_posts(self, count):
+        for index in range(count):
+            author = User.objects.create_user(f'yazar{Post.objects.count()}', password='x')
+            post = create_post(author, title=f'Post {index}')
+            follow_graph.follow(self.reader, author)  # Postlar takip edilince akışa eklenir
+            UserInteraction.objects.create(user=self.reader, post=post, interaction_type='view')
+            post.tags.add(self.tag)
+            post.likes.add(self.reader, author)
+            PostMedia.objects.create(post=post, file='post_media/test.jpg', media_type='image')
+            parent = Comment.objects.create(post=post, author=author, content='Yorum')
+            Comment.objects.create(post=post, author=self.reader, content='Yanıt', parent=parent)
+
+    def count_queries(self):
+        counts = {}
+        for url in self.FEEDS:
+            self.client.get(url)  # Önbelleğe alınan sorgular (ör. çok takipçili yazarlar) ölçüme katılmasın
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+            counts[url] = len(queries)
+        return counts
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        self.add_posts(1)
+        single = self.count_queries()
+        self.add_posts(api_settings.PAGE_SIZE * 2)
+        for url in self.FEEDS:
+            with self.subTest(url=url), self.assertNumQueries(single[url]):
+                response = self.client.get(url)
+                self.assertGreater(len(response.data['results']), 1)
+
+
+@mock.patch.object(timeline, 'FANOUT_THRESHOLD', 2)
+@mock.patch.object(timeline, 'FANOUT_RETURN_THRESHOLD', 1)
+class TimelineFanoutModeTests(TestCase):
+    """Yazar akış kipi değiştirdiğinde önceki kipte yazılmış postların akışlardan kaybolmadığını doğrular."""
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user('yazar', password='x')
+        self.readers = [User.objects.create_user(f'okur{index}', password='x') for index in range(3)]
+
+    def follow_all(self):
+        for reader in self.readers:
+            follow_graph.follow(reader, self.author)
+
+    def timeline_ids(self, user):
+        posts, _ = timeline.read_timeline(user, 10)
+        return [post.pk for post in posts]
+
+    def test_posts_written_before_pull_mode_stay_visible(self):
+        self.follow_all()
+        pushed = create_post(self.author)
+        timeline.fan_out_post(pushed, [reader.pk for reader in self.readers])
+        self.assertEqual(timeline.update_fanout_modes(), 1)
+        pulled = create_post(self.author)
+        timeline.fan_out_post(pulled, [reader.pk for reader in self.readers])
+        self.assertFalse(TimelineEntry.objects.filter(post=pulled).exists())
+        self.assertEqual(self.timeline_ids(self.readers[0]), [pulled.pk, pushed.pk])
+
+    def test_posts_written_in_pull_mode_are_backfilled_on_return(self):
+        self.follow_all()
+        timeline.update_fanout_modes()
+        pulled = create_post(self.author)
+        timeline.fan_out_post(pulled, [reader.pk for reader in self.readers])
+        self.assertEqual(self.timeline_ids(self.readers[0]), [pulled.pk])
+
+        for reader in self.readers[1:]:
+            follow_graph.unfollow(reader, self.author)
+        self.assertEqual(timeline.update_fanout_modes(), 1)
+        self.assertFalse(Profile.objects.get(user=self.author).timeline_pull)
+        self.assertTrue(TimelineEntry.objects.filter(user=self.readers[0], post=pulled).exists())
+        self.assertEqual(self.timeline_ids(self.readers[0]), [pulled.pk])
+
+    def test_mode_does_not_flip_between_thresholds(self):
+        self.follow_all()
+        timeline.update_fanout_modes()
+        follow_graph.unfollow(self.readers[2], self.author)  # 2 takipçi: eşiğin altında ama dönüş eşiğinin üstünde
+        self.assertEqual(timeline.update_fanout_modes(), 0)
+
+
+class KeysetPaginationTests(TestCase):
+    """Cursor kodlamasını ve keyset sayfalamanın tekrarsız, eksiksiz ve COUNT'suz ilerlediğini doğrular."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('alici', password='x')
+        self.sender = User.objects.create_user('gonderen', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_cursor_round_trip(self):
+        moment = datetime(2024, 5, 17, 8, 30, 15, 123456, tzinfo=timezone.utc)
+        self.assertEqual(decode_cursor(encode_cursor(moment, 42)), (moment, 42))
+
+    def test_invalid_cursors_are_not_found(self):
+        for cursor in ['', 'bozuk', encode_cursor(datetime(2024, 1, 1, tzinfo=timezone.utc), 1)[:-4] + '!!!!']:
+            with self.subTest(cursor=cursor), self.assertRaises(NotFound):
+                decode_cursor(cursor)
+        for raw in ['2024-01-01T00:00:00+00:00', 'tarih|1', '2024-01-01T00:00:00+00:00|id']:
+            with self.subTest(raw=raw), self.assertRaises(NotFound):
+                decode_cursor(base64.urlsafe_b64encode(raw.encode()).decode())
+
+    def test_pages_cover_rows_with_equal_timestamps_once(self):
+        notifications = Notification.objects.bulk_create([
+            Notification(user=self.user, sender=self.sender, notification_type='like') for _ in range(12)
+        ])
+        # Aynı zamana sahip satırlar sıralamada ID ile ayrılmalıdır
+        moment = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        for index, notification in enumerate(notifications):
+            Notification.objects.filter(pk=notification.pk).update(created_at=moment - timedelta(minutes=index // 4))
+
+        seen, url = [], '/notifications/'
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertFalse(any('COUNT(' in query['sql'].upper() for query in queries))
+            self.assertLessEqual(len(response.data['results']), api_settings.PAGE_SIZE)
+            seen.extend(item['id'] for item in response.data['results'])
+            url = response.data['next']
+        expected = list(Notification.objects.filter(user=self.user).order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_other_ordering_falls_back_to_page_numbers(self):
+        liked, _ = create_post(self.sender), create_post(self.sender)
+        toggle_like(liked, self.user)
+        response = self.client.get('/posts/?ordering=-like_count')
+        self.assertIn('count', response.data)
+        self.assertEqual(response.data['results'][0]['id'], liked.pk)
+        self.assertNotIn('count', self.client.get('/posts/').data)
+
+
+def png_bytes(size=(8, 8)):
+    """Testler için küçük bir PNG dosyasının içeriği."""
+    buffer = BytesIO()
+    Image.new('RGB', size, (200, 30, 30)).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+class UploadProtocolTests(TestCase):
+    """Parçalı yüklemenin offset, kilit ve tamamlama kurallarını doğrular."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir, ignore_errors=True)
+        patcher = mock.patch.object(uploads, 'TEMP_DIR', self.temp_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        settings = override_settings(MEDIA_ROOT=self.temp_dir)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        self.user = User.objects.create_user('yukleyen', password='x')
+        self.post = create_post(self.user)
+        self.data = png_bytes()
+
+    def start(self, post=None):
+        return uploads.create_upload(self.user, 'foto.png', len(self.data), post=post)
+
+    def test_chunks_resume_from_offset(self):
+        upload = self.start()
+        uploads.write_chunk(upload, 0, BytesIO(self.data[:20]))
+        self.assertEqual(upload.offset, 20)
+        uploads.write_chunk(upload, 20, BytesIO(self.data[20:]))
+        upload.refresh_from_db()
+        self.assertEqual((upload.offset, upload.status), (len(self.data), 'completed'))
+
+    def test_offset_mismatch_is_conflict(self):
+        upload = self.start()
+        uploads.write_chunk(upload, 0, BytesIO(self.data[:20]))
+        with self.assertRaisesMessage(uploads.UploadConflict, 'Beklenen offset 20'):
+            uploads.write_chunk(upload, 10, BytesIO(self.data[10:]))
+        self.assertEqual(MediaUpload.objects.get(pk=upload.pk).offset, 20)
+
+    def test_locked_upload_is_conflict(self):
+        upload = self.start()
+        with open(uploads.part_path(upload.pk), 'r+b') as part:
+            fcntl.flock(part, fcntl.LOCK_EX)
+            with self.assertRaises(uploads.UploadConflict):
+                uploads.write_chunk(upload, 0, BytesIO(self.data))
+        self.assertEqual(MediaUpload.objects.get(pk=upload.pk).offset, 0)
+
+    def test_oversized_body_fails_upload(self):
+        upload = self.start()
+        with self.assertRaises(ValidationError):
+            uploads.write_chunk(upload, 0, BytesIO(self.data + b'fazla'))
+        self.assertEqual(MediaUpload.objects.get(pk=upload.pk).status, 'failed')
+
+    def test_wrong_signature_fails_upload(self):
+        upload = uploads.create_upload(self.user, 'foto.jpg', len(self.data))
+        with self.assertRaises(ValidationError):
+            uploads.write_chunk(upload, 0, BytesIO(self.data))
+        self.assertEqual(MediaUpload.objects.get(pk=upload.pk).status, 'failed')
+
+    def test_retried_final_chunk_attaches_once(self):
+        upload = self.start(post=self.post)
+        stale = MediaUpload.objects.get(pk=upload.pk)
+        uploads.write_chunk(upload, 0, BytesIO(self.data))
+        with self.assertRaises(uploads.UploadConflict):
+            uploads.write_chunk(stale, len(self.data), BytesIO())
+        # Durumu kontrol edilmeden önce tamamlanan yükleme için yarışı doğrudan tamamlama çağrısıyla canlandırıyoruz
+        uploads.complete(stale)
+        self.assertEqual(PostMedia.objects.filter(post=self.post).count(), 1)
+        self.assertEqual(MediaUpload.objects.get(pk=upload.pk).status, 'completed')
+
+
+class BlobReferenceTests(TestCase):
+    """İçerik adresli blobların referans sayaçlarını, sayaç düzeltmeyi ve çöp toplayıcıyı doğrular."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir, ignore_errors=True)
+        settings = override_settings(MEDIA_ROOT=self.temp_dir)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.user = User.objects.create_user('yazar', password='x')
+
+    def store(self, content):
+        return blob_storage.save('foto.png', ContentFile(content))
+
+    def counts(self):
+        return dict(MediaBlob.objects.values_list('name', 'ref_count'))
+
+    def test_records_acquire_and_release_references(self):
+        first, second = self.store(b'birinci'), self.store(b'ikinci')
+        self.assertEqual(self.store(b'birinci'), first)  # Aynı içerik aynı blob
+        post = create_post(self.user, image=first)
+        other = create_post(self.user, image=first)
+        self.assertEqual(self.counts(), {first: 2})
+
+        post.image.name = second
+        post.save()
+        self.assertEqual(self.counts(), {first: 1, second: 1})
+
+        other.delete()
+        blob = MediaBlob.objects.get(name=first)
+        self.assertEqual(blob.ref_count, 0)
+        self.assertIsNotNone(blob.released_at)
+        blobs.release(first)  # Sayaç sıfırın altına düşmez
+        self.assertEqual(MediaBlob.objects.get(name=first).ref_count, 0)
+
+    def test_reconcile_fixes_drifted_counters(self):
+        first, second = self.store(b'birinci'), self.store(b'ikinci')
+        create_post(self.user, image=first)
+        create_post(self.user, image=second)
+        MediaBlob.objects.filter(name=first).update(ref_count=5)
+        MediaBlob.objects.filter(name=second).delete()
+        self.assertEqual(blobs.reference_counts(), {first: 1, second: 1})
+
+        self.assertEqual(blobs.reconcile(), 2)
+        self.assertEqual(self.counts(), {first: 1, second: 1})
+        self.assertEqual(blobs.reconcile(), 0)
+
+    def test_collect_waits_for_grace_and_keeps_referenced_blobs(self):
+        unused, referenced = self.store(b'kullanilmayan'), self.store(b'kullanilan')
+        blobs.acquire(unused)
+        blobs.release(unused)
+        create_post(self.user, image=referenced)
+        MediaBlob.objects.filter(name=referenced).update(ref_count=0)  # Sapmış sayaç
+        orphan = self.store(b'kaydi-olmayan')
+        temp_file = blob_storage.path(f'{BLOB_TEMP_DIR}/yarim')
+        open(temp_file, 'wb').close()
+
+        self.assertEqual(blobs.collect(), 0)
+        self.assertTrue(all(map(blob_storage.exists, (unused, referenced, orphan))))
+
+        later = now() + blobs.GRACE + timedelta(hours=1)
+        with self.assertLogs('backend.blobs', 'WARNING'):
+            self.assertEqual(blobs.collect(current=later), 2)
+        self.assertFalse(blob_storage.exists(unused))
+        self.assertFalse(blob_storage.exists(orphan))
+        self.assertFalse(os.path.exists(temp_file))
+        self.assertTrue(blob_storage.exists(referenced))
+        self.assertEqual(self.counts(), {referenced: 1})
+
+
+def flip_bits(value, count, rng):
+    """Özetin rastgele `count` bitini ters çevirir."""
+    for position in rng.sample(range(HASH_BITS), count):
+        value ^= 1 << position
+    return value
+
+
+class PerceptualIndexTests(TestCase):
+    """Parçalı Hamming aramasının kaba kuvvet karşılaştırmayla aynı sonuçları bulduğunu doğrular."""
+
+    def test_band_radius_covers_every_match(self):
+        rng = random.Random(7)
+        for distance in range(HASH_BITS // 2):
+            radius = band_radius(distance)
+            for _ in range(50):
+                value = rng.getrandbits(HASH_BITS)
+                other = flip_bits(value, distance, rng)
+                closest = min(hamming(a, b) for a, b in zip(bands(value), bands(other)))
+                self.assertLessEqual(closest, radius)
+            # Her parçada `radius`'tan fazla fark olsaydı toplam fark `distance`'ı aşardı
+            self.assertGreater(BANDS * (radius + 1), distance)
+
+    def test_search_matches_brute_force(self):
+        rng = random.Random(11)
+        values = [rng.getrandbits(HASH_BITS) for _ in range(300)]
+        values += [flip_bits(value, rng.randint(0, 14), rng) for value in values[:300]]
+        # En zor durum: farklar tüm parçalara eşit dağılmış (her parçada `band_radius` kadar)
+        spread = sum(((1 << band_radius(14)) - 1) << (BAND_BITS * band) for band in range(BANDS))
+        values += [value ^ spread for value in values[:300:25]]
+        index = MultiIndex()
+        for key, value in enumerate(values):
+            index.add(key, value)
+
+        for distance in (0, 3, 8, 14):
+            for query in values[::25]:
+                expected = sorted(
+                    (key, hamming(query, value)) for key, value in enumerate(values) if hamming(query, value) <= distance
+                )
+                self.assertEqual(sorted(index.search(query, distance)), expected)
+
+
+class RangeHeaderTests(TestCase):
+    """`Range` başlığının ayrıştırılmasını ve aralığın okunmasını doğrular."""
+
+    def test_parse_range(self):
+        cases = {
+            'bytes=0-99': (0, 99),
+            'bytes=100-': (100, 999),
+            'bytes=900-5000': (900, 999),
+            'bytes=-200': (800, 999),
+            'bytes=-5000': (0, 999),
+            'bytes= 5 - 9': (5, 9),
+        }
+        for header, expected in cases.items():
+            self.assertEqual(parse_range(header, 1000), expected, header)
+
+    def test_unsupported_headers_serve_whole_file(self):
+        for header in (None, '', 'bytes=-', 'bytes=0-1,5-9', 'items=0-9', 'bytes=9-5', 'bytes=a-b'):
+            self.assertIsNone(parse_range(header, 1000), header)
+
+    def test_unsatisfiable_ranges(self):
+        for header, size in (('bytes=1000-', 1000), ('bytes=1000-1005', 1000), ('bytes=-0', 1000), ('bytes=-10', 0)):
+            with self.assertRaises(RangeNotSatisfiable, msg=header):
+                parse_range(header, size)
+
+    def test_range_file_reads_only_the_range(self):
+        file = RangeFile(BytesIO(bytes(range(100))), 10, 25)
+        self.assertEqual(file.read(5), bytes(range(10, 15)))
+        self.assertEqual(file.read(), bytes(range(15, 35)))
+        self.assertEqual(file.read(), b'')
+
+
+def dump_thread(comments):
+    """Yüklenen ağacı karşılaştırılabilir iç içe listeye çevirir."""
+    return [
+        (comment.pk, comment.reply_count, comment.replies_cursor, dump_thread(comment.tree_replies))
+        for comment in comments
+    ]
+
+
+class CommentThreadTests(TestCase):
+    """Yorum ağacının sayfa, yanıt penceresi ve yanıt cursor'larıyla yüklenmesini doğrular."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('yorumcu', password='x')
+        self.post = create_post(self.user)
+
+    def comment(self, parent=None):
+        return Comment.objects.create(post=self.post, author=self.user, content='yorum', parent=parent)
+
+    def build_thread(self):
+        """Beş yanıtlı bir ana yorum (en yeni yanıtın iki yanıtı var) ve yanıtsız bir ana yorum."""
+        root = self.comment()
+        replies = [self.comment(root) for _ in range(5)]
+        nested = [self.comment(replies[-1]) for _ in range(2)]
+        empty = self.comment()
+        return root, replies, nested, empty
+
+    def test_load_thread_without_paths_reads_skeleton(self):
+        root, replies, nested, empty = self.build_thread()
+        Comment.objects.update(path='', depth=0)  # Yol özelliğinden önce yazılmış yorumlar
+
+        with mock.patch.object(comment_tree, '_window') as window:
+            comments, has_next = comment_tree.load_thread(self.post.pk, self.user, replies=3)
+        window.assert_not_called()
+        self.assertFalse(has_next)
+        self.assertEqual([comment.pk for comment in comments], [empty.pk, root.pk])
+
+        loaded_empty, loaded_root = comments
+        self.assertEqual((loaded_empty.reply_count, loaded_empty.tree_replies, loaded_empty.replies_cursor), (0, [], None))
+        self.assertEqual(loaded_root.reply_count, 5)
+        self.assertEqual([reply.pk for reply in loaded_root.tree_replies], [reply.pk for reply in replies[:1:-1]])
+        self.assertEqual(loaded_root.replies_cursor, (replies[2].created_at, replies[2].pk))
+        newest = loaded_root.tree_replies[0]
+        self.assertEqual([reply.pk for reply in newest.tree_replies], [reply.pk for reply in nested[::-1]])
+        self.assertIsNone(newest.replies_cursor)
+
+    def test_under_selects_path_prefix(self):
+        rng = random.Random(3)
+        alphabet = '0123456789abcdefghijklmnopqrstuvwxyz'
+        edges = ['0', '1', 'y', 'z']  # 'z' ile biten kökler ardılı hesaplanırken atlanmalıdır
+        paths = {
+            ''.join(rng.choice(edges if rng.random() < 0.5 else alphabet) for _ in range(rng.randint(1, 6)))
+            for _ in range(2000)
+        }
+        for path in sorted(paths)[::7] + ['z', 'zz', '0z', 'az', 'azz']:
+            bounds = dict(comment_tree.under(path).children)
+            selected = {
+                other for other in paths
+                if other >= bounds['path__gte'] and ('path__lt' not in bounds or other < bounds['path__lt'])
+            }
+            self.assertEqual(selected, {other for other in paths if other.startswith(path)}, path)
+
+    def test_subtree_matches_parent_links(self):
+        rng = random.Random(5)
+        comments = [self.comment()]
+        for _ in range(40):
+            comments.append(self.comment(rng.choice(comments)))
+        children = {}
+        for comment in comments:
+            children.setdefault(comment.parent_id, []).append(comment.pk)
+        for comment in comments[::5]:
+            expected, level = set(), [comment.pk]
+            while level:
+                level = [child for pk in level for child in children.get(pk, [])]
+                expected.update(level)
+            self.assertEqual(set(comment_tree.subtree(comment).values_list('pk', flat=True)), expected)
+            self.assertEqual(comment_tree.descendant_count(comment), len(expected))
+
+    def test_window_path_matches_skeleton_path(self):
+        rng = random.Random(9)
+        comments = [self.comment() for _ in range(4)]
+        for _ in range(60):
+            comments.append(self.comment(rng.choice(comments)))
+        root_ids = [comment.pk for comment in comments[:4]]
+        nested = next(comment for comment in comments if comment.parent_id in root_ids)
+
+        requests = [
+            {'limit': 2},
+            {'limit': 2, 'cursor': (comments[2].created_at, comments[2].pk)},
+            {'parent_id': nested.parent_id, 'limit': 3},
+            {'depth': 1, 'replies': 1},
+        ]
+        with mock.patch.object(comment_tree, '_window', wraps=comment_tree._window) as window:
+            with_paths = [comment_tree.load_thread(self.post.pk, self.user, **kwargs) for kwargs in requests]
+        self.assertEqual(window.call_count, len(requests))
+
+        Comment.objects.update(path='', depth=0)
+        without_paths = [comment_tree.load_thread(self.post.pk, self.user, **kwargs) for kwargs in requests]
+        for (window_page, window_next), (skeleton_page, skeleton_next) in zip(with_paths, without_paths):
+            self.assertTrue(window_page)
+            self.assertEqual(dump_thread(window_page), dump_thread(skeleton_page))
+            self.assertEqual(window_next, skeleton_next)
+
+
+class SparseMatrixTests(TestCase):
+    """NumPy ile yazılmış seyrek matris işlemlerini yoğun matris hesabıyla karşılaştırır."""
+
+    def test_square_rows_matches_dense_product(self):
+        rng = np.random.default_rng(2)
+        size = 40
+        rows, cols = rng.integers(0, size, 300), rng.integers(0, size, 300)
+        indptr, indices = csr(rows, cols, size)
+        dense = np.zeros((size, size), dtype=np.int64)
+        dense[rows, cols] = 1
+        self.assertTrue(all(
+            list(indices[indptr[row]:indptr[row + 1]]) == list(np.flatnonzero(dense[row])) for row in range(size)
+        ))
+
+        through = rng.random(size) < 0.7
+        selected = np.array([0, 3, 7, 19, 39])
+        for mask in (None, through):
+            middle = dense if mask is None else dense * mask
+            expected = (middle @ dense)[selected]
+            source, target, values = square_rows(indptr, indices, selected, mask)
+            product = np.zeros_like(expected)
+            product[source, target] = values
+            np.testing.assert_array_equal(product, expected)
+            self.assertTrue((values > 0).all())
+
+    def test_top_k_keeps_best_scores_per_group(self):
+        rng = np.random.default_rng(3)
+        groups = rng.integers(0, 6, 200)
+        scores = rng.random(200)
+        best = top_k(groups, scores, 4)
+        for group in range(6):
+            members = np.flatnonzero(groups == group)
+            expected = members[np.argsort(-scores[members], kind='stable')][:4]
+            self.assertEqual(list(best[groups[best] == group]), list(expected))
+        self.assertEqual(list(groups[best]), sorted(groups[best]))
+
+
+class NearbyPostsTests(TestCase):
+    """Geohash kapsamasını ve yakındaki postlar API'sini kaba kuvvet haversine taramasıyla karşılaştırır."""
+
+    # (enlem, boylam) merkezleri: sıradan bir şehir, tarih değiştirme çizgisi ve kutba yakın bir nokta
+    CENTERS = [(41.0, 29.0), (-17.0, 179.95), (89.8, 10.0)]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user('gezgin', password='x')
+        rng = random.Random(6)
+        self.points = {}
+        for lat, lng in self.CENTERS:
+            for _ in range(25):
+                point_lat = max(min(lat + rng.uniform(-0.6, 0.6), 90.0), -90.0)
+                point_lng = (lng + rng.uniform(-0.6, 0.6) + 180) % 360 - 180
+                post = create_post(self.user, latitude=point_lat, longitude=point_lng)
+                self.points[post.pk] = (point_lat, point_lng)
+
+    def fetch(self, params):
+        """Tüm sayfaları gezerek `[(post ID, mesafe)]` listesini döndürür."""
+        results, url = [], '/posts/nearby/'
+        while url:
+            response = self.client.get(url, params if url == '/posts/nearby/' else None)
+            self.assertEqual(response.status_code, 200, response.data)
+            results += [(item['id'], item['distance_km']) for item in response.data['results']]
+            url = response.data['next']
+        return results
+
+    def test_covering_cells_contain_every_point_of_the_box(self):
+        boxes = [
+            (40.9, 28.8, 41.2, 29.3),
+            (-18.0, 179.5, -16.0, -179.5),  # Tarih değiştirme çizgisini geçen kutu
+            *(bounding_box(lat, lng, 50) for lat, lng in self.CENTERS),  # Kutup yakınında tüm boylamlar
+        ]
+        for min_lat, min_lng, max_lat, max_lng in boxes:
+            cells = covering_cells(min_lat, min_lng, max_lat, max_lng)
+            self.assertLessEqual(len(cells), 16)
+            width = (max_lng - min_lng) % 360 or 360
+            for step_lat in range(11):
+                for step_lng in range(11):
+                    lat = min_lat + (max_lat - min_lat) * step_lat / 10
+                    lng = (min_lng + width * step_lng / 10 + 180) % 360 - 180
+                    geohash = geohash_encode(lat, lng)
+                    self.assertTrue(any(geohash.startswith(cell) for cell in cells), (lat, lng, cells))
+
+    def test_radius_query_matches_brute_force(self):
+        ids = list(self.points)
+        latitudes, longitudes = zip(*self.points.values())
+        for lat, lng in self.CENTERS:
+            distances = haversine_km(lat, lng, latitudes, longitudes)
+            expected = sorted((distance, pk) for pk, distance in zip(ids, distances) if distance <= 40)
+            results = self.fetch({'lat': lat, 'lng': lng, 'radius': 40})
+            self.assertTrue(expected)
+            self.assertEqual([pk for pk, _ in results], [pk for _, pk in expected])
+            self.assertEqual([distance for _, distance in results], [round(distance, 3) for distance, _ in expected])
+
+    def test_bounding_box_query_matches_brute_force(self):
+        boxes = [(40.8, 28.7, 41.3, 29.4), (-17.5, 179.8, -16.5, -179.7), (89.5, -180, 90, 180)]
+        for min_lat, min_lng, max_lat, max_lng in boxes:
+            inside_lng = (lambda lng: min_lng <= lng <= max_lng) if min_lng <= max_lng else (
+                lambda lng: lng >= min_lng or lng <= max_lng
+            )
+            expected = {
+                pk for pk, (lat, lng) in self.points.items() if min_lat <= lat <= max_lat and inside_lng(lng)
+            }
+            results = self.fetch({'min_lat': min_lat, 'min_lng': min_lng, 'max_lat': max_lat, 'max_lng': max_lng})
+            self.assertTrue(expected)
+            self.assertEqual({pk for pk, _ in results}, expected)
+            self.assertEqual(len(results), len(expected))
+
+
+class ConversationSummaryTests(TestCase):
+    """Sohbetlerin son mesajını ve katılımcıların okunmamış sayaçlarını doğrular."""
+
+    def setUp(self):
+        self.alice = User.objects.create_user('ayse', password='x')
+        self.bob = User.objects.create_user('burak', password='x')
+        self.client = APIClient()
+
+    def send(self, sender, recipient, content='Merhaba'):
+        return Message.objects.create(sender=sender, recipient=recipient, content=content)
+
+    def unread(self, user):
+        return ConversationParticipant.objects.get(user=user).unread_count
+
+    def test_messages_update_last_message_and_unread_counts(self):
+        first = self.send(self.alice, self.bob)
+        second = self.send(self.alice, self.bob)
+        last = self.send(self.bob, self.alice, 'Selam')
+        self.assertEqual(first.conversation_id, last.conversation_id)
+
+        conversation = last.conversation
+        conversation.refresh_from_db()
+        self.assertEqual(conversation.last_message_id, last.pk)
+        self.assertEqual(
+            set(ConversationParticipant.objects.values_list('user_id', 'peer_id')),
+            {(self.alice.pk, self.bob.pk), (self.bob.pk, self.alice.pk)},
+        )
+        self.assertEqual((self.unread(self.alice), self.unread(self.bob)), (1, 2))
+
+        last.delete()
+        conversation.refresh_from_db()
+        self.assertEqual(conversation.last_message_id, second.pk)
+        self.assertEqual(self.unread(self.alice), 0)
+
+    def test_mark_read_decrements_and_thread_read_resets(self):
+        messages = [self.send(self.alice, self.bob) for _ in range(3)]
+        self.client.force_authenticate(self.bob)
+
+        response = self.client.patch(f'/messages/{messages[0].pk}/mark-read/')
+        self.assertEqual(response.status_code, 200)
+        self.client.patch(f'/messages/{messages[0].pk}/mark-read/')  # Tekrar okumak sayacı düşürmez
+        self.assertEqual(self.unread(self.bob), 2)
+
+        response = self.client.patch(f'/messages/{messages[1].pk}/mark-read/', {'thread': True}, format='json')
+        self.assertEqual((response.status_code, response.data['okunan']), (200, 2))
+        self.assertEqual(self.unread(self.bob), 0)
+        self.assertFalse(Message.objects.filter(recipient=self.bob, is_read=False).exists())
+
+        self.client.force_authenticate(self.alice)
+        response = self.client.patch(f'/messages/{messages[2].pk}/mark-read/', {'thread': True}, format='json')
+        self.assertEqual(response.status_code, 403)  # Gönderen, alıcının mesajlarını okundu yapamaz
+
+
+def box(kind, *children):
+    """MP4 kutusu: 4 baytlık boyut, 4 baytlık tür ve içerik."""
+    payload = b''.join(children)
+    return struct.pack('>I4s', len(payload) + 8, kind) + payload
+
+
+def video_track(width=1280, height=720, codec=b'avc1', timescale=90000, duration=0, track_id=1):
+    """Genişlik/yükseklik (tkhd), işleyici (hdlr), süre (mdhd) ve kodek (stsd) içeren video trak kutusu."""
+    tkhd = bytes(12) + struct.pack('>I', track_id) + bytes(60) + struct.pack('>II', width << 16, height << 16)
+    mdhd = bytes(12) + struct.pack('>II', timescale, duration) + bytes(4)
+    hdlr = bytes(8) + b'vide' + bytes(12) + b'Video\x00'
+    stsd = bytes(4) + struct.pack('>I', 1) + box(codec, bytes(78))
+    return box(
+        b'trak', box(b'tkhd', tkhd),
+        box(b'mdia', box(b'mdhd', mdhd), box(b'hdlr', hdlr), box(b'minf', box(b'stbl', box(b'stsd', stsd)))),
+    )
+
+
+def mvhd(timescale, duration, version=0):
+    if version == 1:
+        return box(b'mvhd', b'\x01' + bytes(19) + struct.pack('>IQ', timescale, duration) + bytes(80))
+    return box(b'mvhd', bytes(12) + struct.pack('>II', timescale, duration) + bytes(80))
+
+
+def avi(hdrl_size=None, micro_seconds_per_frame=40000, frames=250, width=640, height=480, codec=b'MJPG'):
+    """avih ve video strh kutularını içeren AVI başlığı."""
+    avih = struct.pack('<IIIIIIII', micro_seconds_per_frame, 0, 0, 0, frames, 0, 1, 0) + struct.pack('<II', width, height) + bytes(16)
+    strh = b'vids' + codec + bytes(48)
+    strl = b'LIST' + struct.pack('<I', len(strh) + 12) + b'strl' + b'strh' + struct.pack('<I', len(strh)) + strh
+    body = b'avih' + struct.pack('<I', len(avih)) + avih + strl
+    size = len(body) + 4 if hdrl_size is None else hdrl_size
+    header = b'AVI ' + b'LIST' + struct.pack('<I', size) + b'hdrl' + body
+    return b'RIFF' + struct.pack('<I', len(header) + 16) + header + b'LIST' + struct.pack('<I', 8) + b'movi' + bytes(4)
+
+
+class VideoProbeTests(TestCase):
+    """Video bilgilerinin yalnızca konteyner başlıklarından okunmasını sentetik dosyalarla doğrular."""
+
+    FTYP = box(b'ftyp', b'isom', bytes(4), b'isomavc1')
+
+    def probe(self, data):
+        return probe_stream(BytesIO(data))
+
+    def test_moov_at_start_and_end(self):
+        moov = box(b'moov', mvhd(1000, 12500), video_track(1920, 1080, b'hvc1'))
+        mdat = box(b'mdat', bytes(4096))
+        expected = {'container': 'mp4', 'duration': 12.5, 'width': 1920, 'height': 1080, 'codec': 'hvc1'}
+        self.assertEqual(self.probe(self.FTYP + moov + mdat), expected)
+        self.assertEqual(self.probe(self.FTYP + mdat + moov), expected)
+
+    def test_mvhd_version_1_and_track_duration_fallback(self):
+        info = self.probe(self.FTYP + box(b'moov', mvhd(600, 2 ** 33, version=1), video_track()))
+        self.assertAlmostEqual(info['duration'], 2 ** 33 / 600)
+        info = self.probe(self.FTYP + box(b'moov', mvhd(1000, 0), video_track(timescale=90000, duration=450000)))
+        self.assertEqual((info['duration'], info['width'], info['height'], info['codec']), (5.0, 1280, 720, 'avc1'))
+
+    def test_fragmented_duration_from_trun(self):
+        trex = box(b'trex', bytes(4) + struct.pack('>IIII', 1, 1, 3000, 0))
+        moov = box(b'moov', mvhd(1000, 0), video_track(timescale=90000), box(b'mvex', trex))
+        # Örnek süreleri açıkça yazılmış bir parça (bayrak 0x100) ve varsayılan süreyi kullanan bir parça
+        explicit = box(b'trun', b'\x00\x00\x01\x00' + struct.pack('>I', 3) + struct.pack('>III', 3000, 6000, 9000))
+        defaults = box(b'trun', bytes(4) + struct.pack('>I', 30))
+        other = box(b'traf', box(b'tfhd', bytes(4) + struct.pack('>I', 2)), box(b'trun', bytes(4) + struct.pack('>I', 99)))
+        fragments = b''.join(
+            box(b'moof', box(b'traf', box(b'tfhd', bytes(4) + struct.pack('>I', 1)), trun), other) + box(b'mdat', bytes(64))
+            for trun in (explicit, defaults)
+        )
+        info = self.probe(self.FTYP + moov + fragments)
+        self.assertAlmostEqual(info['duration'], (18000 + 30 * 3000) / 90000)
+
+    def test_avi_header(self):
+        info = self.probe(avi())
+        self.assertEqual(info, {'container': 'avi', 'duration': 10.0, 'width': 640, 'height': 480, 'codec': 'MJPG'})
+
+    def test_truncated_or_garbage_input_is_rejected(self):
+        moov = box(b'moov', mvhd(1000, 12500), video_track())
+        samples = [
+            b'',
+            bytes(range(256)) * 4,
+            self.FTYP,  # moov yok
+            self.FTYP + moov[:-20],  # Yarıda kesilmiş moov
+            self.FTYP + struct.pack('>I4s', 4, b'moov'),  # Başlığından küçük kutu
+            self.FTYP + box(b'moov', struct.pack('>I4s', 500, b'trak')),  # Üst kutusundan taşan kutu
+            avi()[:40],
+            avi(hdrl_size=2),
+            avi(hdrl_size=0),
+        ]
+        for data in samples:
+            self.assertIsNone(self.probe(data), data[:48])
+
+    def test_small_hdrl_size_is_not_read_to_the_end(self):
+        stream = BytesIO(avi(hdrl_size=2) + bytes(1 << 20))
+        with mock.patch.object(stream, 'read', wraps=stream.read) as read:
+            self.assertIsNone(probe_stream(stream))
+        self.assertTrue(all(0 <= call.args[0] <= 64 for call in read.call_args_list), read.call_args_list)
+
+
+@mock.patch.object(fanout, 'CHUNK_SIZE', 3)
+class FanoutJobTests(TestCase):
+    """Dağıtım işlerinin kiralanmasını, yeniden denemelerde tekrarsızlığı ve gecikme ölçümlerini doğrular."""
+
+    def setUp(self):
+        self.author = User.objects.create_user('paylasan', password='x')
+        self.followers = [User.objects.create_user(f'takipci{index}', password='x') for index in range(8)]
+        for follower in self.followers:
+            Follow.objects.create(user=follower, followed_user=self.author)
+        self.post = create_post(self.author)
+        self.job = FanoutJob.objects.create(post=self.post, sender=self.author)
+
+    def expire_lease(self):
+        FanoutJob.objects.filter(pk=self.job.pk).update(locked_until=now() - timedelta(seconds=1))
+
+    def assert_delivered_once(self):
+        notified = Notification.objects.filter(post=self.post, notification_type='post').values_list('user_id', flat=True)
+        self.assertEqual(sorted(notified), sorted(follower.pk for follower in self.followers))
+        self.assertEqual(TimelineEntry.objects.filter(post=self.post).count(), len(self.followers))
+
+    def test_retry_after_crash_continues_from_cursor(self):
+        job = fanout.claim_job()
+        calls = []
+
+        def crash_on_second_chunk(post, follower_ids):
+            calls.append(follower_ids)
+            if len(calls) == 2:
+                raise RuntimeError("işçi çöktü")
+            return timeline.fan_out_post(post, follower_ids)
+
+        with mock.patch.object(fanout, 'fan_out_post', crash_on_second_chunk), self.assertLogs('backend.fanout', 'ERROR'):
+            fanout.process_job(job)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.delivered, job.last_error), ('pending', 3, "işçi çöktü"))
+        self.assertEqual(Notification.objects.filter(post=self.post).count(), 3)  # Yarım kalan parça geri alındı
+
+        self.assertIsNone(fanout.claim_job())  # Bekleme süresi dolmadan yeniden alınmaz
+        self.expire_lease()
+        job = fanout.claim_job()
+        self.assertEqual(job.attempts, 2)
+        fanout.process_job(job)
+        self.assertEqual(FanoutJob.objects.get(pk=job.pk).status, 'done')
+        self.assert_delivered_once()
+
+    def test_expired_lease_moves_job_and_stops_old_worker(self):
+        first = fanout.claim_job()
+        self.assertTrue(fanout._process_chunk(first))
+        self.expire_lease()  # İlk işçi takıldı, kirası doldu
+
+        second = fanout.claim_job()
+        self.assertEqual((second.pk, second.cursor, second.attempts), (first.pk, first.cursor, 2))
+        with self.assertRaises(fanout.LeaseLost):
+            fanout._process_chunk(first)
+        with self.assertLogs('backend.fanout', 'WARNING'):
+            fanout.process_job(first)  # Eski işçi hiçbir şey yazmadan durur
+        self.assertEqual(FanoutJob.objects.get(pk=first.pk).status, 'running')
+
+        fanout.process_job(second)
+        self.assertEqual(FanoutJob.objects.get(pk=first.pk).status, 'done')
+        self.assert_delivered_once()
+
+    def test_job_is_claimed_once(self):
+        other = FanoutJob.objects.create(post=self.post, sender=self.author)
+        stale = FanoutJob.objects.get(pk=self.job.pk)
+        self.assertEqual(fanout.claim_job().pk, self.job.pk)
+        self.assertEqual(fanout.claim_job().pk, other.pk)
+        self.assertIsNone(fanout.claim_job())
+
+        # Aynı anda okuyan ikinci işçi: işi kiralanmadan önceki haliyle görür, koşullu UPDATE onu almasını engeller
+        queryset = mock.MagicMock()
+        queryset.filter.return_value.order_by.return_value.__getitem__.return_value = [stale]
+        self.assertIsNone(fanout.claim_job(queryset))
+        self.assertEqual(FanoutJob.objects.get(pk=self.job.pk).attempts, 1)
+
+    def test_lag_metrics(self):
+        current = now()
+        FanoutJob.objects.filter(pk=self.job.pk).update(created_at=current - timedelta(seconds=30))
+        for status, created, finished, delivered in [
+            ('done', 40, 30, 3), ('done', 25, 5, 5), ('done', 7300, 7200, 9), ('running', 12, None, 0), ('failed', 50, None, 0),
+        ]:
+            job = FanoutJob.objects.create(post=self.post, sender=self.author, status=status, delivered=delivered)
+            FanoutJob.objects.filter(pk=job.pk).update(
+                created_at=current - timedelta(seconds=created),
+                finished_at=current - timedelta(seconds=finished) if finished is not None else None,
+            )
+        with mock.patch.object(fanout, 'now', return_value=current):
+            metrics = fanout.lag_metrics()
+        self.assertEqual(metrics, {
+            'pending': 1, 'running': 1, 'failed': 1, 'oldest_pending_seconds': 30.0,
+            'completed_jobs': 2, 'delivered_notifications': 8, 'average_lag_seconds': 15.0, 'max_lag_seconds': 20.0,
+        })
+
+
+class FollowGraphTests(TestCase):
+    """Takip kümesi önbelleğinin takip başlatma/bırakmada güncellenmesini ve LRU/TTL davranışını doğrular."""
+
+    def setUp(self):
+        follow_graph.adjacency.clear()
+        self.addCleanup(follow_graph.adjacency.clear)
+        self.alice, self.bob, self.carol = (User.objects.create_user(name, password='x') for name in ('ayse', 'burak', 'ceren'))
+
+    def test_follow_and_unfollow_invalidate_both_ends(self):
+        self.assertEqual(follow_graph.following_ids(self.alice.pk), frozenset())
+        self.assertEqual(follow_graph.follower_ids(self.bob.pk), frozenset())
+        with self.assertNumQueries(0):
+            follow_graph.is_following(self.alice.pk, self.bob.pk)  # Önbellekten okunur
+
+        self.assertTrue(follow_graph.toggle(self.alice, self.bob))
+        self.assertEqual(follow_graph.following_ids(self.alice.pk), {self.bob.pk})
+        self.assertEqual(follow_graph.follower_ids(self.bob.pk), {self.alice.pk})
+        self.assertEqual(Profile.objects.get(user=self.bob).followers_count, 1)
+        self.assertFalse(follow_graph.follow(self.alice, self.bob))  # Zaten takip ediliyor
+
+        self.assertFalse(follow_graph.toggle(self.alice, self.bob))
+        self.assertFalse(follow_graph.is_following(self.alice.pk, self.bob.pk))
+        self.assertEqual(follow_graph.follower_ids(self.bob.pk), frozenset())
+        self.assertEqual(Profile.objects.get(user=self.bob).followers_count, 0)
+
+    def test_sets_reloaded_before_commit_are_dropped_again(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            follow_graph.follow(self.alice, self.carol)
+            # Başka bir istek, işlem onaylanmadan önce eski kümeyi yeniden yükledi
+            follow_graph.adjacency.set((follow_graph.FOLLOWING, self.alice.pk), frozenset())
+        self.assertEqual(follow_graph.following_ids(self.alice.pk), {self.carol.pk})
+
+    def test_cache_evicts_least_recently_used_and_expires(self):
+        with mock.patch.object(follow_graph.adjacency, 'maxsize', 2):
+            for user in (self.alice, self.bob):
+                follow_graph.follower_ids(user.pk)
+            follow_graph.follower_ids(self.alice.pk)  # Ayşe en son okunan olur
+            follow_graph.follower_ids(self.carol.pk)
+            self.assertEqual(
+                set(follow_graph.adjacency.entries),
+                {(follow_graph.FOLLOWERS, self.alice.pk), (follow_graph.FOLLOWERS, self.carol.pk)},
+            )
+
+        cache = follow_graph.AdjacencyCache(maxsize=10, ttl=60)
+        with mock.patch('backend.follow_graph.time.monotonic', return_value=1000.0):
+            cache.set('anahtar', frozenset({1}))
+        with mock.patch('backend.follow_graph.time.monotonic', return_value=1059.0):
+            self.assertEqual(cache.get('anahtar'), {1})
+        with mock.patch('backend.follow_graph.time.monotonic', return_value=1061.0):
+            self.assertIsNone(cache.get('anahtar'))
+
+    def test_self_follow_is_rejected(self):
+        self.assertFalse(follow_graph.follow(self.alice, self.alice))
+        self.assertFalse(follow_graph.toggle(self.alice, self.alice))
+        client = APIClient()
+        client.force_authenticate(self.alice)
+        response = client.post('/profile/follow-toggle/', {'followed_user_id': self.alice.pk}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Follow.objects.exists())
+        self.assertEqual(follow_graph.following_ids(self.alice.pk), frozenset())
+
+
+class FollowGraphMigrationTests(TransactionTestCase):
+    """0043 migrasyonunun eski takip ilişkilerini `Follow` tablosuna taşıdığını ve sayaçları düzelttiğini doğrular."""
+
+    before = [('backend', '0042_unify_post_comments')]
+    after = [('backend', '0043_follow_graph')]
+
+    def tearDown(self):
+        MigrationExecutor(connection).migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_legacy_follows_are_reconciled(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.before)
+        apps = executor.loader.project_state(self.before).apps
+        HistoricalUser = apps.get_model('auth', 'User')
+        HistoricalProfile = apps.get_model('backend', 'Profile')
+        HistoricalFollow = apps.get_model('backend', 'Follow')
+        users = [HistoricalUser.objects.create(username=f'eski{index}') for index in range(4)]
+        profiles = [HistoricalProfile.objects.create(user=user) for user in users]
+        a, b, c, d = users
+
+        HistoricalFollow.objects.create(user=a, followed_user=b)  # Zaten tabloda olan takip
+        profiles[1].followers.add(a, c)  # b'yi a (tekrar) ve c takip ediyor
+        profiles[3].following.add(profiles[0])  # d, a'yı takip ediyor
+        profiles[2].followers.add(c)  # Kendini takip satırı taşınmaz
+        HistoricalProfile.objects.filter(pk=profiles[1].pk).update(followers_count=7)  # Sapmış sayaç
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.after)
+        apps = executor.loader.project_state(self.after).apps
+        follows = set(apps.get_model('backend', 'Follow').objects.values_list('user_id', 'followed_user_id'))
+        self.assertEqual(follows, {(a.pk, b.pk), (c.pk, b.pk), (d.pk, a.pk)})
+        counts = dict(
+            (user_id, (followers, following))
+            for user_id, followers, following in apps.get_model('backend', 'Profile').objects.values_list(
+                'user_id', 'followers_count', 'following_count'
+            )
+        )
+        self.assertEqual(counts, {a.pk: (1, 1), b.pk: (2, 0), c.pk: (0, 1), d.pk: (0, 1)})
+
+
+class TrendingScoreTests(TestCase):
+    """Logaritmik ölçekteki trend skorunu ve yalnızca işaretli postları yeniden hesaplayan güncellemeyi doğrular."""
+
+    def test_log_space_score_matches_direct_decay(self):
+        current = datetime(2031, 6, 1, tzinfo=timezone.utc)  # EPOCH'tan yıllar sonra: e^(λt) taşar, log ölçeği taşmaz
+        events = [
+            (current - timedelta(hours=hours), weight)
+            for hours, weight in [(0, 1.0), (1.5, 2.0), (24, 3.0), (200, 0.2), (5, 0.0), (24 * 400, 1.0)]
+        ]
+        direct = sum(weight * math.exp(-trending.DECAY_RATE * (current - moment).total_seconds()) for moment, weight in events)
+        score = trending.decayed_score(events)
+        offset = trending.DECAY_RATE * (current - trending.EPOCH).total_seconds()
+        self.assertAlmostEqual(score - offset, math.log(direct), places=9)
+        self.assertEqual(trending.decayed_score([]), 0.0)
+        self.assertEqual(trending.decayed_score([(current, 0.0)]), 0.0)
+
+        # Aynı olaylar daha yakın zamanda olsaydı skor daha yüksek olurdu
+        newer = [(moment + timedelta(hours=6), weight) for moment, weight in events]
+        self.assertGreater(trending.decayed_score(newer), score)
+
+    def test_incremental_run_rescores_only_active_posts(self):
+        author = User.objects.create_user('yazar', password='x')
+        readers = [User.objects.create_user(f'okur{index}', password='x') for index in range(3)]
+        posts = [create_post(author, title=f'Post {index}') for index in range(3)]
+        for index, post in enumerate(posts):
+            for reader in readers[:index + 1]:
+                trending.record_interaction(reader, post, 'view')
+        trending.update_trending_scores(full=True)
+        self.assertFalse(Post.objects.filter(activity_at__isnull=False).exists())
+
+        active, idle = posts[0], posts[1]
+        Post.objects.filter(pk=idle.pk).update(trending_score=-1.0)  # Yeniden hesaplanırsa değişir
+        trending.record_interaction(readers[1], active, 'like')
+        Comment.objects.create(post=active, author=readers[2], content='Harika')
+        self.assertEqual(trending.update_trending_scores(), 1)
+        scores = dict(Post.objects.values_list('pk', 'trending_score'))
+        self.assertEqual(scores[idle.pk], -1.0)
+        self.assertFalse(Post.objects.filter(activity_at__isnull=False).exists())
+
+        self.assertEqual(trending.update_trending_scores(full=True), len(posts))
+        recomputed = dict(Post.objects.values_list('pk', 'trending_score'))
+        self.assertAlmostEqual(scores[active.pk], recomputed[active.pk], places=9)
+        self.assertEqual(scores[posts[2].pk], recomputed[posts[2].pk])
+        self.assertNotEqual(recomputed[idle.pk], -1.0)
+        self.assertGreater(recomputed[active.pk], recomputed[idle.pk])
+
+
+class UserSearchTests(TestCase):
+    """Bellek içi kullanıcı adı dizininin sonuçlarını kaba kuvvet sıralamasıyla karşılaştırır."""
+
+    SYLLABLES = ['a', 'ali', 'ay', 'şe', 'se', 'ka', 'ra', 'ece', 'mu', 'ı', 'can', 'su', 'lim', 'öz', 'gül', 'İl']
+    QUERIES = ['a', 'al', 'ali', 'ş', 's', 'Şe', 'ka', 'ece', 'lim', 'CAN', 'ıl', 'il', 'gul', 'zzz', 'aliay']
+
+    def setUp(self):
+        patcher = mock.patch.object(user_search, 'username_index', user_search.UsernameIndex())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        rng = random.Random(9)
+        names = {}
+        while len(names) < 300:
+            name = ''.join(rng.choice(self.SYLLABLES) for _ in range(rng.randint(1, 4)))
+            names.setdefault(fold_text(name), name)  # Katlanmış adlar tekil: eşit sıralar arasında belirsizlik olmaz
+        self.users = [User.objects.create_user(name, password='x') for name in names.values()]
+        for user in self.users:
+            Profile.objects.filter(user=user).update(followers_count=rng.choice([0, 0, 1, 5, 12, 40]))
+        User.objects.filter(pk=self.users[0].pk).update(is_active=False)
+
+    def brute_force(self, query, limit=user_search.MAX_SUGGESTIONS):
+        folded = fold_text(query.strip())
+        rows = [
+            (fold_text(username), -followers, (user_id, username, followers))
+            for user_id, username, followers in User.objects.filter(is_active=True).values_list(
+                'id', 'username', 'profile__followers_count'
+            )
+        ]
+        prefixed = sorted((followers, name, row) for name, followers, row in rows if name.startswith(folded))
+        contained = sorted(
+            (followers, name, row) for name, followers, row in rows
+            if folded in name and not name.startswith(folded) and len(folded) >= user_search.MIN_CONTAINS_LENGTH
+        )
+        return [row for _, _, row in prefixed + contained][:min(limit, user_search.MAX_SUGGESTIONS)]
+
+    def assertMatchesBruteForce(self):
+        for query in self.QUERIES:
+            for limit in (3, 10, user_search.MAX_SUGGESTIONS):
+                with self.subTest(query=query, limit=limit):
+                    self.assertEqual(user_search.suggest_users(query, limit), self.brute_force(query, limit))
+
+    def test_results_match_brute_force_ranking(self):
+        self.assertMatchesBruteForce()
+        self.assertNotIn(self.users[0].pk, [row[0] for row in user_search.suggest_users(self.users[0].username)])
+        self.assertEqual(user_search.suggest_users('   '), [])
+
+    def test_results_are_capped(self):
+        self.assertEqual(len(user_search.suggest_users('a', limit=1000)), user_search.MAX_SUGGESTIONS)
+        self.assertEqual(len(self.brute_force('a', limit=1000)), user_search.MAX_SUGGESTIONS)
+        self.assertEqual(len(user_search.suggest_users('a', limit=2)), 2)
+        self.assertEqual(user_search.suggest_users('a', limit=2), user_search.suggest_users('a')[:2])
+
+    def test_index_follows_user_and_follower_updates(self):
+        self.assertMatchesBruteForce()  # Dizin yüklenir ve kısa sorgular önbelleğe alınır
+        renamed, deleted, followed = self.users[1], self.users[2], self.users[3]
+
+        renamed.username = 'Şelale_ali'
+        renamed.save()
+        self.assertIn(renamed.pk, [row[0] for row in user_search.suggest_users('sel')])
+        self.assertEqual(user_search.suggest_users('Şelale_ali'), [(renamed.pk, 'Şelale_ali', Profile.objects.get(user=renamed).followers_count)])
+
+        deleted_pk = deleted.pk
+        deleted.delete()
+        self.assertNotIn(deleted_pk, user_search.username_index.users)
+
+        newcomer = User.objects.create_user('alişan', password='x')
+        followers_count = Profile.objects.get(user=followed).followers_count
+        for follower in self.users[4:60]:
+            follow_graph.follow(follower, followed)
+            follow_graph.follow(follower, newcomer)
+        follow_graph.unfollow(self.users[4], newcomer)
+        self.assertEqual(user_search.suggest_users(fold_text(followed.username)[:2], limit=1), [(followed.pk, followed.username, followers_count + 56)])
+        self.assertEqual(user_search.suggest_users('alişan'), [(newcomer.pk, 'alişan', 55)])
+        self.assertMatchesBruteForce()
+
+        followed.is_active = False
+        followed.save()
+        self.assertNotIn(followed.pk, user_search.username_index.users)
+        self.assertMatchesBruteForce()
+
+
+class MapClusterTests(TestCase):
+    """Post eklenip taşındıkça ve silindikçe güncellenen hücre özetlerinin `rebuild()` sonucuyla aynı olduğunu doğrular."""
+
+    def snapshot(self):
+        return {
+            (precision, cell, category): (count, round(lat_sum, 6), round(lng_sum, 6))
+            for precision, cell, category, count, lat_sum, lng_sum in MapCluster.objects.values_list(
+                'precision', 'cell', 'category', 'count', 'latitude_sum', 'longitude_sum'
+            )
+        }
+
+    def test_incremental_updates_match_rebuild(self):
+        author = User.objects.create_user('yazar', password='x')
+        rng = random.Random(7)
+        places = [(41.01, 28.97), (41.02, 28.99), (39.93, 32.85), (-17.71, 178.07), (-17.72, -179.99)]
+        posts = []
+        for index in range(30):
+            latitude, longitude = rng.choice(places)
+            posts.append(create_post(
+                author, title=f'Post {index}', category=rng.choice(['nature', 'city', 'food']),
+                latitude=latitude + rng.uniform(-0.01, 0.01), longitude=longitude + rng.uniform(-0.01, 0.01),
+            ))
+
+        for post in posts[:10]:  # Bellekteki örnek üzerinden taşınır
+            post.latitude, post.longitude = rng.choice(places)
+            post.save()
+        for post in Post.objects.filter(pk__in=[post.pk for post in posts[10:15]]):  # Veritabanından yüklenip taşınır
+            post.category = 'city' if post.category != 'city' else 'food'
+            post.latitude += 0.5
+            post.save()
+        posts[0].longitude = 29.5  # İkinci kez taşınır
+        posts[0].save()
+        posts[16].title = 'Yeni başlık'
+        posts[16].save(update_fields=['title'])  # Konum değişmez, özetler etkilenmez
+        for post in posts[20:26]:
+            post.delete()
+        Post.objects.filter(pk__in=[post.pk for post in posts[26:29]]).delete()
+
+        incremental = self.snapshot()
+        self.assertFalse(MapCluster.objects.filter(count__lte=0).exists())
+        self.assertEqual(sum(count for (precision, _, _), (count, _, _) in incremental.items() if precision == 1), 21)
+        map_clusters.rebuild()
+        self.assertEqual(incremental, self.snapshot())
+
+
+class PostSearchTests(TestCase):
+    """SQLite'ta kullanılan bellek içi ters dizinin Türkçe katlamayı, alaka sıralamasını ve vurgulamayı doğrular."""
+
+    def setUp(self):
+        patcher = mock.patch.object(search, 'python_index', search.InvertedIndex())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        author = User.objects.create_user('yazar', password='x')
+        self.in_title = create_post(author, title='Kızılay meydanı', description='Akşam yürüyüşü')
+        self.in_location = create_post(author, title='Gece', description='Işıklar', location_name='KIZILAY')
+        self.in_description = create_post(author, title='Ankara gezisi', description='Kizilay meydanında kahve içtik')
+        self.city = create_post(author, title='Şehir manzarası', description='Sahilde gün batımı')
+        self.rain = create_post(author, title='Deniz', description='ŞEHİRDE yağmur')
+
+    def matches(self, query):
+        return set(search.filter_posts(Post.objects.all(), query).values_list('pk', flat=True))
+
+    def test_folded_queries_match_the_same_posts(self):
+        kizilay = {self.in_title.pk, self.in_location.pk, self.in_description.pk}
+        for query in ('kızılay', 'KIZILAY', 'Kizilay', 'kizilay', "Kızılay'da"):
+            with self.subTest(query=query):
+                self.assertEqual(self.matches(query), kizilay)
+        for query in ('şehir', 'sehir', 'ŞEHİR', 'şehirde'):
+            with self.subTest(query=query):
+                self.assertEqual(self.matches(query), {self.city.pk, self.rain.pk})
+        for query in ('ışık', 'ISIK', 'isik', 'IŞIKLAR'):
+            with self.subTest(query=query):
+                self.assertEqual(self.matches(query), {self.in_location.pk})
+        self.assertEqual(self.matches('kızılay kahve'), {self.in_description.pk})  # Tüm kelimeler aranır
+        self.assertEqual(self.matches('kızılay deniz'), set())
+        self.assertEqual(self.matches('ve bir'), set(Post.objects.values_list('pk', flat=True)))  # Yalnızca etkisiz kelimeler
+
+    def test_title_outranks_location_and_description(self):
+        results, stems = search.rank_posts('KIZILAY')
+        self.assertEqual(stems, ['kizilay'])
+        self.assertEqual([post_id for _, post_id in results], [self.in_title.pk, self.in_location.pk, self.in_description.pk])
+        idf = math.log(1 + 5 / 3)
+        for (score, _), weight in zip(results, ('A', 'B', 'C')):
+            self.assertAlmostEqual(score, search.RANK_WEIGHTS[weight] * idf)
+        self.assertEqual(search.rank_posts('kızılay', limit=1)[0], results[:1])
+
+        # Güncellenen başlık dizine yansır: başlık ve açıklamada geçen post öne çıkar
+        self.in_description.title = 'Kızılay'
+        self.in_description.save()
+        results, _ = search.rank_posts('kızılay')
+        self.assertEqual([post_id for _, post_id in results], [self.in_description.pk, self.in_title.pk, self.in_location.pk])
+        self.in_title.delete()
+        self.assertNotIn(self.in_title.pk, [post_id for _, post_id in search.rank_posts('kızılay')[0]])
+
+    def test_highlight_marks_folded_matches(self):
+        self.assertEqual(
+            search.highlight("Kızılay meydanında, <b>Işıklar</b> ve İstanbul'da", {'kizilay', 'isik', 'istanbul'}),
+            "<mark>Kızılay</mark> meydanında, &lt;b&gt;<mark>Işıklar</mark>&lt;/b&gt; ve <mark>İstanbul&#x27;da</mark>",
+        )
+        text = ' '.join(f'kelime{index}' for index in range(30)) + ' Kızılay ' + ' '.join(f'son{index}' for index in range(30))
+        self.assertEqual(search.highlight(text, {'kizilay'}, 6), '…kelime28 kelime29 <mark>Kızılay</mark> son0 son1 son2…')
+        self.assertEqual(search.highlight('Kısa metin', {'kizilay'}, 6), 'Kısa metin')
+        self.assertEqual(search.highlight('', {'kizilay'}), '')
+
+        response = APIClient().get('/posts/search/', {'q': 'KIZILAY'})
+        self.assertEqual(response.status_code, 200)
+        first = response.data['results'][0]
+        self.assertEqual(first['id'], self.in_title.pk)
+        self.assertEqual(first['highlights'], {'title': '<mark>Kızılay</mark> meydanı', 'description': 'Akşam yürüyüşü'})
@@ -0,0 +1,167 @@
+import heapq
+from django.conf import settings
+from django.core.cache import cache
+from backend.models import Follow, Post, Profile, TimelineEntry
+from backend import follow_graph
+from backend.pagination import older_than
+
+# Bu sayıdan fazla takipçisi olan yazarların postları akışlara yazılmaz, okuma sırasında çekilir
+FANOUT_THRESHOLD = getattr(settings, 'TIMELINE_FANOUT_THRESHOLD', 10000)
+# Okuma sırasında çekilen yazar, takipçi sayısı bu değere düşünce yeniden akışlara yazılır (eşik çevresinde gidip
+# gelen yazarların akışları her takipte yeniden doldurulmasın diye eşikten düşüktür)
+FANOUT_RETURN_THRESHOLD = getattr(settings, 'TIMELINE_FANOUT_RETURN_THRESHOLD', FANOUT_THRESHOLD * 9 // 10)
+# Bir kullanıcı takip edildiğinde akışa eklenecek son post sayısı
+BACKFILL_SIZE = getattr(settings, 'TIMELINE_BACKFILL_SIZE', 50)
+# Toplu ekleme yapılırken kullanılan parça boyutu
+FANOUT_BATCH_SIZE = 1000
+
+HIGH_FANOUT_AUTHORS_CACHE_KEY = 'timeline:high_fanout_authors'
+HIGH_FANOUT_AUTHORS_CACHE_TIMEOUT = 300
+
+
+def high_fanout_authors():
+    """
+    Postları okuma sırasında çekilen yazarların ID kümesini döndürür (okuma yolu için).
+    - Yazarın kipi profildeki `timeline_pull` alanındadır; sonuç kısa süreliğine önbellekte tutulur. Önbellek eski
+      kalsa bile kipi değişen yazarın postları kaybolmaz: yazma yolu kipi doğrudan veritabanından okur.
+    """
+    authors = cache.get(HIGH_FANOUT_AUTHORS_CACHE_KEY)
+    if authors is None:
+        authors = set(Profile.objects.filter(timeline_pull=True).values_list('user_id', flat=True))
+        cache.set(HIGH_FANOUT_AUTHORS_CACHE_KEY, authors, HIGH_FANOUT_AUTHORS_CACHE_TIMEOUT)
+    return authors
+
+
+def is_pulled(author_id):
+    """Yazarın postları okuma sırasında çekiliyorsa True döner (önbelleksiz; yazma yolu için)."""
+    return Profile.objects.filter(user_id=author_id, timeline_pull=True).exists()
+
+
+def _bulk_insert(entries):
+    """Akış satırlarını parçalar halinde ekler; zaten var olan satırlar atlanır."""
+    batch = []
+    for entry in entries:
+        batch.append(entry)
+        if len(batch) >= FANOUT_BATCH_SIZE:
+            TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+def fan_out_post(post, follower_ids):
+    """
+    Yeni paylaşılan postu verilen takipçilerin akışlarına yazar.
+    - Takipçiler dağıtım kuyruğu tarafından parça parça verilir (bkz. `backend.fanout`).
+    - Çok takipçili yazarlar atlanır; onların postları okuma sırasında çekilir.
+    """
+    if is_pulled(post.author_id):
+        return
+    _bulk_insert(
+        TimelineEntry(user_id=follower_id, post=post, author_id=post.author_id, created_at=post.created_at)
+        for follower_id in follower_ids
+    )
+
+
+def backfill_author(user, author):
+    """
+    Yeni takip edilen yazarın son postlarını kullanıcının akışına ekler.
+    """
+    if is_pulled(author.id):
+        return
+    posts = Post.objects.filter(author=author).order_by('-created_at', '-id').values_list('id', 'created_at')[:BACKFILL_SIZE]
+    _bulk_insert(
+        TimelineEntry(user=user, post_id=post_id, author=author, created_at=created_at)
+        for post_id, created_at in posts
+    )
+
+
+def backfill_followers(author_id):
+    """
+    Yazarın son postlarını tüm takipçilerinin akışlarına ekler (yazar yeniden akışlara yazılan kipe geçtiğinde).
+    - Takipçiler `user_id` sırasıyla parça parça okunur; var olan satırlar atlanır.
+    """
+    posts = list(
+        Post.objects.filter(author_id=author_id).order_by('-created_at', '-id').values_list('id', 'created_at')[:BACKFILL_SIZE]
+    )
+    if not posts:
+        return
+    cursor = 0
+    while True:
+        follower_ids = list(
+            Follow.objects.filter(followed_user_id=author_id, user_id__gt=cursor)
+            .order_by('user_id').values_list('user_id', flat=True)[:FANOUT_BATCH_SIZE]
+        )
+        if not follower_ids:
+            return
+        _bulk_insert(
+            TimelineEntry(user_id=follower_id, post_id=post_id, author_id=author_id, created_at=created_at)
+            for follower_id in follower_ids
+            for post_id, created_at in posts
+        )
+        cursor = follower_ids[-1]
+
+
+def update_fanout_modes():
+    """
+    Takipçi sayısı eşikleri geçen yazarların akış kipini değiştirir; kipi değişen yazar sayısını döndürür.
+    - `FANOUT_THRESHOLD`'u aşan yazarlar okuma sırasında çekilir. Önceki postları akışlarda kalır; okuma yolu
+      yazarın tüm postlarını çektiği için eksik olmaz, tekrarlar birleştirilirken atılır.
+    - `FANOUT_RETURN_THRESHOLD`'a düşen yazarlar yeniden akışlara yazılır. Kip önce değiştirilir, ardından son
+      postlar takipçilerin akışlarına eklenir; böylece arada dağıtılan ya da atlanan postlar da kapsanır.
+    - Dağıtım işçisi tarafından periyodik olarak çağrılır.
+    """
+    changed = Profile.objects.filter(timeline_pull=False, followers_count__gt=FANOUT_THRESHOLD).update(timeline_pull=True)
+    returning = list(
+        Profile.objects.filter(timeline_pull=True, followers_count__lte=FANOUT_RETURN_THRESHOLD).values_list('user_id', flat=True)
+    )
+    for author_id in returning:
+        if Profile.objects.filter(user_id=author_id, timeline_pull=True).update(timeline_pull=False):
+            changed += 1
+            backfill_followers(author_id)
+    if changed:
+        cache.delete(HIGH_FANOUT_AUTHORS_CACHE_KEY)
+    return changed
+
+
+def remove_author(user, author):
+    """
+    Takibi bırakılan yazarın postlarını kullanıcının akışından siler.
+    """
+    TimelineEntry.objects.filter(user=user, author=author).delete()
+
+
+def read_timeline(user, limit, cursor=None, queryset=None):
+    """
+    Kullanıcının akışından, verilen cursor'dan daha eski en fazla `limit` postu döndürür.
+    - Önceden hesaplanmış akış ile çok takipçili yazarların postları birleştirilir (hibrit okuma).
+    - Her iki sorgu da indeks üzerinden en fazla `limit + 1` satır okur.
+    - Dönen değer (sıralı postlar, sonraki sayfa olup olmadığı) ikilisidir.
+    """
+    entries = TimelineEntry.objects.filter(user=user)
+    if cursor:
+        entries = entries.filter(older_than(cursor, 'post_id'))
+    candidates = [list(entries.order_by('-created_at', '-post_id').values_list('created_at', 'post_id')[:limit + 1])]
+
+    pulled_authors = high_fanout_authors()
+    if pulled_authors:
+        followed = follow_graph.following_ids(user.pk) & pulled_authors
+        pulled = Post.objects.filter(author_id__in=list(followed))
+        if cursor:
+            pulled = pulled.filter(older_than(cursor))
+        candidates.append(list(pulled.order_by('-created_at', '-id').values_list('created_at', 'id')[:limit + 1]))
+
+    # Her iki liste de (created_at, id) sırasına göre azalan; birleştirip tekrar edenleri atıyoruz
+    post_ids = []
+    for _, post_id in heapq.merge(*candidates, reverse=True):
+        if post_id not in post_ids:
+            post_ids.append(post_id)
+        if len(post_ids) > limit:
+            break
+    has_more = len(post_ids) > limit
+    post_ids = post_ids[:limit]
+
+    if queryset is None:
+        queryset = Post.objects.all()
+    posts = queryset.in_bulk(post_ids)
+    return [posts[post_id] for post_id in post_ids if post_id in posts], has_more
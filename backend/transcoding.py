@@ -0,0 +1,248 @@
+import logging
+import os
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import timedelta
+import imageio_ffmpeg
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils.timezone import now
+from backend.images import derivative_name
+from backend.models import PostMedia
+from backend.storage import is_blob
+from backend.utils.video import local_file_path, probe_video
+
+logger = logging.getLogger(__name__)
+
+# Dönüştürmenin işçi süreçte mi (True) yoksa istek içinde mi (False) yapılacağı
+ASYNC = getattr(settings, 'VIDEO_TRANSCODE_ASYNC', True)
+# İşçinin aynı anda dönüştürdüğü video sayısı (her biri ayrı bir ffmpeg süreci)
+WORKERS = getattr(settings, 'VIDEO_TRANSCODE_WORKERS', 2)
+# Web sürümünün en yüksek video bit hızı (kbit/s)
+MAX_BITRATE = getattr(settings, 'VIDEO_MAX_BITRATE_KBPS', 2500)
+# Web sürümünün en uzun kenarı (piksel); daha küçük videolar büyütülmez
+MAX_DIMENSION = getattr(settings, 'VIDEO_MAX_DIMENSION', 1280)
+# Önizlemenin genişliği (piksel), süresi (saniye) ve kare hızı
+PREVIEW_WIDTH = 320
+PREVIEW_SECONDS = 3
+PREVIEW_FPS = 12
+# Kapak görselinin alındığı an (saniye); kısa videolarda videonun ortası
+POSTER_OFFSET = 1.0
+# Tek bir dönüştürmenin en uzun süresi (saniye); aşılırsa ffmpeg durdurulur
+TIMEOUT = 600
+# İşi alan işçinin kira süresi; dönüştürme süresinden uzun olmalıdır
+LEASE_SECONDS = TIMEOUT + 60
+# Bir işin başarısız sayılmadan önce en fazla kaç kez deneneceği
+MAX_ATTEMPTS = 3
+# Boşta kalan işçinin kuyruğu yoklama aralığı (saniye)
+POLL_INTERVAL = 2.0
+# Üretilen dosyalar: anahtar -> (ad eki, uzantı)
+OUTPUTS = {'video': ('web', 'mp4'), 'poster': ('poster', 'jpg'), 'preview': ('preview', 'mp4')}
+
+
+class TranscodeError(Exception):
+    """ffmpeg videoyu dönüştüremediğinde yükseltilir."""
+
+
+def ffmpeg_command(source, directory, poster_at=0.0):
+    """
+    Videoyu tek geçişte çözüp üç çıktı üreten ffmpeg komutunu döndürür.
+    - Web sürümü: en uzun kenarı `MAX_DIMENSION` ile sınırlı, bit hızı `MAX_BITRATE` ile sınırlı H.264/AAC MP4
+      (`faststart`: indirme bitmeden oynatılabilir).
+    - Kapak: `poster_at` anındaki kare (JPEG).
+    - Önizleme: ilk `PREVIEW_SECONDS` saniyenin sessiz, düşük çözünürlüklü MP4'ü.
+    """
+    fit = f"min(1,min({MAX_DIMENSION}/iw,{MAX_DIMENSION}/ih))"
+    preview_fit = f"min(1,{PREVIEW_WIDTH}/iw)"
+    graph = ';'.join([
+        f"[0:v]scale=w='trunc(iw*{fit}/2)*2':h='trunc(ih*{fit}/2)*2',setsar=1,split=3[web][poster][preview]",
+        f"[poster]trim=start={poster_at:.3f},setpts=PTS-STARTPTS[poster_out]",
+        f"[preview]trim=duration={PREVIEW_SECONDS},setpts=PTS-STARTPTS,fps={PREVIEW_FPS},"
+        f"scale=w='trunc(iw*{preview_fit}/2)*2':h=-2[preview_out]",
+    ])
+    output = lambda key: os.path.join(directory, f'{key}.{OUTPUTS[key][1]}')
+    return [
+        imageio_ffmpeg.get_ffmpeg_exe(), '-nostdin', '-hide_banner', '-loglevel', 'error', '-y',
+        '-i', source, '-filter_complex', graph,
+        '-map', '[web]', '-map', '0:a?', '-c:v', 'libx264', '-preset', 'veryfast', '-crf', '23',
+        '-maxrate', f'{MAX_BITRATE}k', '-bufsize', f'{MAX_BITRATE * 2}k', '-pix_fmt', 'yuv420p',
+        '-c:a', 'aac', '-b:a', '128k', '-movflags', '+faststart', output('video'),
+        '-map', '[poster_out]', '-frames:v', '1', '-q:v', '3', output('poster'),
+        '-map', '[preview_out]', '-an', '-t', str(PREVIEW_SECONDS), '-c:v', 'libx264', '-preset', 'veryfast',
+        '-crf', '30', '-pix_fmt', 'yuv420p', '-movflags', '+faststart', output('preview'),
+    ]
+
+
+def storage_path(name):
+    """Depolama yerel diskteyse dosyanın yolunu, değilse None döndürür."""
+    try:
+        return default_storage.path(name)
+    except NotImplementedError:
+        return None
+
+
+def transcode(name):
+    """
+    Depolamadaki videonun web sürümünü, kapağını ve önizlemesini üretip kaydeder ve bilgilerini döndürür.
+    - Yerel diskteki videolar kopyalanmadan ffmpeg'e verilir; diğer depolamalarda geçici bir kopya kullanılır.
+    """
+    path = storage_path(name)
+    with default_storage.open(name, 'rb') as file, tempfile.TemporaryDirectory() as directory:
+        info = probe_video(file) or {}
+        duration = info.get('duration') or 0
+        with nullcontext(path) if path else local_file_path(file) as source:
+            command = ffmpeg_command(source, directory, min(POSTER_OFFSET, duration / 2))
+            completed = subprocess.run(command, capture_output=True, timeout=TIMEOUT)
+        if completed.returncode:
+            lines = completed.stderr.decode(errors='replace').strip().splitlines()
+            raise TranscodeError(lines[-1] if lines else f"ffmpeg exited with {completed.returncode}")
+
+        with open(os.path.join(directory, 'video.mp4'), 'rb') as output:
+            web = probe_video(File(output)) or {}
+        result = {'source': name, 'width': web.get('width'), 'height': web.get('height'), 'duration': web.get('duration')}
+        for key, (suffix, extension) in OUTPUTS.items():
+            with open(os.path.join(directory, f'{key}.{extension}'), 'rb') as output:
+                result[key] = default_storage.save(derivative_name(name, suffix, extension), File(output))
+    return result
+
+
+def delete_files(transcoded):
+    """
+    Dönüştürme çıktılarını depolamadan siler.
+    - İçerik adresli bir blobun çıktıları başka kayıtlarca da kullanılabildiğinden silinmez; blobla birlikte silinir.
+    """
+    if is_blob((transcoded or {}).get('source')):
+        return
+    for key in OUTPUTS:
+        if (transcoded or {}).get(key):
+            default_storage.delete(transcoded[key])
+
+
+def needs_transcode(media):
+    """Videonun (yeniden) dönüştürülmesi gerekip gerekmediğini döndürür."""
+    name = media.file.name
+    return media.media_type == 'video' and bool(name) and (media.transcoded or {}).get('source') != name
+
+
+def shared_result(name):
+    """Aynı blobu kullanan başka bir medyada tamamlanmış dönüştürmenin çıktılarını döndürür (yoksa None)."""
+    if not is_blob(name):
+        return None
+    done = PostMedia.objects.filter(file=name, transcode_status='ready').values_list('transcoded', flat=True)
+    return next((transcoded for transcoded in done[:10] if (transcoded or {}).get('source') == name), None)
+
+
+def schedule(media):
+    """
+    Yeni veya değişen videoyu dönüştürme kuyruğuna ekler; eski çıktılar silinir.
+    - Aynı blobun dönüştürülmüş çıktıları başka bir medyada hazırsa iş oluşturulmadan kullanılır.
+    - İş, medyayla aynı transaction'da kuyruğa alınır ve `run_transcode_worker` işçisi tarafından işlenir.
+    - `VIDEO_TRANSCODE_ASYNC = False` ise video commit sonrasında istek içinde dönüştürülür.
+    """
+    if not needs_transcode(media):
+        return
+    delete_files(media.transcoded)
+    shared = shared_result(media.file.name)
+    queued = {
+        'transcoded': shared or {'source': media.file.name}, 'transcode_status': 'ready' if shared else 'pending',
+        'transcode_attempts': 0, 'transcode_locked_until': None, 'transcode_error': '',
+    }
+    for field, value in queued.items():
+        setattr(media, field, value)
+    PostMedia.objects.filter(pk=media.pk).update(**queued)
+    if not ASYNC and not shared:
+        transaction.on_commit(lambda: _run_inline(media.pk))
+
+
+def _run_inline(media_id):
+    media = claim_job(PostMedia.objects.filter(pk=media_id))
+    if media is not None:
+        process_job(media)
+
+
+def claim_job(queryset=None):
+    """
+    Kuyruktaki en eski dönüştürme işini alır ve kirasını başlatır; alınacak iş yoksa None döndürür.
+    - Yeniden deneme zamanı gelmiş bekleyen işler ile kira süresi dolmuş (işçisi çökmüş) işler alınabilir.
+    - İş, koşullu bir UPDATE ile alınır; aynı işi iki işçi aynı anda alamaz.
+    """
+    current = now()
+    queryset = PostMedia.objects.all() if queryset is None else queryset
+    claimable = queryset.filter(
+        Q(transcode_status='pending') & (Q(transcode_locked_until__isnull=True) | Q(transcode_locked_until__lte=current))
+        | Q(transcode_status='processing', transcode_locked_until__lte=current)
+    )
+    for media in claimable.order_by('id')[:10]:
+        lease = current + timedelta(seconds=LEASE_SECONDS)
+        claimed = PostMedia.objects.filter(
+            pk=media.pk, transcode_status=media.transcode_status, transcode_locked_until=media.transcode_locked_until,
+        ).update(transcode_status='processing', transcode_locked_until=lease, transcode_attempts=F('transcode_attempts') + 1)
+        if claimed:
+            media.refresh_from_db()
+            return media
+    return None
+
+
+def process_job(media):
+    """
+    Alınmış dönüştürme işini çalıştırır ve sonucu kayda yazar.
+    - Hata olursa iş artan bekleme süresiyle yeniden kuyruğa alınır; `MAX_ATTEMPTS` denemeden sonra başarısız sayılır.
+    - Bu arada video değiştiyse veya kira başka bir işçiye geçtiyse üretilen dosyalar silinir.
+    """
+    name, lease = media.file.name, media.transcode_locked_until
+    job = PostMedia.objects.filter(pk=media.pk, file=name, transcode_status='processing', transcode_locked_until=lease)
+    try:
+        if media.transcode_attempts > MAX_ATTEMPTS:
+            raise TranscodeError("Dönüştürme işi tamamlanamadan çok kez yarıda kaldı.")
+        result = transcode(name)
+    except Exception as error:
+        logger.exception("Transcoding media %s (%s) failed", media.pk, name)
+        failed = media.transcode_attempts >= MAX_ATTEMPTS
+        media.transcode_status = 'failed' if failed else 'pending'
+        job.update(
+            transcode_status=media.transcode_status,
+            transcode_locked_until=now() + timedelta(seconds=2 ** media.transcode_attempts),
+            transcode_error=str(error)[:255],
+        )
+        return media
+
+    if job.update(transcode_status='ready', transcoded=result, transcode_locked_until=None, transcode_error=''):
+        media.transcode_status, media.transcoded, media.transcode_locked_until = 'ready', result, None
+    else:
+        delete_files(result)
+    return media
+
+
+def _work(once, poll_interval):
+    """Tek bir iş parçacığının kuyruktan iş alıp işleme döngüsü."""
+    processed = 0
+    try:
+        while True:
+            media = claim_job()
+            if media is None:
+                if once:
+                    return processed
+                time.sleep(poll_interval)
+                continue
+            started = time.monotonic()
+            process_job(media)
+            processed += 1
+            logger.info("Transcoding media %s %s in %.1fs", media.pk, media.transcode_status, time.monotonic() - started)
+    finally:
+        connection.close()  # Bu iş parçacığının bağlantısı açık bırakılmaz
+
+
+def run_worker(once=False, poll_interval=POLL_INTERVAL, workers=WORKERS):
+    """
+    Kuyruktaki dönüştürme işlerini `workers` iş parçacığında eşzamanlı işleyen işçi döngüsü.
+    - Asıl iş ayrı ffmpeg süreçlerinde yapıldığından iş parçacıkları GIL'i beklemez; eşzamanlılık `workers` ile sınırlıdır.
+    - `once=True` ise kuyruk boşaldığında döner; işlenen iş sayısını döndürür.
+    """
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='transcode') as pool:
+        return sum(pool.map(lambda _: _work(once, poll_interval), range(workers)))
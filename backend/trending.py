@@ -0,0 +1,126 @@
+import math
+from collections import defaultdict
+from datetime import datetime, timezone as dt_timezone
+from django.conf import settings
+from django.db.models import Count
+from django.db.models.functions import TruncHour
+from django.utils.timezone import now
+from backend.models import Comment, Post, SharedPost, UserInteraction
+
+# Etkileşim türlerinin trend skoruna katkı ağırlıkları
+WEIGHTS = getattr(settings, 'TRENDING_WEIGHTS', {'post': 1.0, 'like': 1.0, 'comment': 2.0, 'share': 3.0, 'view': 0.2})
+# Bir etkileşimin katkısının yarıya inmesi için geçen süre (saat)
+HALF_LIFE_HOURS = getattr(settings, 'TRENDING_HALF_LIFE_HOURS', 24)
+# Skorların hesaplandığı sabit referans zamanı
+EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+# Tek seferde yeniden hesaplanacak post sayısı
+BATCH_SIZE = 500
+
+DECAY_RATE = math.log(2) / (HALF_LIFE_HOURS * 3600)
+
+
+def mark_active(post_id):
+    """
+    Postun trend skorunun bir sonraki çalıştırmada yeniden hesaplanması için işaretler.
+    """
+    Post.objects.filter(pk=post_id).update(activity_at=now())
+
+
+def record_interaction(user, post, interaction_type):
+    """
+    Kullanıcının post ile etkileşimini (beğeni, görüntüleme vb.) zamanıyla birlikte kaydeder ve postu işaretler.
+    - Aynı türde bir etkileşim zaten varsa yalnızca zamanı güncellenir.
+    """
+    updated = UserInteraction.objects.filter(user=user, post=post, interaction_type=interaction_type).update(created_at=now())
+    if not updated:
+        UserInteraction.objects.bulk_create(
+            [UserInteraction(user=user, post=post, interaction_type=interaction_type)], ignore_conflicts=True
+        )
+    mark_active(post.pk)
+
+
+def remove_interaction(user, post, interaction_type):
+    """
+    Kullanıcının post ile etkileşimini siler (örneğin beğeni kaldırıldığında) ve postu işaretler.
+    """
+    UserInteraction.objects.filter(user=user, post=post, interaction_type=interaction_type).delete()
+    mark_active(post.pk)
+
+
+def decayed_score(events):
+    """
+    (zaman, ağırlık) çiftlerinden üstel olarak sönümlenen skoru logaritmik ölçekte hesaplar.
+
+    Skor, sabit EPOCH'a göre `log(Σ ağırlık * e^(λ * (t - EPOCH)))` olarak tutulur. Şu anki sönümlenmiş skor
+    tüm postlar için aynı `e^(-λ * (şimdi - EPOCH))` çarpanıyla bulunduğundan, bu değere göre sıralamak
+    güncel skora göre sıralamakla aynıdır ve etkileşim almayan postların skorunun yeniden hesaplanmasına gerek kalmaz.
+    """
+    exponents = [(DECAY_RATE * (moment - EPOCH).total_seconds(), weight) for moment, weight in events if weight > 0]
+    if not exponents:
+        return 0.0
+    peak = max(exponent for exponent, _ in exponents)
+    return peak + math.log(sum(weight * math.exp(exponent - peak) for exponent, weight in exponents))
+
+
+def _hourly_counts(queryset, post_ids):
+    """Verilen kaynaktaki etkileşimleri post ve saat bazında gruplayarak sayar."""
+    return (
+        queryset.filter(post_id__in=post_ids)
+        .annotate(bucket=TruncHour('created_at'))
+        .order_by()
+        .values_list('post_id', 'bucket')
+        .annotate(total=Count('id'))
+    )
+
+
+def compute_scores(posts):
+    """
+    Verilen postların trend skorlarını tüm etkileşimlerinden yeniden hesaplar.
+    - Beğeniler, yorumlar, paylaşımlar ve görüntülemeler saatlik gruplar halinde okunur.
+    - Zamanı bilinmeyen (etkileşim kaydı olmayan) eski beğeniler postun oluşturulma zamanına yazılır.
+    """
+    post_ids = [post.id for post in posts]
+    events = defaultdict(list)
+    like_events = defaultdict(int)
+
+    sources = [
+        ('like', UserInteraction.objects.filter(interaction_type='like')),
+        ('view', UserInteraction.objects.filter(interaction_type='view')),
+        ('comment', Comment.objects.all()),
+        ('share', SharedPost.objects.all()),
+    ]
+    for kind, queryset in sources:
+        for post_id, bucket, total in _hourly_counts(queryset, post_ids):
+            events[post_id].append((bucket, WEIGHTS[kind] * total))
+            if kind == 'like':
+                like_events[post_id] += total
+
+    scores = {}
+    for post in posts:
+        untimed_likes = max(post.like_count - like_events[post.id], 0)
+        post_events = events[post.id] + [(post.created_at, WEIGHTS['post'] + WEIGHTS['like'] * untimed_likes)]
+        scores[post.id] = decayed_score(post_events)
+    return scores
+
+
+def update_trending_scores(full=False):
+    """
+    Son çalıştırmadan bu yana etkileşim alan postların trend skorlarını günceller.
+    - `full=True` verilirse tüm postlar yeniden hesaplanır.
+    - Güncellenen post sayısını döndürür.
+    """
+    started_at = now()
+    queryset = Post.objects.all() if full else Post.objects.filter(activity_at__isnull=False)
+    post_ids = list(queryset.order_by('pk').values_list('pk', flat=True))
+
+    for start in range(0, len(post_ids), BATCH_SIZE):
+        batch_ids = post_ids[start:start + BATCH_SIZE]
+        posts = list(Post.objects.filter(pk__in=batch_ids).only('id', 'created_at', 'like_count'))
+        scores = compute_scores(posts)
+        for post in posts:
+            post.trending_score = scores[post.id]
+        Post.objects.bulk_update(posts, ['trending_score'])
+        # Hesaplama sırasında yeni etkileşim alan postlar işaretli kalır
+        Post.objects.filter(pk__in=batch_ids, activity_at__lte=started_at).update(activity_at=None)
+
+    return len(post_ids)
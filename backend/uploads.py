@@ -0,0 +1,221 @@
+import fcntl
+import os
+from datetime import timedelta
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.db import transaction
+from django.utils.timezone import now
+from PIL import Image
+from backend.models import MediaUpload, PostMedia
+from backend.utils.validators import validate_video_duration
+from backend.utils.video import QUICKTIME_ATOMS
+
+# Parçaların yazıldığı geçici dizin
+TEMP_DIR = getattr(settings, 'UPLOAD_TEMP_DIR', os.path.join(settings.BASE_DIR, 'uploads_tmp'))
+# Tek bir dosyanın en büyük boyutu (bayt)
+MAX_UPLOAD_SIZE = getattr(settings, 'MAX_UPLOAD_SIZE', 500 * 1024 * 1024)
+# Gönderiye bağlanmayan yüklemelerin saklanma süresi
+EXPIRY = timedelta(hours=getattr(settings, 'UPLOAD_EXPIRY_HOURS', 24))
+# İstek gövdesinden tek seferde okunup diske yazılan bayt sayısı
+READ_SIZE = 64 * 1024
+# Uzantılara göre medya türleri
+MEDIA_TYPES = {'jpg': 'image', 'jpeg': 'image', 'png': 'image', 'mp4': 'video', 'mov': 'video', 'avi': 'video'}
+# Dosya imzasının kontrolü için gereken baş kısmın uzunluğu
+HEADER_SIZE = 12
+
+
+class UploadConflict(Exception):
+    """İstemcinin gönderdiği offset sunucudakiyle uyuşmadığında veya yükleme başka bir istekte yazılırken yükseltilir."""
+
+
+def extension(filename):
+    return os.path.splitext(filename)[1].lstrip('.').lower()
+
+
+def part_path(upload_id):
+    """Yüklemenin parçalarının yazıldığı geçici dosyanın yolu."""
+    return os.path.join(TEMP_DIR, f'{upload_id}.part')
+
+
+def discard_part(upload_id):
+    """Yüklemenin geçici dosyasını (varsa) siler."""
+    try:
+        os.remove(part_path(upload_id))
+    except FileNotFoundError:
+        pass
+
+
+def check_signature(header, ext):
+    """Dosyanın ilk baytlarının uzantısıyla uyuşup uyuşmadığını kontrol eder (içerik türü taklidine karşı)."""
+    if ext in ('jpg', 'jpeg'):
+        valid = header.startswith(b'\xff\xd8\xff')
+    elif ext == 'png':
+        valid = header.startswith(b'\x89PNG\r\n\x1a\n')
+    elif ext == 'avi':
+        valid = header[:4] == b'RIFF' and header[8:12] == b'AVI '
+    else:
+        valid = header[4:8] in QUICKTIME_ATOMS
+    if not valid:
+        raise ValidationError("Dosya içeriği uzantısıyla uyuşmuyor.")
+
+
+def create_upload(user, filename, length, post=None):
+    """
+    Yeni bir yükleme başlatır ve boş geçici dosyasını oluşturur.
+    - Dosya adı ve boyutu çağıran tarafından doğrulanmış olmalıdır.
+    """
+    upload = MediaUpload.objects.create(
+        user=user, post=post, filename=os.path.basename(filename), media_type=MEDIA_TYPES[extension(filename)],
+        length=length, expires_at=now() + EXPIRY,
+    )
+    os.makedirs(TEMP_DIR, exist_ok=True)
+    open(part_path(upload.pk), 'wb').close()
+    return upload
+
+
+def write_chunk(upload, offset, stream):
+    """
+    İstek gövdesini parça parça okuyarak yüklemenin geçici dosyasına `offset` konumundan itibaren yazar.
+    - Gövde hiçbir zaman tamamen belleğe alınmaz; `READ_SIZE` baytlık bloklar halinde okunur.
+    - Aynı yüklemeye eşzamanlı yazan ikinci istek dosya kilidi nedeniyle `UploadConflict` alır.
+    - İstemci bağlantısı yarıda kesilirse alınan kadar bayt kaydedilir; istemci yeni offset'ten devam eder.
+    - Dosyanın ilk baytları alınır alınmaz imzası kontrol edilir; son bayt alınınca yükleme tamamlanır.
+    """
+    try:
+        part = open(part_path(upload.pk), 'r+b')
+    except FileNotFoundError:
+        raise UploadConflict("Yüklemenin geçici dosyası bulunamadı.")
+    with part:
+        try:
+            fcntl.flock(part, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise UploadConflict("Yükleme başka bir istekte yazılıyor.")
+        # Kilit alındıktan sonra güncel durum okunur (önceki istek offset'i ilerletmiş olabilir)
+        upload.refresh_from_db()
+        if upload.status != 'uploading':
+            raise UploadConflict("Yükleme devam etmiyor.")
+        if offset != upload.offset:
+            raise UploadConflict(f"Beklenen offset {upload.offset}.")
+
+        part.seek(offset)
+        position = offset
+        try:
+            while position < upload.length:
+                block = stream.read(min(READ_SIZE, upload.length - position))
+                if not block:
+                    break
+                part.write(block)
+                position += len(block)
+        finally:
+            part.flush()
+            if position > upload.offset:
+                upload.offset = position
+                MediaUpload.objects.filter(pk=upload.pk).update(offset=position, updated_at=now())
+        if stream.read(1):
+            fail(upload)
+            raise ValidationError("Gönderilen veri dosya boyutunu aşıyor.")
+
+        if offset < HEADER_SIZE <= position or position == upload.length:
+            part.seek(0)
+            try:
+                check_signature(part.read(HEADER_SIZE), extension(upload.filename))
+            except ValidationError:
+                fail(upload)
+                raise
+
+        # Tamamlama kilit bırakılmadan yapılır; aynı offset'i tekrar gönderen istek tamamlanmayı beklemez, çakışma alır
+        if upload.offset == upload.length:
+            complete(upload)
+    return upload
+
+
+def fail(upload):
+    """Yüklemeyi başarısız olarak işaretler ve geçici dosyasını siler."""
+    upload.status = 'failed'
+    MediaUpload.objects.filter(pk=upload.pk).update(status='failed')
+    discard_part(upload.pk)
+
+
+class PartFile(File):
+    """
+    Geçici yükleme dosyası; `temporary_file_path` sayesinde depolamaya kopyalanmak yerine taşınır
+    ve doğrulayıcılar dosyayı yeniden yazmadan doğrudan okur.
+    """
+
+    def temporary_file_path(self):
+        return self.file.name
+
+
+def complete(upload):
+    """
+    Son baytı alınan yüklemenin içeriğini doğrular (video süresi, görselin okunabilirliği) ve tamamlandı yapar.
+    - Tamamlama durum güncellemesiyle atomik olarak üstlenilir; yükleme zaten tamamlanıyorsa tekrar işlenmez
+      (aynı dosyadan iki `PostMedia` oluşmaz).
+    - Hedef gönderisi olan yükleme hemen `PostMedia` olarak kaydedilir.
+    """
+    if not MediaUpload.objects.filter(pk=upload.pk, status='uploading').update(status='completing'):
+        upload.refresh_from_db()
+        return upload
+    upload.status = 'completing'
+    path = part_path(upload.pk)
+    try:
+        if upload.media_type == 'video':
+            with open(path, 'rb') as file:
+                validate_video_duration(PartFile(file))
+        else:
+            with Image.open(path) as image:
+                image.verify()
+    except ValidationError:
+        fail(upload)
+        raise
+    except Exception:
+        fail(upload)
+        raise ValidationError("Medya dosyası okunamadı.")
+
+    upload.status = 'completed'
+    MediaUpload.objects.filter(pk=upload.pk).update(status='completed')
+    if upload.post_id is not None:
+        attach(upload, upload.post)
+    return upload
+
+
+def attach(upload, post):
+    """
+    Tamamlanmış yüklemeyi gönderiye `PostMedia` olarak ekler; geçici dosya depolamaya taşınır.
+    """
+    with open(part_path(upload.pk), 'rb') as file:
+        media = PostMedia(post=post, media_type=upload.media_type)
+        media.file.save(upload.filename, PartFile(file), save=False)
+    try:
+        with transaction.atomic():
+            media.save()
+            upload.post, upload.media = post, media
+            MediaUpload.objects.filter(pk=upload.pk).update(post=post, media=media)
+    except Exception:
+        media.file.delete(save=False)
+        raise
+    return media
+
+
+def cleanup_expired(current=None):
+    """
+    Süresi dolan yüklemeleri ve sahipsiz geçici dosyaları siler; silinen yükleme sayısını döndürür.
+    - Yükleme kayıtları silinirken geçici dosyaları `post_delete` sinyaliyle kaldırılır.
+    """
+    current = current or now()
+    deleted = 0
+    for upload in MediaUpload.objects.filter(expires_at__lte=current).iterator():
+        upload.delete()
+        deleted += 1
+
+    # Kaydı olmayan (ör. süreç çökmesiyle yarım kalmış) ve süresi geçmiş geçici dosyalar
+    if os.path.isdir(TEMP_DIR):
+        known = set(MediaUpload.objects.values_list('id', flat=True))
+        cutoff = (current - EXPIRY).timestamp()
+        for name in os.listdir(TEMP_DIR):
+            stem, _, suffix = name.partition('.')
+            path = os.path.join(TEMP_DIR, name)
+            if suffix == 'part' and stem.isdigit() and int(stem) not in known and os.path.getmtime(path) < cutoff:
+                os.remove(path)
+    return deleted
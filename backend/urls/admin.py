@@ -3,6 +3,8 @@ from backend.admin_panel.report import ReportListView, ReportCreateView
 from backend.admin_panel.leaderboard import LeaderboardView
 from backend.admin_panel.analytics import AnalyticsView
 from backend.admin_panel.prominent_users import ProminentUsersView
+from backend.admin_panel.fanout import FanoutMetricsView
+from backend.admin_panel.duplicates import NearDuplicateClusterView
 
 urlpatterns = [
     path('reports/', ReportListView.as_view(), name='report-list'),
@@ -10,4 +12,6 @@ urlpatterns = [
     path('leaderboard/', LeaderboardView.as_view(), name='leaderboard'),
     path('analytics/', AnalyticsView.as_view(), name='analytics'),
     path('prominent-users/', ProminentUsersView.as_view(), name='prominent-users'),
+    path('fanout-metrics/', FanoutMetricsView.as_view(), name='fanout-metrics'),
+    path('near-duplicates/', NearDuplicateClusterView.as_view(), name='near-duplicates'),
 ]
@@ -0,0 +1,6 @@
+from django.urls import re_path
+from backend.media.files import MediaFileView
+
+urlpatterns = [
+    re_path(r'^(?P<path>.+)$', MediaFileView.as_view(), name='media-file'),
+]
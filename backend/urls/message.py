@@ -1,13 +1,18 @@
 from django.urls import path
-from backend.message.message import MessageListCreateView, MessageMarkAsReadView
-from backend.message.message_group import GroupChatCreateView, GroupInviteView, GroupInvitationResponseView
+from backend.message.message import MessageListCreateView, MessageMarkAsReadView, ConversationListView, ConversationMessageListView, ConversationMarkAsReadView
+from backend.message.message_group import GroupChatCreateView, GroupInviteView, GroupInvitationResponseView, GroupMessageHistoryView, GroupReadCursorView
 from backend.message.share_post import SharePostView
 
 urlpatterns = [
     path('', MessageListCreateView.as_view(), name='message-list-create'),
     path('<int:pk>/mark-read/', MessageMarkAsReadView.as_view(), name='message-mark-as-read'),
+    path('conversations/', ConversationListView.as_view(), name='conversation-list'),
+    path('conversations/<int:conversation_id>/', ConversationMessageListView.as_view(), name='conversation-messages'),
+    path('conversations/<int:conversation_id>/read/', ConversationMarkAsReadView.as_view(), name='conversation-mark-as-read'),
     path('group-chats/', GroupChatCreateView.as_view(), name='group-create'),
     path('group-chats/<int:group_id>/invite/', GroupInviteView.as_view(), name='group-invite'),
+    path('group-chats/<int:group_id>/messages/', GroupMessageHistoryView.as_view(), name='group-message-history'),
+    path('group-chats/<int:group_id>/read/', GroupReadCursorView.as_view(), name='group-read-cursor'),
     path('group-invitations/<int:invitation_id>/respond/', GroupInvitationResponseView.as_view(), name='group-invitation-respond'),
     path('share-post/', SharePostView.as_view(), name='share-post'),
 ]
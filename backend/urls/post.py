@@ -1,13 +1,23 @@
 from django.urls import path
 from backend.post.post import PostListCreateView, PostRetrieveUpdateDestroyView, PostLikeToggleView
-from backend.post.comment import CommentListCreateView, CommentUpdateView, CommentDestroyView, CommentLikeToggleView
+from backend.post.nearby import NearbyPostsView
+from backend.post.map_clusters import MapClusterView
+from backend.post.search import PostSearchView
+from backend.post.uploads import MediaUploadCreateView, MediaUploadView
+from backend.post.comment import CommentListCreateView, CommentUpdateView, CommentDestroyView, CommentLikeToggleView, CommentRepliesView
 
 urlpatterns = [
     path('', PostListCreateView.as_view(), name='post-list-create'),
+    path('nearby/', NearbyPostsView.as_view(), name='post-nearby'),
+    path('search/', PostSearchView.as_view(), name='post-search'),
+    path('map-clusters/', MapClusterView.as_view(), name='post-map-clusters'),
+    path('uploads/', MediaUploadCreateView.as_view(), name='media-upload-create'),
+    path('uploads/<int:pk>/', MediaUploadView.as_view(), name='media-upload'),
     path('<int:pk>/', PostRetrieveUpdateDestroyView.as_view(), name='post-detail'),
     path('<int:pk>/like/', PostLikeToggleView.as_view(), name='post-like-toggle'),
     path('<int:post_id>/comments/', CommentListCreateView.as_view(), name='comment-list-create'),
     path('comments/<int:pk>/update/', CommentUpdateView.as_view(), name='comment-update'),
     path('comments/<int:pk>/', CommentDestroyView.as_view(), name='comment-destroy'),
+    path('comments/<int:pk>/replies/', CommentRepliesView.as_view(), name='comment-replies'),
     path('comments/<int:pk>/like/', CommentLikeToggleView.as_view(), name='comment-like-toggle'),
 ]
@@ -3,6 +3,7 @@ from backend.profile.profile import ProfileDetailView
 from backend.profile.check_user_status import CheckUserStatusAPIView
 from backend.profile.user_id import GetUserIdAPIView
 from backend.profile.follow import FollowedUsersPostListView, FollowToggleView, FollowedUsersView, FollowersView
+from backend.profile.suggestions import PeopleYouMayKnowView
 
 urlpatterns = [
     path('', ProfileDetailView.as_view(), name='profile-detail'),
@@ -12,4 +13,5 @@ urlpatterns = [
     path('follow-toggle/', FollowToggleView.as_view(), name='follow-toggle'),
     path('followed-users/', FollowedUsersView.as_view(), name='followed-users'),
     path('followers/', FollowersView.as_view(), name='followers'),
+    path('suggestions/', PeopleYouMayKnowView.as_view(), name='people-you-may-know'),
 ]
@@ -1,6 +1,7 @@
 from django.urls import path
-from backend.home.search import SearchUserAPI
+from backend.home.search import SearchUserAPI, UserTypeaheadView
 
 urlpatterns = [
     path('', SearchUserAPI.as_view(), name='search'),
+    path('users/', UserTypeaheadView.as_view(), name='search-users'),
 ]
@@ -0,0 +1,198 @@
+import heapq
+import threading
+from bisect import bisect_left, insort
+from collections import defaultdict
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models.functions import Coalesce
+from backend.utils.text import fold_text
+
+# Bir aramada döndürülecek en fazla kullanıcı
+MAX_SUGGESTIONS = 50
+# Kullanıcı adının ortasındaki eşleşmelerin aranması için gereken en kısa sorgu uzunluğu
+MIN_CONTAINS_LENGTH = 3
+# Bu uzunluğa kadar olan sorguların sonuçları önbellekte tutulur (kısa sorgular çok sayıda kullanıcıyla eşleşir)
+CACHED_QUERY_LENGTH = 3
+# Önbellekte tutulacak en fazla sorgu sayısı
+MAX_CACHED_QUERIES = 10000
+
+
+def uses_postgres():
+    """Veritabanının PostgreSQL olup olmadığını döndürür (değilse Python dizini kullanılır)."""
+    return connection.vendor == 'postgresql'
+
+
+def _trigrams(text):
+    return {text[index:index + 3] for index in range(len(text) - 2)}
+
+
+class UsernameIndex:
+    """
+    PostgreSQL (pg_trgm) bulunmadığında kullanılan bellek içi kullanıcı adı dizini.
+    - Katlanmış kullanıcı adları sıralı bir listede tutulur; önek eşleşmeleri ikili arama ile bulunur.
+    - Kullanıcı adının ortasındaki eşleşmeler için trigram (üçlü harf) dizini tutulur.
+    - İlk aramada veritabanından oluşturulur, ardından sinyallerle güncellenir.
+    - Kısa sorguların sonuçları önbellekte tutulur; bir kullanıcı değiştiğinde yalnızca adının eşleştiği sorgular silinir.
+    """
+
+    def __init__(self):
+        self.names = []  # (katlanmış kullanıcı adı, kullanıcı ID) sıralı listesi
+        self.users = {}  # kullanıcı ID -> [kullanıcı adı, katlanmış ad, takipçi sayısı]
+        self.trigrams = defaultdict(set)
+        self.cache = {}  # katlanmış kısa sorgu -> en fazla MAX_SUGGESTIONS kullanıcı ID'si
+        self.loaded = False
+        self.lock = threading.RLock()
+
+    def _invalidate(self, folded):
+        """Katlanmış adın eşleştiği (önek veya trigram) önbellekteki sorguları siler."""
+        for length in range(1, CACHED_QUERY_LENGTH + 1):
+            self.cache.pop(folded[:length], None)
+        for trigram in _trigrams(folded):
+            self.cache.pop(trigram, None)
+
+    def add(self, user_id, username, followers_count=0):
+        with self.lock:
+            self.remove(user_id)
+            folded = fold_text(username)
+            self._invalidate(folded)
+            self.users[user_id] = [username, folded, followers_count]
+            insort(self.names, (folded, user_id))
+            for trigram in _trigrams(folded):
+                self.trigrams[trigram].add(user_id)
+
+    def remove(self, user_id):
+        with self.lock:
+            entry = self.users.pop(user_id, None)
+            if entry is None:
+                return
+            folded = entry[1]
+            self._invalidate(folded)
+            index = bisect_left(self.names, (folded, user_id))
+            if index < len(self.names) and self.names[index] == (folded, user_id):
+                del self.names[index]
+            for trigram in _trigrams(folded):
+                users = self.trigrams[trigram]
+                users.discard(user_id)
+                if not users:
+                    del self.trigrams[trigram]
+
+    def adjust_followers(self, user_id, delta):
+        with self.lock:
+            entry = self.users.get(user_id)
+            if entry is not None:
+                entry[2] = max(entry[2] + delta, 0)
+                self._invalidate(entry[1])
+
+    def load(self):
+        """Dizini tüm aktif kullanıcılardan yeniden oluşturur."""
+        with self.lock:
+            self.names, self.users = [], {}
+            self.trigrams.clear()
+            self.cache.clear()
+            rows = User.objects.filter(is_active=True).values_list(
+                'id', 'username', Coalesce('profile__followers_count', 0)
+            )
+            for user_id, username, followers_count in rows.iterator(chunk_size=5000):
+                folded = fold_text(username)
+                self.users[user_id] = [username, folded, followers_count]
+                self.names.append((folded, user_id))
+                for trigram in _trigrams(folded):
+                    self.trigrams[trigram].add(user_id)
+            self.names.sort()
+            self.loaded = True
+
+    def _top(self, user_ids, limit):
+        return heapq.nsmallest(limit, user_ids, key=lambda user_id: (-self.users[user_id][2], self.users[user_id][1]))
+
+    def search(self, query, limit):
+        """
+        Sorguyla eşleşen kullanıcıların (ID, kullanıcı adı, takipçi sayısı) listesini döndürür.
+        - Önce kullanıcı adı sorguyla başlayanlar, ardından sorguyu içerenler takipçi sayısına göre sıralanır.
+        """
+        folded = fold_text(query)
+        with self.lock:
+            if not self.loaded:
+                self.load()
+            cached = len(folded) <= CACHED_QUERY_LENGTH
+            if cached and folded in self.cache:
+                results = self.cache[folded][:limit]
+            else:
+                results = self._find(folded, MAX_SUGGESTIONS if cached else limit)
+                if cached:
+                    if len(self.cache) >= MAX_CACHED_QUERIES:
+                        self.cache.clear()
+                    self.cache[folded] = results
+                    results = results[:limit]
+            return [(user_id, self.users[user_id][0], self.users[user_id][2]) for user_id in results]
+
+    def _find(self, folded, limit):
+        """Katlanmış sorguyla eşleşen kullanıcı ID'lerini sıralı olarak döndürür (kilit tutulurken çağrılır)."""
+        start = bisect_left(self.names, (folded,))
+        end = bisect_left(self.names, (folded + '\uffff',))
+        prefixed = [user_id for _, user_id in self.names[start:end]]
+        results = self._top(prefixed, limit)
+
+        if len(results) < limit and len(folded) >= MIN_CONTAINS_LENGTH:
+            postings = sorted((self.trigrams.get(trigram, set()) for trigram in _trigrams(folded)), key=len)
+            candidates = set(postings[0]).intersection(*postings[1:]).difference(prefixed)
+            contained = [user_id for user_id in candidates if folded in self.users[user_id][1]]
+            results += self._top(contained, limit - len(results))
+        return results
+
+
+username_index = UsernameIndex()
+
+
+def index_user(user):
+    """Kullanıcıyı dizine ekler veya kullanıcı adını günceller (pasif kullanıcılar çıkarılır)."""
+    if uses_postgres() or not username_index.loaded:
+        return
+    if not user.is_active:
+        username_index.remove(user.pk)
+        return
+    entry = username_index.users.get(user.pk)
+    if entry is None or entry[0] != user.username:
+        followers_count = entry[2] if entry else 0
+        username_index.add(user.pk, user.username, followers_count)
+
+
+def remove_user(user_id):
+    """Kullanıcıyı dizinden çıkarır."""
+    if not uses_postgres():
+        username_index.remove(user_id)
+
+
+def adjust_followers(user_id, delta):
+    """Dizindeki takipçi sayısını günceller (PostgreSQL'de sayaç doğrudan profilden okunur)."""
+    if not uses_postgres():
+        username_index.adjust_followers(user_id, delta)
+
+
+def suggest_users(query, limit=MAX_SUGGESTIONS):
+    """
+    Yazarken öneri (typeahead) için sorguyla eşleşen kullanıcıları döndürür.
+    - Sonuçlar (ID, kullanıcı adı, takipçi sayısı) listesidir ve en fazla `MAX_SUGGESTIONS` kadardır.
+    - PostgreSQL'de sorgular pg_trgm GIN indeksi üzerinden çalışır.
+    """
+    query = query.strip()
+    limit = min(limit, MAX_SUGGESTIONS)
+    if not query:
+        return []
+    if not uses_postgres():
+        return username_index.search(query, limit)
+
+    users = User.objects.filter(is_active=True).annotate(followers=Coalesce('profile__followers_count', 0))
+    prefixed = list(
+        users.filter(username__istartswith=query)
+        .order_by('-followers', 'username')
+        .values_list('id', 'username', 'followers')[:limit]
+    )
+    if len(prefixed) < limit and len(query) >= MIN_CONTAINS_LENGTH:
+        contained = (
+            users.filter(username__icontains=query)
+            .exclude(username__istartswith=query)
+            .order_by('-followers', 'username')
+            .values_list('id', 'username', 'followers')
+        )
+        prefixed += list(contained[:limit - len(prefixed)])
+    return prefixed
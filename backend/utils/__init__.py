@@ -1,7 +1,33 @@
 # backend/utils/__init__.py
 from .validators import validate_video_duration, validate_password_strength
+from .geo import geohash_encode, covering_cells, bounding_box, haversine_km
+from .text import fold_text, analyze
+from .video import probe_video
+from .images import render_variants
+from .perceptual import phash, hamming, MultiIndex
+from .http import parse_range, RangeFile, RangeNotSatisfiable
+from .sparse import csr, square_rows, top_k
+from .params import float_param
 
 __all__ = [
     'validate_video_duration',
-    'validate_password_strength'
+    'validate_password_strength',
+    'geohash_encode',
+    'covering_cells',
+    'bounding_box',
+    'haversine_km',
+    'fold_text',
+    'analyze',
+    'probe_video',
+    'render_variants',
+    'phash',
+    'hamming',
+    'MultiIndex',
+    'parse_range',
+    'RangeFile',
+    'RangeNotSatisfiable',
+    'csr',
+    'square_rows',
+    'top_k',
+    'float_param',
 ]
\ No newline at end of file
@@ -0,0 +1,94 @@
+import math
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_PRECISION = 12
+# Bir sorguda taranacak en fazla geohash hücresi
+MAX_COVER_CELLS = 16
+
+
+def geohash_encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Enlem/boylam bilgisini verilen uzunlukta geohash'e dönüştürür."""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, char, even = [], 0, 0, True
+    while len(chars) < precision:
+        interval, value = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (interval[0] + interval[1]) / 2
+        char <<= 1
+        if value >= mid:
+            char |= 1
+            interval[0] = mid
+        else:
+            interval[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(GEOHASH_ALPHABET[char])
+            bits, char = 0, 0
+    return ''.join(chars)
+
+
+def geohash_cell_size(precision):
+    """Verilen uzunluktaki bir geohash hücresinin (enlem, boylam) derece cinsinden boyutunu döndürür."""
+    lat_bits = (5 * precision) // 2
+    lon_bits = 5 * precision - lat_bits
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+
+def _steps(start, end, step):
+    """[start, end] aralığını `step` adımlarıyla ve uç noktasıyla birlikte örnekler."""
+    values, value = [], start
+    while value < end:
+        values.append(value)
+        value += step
+    values.append(end)
+    return values
+
+
+def _normalize_longitude(longitude):
+    return (longitude + 180.0) % 360.0 - 180.0
+
+
+def covering_cells(min_lat, min_lon, max_lat, max_lon, max_cells=MAX_COVER_CELLS):
+    """
+    Sınır kutusunu (bounding box) kaplayan en kısa geohash öneklerini döndürür.
+    - Hücre sayısı `max_cells` değerini aşmayacak şekilde en uzun (en hassas) önek seçilir.
+    - Tarih değiştirme çizgisini geçen kutular için `min_lon > max_lon` verilebilir.
+    """
+    min_lat, max_lat = max(min_lat, -90.0), min(max_lat, 90.0)
+    if max_lon < min_lon:
+        max_lon += 360.0
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_step, lon_step = geohash_cell_size(precision)
+        count = (math.ceil((max_lat - min_lat) / lat_step) + 1) * (math.ceil((max_lon - min_lon) / lon_step) + 1)
+        if count <= max_cells:
+            break
+    return sorted({
+        geohash_encode(lat, _normalize_longitude(lon), precision)
+        for lat in _steps(min_lat, max_lat, lat_step)
+        for lon in _steps(min_lon, max_lon, lon_step)
+    })
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """Merkez nokta ve yarıçaptan (km) sınır kutusunu (min_lat, min_lon, max_lat, max_lon) hesaplar."""
+    lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = latitude - lat_delta, latitude + lat_delta
+    if min_lat <= -90 or max_lat >= 90:
+        # Kutuplara yakın noktalarda tüm boylamlar kapsanır
+        return max(min_lat, -90.0), -180.0, min(max_lat, 90.0), 180.0
+    lon_delta = math.degrees(radius_km / (EARTH_RADIUS_KM * math.cos(math.radians(latitude))))
+    if lon_delta >= 180:
+        return min_lat, -180.0, max_lat, 180.0
+    return min_lat, _normalize_longitude(longitude - lon_delta), max_lat, _normalize_longitude(longitude + lon_delta)
+
+
+def haversine_km(latitude, longitude, latitudes, longitudes):
+    """
+    Bir noktadan aday noktalara olan büyük daire mesafelerini (km) NumPy ile vektörel olarak hesaplar.
+    """
+    lat1, lon1 = np.radians(latitude), np.radians(longitude)
+    lat2, lon2 = np.radians(np.asarray(latitudes, dtype=float)), np.radians(np.asarray(longitudes, dtype=float))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
@@ -0,0 +1,62 @@
+import re
+
+# Tek bir bayt aralığı: "bytes=başlangıç-bitiş", "bytes=başlangıç-" veya "bytes=-son_n_bayt"
+_RANGE_RE = re.compile(r'^bytes=\s*(\d*)\s*-\s*(\d*)\s*$')
+
+
+class RangeNotSatisfiable(ValueError):
+    """İstenen bayt aralığı dosyanın dışında (416 Range Not Satisfiable)."""
+
+
+def parse_range(header, size):
+    """
+    `Range` başlığındaki bayt aralığını `(başlangıç, bitiş)` olarak döndürür (bitiş dahil, dosya sonuna kırpılır).
+    - Başlık yoksa, biçimi tanınmıyorsa veya birden fazla aralık isteniyorsa None döner; tüm dosya gönderilir
+      (RFC 9110 bu durumda başlığın yok sayılmasına izin verir).
+    - Aralık dosyanın dışındaysa `RangeNotSatisfiable` yükseltilir.
+    """
+    match = _RANGE_RE.match(header or '')
+    if not match or match.group(1) == match.group(2) == '':
+        return None
+    first, last = match.groups()
+    if first == '':
+        # Son n bayt
+        length = int(last)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiable(header)
+        return max(size - length, 0), size - 1
+    first = int(first)
+    if last != '' and int(last) < first:
+        return None
+    if first >= size:
+        raise RangeNotSatisfiable(header)
+    last = size - 1 if last == '' else int(last)
+    return first, min(last, size - 1)
+
+
+class RangeFile:
+    """
+    Açık bir dosyanın yalnızca `[start, start + length)` bölümünü okuyan dosya benzeri nesne.
+    - `fileno` korunduğundan WSGI sunucusu `wsgi.file_wrapper` ile dosyayı `sendfile` kullanarak (kullanıcı alanına
+      kopyalamadan) gönderebilir; sunucu, dosyanın konumundan başlayıp `Content-Length` kadar bayt gönderir.
+    - `tell`/`seek` bilerek sunulmaz; `FileResponse` uzunluğu tüm dosyadan hesaplamaya çalışmaz.
+    """
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.remaining = length
+        file.seek(start)
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        size = self.remaining if size is None or size < 0 else min(size, self.remaining)
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
@@ -0,0 +1,61 @@
+from io import BytesIO
+from PIL import Image, ImageOps
+
+# Türev boyutları ve genişlikleri (piksel); büyükten küçüğe sıralı
+DERIVATIVE_WIDTHS = {'large': 1440, 'medium': 768, 'thumb': 320}
+# Türev biçimleri ve kodlama ayarları
+DERIVATIVE_FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+
+def _flatten(image):
+    """Saydam görseli beyaz zemin üzerine yerleştirir (JPEG saydamlığı desteklemez)."""
+    if image.mode != 'RGBA':
+        return image
+    background = Image.new('RGB', image.size, 'white')
+    background.paste(image, mask=image.getchannel('A'))
+    return background
+
+
+def render_variants(file):
+    """
+    Görselden tüm türev boyutlarını WebP ve JPEG olarak üretir.
+    - (orijinal genişlik, orijinal yükseklik, türevler) döndürür; her türev
+      `{'size', 'format', 'width', 'height', 'content'}` sözlüğüdür.
+    - JPEG kaynaklar en büyük türevin boyutuna yakın çözünürlükte çözülür (draft); tam çözünürlük açılmaz.
+    - Her boyut bir öncekinden küçültülür; orijinalden daha büyük türev üretilmez (en küçük boyut her zaman üretilir).
+    """
+    with Image.open(file) as image:
+        original_width, original_height = image.size
+        # EXIF yönü uygulandıktan sonra genişlik ve yükseklik yer değiştirebilir
+        if (image.getexif().get(0x0112) or 1) in (5, 6, 7, 8):
+            original_width, original_height = original_height, original_width
+        largest = min(max(DERIVATIVE_WIDTHS.values()), original_width)
+        scale = largest / original_width
+        image.draft('RGB', (int(image.size[0] * scale) or 1, int(image.size[1] * scale) or 1))
+        current = ImageOps.exif_transpose(image)
+        current.load()
+    if current.mode not in ('RGB', 'RGBA'):
+        # Palet ve gri tonlu görseller küçültme kalitesi için RGB(A)'ya çevrilir
+        transparent = current.mode in ('LA', 'PA') or 'transparency' in current.info
+        current = current.convert('RGBA' if transparent else 'RGB')
+
+    variants = []
+    smallest = min(DERIVATIVE_WIDTHS.values())
+    for size, width in DERIVATIVE_WIDTHS.items():
+        if width >= original_width and width != smallest:
+            continue
+        width = min(width, original_width)
+        height = max(round(original_height * width / original_width), 1)
+        if current.size != (width, height):
+            current = current.resize((width, height), Image.LANCZOS, reducing_gap=2.0)
+        for extension, (format_name, options) in DERIVATIVE_FORMATS.items():
+            source = _flatten(current) if format_name == 'JPEG' else current
+            buffer = BytesIO()
+            source.save(buffer, format_name, **options)
+            variants.append({
+                'size': size, 'format': extension, 'width': width, 'height': height, 'content': buffer.getvalue(),
+            })
+    return original_width, original_height, variants
@@ -0,0 +1,21 @@
+from rest_framework.exceptions import ValidationError
+
+
+def float_param(params, name, low, high, default=None):
+    """
+    Sorgu parametresini ondalık sayı olarak okur ve `[low, high]` aralığında olduğunu doğrular.
+    - Parametre yoksa `default` döner; `default` verilmemişse parametre zorunludur.
+    - Hatalar DRF `ValidationError` olarak yükseltilir (400 yanıtı).
+    """
+    value = params.get(name)
+    if value in (None, ''):
+        if default is None:
+            raise ValidationError({name: "Bu alan gereklidir."})
+        return default
+    try:
+        value = float(value)
+    except ValueError:
+        raise ValidationError({name: "Geçerli bir sayı giriniz."})
+    if not low <= value <= high:
+        raise ValidationError({name: f"Değer {low} ile {high} arasında olmalıdır."})
+    return value
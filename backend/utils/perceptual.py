@@ -0,0 +1,97 @@
+from collections import defaultdict
+from itertools import combinations
+import numpy as np
+from PIL import Image
+
+# Algısal özetin bit sayısı (8x8 DCT katsayısı)
+HASH_BITS = 64
+# Özetin bölündüğü parça sayısı; her parça ayrı indekslenir (çoklu indeksli Hamming araması)
+BANDS = 4
+BAND_BITS = HASH_BITS // BANDS
+# Özetin hesaplandığı gri tonlu görselin kenar uzunluğu
+_SIZE = 32
+# Ortonormal DCT-II matrisi: DCT(X) = C @ X @ C.T
+_DCT = np.sqrt(2 / _SIZE) * np.cos(np.pi * np.outer(np.arange(_SIZE), 2 * np.arange(_SIZE) + 1) / (2 * _SIZE))
+_DCT[0] /= np.sqrt(2)
+
+
+def phash(image):
+    """
+    Görselin 64 bitlik algısal özetini (pHash) hesaplar.
+    - Görsel 32x32 gri tonlu hale getirilir, iki boyutlu DCT'si alınır ve en düşük frekanslı 8x8 katsayı
+      medyanla karşılaştırılarak bitlere çevrilir.
+    - Yeniden sıkıştırma, yeniden boyutlandırma, parlaklık değişimi ve küçük kırpmalarda özet az değişir.
+    """
+    pixels = np.asarray(image.convert('L').resize((_SIZE, _SIZE), Image.LANCZOS), dtype=np.float64)
+    low = (_DCT @ pixels @ _DCT.T)[:8, :8].ravel()
+    bits = low > np.median(low)
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+
+def hamming(a, b):
+    """İki özet arasındaki farklı bit sayısı."""
+    return (a ^ b).bit_count()
+
+
+def to_signed(value):
+    """64 bitlik işaretsiz özeti veritabanının işaretli 64 bitlik tamsayı alanına sığacak biçime çevirir."""
+    return value - (1 << HASH_BITS) if value >= 1 << (HASH_BITS - 1) else value
+
+
+def to_unsigned(value):
+    """`to_signed` ile saklanan özeti geri çevirir."""
+    return value + (1 << HASH_BITS) if value < 0 else value
+
+
+def bands(value):
+    """Özeti `BANDS` adet `BAND_BITS` bitlik parçaya böler."""
+    mask = (1 << BAND_BITS) - 1
+    return [(value >> (BAND_BITS * index)) & mask for index in range(BANDS)]
+
+
+def band_radius(distance):
+    """
+    Toplam Hamming mesafesi `distance` olan eşleşmelerin hepsini bulmak için her parçada aranacak yarıçap.
+    - Güvercin yuvası ilkesi: her parçada `distance // BANDS`'ten fazla fark varsa toplam fark `distance`'ı aşar.
+    """
+    return distance // BANDS
+
+
+def band_neighbors(value, radius):
+    """Parçaya en fazla `radius` bit uzaklıktaki tüm değerler (kendisi dahil)."""
+    neighbors = [value]
+    for flips in range(1, radius + 1):
+        for positions in combinations(range(BAND_BITS), flips):
+            flipped = value
+            for position in positions:
+                flipped ^= 1 << position
+            neighbors.append(flipped)
+    return neighbors
+
+
+class MultiIndex:
+    """
+    64 bitlik özetler üzerinde bellek içi çoklu indeksli Hamming araması.
+    - Her parça için ayrı bir sözlük tutulur; arama yalnızca parçalarından biri yakın olan adaylara bakar
+      (tüm özetlerle karşılaştırma yapılmaz).
+    """
+
+    def __init__(self):
+        self.tables = [defaultdict(list) for _ in range(BANDS)]
+        self.values = {}
+
+    def add(self, key, value):
+        """`key` özetini `value` ile birlikte ekler."""
+        self.values[key] = value
+        for table, band in zip(self.tables, bands(value)):
+            table[band].append(key)
+
+    def search(self, value, distance):
+        """`value` özetine en fazla `distance` uzaklıktaki `(key, mesafe)` çiftlerini döndürür."""
+        radius = band_radius(distance)
+        candidates = set()
+        for table, band in zip(self.tables, bands(value)):
+            for neighbor in band_neighbors(band, radius):
+                candidates.update(table.get(neighbor, ()))
+        matches = ((key, hamming(value, self.values[key])) for key in candidates)
+        return [(key, found) for key, found in matches if found <= distance]
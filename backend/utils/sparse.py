@@ -0,0 +1,65 @@
+import numpy as np
+
+# SciPy olmadan, yalnızca NumPy dizileriyle seyrek (CSR) matris işlemleri.
+# Satır `i`'nin sütunları `indices[indptr[i]:indptr[i + 1]]` aralığındadır (sıralı).
+
+
+def csr(rows, cols, size):
+    """
+    `(rows[j], cols[j])` kenarlarından `size x size` boyutlu ikili seyrek matrisin `(indptr, indices)` dizilerini kurar.
+    - Tekrarlanan kenarlar bir kez sayılır; her satırın sütunları sıralıdır.
+    """
+    keys = np.unique(rows.astype(np.int64) * size + cols)
+    rows, cols = keys // size, keys % size
+    indptr = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=size), out=indptr[1:])
+    return indptr, cols
+
+
+def concat_ranges(starts, lengths):
+    """`[starts[i], starts[i] + lengths[i])` aralıklarını tek bir dizi olarak birleştirir (Python döngüsü olmadan)."""
+    total = int(lengths.sum())
+    if not total:
+        return np.zeros(0, dtype=np.int64)
+    offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    return offsets + np.arange(total)
+
+
+def square_rows(indptr, indices, rows, through=None):
+    """
+    `A[rows] @ A` çarpımının sıfır olmayan elemanlarını `(satır sırası, sütun, değer)` dizileri olarak döndürür.
+    - İkili `A` için değer, satırdan sütuna giden iki adımlı yol sayısıdır (ortak komşu sayısı).
+    - Yollar genişletilip sıralanarak toplanır; `through` verilirse yalnızca maskesi True olan ara düğümlerden geçilir.
+    """
+    degree = np.diff(indptr)
+    first = degree[rows]
+    source = np.repeat(np.arange(len(rows)), first)
+    middle = indices[concat_ranges(indptr[rows], first)]
+    if through is not None:
+        keep = through[middle]
+        source, middle = source[keep], middle[keep]
+    second = degree[middle]
+    source = np.repeat(source, second)
+    target = indices[concat_ranges(indptr[middle], second)]
+    size = len(indptr) - 1
+    keys, counts = np.unique(source * size + target, return_counts=True)
+    return keys // size, keys % size, counts
+
+
+def row_paths(indptr, indices, through=None):
+    """Her satır için `square_rows`'un genişleteceği iki adımlı yol sayısı (parti boyutunu belirlemek için)."""
+    weights = np.diff(indptr)[indices]
+    if through is not None:
+        weights = np.where(through[indices], weights, 0)
+    totals = np.concatenate([[0], np.cumsum(weights)])
+    return totals[indptr[1:]] - totals[indptr[:-1]]
+
+
+def top_k(groups, scores, k):
+    """
+    Her gruptaki en yüksek skorlu en fazla `k` elemanın konumlarını döndürür (grup sırasına, sonra azalan skora göre).
+    """
+    order = np.lexsort((-scores, groups))
+    sorted_groups = groups[order]
+    rank = np.arange(len(order)) - np.searchsorted(sorted_groups, sorted_groups)
+    return order[rank < k]
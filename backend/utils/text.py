@@ -0,0 +1,51 @@
+import re
+import unicodedata
+
+# Türkçe karakterlerin ASCII karşılıkları (küçük harfe çevrildikten sonra uygulanır)
+TURKISH_FOLD = str.maketrans('çğıöşü', 'cgiosu')
+# Kelimeleri ayıran desen; kesme işaretinden sonraki ekler (İstanbul'da) ayrı kelime sayılmaz
+WORD_PATTERN = re.compile(r"(\w+)(?:['’]\w+)?")
+# Aramada anlam taşımayan sık kelimeler (katlanmış halleriyle)
+STOPWORDS = frozenset({
+    've', 'ile', 'bir', 'bu', 'o', 'da', 'de', 'ki', 'mi', 'icin', 'gibi', 'cok', 'en', 'ya', 'ama',
+    'the', 'and', 'of', 'in', 'on', 'at', 'to', 'a', 'an', 'is', 'for', 'with',
+})
+# Katlanmış haldeki çekim ekleri, uzundan kısaya sıralı (her kelimeden en fazla bir ek atılır)
+SUFFIXES = sorted({
+    'lerinden', 'larindan', 'lerinde', 'larinda', 'lerine', 'larina', 'lerini', 'larini',
+    'leri', 'lari', 'ler', 'lar',
+    'nden', 'ndan', 'nde', 'nda', 'den', 'dan', 'ten', 'tan', 'de', 'da', 'te', 'ta',
+    'nin', 'nun', 'in', 'un', 'yi', 'yu', 'ye', 'ya', 'si', 'su',
+}, key=len, reverse=True)
+# Ek atıldıktan sonra kalması gereken en kısa kök uzunluğu
+MIN_STEM_LENGTH = 3
+
+
+def fold_text(text):
+    """
+    Metni Türkçe kurallarına göre küçük harfe çevirir ve aksanları kaldırır (İ -> i, Ş -> s, é -> e).
+    """
+    text = text.replace('İ', 'i').replace('I', 'ı').lower().translate(TURKISH_FOLD)
+    return ''.join(char for char in unicodedata.normalize('NFKD', text) if not unicodedata.combining(char))
+
+
+def stem_word(word):
+    """Katlanmış bir kelimenin sonundaki çekim ekini (varsa) atarak kökünü döndürür."""
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM_LENGTH:
+            return word[:-len(suffix)]
+    return word
+
+
+def iter_words(text):
+    """Metindeki kelimeleri (başlangıç, bitiş, kök) olarak döndürür; etkisiz kelimeler atlanır."""
+    for match in WORD_PATTERN.finditer(text or ''):
+        word = fold_text(match.group(1))
+        if word in STOPWORDS:
+            continue
+        yield match.start(), match.end(), stem_word(word)
+
+
+def analyze(text):
+    """Metni arama dizini ve sorgular için köklerin listesine dönüştürür."""
+    return [stem for _, _, stem in iter_words(text)]
@@ -1,28 +1,18 @@
-import tempfile
-import cv2
 import re
 from django.core.exceptions import ValidationError
+from .video import probe_video
+
+# Gönderilerde izin verilen en uzun video süresi (saniye)
+MAX_VIDEO_DURATION = 15
 
 def validate_video_duration(media_file):
-    """Video süresini kontrol eden validator"""
-    
-    with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-        temp_file.write(media_file.read())
-        temp_file.flush()
-        file_path = temp_file.name
+    """Video süresini kontrol eden validator (süre dosya başlıklarından okunur)"""
 
-    video = cv2.VideoCapture(file_path)
-    if not video.isOpened():
+    info = probe_video(media_file)
+    if info is None:
         raise ValidationError("Video file could not be opened.")
-    
-    fps = video.get(cv2.CAP_PROP_FPS)
-    frame_count = video.get(cv2.CAP_PROP_FRAME_COUNT)
-    duration = frame_count / fps if fps > 0 else 0
-    
-    video.release()
-    temp_file.close()
 
-    if duration > 15:
+    if info['duration'] > MAX_VIDEO_DURATION:
         raise ValidationError("Video duration exceeds the limit of 15 seconds.")
 
 def validate_password_strength(password):
@@ -0,0 +1,301 @@
+import os
+import struct
+import tempfile
+from contextlib import contextmanager
+
+# MP4/MOV dosyalarının en üst seviyesinde bulunabilecek kutu (atom) türleri
+QUICKTIME_ATOMS = {b'ftyp', b'moov', b'mdat', b'wide', b'free', b'skip', b'uuid', b'pnot'}
+# Video parçasına (track) ulaşmak için içine girilen kapsayıcı kutular
+CONTAINER_ATOMS = {b'trak', b'mdia', b'minf', b'stbl'}
+# moov kutusu için kabul edilen en büyük boyut; daha büyüğü bozuk dosya sayılır
+MAX_MOOV_SIZE = 64 * 1024 * 1024
+
+
+def _read_exact(stream, size):
+    data = stream.read(size)
+    if len(data) != size:
+        raise ValueError("Unexpected end of file.")
+    return data
+
+
+def _iter_boxes(data, start=0, end=None):
+    """Bellekteki bir bayt dizisindeki kutuları (tür, içerik başlangıcı, bitiş) olarak döndürür."""
+    end = len(data) if end is None else end
+    position = start
+    while position + 8 <= end:
+        size, kind = struct.unpack_from('>I4s', data, position)
+        header = 8
+        if size == 1:
+            size = struct.unpack_from('>Q', data, position + 8)[0]
+            header = 16
+        elif size == 0:
+            size = end - position
+        if size < header or position + size > end:
+            raise ValueError("Invalid box size.")
+        yield kind, position + header, position + size
+        position += size
+
+
+def _walk(stream):
+    """
+    Dosyanın üst seviye kutularını yalnızca başlıklarını okuyarak (tür, içerik boyutu) olarak döndürür.
+    - Her adımda akış kutunun içeriğinin başındadır; çağıran içeriği okumazsa üzerinden atlanır (mdat okunmaz).
+    - Dosyanın sonuna kadar uzanan kutuların içerik boyutu None'dır.
+    """
+    position = 0
+    while True:
+        stream.seek(position)
+        header = stream.read(8)
+        if len(header) < 8:
+            return
+        size, kind = struct.unpack('>I4s', header)
+        header_size = 8
+        if size == 1:
+            size = struct.unpack('>Q', _read_exact(stream, 8))[0]
+            header_size = 16
+        if size == 0:
+            yield kind, None
+            return
+        if size < header_size:
+            raise ValueError("Invalid box size.")
+        yield kind, size - header_size
+        position += size
+
+
+def _read_box(stream, kind, size):
+    if size is None:
+        return stream.read(MAX_MOOV_SIZE)
+    if size > MAX_MOOV_SIZE:
+        raise ValueError(f"{kind!r} box is too large.")
+    return _read_exact(stream, size)
+
+
+def _find_moov(stream):
+    """moov kutusunun içeriğini döndürür; moov dosyanın sonunda olsa bile yalnızca o kısım okunur."""
+    for kind, size in _walk(stream):
+        if kind == b'moov':
+            return _read_box(stream, kind, size)
+    return None
+
+
+def _fragments_duration(stream, track_id, default_sample_duration):
+    """
+    Parçalı (fragmented) MP4'te bir parçanın (track) örnek sürelerini moof/traf/trun kutularından toplar.
+    - Yalnızca moof kutuları okunur; aradaki medya verisinin üzerinden atlanır.
+    """
+    total = 0
+    for kind, size in _walk(stream):
+        if kind != b'moof':
+            continue
+        moof = _read_box(stream, kind, size)
+        for traf_kind, traf_start, traf_end in _iter_boxes(moof):
+            if traf_kind != b'traf':
+                continue
+            default_duration, matches = default_sample_duration, False
+            for child, content, _ in _iter_boxes(moof, traf_start, traf_end):
+                flags = int.from_bytes(moof[content + 1:content + 4], 'big')
+                if child == b'tfhd':
+                    matches = struct.unpack_from('>I', moof, content + 4)[0] == track_id
+                    # İsteğe bağlı alanlar: base_data_offset (8), sample_description_index (4), default_sample_duration (4)
+                    offset = content + 8 + (8 if flags & 0x01 else 0) + (4 if flags & 0x02 else 0)
+                    if flags & 0x08:
+                        default_duration = struct.unpack_from('>I', moof, offset)[0]
+                elif child == b'trun' and matches:
+                    sample_count = struct.unpack_from('>I', moof, content + 4)[0]
+                    if not flags & 0x100:
+                        total += sample_count * default_duration
+                        continue
+                    # Örnek başına alanlar: süre, boyut, bayraklar, kompozisyon farkı (bayraklara göre)
+                    offset = content + 8 + (4 if flags & 0x01 else 0) + (4 if flags & 0x04 else 0)
+                    stride = 4 * sum(1 for bit in (0x100, 0x200, 0x400, 0x800) if flags & bit)
+                    for index in range(sample_count):
+                        total += struct.unpack_from('>I', moof, offset + index * stride)[0]
+    return total
+
+
+def _parse_duration(data, start):
+    """mvhd/mdhd kutularının (sürüm 0 veya 1) zaman ölçeği ve süre alanlarını döndürür."""
+    version = data[start]
+    if version == 1:
+        return struct.unpack_from('>IQ', data, start + 20)
+    return struct.unpack_from('>II', data, start + 12)
+
+
+def _parse_track(data, start, end):
+    """Bir trak kutusundan işleyici türünü, genişlik/yüksekliği ve kodek adını çıkarır."""
+    track = {}
+    stack = [(start, end)]
+    while stack:
+        box_start, box_end = stack.pop()
+        for kind, content, box_stop in _iter_boxes(data, box_start, box_end):
+            if kind in CONTAINER_ATOMS:
+                stack.append((content, box_stop))
+            elif kind == b'tkhd':
+                track['track_id'] = struct.unpack_from('>I', data, content + (20 if data[content] == 1 else 12))[0]
+                # Genişlik ve yükseklik kutunun son 8 baytında 16.16 sabit noktalı sayılardır
+                width, height = struct.unpack_from('>II', data, box_stop - 8)
+                track['width'], track['height'] = width >> 16, height >> 16
+            elif kind == b'hdlr':
+                # MOV dosyalarında minf içinde ikinci bir (veri) işleyicisi bulunur; mdia'daki ilk işleyici geçerlidir
+                track.setdefault('handler', data[content + 8:content + 12])
+            elif kind == b'mdhd':
+                track['timescale'], track['duration'] = _parse_duration(data, content)
+            elif kind == b'stsd' and content + 16 <= box_stop:
+                # İlk örnek girdisinin türü kodeği belirtir (avc1, hvc1, mp4v ...)
+                track['codec'] = data[content + 12:content + 16].decode('latin-1').strip()
+                if content + 8 + 36 <= box_stop:
+                    # VisualSampleEntry içinde genişlik/yükseklik girdinin 32. baytından başlar
+                    track.setdefault('sample_size', struct.unpack_from('>HH', data, content + 8 + 32))
+    return track
+
+
+def probe_quicktime(stream):
+    """
+    MP4/MOV dosyasının süresini, çözünürlüğünü ve kodeğini yalnızca kutu başlıklarını okuyarak döndürür.
+    - Süre moov/mvhd kutusundan okunur; değişken kare hızlı (VFR) dosyalarda da doğrudur.
+    - Parçalı (fragmented) MP4'lerde süre mvex/mehd kutusundan, yoksa parçaların (moof) örnek sürelerinden hesaplanır.
+    """
+    moov = _find_moov(stream)
+    if moov is None:
+        raise ValueError("moov box not found.")
+    info = {'container': 'mp4', 'duration': None, 'width': None, 'height': None, 'codec': None}
+    video_track, timescale, fragment_duration, sample_durations = None, 0, 0, {}
+    for kind, content, end in _iter_boxes(moov):
+        if kind == b'mvhd':
+            timescale, duration = _parse_duration(moov, content)
+            if timescale and duration:
+                info['duration'] = duration / timescale
+        elif kind == b'mvex':
+            for child, child_content, _ in _iter_boxes(moov, content, end):
+                if child == b'mehd':
+                    # Parçalı dosyanın toplam süresi; zaman ölçeği mvhd ile aynıdır
+                    version = moov[child_content]
+                    fragment_duration, = struct.unpack_from('>Q' if version == 1 else '>I', moov, child_content + 4)
+                elif child == b'trex':
+                    # Parçaların varsayılan örnek süresi (parça ID'sine göre)
+                    track_id, _, default_duration = struct.unpack_from('>III', moov, child_content + 4)
+                    sample_durations[track_id] = default_duration
+        elif kind == b'trak' and video_track is None:
+            track = _parse_track(moov, content, end)
+            if track.get('handler') == b'vide':
+                video_track = track
+
+    if video_track is not None:
+        info['codec'] = video_track.get('codec')
+        info['width'], info['height'] = video_track.get('width'), video_track.get('height')
+        if not info['width'] and 'sample_size' in video_track:
+            info['width'], info['height'] = video_track['sample_size']
+        if info['duration'] is None and video_track.get('timescale') and video_track.get('duration'):
+            info['duration'] = video_track['duration'] / video_track['timescale']
+    if info['duration'] is None and timescale and fragment_duration:
+        info['duration'] = fragment_duration / timescale
+    if info['duration'] is None and video_track is not None and video_track.get('timescale'):
+        track_id = video_track.get('track_id')
+        total = _fragments_duration(stream, track_id, sample_durations.get(track_id, 0))
+        if total:
+            info['duration'] = total / video_track['timescale']
+    return info
+
+
+def probe_avi(stream):
+    """
+    AVI dosyasının süresini, çözünürlüğünü ve kodeğini RIFF başlığındaki avih/strh kutularından döndürür.
+    """
+    stream.seek(0)
+    riff, _, form, hdrl_list, hdrl_size, hdrl = struct.unpack('<4sI4s4sI4s', _read_exact(stream, 24))
+    if riff != b'RIFF' or form != b'AVI ' or hdrl_list != b'LIST' or hdrl != b'hdrl':
+        raise ValueError("Not an AVI file.")
+    if hdrl_size < 4:
+        raise ValueError("Invalid hdrl list size.")
+    data = _read_exact(stream, min(hdrl_size - 4, MAX_MOOV_SIZE))
+    info = {'container': 'avi', 'duration': None, 'width': None, 'height': None, 'codec': None}
+    position = 0
+    while position + 8 <= len(data):
+        kind, size = struct.unpack_from('<4sI', data, position)
+        content = position + 8
+        if kind == b'avih':
+            micro_seconds_per_frame, = struct.unpack_from('<I', data, content)
+            total_frames, = struct.unpack_from('<I', data, content + 16)
+            info['width'], info['height'] = struct.unpack_from('<II', data, content + 32)
+            info['duration'] = total_frames * micro_seconds_per_frame / 1e6
+        elif kind == b'LIST':
+            position = content + 4  # Liste türü (strl) atlanır, içindeki kutular sırayla okunur
+            continue
+        elif kind == b'strh' and data[content:content + 4] == b'vids' and info['codec'] is None:
+            info['codec'] = data[content + 4:content + 8].decode('latin-1').strip('\x00 ') or None
+        position = content + size + (size & 1)
+    return info
+
+
+@contextmanager
+def local_file_path(media_file):
+    """
+    Dosyanın diskteki yolunu verir.
+    - Diskte geçici dosyası olan yüklemelerde (`temporary_file_path`) kopya oluşturulmaz.
+    - Bellekteki dosyalar parça parça geçici bir dosyaya yazılır; geçici dosya blok bitince her durumda silinir.
+    """
+    if hasattr(media_file, 'temporary_file_path'):
+        yield media_file.temporary_file_path()
+        return
+    temp_file = tempfile.NamedTemporaryFile(delete=False)
+    try:
+        with temp_file:
+            for chunk in media_file.chunks():
+                temp_file.write(chunk)
+        yield temp_file.name
+    finally:
+        os.remove(temp_file.name)
+
+
+def probe_opencv(path):
+    """Başlıkları tanınmayan dosyalar için OpenCV ile süre ve çözünürlük okur (dosya açılıp çözülür)."""
+    import cv2  # Yalnızca yedek yolda gerektiği için burada içe aktarılır (yüklenmesi yavaştır)
+
+    video = cv2.VideoCapture(path)
+    try:
+        if not video.isOpened():
+            return None
+        fps = video.get(cv2.CAP_PROP_FPS)
+        frame_count = video.get(cv2.CAP_PROP_FRAME_COUNT)
+        fourcc = int(video.get(cv2.CAP_PROP_FOURCC))
+        return {
+            'container': None,
+            'duration': frame_count / fps if fps > 0 else 0,
+            'width': int(video.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            'height': int(video.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            'codec': fourcc.to_bytes(4, 'little').decode('latin-1').strip('\x00 ') or None,
+        }
+    finally:
+        video.release()
+
+
+def probe_stream(stream):
+    """
+    Açık bir dosya akışındaki videonun bilgilerini (container, duration, width, height, codec) başlıklardan okur.
+    - Konteyner tanınmazsa veya başlıklar okunamazsa None döndürür.
+    """
+    stream.seek(0)
+    head = stream.read(12)
+    try:
+        if head[:4] == b'RIFF' and head[8:12] == b'AVI ':
+            return probe_avi(stream)
+        if head[4:8] in QUICKTIME_ATOMS:
+            return probe_quicktime(stream)
+    except (ValueError, struct.error):
+        return None
+    finally:
+        stream.seek(0)
+    return None
+
+
+def probe_video(media_file):
+    """
+    Yüklenen video dosyasının bilgilerini (container, duration, width, height, codec) döndürür.
+    - MP4/MOV ve AVI dosyaları yalnızca başlıkları okunarak, kopyalanmadan ve çözülmeden incelenir.
+    - Konteyner tanınmazsa OpenCV'ye geri dönülür; o da açamazsa None döndürülür.
+    """
+    info = probe_stream(media_file)
+    if info is None or info['duration'] is None:
+        with local_file_path(media_file) as path:
+            info = probe_opencv(path)
+    return info